@@ -4,6 +4,8 @@ import json
 import time
 from typing import Dict, Any, Optional
 from utils.ai_client import ai_client
+from utils.webhook_verifier import (SIGNATURE_SCHEMES, compute_signature, verify_jsonl_batch,
+                                    sign_jsonl_batch)
 
 
 def display_api_tools(auto_select_tool: str = None):
@@ -271,6 +273,14 @@ def display_webhook_tester():
     st.info(
         "💡 This tool helps you test webhook payloads, validate JSON structures, and simulate webhook events for development purposes.")
 
+    mode = st.radio("Mode:", ["Single Webhook", "Batch Verification", "Batch Signing"], horizontal=True)
+    if mode == "Batch Verification":
+        display_webhook_batch_verifier()
+        return
+    elif mode == "Batch Signing":
+        display_webhook_batch_signer()
+        return
+
     col1, col2 = st.columns([1, 1])
 
     with col1:
@@ -340,12 +350,14 @@ def display_webhook_tester():
 
         # Add signature simulation
         include_signature = st.checkbox("Include HMAC Signature", value=True)
+        scheme = "HMAC-SHA256"
         if include_signature:
             secret_key = st.text_input("Secret Key:", value="webhook_secret_123")
+            scheme = st.selectbox("Signature Scheme:", list(SIGNATURE_SCHEMES.keys()), index=1)
 
         # Test webhook button
         if st.button("🚀 Test Webhook", type="primary", use_container_width=True):
-            test_webhook(payload_text, include_signature, secret_key if include_signature else None)
+            test_webhook(payload_text, include_signature, secret_key if include_signature else None, scheme)
 
     with col2:
         st.markdown("**Webhook Response**")
@@ -362,7 +374,7 @@ def display_webhook_tester():
 
                 if result.get('signature'):
                     st.markdown("**Generated HMAC Signature:**")
-                    st.code(result['signature'])
+                    st.code(f"{result.get('signature_header', 'X-Hub-Signature-256')}: {result['signature']}")
 
                 # Simulate processing
                 st.markdown("**Simulated Processing:**")
@@ -376,7 +388,7 @@ def display_webhook_tester():
             st.info("Configure and test a webhook to see the results here")
 
 
-def test_webhook(payload_text: str, include_signature: bool, secret_key: str):
+def test_webhook(payload_text: str, include_signature: bool, secret_key: str, scheme: str = "HMAC-SHA256"):
     """Test and validate webhook payload"""
     try:
         # Validate JSON
@@ -389,16 +401,8 @@ def test_webhook(payload_text: str, include_signature: bool, secret_key: str):
 
         # Generate HMAC signature if requested
         if include_signature and secret_key:
-            import hmac
-            import hashlib
-
-            signature = hmac.new(
-                secret_key.encode('utf-8'),
-                payload_text.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-
-            result['signature'] = f"sha256={signature}"
+            result['signature'] = compute_signature(payload_text, secret_key, scheme)
+            result['signature_header'] = SIGNATURE_SCHEMES[scheme]['header']
 
         st.session_state.webhook_result = result
         st.rerun()
@@ -417,6 +421,113 @@ def test_webhook(payload_text: str, include_signature: bool, secret_key: str):
         st.rerun()
 
 
+def display_webhook_batch_verifier():
+    """Verify signatures for a JSONL file of captured webhook deliveries"""
+    st.markdown("**Batch Signature Verification**")
+    st.caption('Upload a JSONL file with one delivery per line, e.g. '
+               '{"id": "evt_1", "payload": "...", "headers": {"X-Hub-Signature-256": "sha256=..."}}')
+
+    uploaded = st.file_uploader("Captured deliveries (JSONL):", type=['jsonl', 'ndjson', 'txt'])
+    scheme = st.selectbox("Signature Scheme:", list(SIGNATURE_SCHEMES.keys()), index=1, key="batch_verify_scheme")
+    secrets_text = st.text_area("Secrets (one per line, e.g. current and rotated keys):",
+                                value="webhook_secret_123", height=80)
+
+    tolerance = None
+    if scheme == "Stripe (timestamped)":
+        if st.checkbox("Enforce timestamp tolerance", value=False):
+            tolerance = st.number_input("Tolerance (seconds):", min_value=1, value=300)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        chunk_size = st.number_input("Records per worker chunk:", min_value=50, max_value=10000, value=500, step=50)
+    with col2:
+        workers = st.number_input("Worker processes (0 = auto):", min_value=0, max_value=64, value=0)
+
+    if uploaded and st.button("🔐 Verify Signatures", type="primary", use_container_width=True):
+        secrets = [line.strip() for line in secrets_text.splitlines() if line.strip()]
+        if not secrets:
+            st.error("Please enter at least one secret")
+            return
+
+        status_text = st.empty()
+
+        def report_progress(records: int, total_bytes: int):
+            status_text.text(f"Verified {records:,} deliveries ({total_bytes / (1024 * 1024):.1f} MB)...")
+
+        try:
+            with st.spinner("Verifying signatures..."):
+                report = verify_jsonl_batch(uploaded, secrets, scheme, tolerance=tolerance,
+                                            chunk_size=int(chunk_size), max_workers=int(workers) or None,
+                                            progress_callback=report_progress)
+        except Exception as e:
+            st.error(f"Error verifying batch: {str(e)}")
+            return
+
+        status_text.empty()
+        display_webhook_batch_report(report)
+
+
+def display_webhook_batch_report(report: Dict[str, Any]):
+    """Display pass/fail results and throughput for a batch verification"""
+    stats = report['stats']
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Deliveries", f"{stats['total']:,}")
+    with col2:
+        st.metric("Passed", f"{stats['passed']:,}")
+    with col3:
+        st.metric("Failed", f"{stats['failed']:,}")
+    with col4:
+        st.metric("Throughput", f"{stats['records_per_second']:,.0f}/s")
+
+    st.caption(f"Processed {stats['bytes'] / (1024 * 1024):.2f} MB in {stats['elapsed_seconds']:.2f}s "
+               f"({stats['mb_per_second']:.2f} MB/s)")
+
+    failures = [r for r in report['results'] if not r['valid']]
+    if failures:
+        st.error(f"❌ {len(failures):,} deliveries failed verification")
+        st.dataframe(failures[:1000], use_container_width=True)
+    elif stats['total']:
+        st.success("✅ All signatures verified")
+
+    report_lines = [json.dumps(r) for r in report['results']]
+    st.download_button(
+        label="📥 Download Verification Report (JSONL)",
+        data='\n'.join(report_lines).encode('utf-8'),
+        file_name="webhook_verification_report.jsonl",
+        mime="application/x-ndjson"
+    )
+
+
+def display_webhook_batch_signer():
+    """Generate signatures for every payload in a JSONL file"""
+    st.markdown("**Batch Signature Generation**")
+    st.caption('Upload a JSONL file with one payload per line (either raw JSON or {"payload": ...}).')
+
+    uploaded = st.file_uploader("Payloads (JSONL):", type=['jsonl', 'ndjson', 'txt'], key="batch_sign_upload")
+    scheme = st.selectbox("Signature Scheme:", list(SIGNATURE_SCHEMES.keys()), index=1, key="batch_sign_scheme")
+    secret = st.text_input("Secret Key:", value="webhook_secret_123", key="batch_sign_secret")
+
+    if uploaded and st.button("✍️ Sign Payloads", type="primary", use_container_width=True):
+        try:
+            with st.spinner("Signing payloads..."):
+                report = sign_jsonl_batch(uploaded, secret, scheme)
+        except Exception as e:
+            st.error(f"Error signing batch: {str(e)}")
+            return
+
+        stats = report['stats']
+        st.success(f"✅ Signed {stats['total']:,} payloads in {stats['elapsed_seconds']:.2f}s "
+                   f"({stats['records_per_second']:,.0f}/s, {stats['mb_per_second']:.2f} MB/s)")
+        st.download_button(
+            label="📥 Download Signed Deliveries (JSONL)",
+            data=report['output'],
+            file_name="signed_webhooks.jsonl",
+            mime="application/x-ndjson"
+        )
+
+
 def display_api_analyzer():
     """AI-powered API response analyzer"""
     st.markdown("### 🤖 AI API Response Analyzer")
@@ -0,0 +1,40 @@
+import io
+import os
+
+from utils.artifact_store import ArtifactStore
+
+
+def _store(tmp_path) -> ArtifactStore:
+    return ArtifactStore(root=str(tmp_path), compress_threshold=1024)
+
+
+def test_identical_payload_reuses_artifact(tmp_path):
+    store = _store(tmp_path)
+    data = b"id,value\n" + b"1,abc\n" * 10_000
+    first = store.register_bytes(data, "result.csv", "text/csv")
+    second = store.register_stream(io.BytesIO(data), "result.csv", "text/csv")
+    assert second is first
+    assert first.compressed
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(first.path)]
+    assert store.get(first.id) is first
+
+
+def test_different_content_or_filename_is_stored_separately(tmp_path):
+    store = _store(tmp_path)
+    first = store.register_bytes(b"a", "a.bin")
+    assert store.register_bytes(b"b", "a.bin").id != first.id
+    assert store.register_bytes(b"a", "b.bin").id != first.id
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_register_file_reuse_consumes_moved_source(tmp_path):
+    store = _store(tmp_path / 'store')
+    source = tmp_path / 'out.bin'
+    source.write_bytes(b"payload")
+    first = store.register_file(str(source), "out.bin", move=False)
+    assert source.exists()
+    second = store.register_file(str(source), "out.bin")
+    assert second is first
+    assert not source.exists()
+    with first.open() as handle:
+        assert handle.read() == b"payload"
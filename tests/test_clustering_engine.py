@@ -0,0 +1,33 @@
+import numpy as np
+
+from utils.clustering_engine import (CHUNK_ROWS, HIERARCHICAL_MAX_ROWS, _birch_labels, _chunks, _predict, cluster_labels,
+                                     fit_birch_tree)
+
+
+def test_chunks_merge_short_remainder():
+    assert _chunks(10001, 10000) == [slice(0, 10001)]
+    assert _chunks(25000, 10000) == [slice(0, 10000), slice(10000, 25000)]
+    assert _chunks(20000, 10000) == [slice(0, 10000), slice(10000, 20000)]
+    assert _chunks(5, 10000) == [slice(0, 5)]
+
+
+def test_minibatch_kmeans_with_one_row_remainder():
+    X = np.random.RandomState(0).normal(size=(10001, 3)).astype(np.float32)
+    for seed in range(5):
+        labels, method = cluster_labels(X, 5, "K-Means", scalable=True, random_state=seed)
+        assert method == "Mini-Batch K-Means"
+        assert len(labels) == 10001
+        assert len(np.unique(labels)) == 5
+
+
+def test_birch_on_wide_data_bounds_the_global_step():
+    # Standardized wide rows leave the CF-tree with far more subclusters than HIERARCHICAL_MAX_ROWS;
+    # cluster_labels and k_sweep both cut it through _birch_labels
+    X = np.random.RandomState(0).normal(size=(100_000, 12)).astype(np.float32)
+    tree = fit_birch_tree(X)
+    assert len(tree.subcluster_centers_) > HIERARCHICAL_MAX_ROWS
+    subclusters = _predict(tree, X, CHUNK_ROWS)
+    for k in (2, 4):
+        labels = _birch_labels(tree, subclusters, k)
+        assert len(labels) == 100_000
+        assert len(np.unique(labels)) == k
@@ -0,0 +1,48 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils.dedup_engine import dedup_stream, duplicate_groups, duplicate_mask, row_hashes
+
+
+def _mixed_frame() -> pd.DataFrame:
+    # Typical Excel upload: numbers and numeric text in the same column
+    return pd.DataFrame({'code': pd.Series([1, '1', 2, 1, 'a'], dtype=object), 'n': [0, 0, 0, 0, 0]})
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+def test_mixed_types_are_not_merged(keep):
+    df = _mixed_frame()
+    mask = duplicate_mask(row_hashes(df), keep, df)
+    assert mask.tolist() == df.duplicated(keep=keep).tolist()
+
+
+def test_hash_collisions_are_confirmed_on_values():
+    df = pd.DataFrame({'a': [1, 2, 3, 4]})
+    colliding = np.zeros(4, dtype=np.uint64)
+    assert not duplicate_mask(colliding, 'first', df).any()
+    assert duplicate_groups(colliding, df=df) == []
+
+
+def test_groups_by_value():
+    df = pd.DataFrame({'name': ['Ann', 'bob', 'ANN', 'Bob', 'cy'], 'city': ['X', 'Y', 'X', 'Y', 'Z']})
+    hashes = row_hashes(df, normalize=True)
+    groups = duplicate_groups(hashes, df=df, normalize=True)
+    assert [g.tolist() for g in groups] == [[0, 2], [1, 3]]
+    assert duplicate_groups(row_hashes(df, ['city']), df=df, subset=['city'], limit=1)[0].tolist() == [0, 2]
+
+
+def test_arrow_text_is_normalized():
+    df = pd.DataFrame({'name': pd.Series(['Ann', 'ANN', 'Bo'], dtype=pd.ArrowDtype(pa.string()))})
+    assert duplicate_mask(row_hashes(df, normalize=True), 'first', df, normalize=True).tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+def test_dedup_stream_matches_pandas(keep):
+    df = pd.DataFrame({'a': [1, 2, 1, 3, 2, 1], 'b': ['x', 'y', 'x', 'x', 'y', 'z']})
+    result = dedup_stream(io.BytesIO(df.to_csv(index=False).encode()), "CSV", keep=keep)
+    kept = pd.read_csv(result.output)
+    pd.testing.assert_frame_equal(kept, df[~df.duplicated(keep=keep)].reset_index(drop=True))
@@ -0,0 +1,18 @@
+import datetime
+
+import pandas as pd
+import pyarrow as pa
+from openpyxl import load_workbook
+
+from utils.excel_export import write_excel
+
+
+def test_arrow_timezone_column_is_written_as_wall_clock_time():
+    times = pd.Series(pd.to_datetime(['2024-01-01 10:00', None, '2024-06-01 12:30']).tz_localize('Europe/Paris'))
+    arrow_times = times.astype(pd.ArrowDtype(pa.timestamp('us', tz='Europe/Paris')))
+    df = pd.DataFrame({'numpy_tz': times, 'arrow_tz': arrow_times})
+    workbook = load_workbook(write_excel({'Data': df}))
+    rows = list(workbook['Data'].values)
+    expected = [datetime.datetime(2024, 1, 1, 10, 0), None, datetime.datetime(2024, 6, 1, 12, 30)]
+    assert [row[0] for row in rows[1:]] == expected
+    assert [row[1] for row in rows[1:]] == expected
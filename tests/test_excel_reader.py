@@ -0,0 +1,32 @@
+import os
+import time
+
+from utils.excel_reader import sweep_shadows
+
+
+def _shadow(directory, name: str, size: int, age_seconds: float) -> str:
+    path = directory / name
+    path.write_bytes(b'x' * size)
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return name
+
+
+def test_sweep_removes_expired_shadows(tmp_path):
+    _shadow(tmp_path, 'old.parquet', 10, 3600)
+    _shadow(tmp_path, 'new.parquet', 10, 0)
+    sweep_shadows(str(tmp_path), ttl_seconds=600, budget_mb=1)
+    assert os.listdir(tmp_path) == ['new.parquet']
+
+
+def test_sweep_evicts_least_recently_used_over_budget(tmp_path):
+    megabyte = 1024 * 1024
+    _shadow(tmp_path, 'a.parquet', megabyte, 300)
+    _shadow(tmp_path, 'b.parquet', megabyte, 200)
+    _shadow(tmp_path, 'c.parquet', megabyte, 100)
+    sweep_shadows(str(tmp_path), ttl_seconds=3600, budget_mb=2)
+    assert sorted(os.listdir(tmp_path)) == ['b.parquet', 'c.parquet']
+
+
+def test_sweep_ignores_missing_directory(tmp_path):
+    sweep_shadows(str(tmp_path / 'missing'))
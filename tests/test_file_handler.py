@@ -0,0 +1,43 @@
+import io
+
+from PIL import Image
+
+from utils.file_handler import FileHandler
+
+
+class UploadedFile(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.file_id = f"{name}:{len(data)}"
+
+
+def _jpeg_with_exif() -> bytes:
+    exif = Image.Exif()
+    exif[271] = 'Canon'
+    exif[306] = '2024:01:01 10:00:00'
+    exif.get_ifd(0x8825)[1] = 'N'
+    output = io.BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(output, 'JPEG', exif=exif.tobytes())
+    return output.getvalue()
+
+
+def test_process_image_file_keeps_exif():
+    image = FileHandler.process_image_file(UploadedFile(_jpeg_with_exif(), 'photo.jpg'))
+    exif = image.getexif()
+    assert exif[271] == 'Canon'
+    assert exif[306] == '2024:01:01 10:00:00'
+    assert exif.get_ifd(0x8825) == {1: 'N'}
+
+
+def test_process_image_file_returns_private_copy():
+    upload = UploadedFile(_jpeg_with_exif(), 'photo.jpg')
+    first = FileHandler.process_image_file(upload)
+    first.info['exif'] = b''
+    first.putpixel((0, 0), (0, 0, 0))
+    second = FileHandler.process_image_file(upload)
+    assert second.getexif()[271] == 'Canon'
+    assert second.getpixel((0, 0)) != (0, 0, 0)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from utils.forecast_engine import forecast_matrix
+
+
+def _trending_seasonal(n: int) -> np.ndarray:
+    t = np.arange(n)
+    return 10 + 0.2 * t + 3 * np.sin(2 * np.pi * t / 12)
+
+
+@pytest.mark.parametrize('n', [24, 36, 60, 240])
+def test_holt_winters_forecasts_noise_free_series_exactly(n):
+    y = _trending_seasonal(n + 12)
+    forecast = forecast_matrix(y[None, :n], np.array([n]), 12, "Holt-Winters", season=12)
+    np.testing.assert_allclose(forecast[0], y[n:], atol=1e-9)
+
+
+def test_holt_winters_batch_of_different_lengths():
+    lengths = np.array([36, 60])
+    Y = np.full((2, 60), np.nan)
+    for row, n in enumerate(lengths):
+        Y[row, :n] = _trending_seasonal(n)
+    forecast = forecast_matrix(Y, lengths, 12, "Holt-Winters", season=12)
+    for row, n in enumerate(lengths):
+        np.testing.assert_allclose(forecast[row], _trending_seasonal(n + 12)[n:], atol=1e-9)
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from utils.formula_engine import evaluate_formula
+
+
+@pytest.mark.parametrize('formula, expected', [
+    ('a // b', lambda df: df['a'] // df['b']),
+    ('a % b', lambda df: df['a'] % df['b']),
+    ('a // 0', lambda df: df['a'] // 0),
+    ('a % 0', lambda df: df['a'] % 0),
+    ('a % 3', lambda df: df['a'] % 3),
+    ('x // b', lambda df: df['x'] // df['b']),
+])
+def test_zero_divisors_match_pandas(formula, expected):
+    df = pd.DataFrame({'a': [7, -7, 0, 9, 4, -4], 'b': [2, 3, 5, 0, 0, 0], 'x': [1.5, -2.5, 0.0, 3.5, 0.0, -1.0]})
+    result = evaluate_formula(df, formula, chunk_rows=2, use_numexpr=False)
+    pd.testing.assert_series_equal(result, expected(df), check_names=False)
+
+
+def test_integer_constants_are_exact():
+    df = pd.DataFrame({'a': [1, 2]})
+    assert evaluate_formula(df, '2 ** 70').tolist() == [2 ** 70, 2 ** 70]
+    assert evaluate_formula(df, '-(2 ** 64) // 3 + 1').tolist() == [-(2 ** 64) // 3 + 1] * 2
+    assert evaluate_formula(df, 'a * 2 ** 40').tolist() == [2 ** 40, 2 ** 41]
+    with pytest.raises(ValueError):
+        evaluate_formula(df, '9 ** 9 ** 9')
+
+
+def test_datetime_reductions():
+    df = pd.DataFrame({'d': pd.to_datetime(['2024-01-03', '2024-01-01', None, '2024-01-10'])})
+    pd.testing.assert_series_equal(evaluate_formula(df, 'd - d.min()'), df['d'] - df['d'].min(), check_names=False)
+    pd.testing.assert_series_equal(evaluate_formula(df, "df['d'] > df['d'].mean()"), df['d'] > df['d'].mean(),
+                                   check_names=False)
+
+
+@pytest.mark.parametrize('formula', [
+    "__import__('os').system('true')",
+    "df.__class__",
+    "a.__class__.__bases__",
+    "open('/etc/passwd')",
+    "getattr(df, 'a')",
+    "(lambda: 1)()",
+    "[x for x in a]",
+    "{'k': 1}",
+    "a.mean(skipna=False)",
+    "np.load('data.npy')",
+    "df[a]",
+    "b",
+])
+def test_unsafe_or_unknown_syntax_is_rejected(formula):
+    with pytest.raises(ValueError):
+        evaluate_formula(pd.DataFrame({'a': [1, 2]}), formula)
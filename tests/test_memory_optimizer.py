@@ -0,0 +1,35 @@
+import pandas as pd
+
+from utils.memory_optimizer import optimize_dataframe
+
+
+def test_numeric_text_is_kept_by_default():
+    df = pd.DataFrame({'n': ['1', '22', '333']})
+    optimized, report = optimize_dataframe(df)
+    assert report['Action'].iloc[0] != 'parsed numbers'
+    assert optimized['n'].tolist() == ['1', '22', '333']
+
+
+def test_number_parsing_keeps_leading_zeros():
+    df = pd.DataFrame({'zip': ['02134', '10001', '94105'], 'n': ['1', '22', '333']})
+    optimized, report = optimize_dataframe(df, {'parse_numbers': True})
+    actions = dict(zip(report['Column'], report['Action']))
+    assert actions['zip'] != 'parsed numbers'
+    assert optimized['zip'].tolist() == ['02134', '10001', '94105']
+    assert actions['n'] == 'parsed numbers'
+    assert optimized['n'].tolist() == [1, 22, 333]
+
+
+def test_integers_are_downcast_to_signed_types():
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': [3, 5, 7], 'f': [1.0, 2.0, 200.0]})
+    optimized, _ = optimize_dataframe(df)
+    assert optimized['a'].dtype == 'int8'
+    assert optimized['f'].dtype == 'int16'
+    assert (optimized['a'] - optimized['b']).tolist() == [-2, -3, -4]
+    assert (-optimized['a']).tolist() == [-1, -2, -3]
+
+
+def test_unsigned_downcast_is_opt_in():
+    df = pd.DataFrame({'a': [1, 2, 200]})
+    optimized, _ = optimize_dataframe(df, {'unsigned_ints': True})
+    assert optimized['a'].dtype == 'uint8'
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold
+
+from utils import model_executor
+from utils.hyperparameter_search import HyperparameterSearch
+from utils.model_executor import PreparedData
+
+
+def _data(rows=300):
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(rows, 3))
+    y = X @ np.array([1.0, -2.0, 0.5]) + rng.normal(scale=0.1, size=rows)
+    return PreparedData(X, y, pd.RangeIndex(rows), ['a', 'b', 'c'], 'Regression', None, f'test-{rows}')
+
+
+def test_fold_and_split_caches_are_bounded():
+    data, cv = _data(), KFold(3)
+    for n in range(20, 20 + 3 * model_executor.SPLIT_CACHE_ENTRIES):
+        data.folds(cv, rows=np.arange(n))
+        data.split(test_size=n / 100)
+    assert len(data._folds) == model_executor.SPLIT_CACHE_ENTRIES
+    assert len(data._splits) == model_executor.SPLIT_CACHE_ENTRIES
+    folds = data.folds(cv, rows=np.arange(20))[1]
+    assert data.folds(cv, rows=np.arange(20))[1] is folds
+
+
+def test_search_counts_only_fits_it_ran():
+    model_executor.get_fit_cache.clear()
+    data = _data(rows=301)
+    first = HyperparameterSearch(data, "Ridge Regression", "r2", np.arange(301), cv=3, n_jobs=1)
+    result = first.run("Random Search", n_candidates=4)
+    assert result.fits == 4 * 3
+    again = HyperparameterSearch(data, "Ridge Regression", "r2", np.arange(301), cv=3, n_jobs=1)
+    assert again.run("Random Search", n_candidates=4).fits == 0
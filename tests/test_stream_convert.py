@@ -0,0 +1,45 @@
+import io
+
+import pandas as pd
+import pytest
+
+from utils import ingestion
+from utils.dedup_engine import dedup_stream
+from utils.stream_convert import convert_stream
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Small reader blocks so the type change below lands in a later block than the first
+    monkeypatch.setattr(ingestion, 'DEFAULT_BLOCK_SIZE', 64 * 1024)
+
+
+def _drifting_csv(rows: int = 50_000) -> bytes:
+    lines = ["id,value"] + [f"{i},{i % 7}" for i in range(rows)] + ["x1,hello", "x1,hello"]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def test_text_conversion_keeps_values_unchanged(small_blocks):
+    data = b"zip,price\n02134,1.50\n10001,2\n"
+    result = convert_stream(io.BytesIO(data), "CSV", "TSV")
+    table = pd.read_csv(result.output, sep='\t', dtype=str)
+    assert table['zip'].tolist() == ['02134', '10001']
+    assert table['price'].tolist() == ['1.50', '2']
+
+
+@pytest.mark.parametrize('output_format', ["TSV", "Parquet", "JSON Lines"])
+def test_later_block_with_new_type_is_converted(small_blocks, output_format):
+    result = convert_stream(io.BytesIO(_drifting_csv()), "CSV", output_format)
+    assert result.stats['rows'] == 50_002
+
+
+def test_parquet_schema_is_widened(small_blocks):
+    result = convert_stream(io.BytesIO(_drifting_csv()), "CSV", "Parquet")
+    table = pd.read_parquet(result.output)
+    assert table['id'].iloc[-1] == 'x1'
+    assert table['value'].iloc[-1] == 'hello'
+
+
+def test_dedup_stream_handles_later_block_with_new_type(small_blocks):
+    result = dedup_stream(io.BytesIO(_drifting_csv()), "CSV", subset=['value'])
+    assert result.stats['kept_rows'] == 8
@@ -0,0 +1,54 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from utils.text_engine import _hash_chunk, hash_documents, key_terms, kmeans_topics, lda_topics
+
+PETS = "cat dog puppy kitten leash vet fur".split()
+MARKETS = "stock bond market trade shares broker dividend".split()
+
+
+def _corpus(n_docs: int = 120):
+    rng = np.random.RandomState(0)
+    return [" ".join(rng.choice(PETS if i % 2 == 0 else MARKETS, 12)) for i in range(n_docs)]
+
+
+def _themes(topics):
+    return [set(topic['top_words'][:5]) for topic in topics]
+
+
+def test_lda_topics_separate_themes():
+    documents = _corpus()
+    result = lda_topics(documents, 2, max_features=100, min_df=2, stop_words=True, passes=10)
+    themes = _themes(result['topics'])
+    assert sorted(len(theme & set(PETS)) for theme in themes) == [0, 5]
+    assert result['doc_topic_probs'].shape == (len(documents), 2)
+    dominant = result['doc_topic_probs'].argmax(axis=1)
+    assert (dominant[::2] != dominant[1::2]).all()
+
+
+def test_kmeans_topics_separate_themes():
+    documents = _corpus()
+    result = kmeans_topics(documents, 2, max_features=100, min_df=2, stop_words=True)
+    themes = _themes(result['topics'])
+    assert sorted(len(theme & set(MARKETS)) for theme in themes) == [0, 5]
+    labels = result['doc_assignments']
+    assert len(set(labels[::2])) == len(set(labels[1::2])) == 1 and labels[0] != labels[1]
+
+
+def test_key_terms_match_tfidf_on_joined_text():
+    documents = _corpus(60) + ["the and of"]
+    terms = key_terms(documents, top=5, n_jobs=1, chunk_docs=7)
+    vectorizer = TfidfVectorizer(max_features=5, stop_words='english')
+    scores = vectorizer.fit_transform([" ".join(documents)]).toarray()[0]
+    expected = sorted(zip(vectorizer.get_feature_names_out(), scores), key=lambda item: -item[1])
+    assert [term for term, _ in terms] == [term for term, _ in expected]
+    np.testing.assert_allclose([score for _, score in terms], [score for _, score in expected])
+
+
+def test_bucket_names_come_from_bounded_top_terms():
+    rare = [f"typo{i}x" for i in range(500)]
+    documents = _corpus(40) + [" ".join(rare[i::20]) for i in range(20)]
+    assert len(_hash_chunk(documents, True, 2 ** 12, 30)[1]) == 30
+    dtm = hash_documents(documents, n_features=2 ** 12, n_jobs=1, chunk_docs=10, named_terms=30)
+    _, terms = dtm.select(len(PETS + MARKETS))
+    assert set(terms) == set(PETS + MARKETS)
@@ -0,0 +1,38 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils import ingestion
+from utils.ingestion import ingest_dataframe
+from utils.tool_page import read_dataframe
+
+
+class UploadedFile(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.file_id = f"{name}:{len(data)}"
+
+
+def _large_csv(rows: int = 400_000) -> bytes:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'id': np.arange(rows), 'value': rng.normal(size=rows), 'label': rng.choice(['a', 'b'], rows)})
+    return df.to_csv(index=False).encode()
+
+
+def test_budgeted_ingest_reports_truncation():
+    result = ingest_dataframe(io.BytesIO(_large_csv()), "CSV", memory_budget_mb=1, dtype_backend="numpy")
+    assert result.info['truncated']
+    assert len(result.df) < 400_000
+
+
+def test_read_dataframe_reads_large_csv_in_full(monkeypatch):
+    # Shrink the default ingest budget so this upload is larger than it
+    monkeypatch.setattr(ingestion, 'DEFAULT_MEMORY_BUDGET_MB', 1)
+    df = read_dataframe(UploadedFile(_large_csv(), 'large.csv'))
+    assert len(df) == 400_000
+    assert df['id'].iloc[-1] == 399_999
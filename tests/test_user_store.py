@@ -0,0 +1,48 @@
+from utils.user_store import UserStateStore
+
+
+def _store(max_cached_users: int) -> UserStateStore:
+    return UserStateStore(':memory:', flush_batch_size=1000, flush_interval=1e9,
+                          max_cached_users=max_cached_users)
+
+
+def test_cache_is_bounded_to_most_recent_users():
+    store = _store(3)
+    for i in range(10):
+        store.load(f'user{i}')
+    store.load('user7')
+    store.load('user10')
+    assert list(store._cache) == ['user9', 'user7', 'user10']
+
+
+def test_evicted_users_keep_their_pending_changes():
+    store = _store(2)
+    store.add_recent('alice', 'CSV Converter')
+    store.load('bob')
+    store.load('carol')
+    assert 'alice' not in store._cache
+    assert list(store.load('alice').recent_tools) == ['CSV Converter']
+
+
+def _session_script():
+    from utils import common
+
+    common.init_session_state()
+    common.get_user_store().load('another-user')  # evicts this session's user from the store's cache
+    common.add_to_recent('Tool B')
+
+
+def test_session_sees_updates_after_eviction(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    from utils import common
+
+    store = _store(1)
+    monkeypatch.setattr(common, 'get_user_store', lambda: store)
+    app = AppTest.from_function(_session_script)
+    app.query_params['uid'] = 'shared-link-id'
+    app.run()
+    assert not app.exception
+    assert 'Tool B' in app.session_state.recent_tools
+    assert app.session_state.user_id != 'shared-link-id'
+    assert 'uid' not in app.query_params
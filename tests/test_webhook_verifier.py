@@ -0,0 +1,55 @@
+import hashlib
+import hmac
+import json
+
+from utils.webhook_verifier import (STRIPE_SCHEME, compute_signature, iter_jsonl_chunks, sign_jsonl_batch,
+                                    verify_jsonl_batch, verify_signature)
+
+SECRET = "webhook_secret_123"
+
+
+def _jsonl(records) -> bytes:
+    return ("\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n").encode('utf-8')
+
+
+def test_signature_round_trip_and_rotation():
+    signature = compute_signature(b'{"a": 1}', SECRET)
+    assert signature == "sha256=" + hmac.new(SECRET.encode(), b'{"a": 1}', hashlib.sha256).hexdigest()
+    assert verify_signature(b'{"a": 1}', signature, ["old", SECRET]) == {'valid': True, 'reason': 'OK',
+                                                                        'secret_index': 1}
+    assert not verify_signature(b'{"a":1}', signature, [SECRET])['valid']
+
+    stripe = compute_signature(b'{}', SECRET, STRIPE_SCHEME, timestamp=1000)
+    assert verify_signature(b'{}', stripe, [SECRET], STRIPE_SCHEME, tolerance=60, now=1030)['valid']
+    assert verify_signature(b'{}', stripe, [SECRET], STRIPE_SCHEME, tolerance=60, now=1100)['reason'] == \
+        'Timestamp outside tolerance'
+
+
+def test_verify_uses_the_raw_payload_text():
+    # The sender signed the body exactly as delivered: spaced, with its own key order and non-ASCII text
+    body = '{"zeta": 1, "alpha": "café", "nested": {"b": [1, 2.50]}}'
+    signature = compute_signature(body.encode('utf-8'), SECRET)
+    line = f'{{"id": "evt_1", "payload": {body}, "headers": {{"X-Hub-Signature-256": "{signature}"}}}}'
+    report = verify_jsonl_batch(line.encode('utf-8'), [SECRET], max_workers=1)
+    assert [r['valid'] for r in report['results']] == [True]
+
+
+def test_signed_batch_verifies_and_keeps_payloads():
+    records = [{'payload': {'user': 'Zoë', 'amount': 1.50, 'tags': ['ü', 'ß']}}, {'event': 'ping', 'n': 2},
+               {'payload': 'plain text body'}]
+    for scheme in ("HMAC-SHA256", STRIPE_SCHEME):
+        signed = sign_jsonl_batch(_jsonl(records), SECRET, scheme, max_workers=1)
+        lines = signed['output'].decode('utf-8').splitlines()
+        assert [json.loads(line)['payload'] for line in lines] == [records[0]['payload'], records[1],
+                                                                     'plain text body']
+        report = verify_jsonl_batch(signed['output'], [SECRET], scheme, max_workers=1)
+        assert report['stats']['passed'] == 3
+        assert not verify_jsonl_batch(signed['output'], ["other"], scheme, max_workers=1)['stats']['passed']
+
+
+def test_chunks_count_bytes_not_characters():
+    data = _jsonl([{'payload': 'ünïcödé ' * 10}] * 7)
+    chunks = list(iter_jsonl_chunks(data, chunk_size=3))
+    assert [len(chunk) for chunk, _ in chunks] == [3, 3, 1]
+    assert sum(size for _, size in chunks) == len(data)
+    assert verify_jsonl_batch(data, [SECRET], max_workers=1)['stats']['bytes'] == len(data)
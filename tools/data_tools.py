@@ -6,9 +6,40 @@ import csv
 from io import StringIO, BytesIO
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.common import create_tool_header, show_progress_bar, add_to_recent, display_test_results
 from utils.file_handler import FileHandler
 from utils.ai_client import ai_client
+from utils.tool_page import fragment, load_dataframe, replace_dataframe
+from utils.ingestion import ingest_dataframe, iter_record_batches, DEFAULT_MEMORY_BUDGET_MB
+from utils.stream_convert import convert_stream, STREAMING_FORMATS, DEFAULT_ROW_GROUP_SIZE
+from utils.artifact_store import serve_download
+from utils.excel_export import write_excel, EXCEL_MIME, EXCEL_MAX_ROWS
+from utils.excel_reader import read_excel_sheets, fast_engine_name
+from utils.upload_cache import upload_digest
+from utils.profiler import profile_dataframe
+from utils.join_engine import estimate_join, hash_join, JOIN_TYPES, JOIN_OUTPUT_FORMATS
+from utils.dedup_engine import (row_hashes, duplicate_mask, duplicate_groups, dedup_stream,
+                                 near_duplicate_groups)
+from utils.formula_engine import evaluate_formula
+from utils.correlation_engine import correlation_matrix, top_pairs, correlation_heatmap
+from utils.model_executor import prepare_data, fit_models, cross_validate_models, with_scaling
+from utils.hyperparameter_search import (HyperparameterSearch, SEARCH_SPACES, SEARCH_STRATEGIES, BUDGET_TYPES,
+                                         SCORING_OPTIONS, serialize_pipeline)
+from utils.clustering_engine import (CLUSTERING_ALGORITHMS, SCALABLE_ROWS, SILHOUETTE_SAMPLE, standardize,
+                                     cluster_labels, sampled_silhouette, k_sweep, assign_to_rows, plot_sample,
+                                     describe_method)
+from utils.spectral_engine import spectral_profile, detect_period, seasonal_means
+from utils.forecast_engine import (FORECAST_METHODS, SEASONAL_METHODS, forecast_series, batch_forecast,
+                                   default_season_length, infer_frequency, future_dates)
+from utils.plot_reduction import (DENSITY_THRESHOLD, LINE_POINTS, MATRIX_BINS, reduce_lines, draw_density,
+                                  density_note, scatter_matrix_figure)
+from utils.aggregation_engine import AGGREGATIONS, group_partials, aggregate, value_counts, pivot
+from utils.hypothesis_engine import (CORRECTIONS, ALTERNATIVES, apply_correction, adjust_pvalues, one_sample_ttests,
+                                     two_sample_ttests, anova_tests, normality_tests)
+from utils.text_engine import lda_topics, kmeans_topics, key_terms as corpus_key_terms
+from utils.memory_optimizer import optimize_dataframe, dense_copy
+from utils.quality_engine import (get_quality_report, DATE_FORMAT_PATTERNS, DATE_LIKE_PATTERN, EMAIL_PATTERN,
+                                  PHONE_PATTERN)
 import sqlite3
 import tempfile
 import os
@@ -16,9 +47,6 @@ import io
 import re
 from collections import Counter, defaultdict
 import string
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-from sklearn.cluster import KMeans
 
 
 def display_tools():
@@ -43,8 +71,8 @@ def display_tools():
         ],
         "Machine Learning": [
             "Linear Regression", "Advanced Regression", "Classification Models", "Ensemble Methods",
-            "Clustering Analysis", "Feature Selection", "Model Evaluator", "Cross Validation", "Pattern Recognition",
-            "Predictive Modeling"
+            "Clustering Analysis", "Feature Selection", "Model Evaluator", "Cross Validation", "Hyperparameter Search",
+            "Pattern Recognition", "Predictive Modeling"
         ],
         "Text Analytics": [
             "Text Mining", "Sentiment Analysis", "Word Frequency", "N-gram Analysis", "Topic Modeling"
@@ -104,6 +132,8 @@ def display_tools():
         model_evaluator()
     elif selected_tool == "Cross Validation":
         cross_validation()
+    elif selected_tool == "Hyperparameter Search":
+        hyperparameter_search()
     elif selected_tool == "Trend Analysis":
         trend_analysis()
     elif selected_tool == "Data Profiling":
@@ -206,7 +236,7 @@ def csv_converter():
         uploaded_file = FileHandler.upload_files(['xlsx', 'xls'], accept_multiple=False)
         if uploaded_file:
             try:
-                df = pd.read_excel(uploaded_file[0])
+                df = FileHandler.process_excel_file(uploaded_file[0])
                 st.dataframe(df.head())
                 convert_excel_to_csv(df)
             except Exception as e:
@@ -237,26 +267,11 @@ def convert_csv_to_excel(df):
     """Convert CSV DataFrame to Excel"""
     if st.button("Convert to Excel"):
         try:
-            # Create a temporary file path for Excel conversion
-            import tempfile
-            import os
-
-            with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-
-            # Write Excel file to temp path
-            with pd.ExcelWriter(temp_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Data', index=False)
-
-            # Read the file and create download
-            with open(temp_path, 'rb') as f:
-                excel_data = f.read()
-
-            # Clean up temp file
-            os.unlink(temp_path)
-
-            FileHandler.create_download_link(excel_data, "converted_data.xlsx",
-                                             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+            # Stream rows into a write-only workbook; sheets split automatically past Excel's row limit
+            with write_excel({'Data': df}) as excel_data:
+                FileHandler.create_download_link(excel_data, "converted_data.xlsx", EXCEL_MIME)
+            if len(df) >= EXCEL_MAX_ROWS:
+                st.info(f"ℹ️ {len(df):,} rows exceed Excel's sheet limit; data was split across multiple sheets.")
             st.success("✅ Conversion completed!")
         except Exception as e:
             st.error(f"Conversion error: {str(e)}")
@@ -379,7 +394,7 @@ def statistical_summary():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -390,6 +405,9 @@ def statistical_summary():
 
 def generate_summary(df):
     """Generate enhanced statistical summary with automated insights"""
+    # One chunked pass feeds the overview, column info and enhanced statistics
+    profile = profile_dataframe(df)
+
     st.markdown("### 📊 Dataset Overview")
 
     col1, col2, col3, col4 = st.columns(4)
@@ -398,10 +416,10 @@ def generate_summary(df):
     with col2:
         st.metric("Columns", len(df.columns))
     with col3:
-        missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
+        missing_pct = 100 - profile.completeness
         st.metric("Missing %", f"{missing_pct:.1f}%")
     with col4:
-        memory_usage = df.memory_usage(deep=True).sum() / 1024 ** 2
+        memory_usage = profile.memory_bytes / 1024 ** 2
         st.metric("Memory (MB)", f"{memory_usage:.1f}")
 
     # Enhanced Data Quality Score
@@ -412,7 +430,7 @@ def generate_summary(df):
 
     # Data types with enhanced info
     st.markdown("### 📋 Enhanced Column Information")
-    info_df = create_enhanced_column_info(df)
+    info_df = create_enhanced_column_info(df, profile=profile)
     st.dataframe(info_df)
 
     # Data Quality Assessment
@@ -422,8 +440,7 @@ def generate_summary(df):
         st.metric("Quality Score", f"{data_quality_score:.1f}/100",
                   delta=None if data_quality_score >= 80 else "Needs Improvement")
     with col2:
-        completeness = ((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns))) * 100
-        st.metric("Completeness", f"{completeness:.1f}%")
+        st.metric("Completeness", f"{profile.completeness:.1f}%")
 
     # Automated Insights
     if insights:
@@ -446,7 +463,7 @@ def generate_summary(df):
         st.dataframe(desc_stats)
 
         # Additional statistical measures
-        enhanced_stats = calculate_enhanced_statistics(df, numeric_cols)
+        enhanced_stats = calculate_enhanced_statistics(df, numeric_cols, profile=profile)
         st.dataframe(enhanced_stats)
 
         # Distribution analysis
@@ -473,27 +490,24 @@ def generate_summary(df):
 
 def calculate_data_quality_score(df):
     """Calculate a comprehensive data quality score (0-100)"""
+    report = get_quality_report(df)
     score = 100
 
     # Completeness (40% weight)
-    missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
+    missing_pct = (report.missing_cells / report.total_cells) * 100
     completeness_score = max(0, 100 - missing_pct * 2)
     score = score * 0.4 + completeness_score * 0.4
 
     # Consistency (30% weight) - check for data type issues
     consistency_score = 100
     for col in df.columns:
-        if df[col].dtype == 'object':
-            try:
-                pd.to_numeric(df[col], errors='raise')
-                consistency_score -= 10  # Penalty for mixed types
-            except:
-                pass
+        if report.columns[col].is_object and report.columns[col].parses_as_numeric:
+            consistency_score -= 10  # Penalty for mixed types
 
     score = score * 0.7 + consistency_score * 0.3
 
     # Uniqueness (20% weight) - check for duplicates
-    duplicates_pct = (df.duplicated().sum() / len(df)) * 100
+    duplicates_pct = (report.duplicate_rows / len(df)) * 100
     uniqueness_score = max(0, 100 - duplicates_pct * 5)
     score = score * 0.8 + uniqueness_score * 0.2
 
@@ -501,7 +515,8 @@ def calculate_data_quality_score(df):
     validity_score = 100
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     for col in numeric_cols:
-        if (df[col] < 0).any() and col.lower() in ['age', 'count', 'quantity', 'amount']:
+        column = report.columns[col]
+        if column.count and column.negative_count > 0 and col.lower() in ['age', 'count', 'quantity', 'amount']:
             validity_score -= 5  # Penalty for negative values where they shouldn't be
 
     score = score * 0.9 + validity_score * 0.1
@@ -575,64 +590,71 @@ def generate_automated_insights(df):
     return insights
 
 
-def create_enhanced_column_info(df):
+def create_enhanced_column_info(df, profile=None):
     """Create enhanced column information with additional metrics"""
+    if profile is None:
+        profile = profile_dataframe(df)
     info_data = []
 
     for col in df.columns:
-        col_data = df[col]
+        col_profile = profile.columns[col]
         info = {
             'Column': col,
-            'Data Type': str(col_data.dtype),
-            'Non-Null Count': col_data.count(),
-            'Null Count': col_data.isnull().sum(),
-            'Null %': (col_data.isnull().sum() / len(df)) * 100,
-            'Unique Values': col_data.nunique(),
-            'Unique %': (col_data.nunique() / len(df)) * 100
+            'Data Type': col_profile.dtype,
+            'Non-Null Count': col_profile.count,
+            'Null Count': col_profile.missing,
+            'Null %': (col_profile.missing / len(df)) * 100,
+            'Unique Values': col_profile.unique,
+            'Unique %': (col_profile.unique / len(df)) * 100
         }
 
         # Add type-specific metrics
-        if pd.api.types.is_numeric_dtype(col_data):
-            info['Min'] = col_data.min()
-            info['Max'] = col_data.max()
-            info['Mean'] = col_data.mean()
-            info['Std'] = col_data.std()
+        if col_profile.kind == 'numeric':
+            moments = col_profile.moments
+            info['Min'] = moments.min if moments.n else np.nan
+            info['Max'] = moments.max if moments.n else np.nan
+            info['Mean'] = moments.mean if moments.n else np.nan
+            info['Std'] = moments.std()
         else:
-            most_common = col_data.mode()
-            info['Most Common'] = most_common.iloc[0] if len(most_common) > 0 else 'N/A'
-            info['Mode Frequency'] = (col_data == info['Most Common']).sum() if info['Most Common'] != 'N/A' else 0
+            top = col_profile.top_k(1)
+            info['Most Common'] = top[0][0] if top else 'N/A'
+            info['Mode Frequency'] = top[0][1] if top else 0
 
         info_data.append(info)
 
     return pd.DataFrame(info_data).round(2)
 
 
-def calculate_enhanced_statistics(df, numeric_cols):
+def calculate_enhanced_statistics(df, numeric_cols, profile=None):
     """Calculate additional statistical measures beyond basic describe()"""
+    if profile is None:
+        profile = profile_dataframe(df[list(numeric_cols)])
     stats_data = []
 
     for col in numeric_cols:
-        data = df[col].dropna()
-        if len(data) > 0:
+        col_profile = profile.columns[col]
+        moments = col_profile.moments
+        if moments.n > 0:
             from scipy import stats
 
+            q1, q3 = col_profile.quantile(0.25), col_profile.quantile(0.75)
+            iqr = q3 - q1
+
             # Basic stats
             stats_info = {
                 'Column': col,
-                'Skewness': stats.skew(data),
-                'Kurtosis': stats.kurtosis(data),
-                'Variance': data.var(),
-                'CV (%)': (data.std() / data.mean()) * 100 if data.mean() != 0 else 0,
-                'IQR': data.quantile(0.75) - data.quantile(0.25),
-                'Outliers (IQR)': ((data < (data.quantile(0.25) - 1.5 * (data.quantile(0.75) - data.quantile(0.25)))) |
-                                   (data > (data.quantile(0.75) + 1.5 * (
-                                               data.quantile(0.75) - data.quantile(0.25))))).sum()
+                'Skewness': moments.skew(bias=True),
+                'Kurtosis': moments.kurtosis(bias=True),
+                'Variance': moments.variance(),
+                'CV (%)': (moments.std() / moments.mean) * 100 if moments.mean != 0 else 0,
+                'IQR': iqr,
+                'Outliers (IQR)': col_profile.count_outside(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
             }
 
             # Normality test (if sample size is appropriate)
-            if 8 <= len(data) <= 5000:
+            if 8 <= moments.n <= 5000:
                 try:
-                    _, p_value = stats.normaltest(data)
+                    _, p_value = stats.normaltest(df[col].dropna())
                     stats_info['Normality p-value'] = p_value
                     stats_info['Likely Normal'] = 'Yes' if p_value > 0.05 else 'No'
                 except:
@@ -816,29 +838,20 @@ def show_correlation_insights(df, numeric_cols):
     if len(numeric_cols) < 2:
         return
 
-    corr_matrix = df[numeric_cols].corr()
-
-    # Find strongest correlations
-    strong_correlations = []
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i + 1, len(corr_matrix.columns)):
-            corr_value = corr_matrix.iloc[i, j]
-            if abs(corr_value) > 0.5:  # Moderate to strong correlation
-                strong_correlations.append({
-                    'Variable 1': corr_matrix.columns[i],
-                    'Variable 2': corr_matrix.columns[j],
-                    'Correlation': corr_value,
-                    'Strength': 'Strong' if abs(corr_value) > 0.7 else 'Moderate'
-                })
+    corr_matrix = correlation_matrix(df[numeric_cols])
 
-    if strong_correlations:
-        strong_corr_df = pd.DataFrame(strong_correlations)
-        strong_corr_df['Correlation'] = strong_corr_df['Correlation'].round(3)
-        st.dataframe(strong_corr_df)
+    # Find strongest correlations (moderate to strong)
+    strong_corr_df = top_pairs(corr_matrix, threshold=0.5)
+
+    if not strong_corr_df.empty:
+        strong_corr_df['Strength'] = np.where(strong_corr_df['Correlation'].abs() > 0.7, 'Strong', 'Moderate')
 
         # Insights
-        positive_strong = len([c for c in strong_correlations if c['Correlation'] > 0.7])
-        negative_strong = len([c for c in strong_correlations if c['Correlation'] < -0.7])
+        positive_strong = int((strong_corr_df['Correlation'] > 0.7).sum())
+        negative_strong = int((strong_corr_df['Correlation'] < -0.7).sum())
+
+        strong_corr_df['Correlation'] = strong_corr_df['Correlation'].round(3)
+        st.dataframe(strong_corr_df)
 
         if positive_strong > 0:
             st.info(f"Found {positive_strong} strong positive correlations - variables tend to increase together")
@@ -859,7 +872,7 @@ def chart_generator():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -921,9 +934,14 @@ def create_histogram(df, col):
 
 
 def create_scatter_plot(df, x_col, y_col):
-    """Create scatter plot"""
+    """Create scatter plot; large data is drawn as a binned density"""
     plt.figure(figsize=(10, 6))
-    plt.scatter(df[x_col], df[y_col], alpha=0.6)
+    if len(df) > DENSITY_THRESHOLD:
+        mesh = draw_density(plt.gca(), df, x_col, y_col)
+        plt.colorbar(mesh, label='Points per cell')
+        st.caption(density_note(len(df)))
+    else:
+        plt.scatter(df[x_col], df[y_col], alpha=0.6)
     plt.title(f"Scatter Plot: {y_col} vs {x_col}")
     plt.xlabel(x_col)
     plt.ylabel(y_col)
@@ -943,7 +961,7 @@ def missing_value_handler():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -1043,7 +1061,7 @@ def correlation_analysis():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             numeric_df = df.select_dtypes(include=[np.number])
@@ -1060,37 +1078,23 @@ def correlation_analysis():
 
 def calculate_correlations(df):
     """Calculate and display correlations"""
-    corr_matrix = df.corr()
+    corr_matrix = correlation_matrix(df)
 
     st.markdown("### 📊 Correlation Matrix")
     st.dataframe(corr_matrix)
 
-    # Heatmap
+    # Heatmap (wide matrices are clustered and downsampled)
     st.markdown("### 🔥 Correlation Heatmap")
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
-                square=True, linewidths=0.5)
-    plt.title("Correlation Heatmap")
-    plt.tight_layout()
-    st.pyplot()
-    plt.close()
+    fig = correlation_heatmap(corr_matrix, "Correlation Heatmap")
+    st.pyplot(fig)
+    plt.close(fig)
 
     # Strong correlations
     st.markdown("### 🔍 Strong Correlations")
-    strong_corr = []
-
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i + 1, len(corr_matrix.columns)):
-            corr_value = corr_matrix.iloc[i, j]
-            if abs(corr_value) > 0.7:  # Strong correlation threshold
-                strong_corr.append({
-                    'Variable 1': corr_matrix.columns[i],
-                    'Variable 2': corr_matrix.columns[j],
-                    'Correlation': round(corr_value, 3)
-                })
+    strong_corr_df = top_pairs(corr_matrix, threshold=0.7)
 
-    if strong_corr:
-        strong_corr_df = pd.DataFrame(strong_corr)
+    if not strong_corr_df.empty:
+        strong_corr_df['Correlation'] = strong_corr_df['Correlation'].round(3)
         st.dataframe(strong_corr_df)
     else:
         st.info("No strong correlations (|r| > 0.7) found")
@@ -1106,7 +1110,7 @@ def data_validator():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -1173,10 +1177,8 @@ def pivot_table_creator():
     uploaded_file = FileHandler.upload_files(['csv', 'xlsx'], accept_multiple=False)
 
     if uploaded_file:
-        if uploaded_file[0].name.endswith('.csv'):
-            df = FileHandler.process_csv_file(uploaded_file[0])
-        else:
-            df = pd.read_excel(uploaded_file[0])
+        # Parsed once per file content; the shared frame keeps its aggregation cache entries across reruns
+        df = load_dataframe(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -1200,17 +1202,7 @@ def create_pivot_table(df):
 
     if index_cols and values_cols and st.button("Create Pivot Table"):
         try:
-            pivot_kwargs = {
-                'data': df,
-                'index': index_cols,
-                'values': values_cols,
-                'aggfunc': aggfunc
-            }
-
-            if column_cols:
-                pivot_kwargs['columns'] = column_cols
-
-            pivot_table = pd.pivot_table(**pivot_kwargs)
+            pivot_table = pivot(df, index_cols, values_cols, aggfunc, column_cols)
 
             st.markdown("### 📊 Pivot Table Results")
             st.dataframe(pivot_table)
@@ -1233,7 +1225,7 @@ def linear_regression():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -1319,7 +1311,7 @@ def advanced_regression():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -1555,7 +1547,7 @@ def classification_models():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -1588,8 +1580,6 @@ def perform_classification(df, feature_cols, target_col, classifier_type):
     """Perform classification analysis"""
     if st.button("Run Classification"):
         try:
-            from sklearn.model_selection import train_test_split
-            from sklearn.preprocessing import StandardScaler, LabelEncoder
             from sklearn.linear_model import LogisticRegression
             from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
             from sklearn.svm import SVC
@@ -1598,22 +1588,12 @@ def perform_classification(df, feature_cols, target_col, classifier_type):
             from sklearn.metrics import precision_score, recall_score, f1_score
             import seaborn as sns
 
-            # Prepare data
-            X = df[feature_cols].dropna()
-            y = df[target_col].dropna()
-
-            # Align data
-            common_index = X.index.intersection(y.index)
-            X = X.loc[common_index]
-            y = y.loc[common_index]
-
-            # Encode target variable
-            le = LabelEncoder()
-            y_encoded = le.fit_transform(y)
+            # Prepare data (shared with the other model tools, cached per dataset and columns)
+            data = prepare_data(df, feature_cols, target_col, "Classification")
 
             # Check for class balance
-            unique_classes, class_counts = np.unique(y_encoded, return_counts=True)
-            class_balance = dict(zip(le.classes_, class_counts))
+            unique_classes, class_counts = np.unique(data.y, return_counts=True)
+            class_balance = dict(zip(data.classes, class_counts))
 
             st.markdown("### 📊 Class Distribution")
             st.bar_chart(pd.Series(class_balance))
@@ -1622,15 +1602,6 @@ def perform_classification(df, feature_cols, target_col, classifier_type):
                 st.error("Need at least 2 classes for classification")
                 return
 
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(X, y_encoded, test_size=0.2,
-                                                                random_state=42, stratify=y_encoded)
-
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-
             # Initialize model
             model = None
 
@@ -1657,17 +1628,14 @@ def perform_classification(df, feature_cols, target_col, classifier_type):
                 st.error("Model initialization failed")
                 return
 
-            # Fit model
+            # Fit model on the shared stratified split (scaled for SVM); unchanged settings reuse the last fit
             if classifier_type == "Support Vector Machine":
-                model.fit(X_train_scaled, y_train)
-                y_pred_train = model.predict(X_train_scaled)
-                y_pred_test = model.predict(X_test_scaled)
-                y_pred_proba = model.predict_proba(X_test_scaled)
-            else:
-                model.fit(X_train, y_train)
-                y_pred_train = model.predict(X_train)
-                y_pred_test = model.predict(X_test)
-                y_pred_proba = model.predict_proba(X_test)
+                model = with_scaling(model)
+            fits, (train_rows, test_rows) = fit_models(data, {classifier_type: model})
+            fit = fits[classifier_type]
+            model = fit.model
+            y_train, y_test = data.y[train_rows], data.y[test_rows]
+            y_pred_train, y_pred_test = fit.train_pred, fit.test_pred
 
             # Calculate metrics
             train_accuracy = accuracy_score(y_train, y_pred_train)
@@ -1698,7 +1666,7 @@ def perform_classification(df, feature_cols, target_col, classifier_type):
 
             plt.figure(figsize=(8, 6))
             sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
-                        xticklabels=le.classes_, yticklabels=le.classes_)
+                        xticklabels=data.classes, yticklabels=data.classes)
             plt.xlabel('Predicted')
             plt.ylabel('Actual')
             plt.title('Confusion Matrix')
@@ -1725,7 +1693,7 @@ def perform_classification(df, feature_cols, target_col, classifier_type):
 
             # Classification report
             st.markdown("### 📋 Detailed Classification Report")
-            report = classification_report(y_test, y_pred_test, target_names=le.classes_, output_dict=True)
+            report = classification_report(y_test, y_pred_test, target_names=data.classes, output_dict=True)
             report_df = pd.DataFrame(report).transpose()
             st.dataframe(report_df.round(3))
 
@@ -1758,7 +1726,7 @@ def ensemble_methods():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -1800,8 +1768,6 @@ def perform_ensemble_analysis(df, feature_cols, target_col, ensemble_type, task_
     """Perform ensemble analysis"""
     if st.button("Run Ensemble Analysis"):
         try:
-            from sklearn.model_selection import train_test_split, cross_val_score
-            from sklearn.preprocessing import StandardScaler, LabelEncoder
             from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor,
                                           ExtraTreesClassifier, ExtraTreesRegressor,
                                           GradientBoostingClassifier, GradientBoostingRegressor,
@@ -1813,36 +1779,8 @@ def perform_ensemble_analysis(df, feature_cols, target_col, ensemble_type, task_
             from sklearn.metrics import accuracy_score, r2_score, mean_squared_error
             import numpy as np
 
-            # Prepare data
-            X = df[feature_cols].dropna()
-            y = df[target_col].dropna()
-
-            # Align data
-            common_index = X.index.intersection(y.index)
-            X = X.loc[common_index]
-            y = y.loc[common_index]
-
-            # Encode target if classification
-            if task_type == "Classification":
-                le = LabelEncoder()
-                y_encoded = le.fit_transform(y)
-                y_to_use = y_encoded
-                classes = le.classes_
-            else:
-                y_to_use = y
-                classes = None
-
-            # Split data
-            test_size = 0.2
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y_to_use, test_size=test_size, random_state=42,
-                stratify=y_to_use if task_type == "Classification" and len(np.unique(y_to_use)) > 1 else None
-            )
-
-            # Scale features for some algorithms
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
+            # Prepare data (shared with the other model tools, cached per dataset and columns)
+            data = prepare_data(df, feature_cols, target_col, task_type)
 
             # Initialize model
             model = None
@@ -1930,15 +1868,21 @@ def perform_ensemble_analysis(df, feature_cols, target_col, ensemble_type, task_
                 st.error("Model initialization failed")
                 return
 
-            # Fit model
+            # Scale features for the combined classifiers
             if ensemble_type in ["Voting Classifier/Regressor", "Stacking"] and task_type == "Classification":
-                model.fit(X_train_scaled, y_train)
-                y_pred_train = model.predict(X_train_scaled)
-                y_pred_test = model.predict(X_test_scaled)
-            else:
-                model.fit(X_train, y_train)
-                y_pred_train = model.predict(X_train)
-                y_pred_test = model.predict(X_test)
+                model = with_scaling(model)
+
+            # Fit the holdout model, then cross-validate on the training rows with the folds spread over the
+            # process pool; unchanged settings reuse earlier fits
+            cv_scoring = 'accuracy' if task_type == "Classification" else 'r2'
+            with st.spinner("Training ensemble..."):
+                fits, (train_rows, test_rows) = fit_models(data, {ensemble_type: model})
+                cv_results = cross_validate_models(data, {ensemble_type: model}, cv=5, scoring=[cv_scoring],
+                                                   rows=train_rows)
+            fit = fits[ensemble_type]
+            model = fit.model
+            y_train, y_test = data.y[train_rows], data.y[test_rows]
+            y_pred_train, y_pred_test = fit.train_pred, fit.test_pred
 
             # Calculate metrics and display results
             st.markdown("### 📊 Ensemble Model Performance")
@@ -1968,12 +1912,7 @@ def perform_ensemble_analysis(df, feature_cols, target_col, ensemble_type, task_
 
             # Cross-validation
             st.markdown("### 🔄 Cross-Validation Results")
-            cv_scoring = 'accuracy' if task_type == "Classification" else 'r2'
-
-            if ensemble_type in ["Voting Classifier/Regressor", "Stacking"] and task_type == "Classification":
-                cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=5, scoring=cv_scoring)
-            else:
-                cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring=cv_scoring)
+            cv_scores = cv_results[ensemble_type][f'test_{cv_scoring}']
 
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -2040,7 +1979,7 @@ def feature_selection():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -2085,25 +2024,12 @@ def perform_feature_selection(df, feature_cols, target_col, selection_method, ta
                                                    RFE, SelectFromModel)
             from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
             from sklearn.linear_model import LassoCV, LogisticRegression
-            from sklearn.preprocessing import LabelEncoder
             import numpy as np
 
-            # Prepare data
-            X = df[feature_cols].dropna()
-            y = df[target_col].dropna()
-
-            # Align data
-            common_index = X.index.intersection(y.index)
-            X = X.loc[common_index]
-            y = y.loc[common_index]
-
-            # Encode target if classification
-            if task_type == "Classification":
-                le = LabelEncoder()
-                y_encoded = le.fit_transform(y)
-                y_to_use = y_encoded
-            else:
-                y_to_use = y
+            # Prepare data (shared with the other model tools, cached per dataset and columns)
+            data = prepare_data(df, feature_cols, target_col, task_type)
+            X = data.frame
+            y_to_use = data.y
 
             st.markdown("### 🎯 Feature Selection Results")
 
@@ -2180,9 +2106,9 @@ def perform_feature_selection(df, feature_cols, target_col, selection_method, ta
                 n_features = st.slider("Target Number of Features:", 1, len(feature_cols), min(5, len(feature_cols)))
 
                 if task_type == "Classification":
-                    estimator = RandomForestClassifier(n_estimators=100, random_state=42)
+                    estimator = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
                 else:
-                    estimator = RandomForestRegressor(n_estimators=100, random_state=42)
+                    estimator = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
 
                 rfe = RFE(estimator=estimator, n_features_to_select=n_features)
                 rfe.fit(X, y_to_use)
@@ -2204,7 +2130,8 @@ def perform_feature_selection(df, feature_cols, target_col, selection_method, ta
                 else:
                     model = RandomForestRegressor(n_estimators=100, random_state=42)
 
-                model.fit(X, y_to_use)
+                # Fitted on every row; reused until the data or columns change
+                model = fit_models(data, {'importance': model}, test_size=None)[0]['importance'].model
 
                 feature_importance = pd.DataFrame({
                     'Feature': feature_cols,
@@ -2234,7 +2161,7 @@ def perform_feature_selection(df, feature_cols, target_col, selection_method, ta
                     model.fit(X, y_to_use)
                     coefs = np.abs(model.coef_[0])
                 else:
-                    model = LassoCV(cv=5, random_state=42)
+                    model = LassoCV(cv=5, random_state=42, n_jobs=-1)
                     model.fit(X, y_to_use)
                     coefs = np.abs(model.coef_)
 
@@ -2282,7 +2209,7 @@ def model_evaluator():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -2318,8 +2245,6 @@ def perform_model_evaluation(df, feature_cols, target_col, task_type):
     """Perform comprehensive model evaluation"""
     if st.button("Run Model Evaluation"):
         try:
-            from sklearn.model_selection import train_test_split, cross_val_score
-            from sklearn.preprocessing import StandardScaler, LabelEncoder
             from sklearn.metrics import (accuracy_score, precision_score, recall_score, f1_score,
                                          r2_score, mean_squared_error, mean_absolute_error,
                                          classification_report, confusion_matrix)
@@ -2328,45 +2253,18 @@ def perform_model_evaluation(df, feature_cols, target_col, task_type):
             from sklearn.svm import SVR, SVC
             from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
             import numpy as np
-            import time
 
-            # Prepare data
-            X = df[feature_cols].dropna()
-            y = df[target_col].dropna()
+            # Prepare data (shared with the other model tools, cached per dataset and columns)
+            data = prepare_data(df, feature_cols, target_col, task_type)
+            y_to_use = data.y
 
-            # Align data
-            common_index = X.index.intersection(y.index)
-            X = X.loc[common_index]
-            y = y.loc[common_index]
-
-            # Encode target if classification
-            if task_type == "Classification":
-                le = LabelEncoder()
-                y_encoded = le.fit_transform(y)
-                y_to_use = y_encoded
-                classes = le.classes_
-            else:
-                y_to_use = y
-                classes = None
-
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y_to_use, test_size=0.2, random_state=42,
-                stratify=y_to_use if task_type == "Classification" and len(np.unique(y_to_use)) > 1 else None
-            )
-
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-
-            # Define models to compare
+            # Define models to compare (SVM on standardized features)
             if task_type == "Classification":
                 models = {
                     'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
                     'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
                     'Decision Tree': DecisionTreeClassifier(random_state=42),
-                    'SVM': SVC(random_state=42, probability=True)
+                    'SVM': with_scaling(SVC(random_state=42, probability=True))
                 }
                 scoring_metric = 'accuracy'
             else:
@@ -2374,7 +2272,7 @@ def perform_model_evaluation(df, feature_cols, target_col, task_type):
                     'Linear Regression': LinearRegression(),
                     'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
                     'Decision Tree': DecisionTreeRegressor(random_state=42),
-                    'SVM': SVR()
+                    'SVM': with_scaling(SVR())
                 }
                 scoring_metric = 'r2'
 
@@ -2386,31 +2284,21 @@ def perform_model_evaluation(df, feature_cols, target_col, task_type):
             progress_bar = st.progress(0)
             status_text = st.empty()
 
-            for i, (name, model) in enumerate(models.items()):
-                status_text.text(f"Evaluating {name}...")
-                progress_bar.progress((i + 1) / len(models))
-
-                start_time = time.time()
-
-                # Use scaled data for SVM, original for tree-based
-                if 'SVM' in name:
-                    X_train_model = X_train_scaled
-                    X_test_model = X_test_scaled
-                else:
-                    X_train_model = X_train
-                    X_test_model = X_test
-
-                # Fit model
-                model.fit(X_train_model, y_train)
-
-                # Predictions
-                y_pred_train = model.predict(X_train_model)
-                y_pred_test = model.predict(X_test_model)
-
-                # Cross-validation
-                cv_scores = cross_val_score(model, X_train_model, y_train, cv=5, scoring=scoring_metric)
-
-                training_time = time.time() - start_time
+            # Holdout fits and every cross-validation fold run across the process pool; models whose
+            # settings are unchanged since the last comparison are not refitted
+            status_text.text("Fitting models...")
+            fits, (train_rows, test_rows) = fit_models(data, models,
+                                                       progress_callback=lambda p: progress_bar.progress(p / 2))
+            status_text.text("Cross-validating models...")
+            cv_results = cross_validate_models(data, models, cv=5, scoring=[scoring_metric], rows=train_rows,
+                                               progress_callback=lambda p: progress_bar.progress(0.5 + p / 2))
+            y_train, y_test = data.y[train_rows], data.y[test_rows]
+
+            for name in models:
+                fit = fits[name]
+                y_pred_train, y_pred_test = fit.train_pred, fit.test_pred
+                cv_scores = cv_results[name][f'test_{scoring_metric}']
+                training_time = fit.fit_time + cv_results[name]['fit_time'].sum()
 
                 # Calculate metrics
                 if task_type == "Classification":
@@ -2540,7 +2428,7 @@ def cross_validation():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -2583,32 +2471,18 @@ def perform_cross_validation(df, feature_cols, target_col, task_type, cv_strateg
     """Perform cross-validation analysis"""
     if st.button("Run Cross-Validation"):
         try:
-            from sklearn.model_selection import (cross_val_score, cross_validate,
-                                                 KFold, StratifiedKFold, TimeSeriesSplit,
+            from sklearn.model_selection import (KFold, StratifiedKFold, TimeSeriesSplit,
                                                  LeaveOneOut, ShuffleSplit, GroupKFold)
-            from sklearn.preprocessing import StandardScaler, LabelEncoder
             from sklearn.linear_model import LinearRegression, LogisticRegression
             from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier, GradientBoostingRegressor, \
                 GradientBoostingClassifier
             from sklearn.svm import SVR, SVC
             import numpy as np
 
-            # Prepare data
-            X = df[feature_cols].dropna()
-            y = df[target_col].dropna()
-
-            # Align data
-            common_index = X.index.intersection(y.index)
-            X = X.loc[common_index]
-            y = y.loc[common_index]
-
-            # Encode target if classification
-            if task_type == "Classification":
-                le = LabelEncoder()
-                y_encoded = le.fit_transform(y)
-                y_to_use = y_encoded
-            else:
-                y_to_use = y
+            # Prepare data (shared with the other model tools, cached per dataset and columns)
+            data = prepare_data(df, feature_cols, target_col, task_type)
+            X = data.X
+            groups = None
 
             # Create model
             if task_type == "Classification":
@@ -2664,11 +2538,7 @@ def perform_cross_validation(df, feature_cols, target_col, task_type, cv_strateg
 
             # Scale features if needed
             if selected_model == "SVM":
-                from sklearn.pipeline import Pipeline
-                model = Pipeline([
-                    ('scaler', StandardScaler()),
-                    ('model', model)
-                ])
+                model = with_scaling(model)
 
             # Define scoring metrics
             if task_type == "Classification":
@@ -2679,13 +2549,10 @@ def perform_cross_validation(df, feature_cols, target_col, task_type, cv_strateg
             # Perform cross-validation
             st.markdown("### 🔄 Cross-Validation Results")
 
+            # Folds are cached per splitter and run across the process pool
             with st.spinner("Running cross-validation..."):
-                if cv_strategy == "Group K-Fold":
-                    cv_results = cross_validate(model, X, y_to_use, cv=cv, scoring=scoring,
-                                                groups=groups, return_train_score=True)
-                else:
-                    cv_results = cross_validate(model, X, y_to_use, cv=cv, scoring=scoring,
-                                                return_train_score=True)
+                cv_results = cross_validate_models(data, {selected_model: model}, cv=cv, scoring=scoring,
+                                                   groups=groups, return_train_score=True)[selected_model]
 
             # Display results
             results_summary = []
@@ -2796,6 +2663,127 @@ def perform_cross_validation(df, feature_cols, target_col, task_type, cv_strateg
             st.error(f"Error in cross-validation: {str(e)}")
 
 
+def hyperparameter_search():
+    """Budgeted hyperparameter search for the machine learning models"""
+    create_tool_header("Hyperparameter Search", "Tune models with successive halving, Hyperband or random search",
+                       "🎛️")
+
+    uploaded_file = FileHandler.upload_files(['csv', 'xlsx'], accept_multiple=False)
+
+    if uploaded_file:
+        if uploaded_file[0].name.endswith('.csv'):
+            df = FileHandler.process_csv_file(uploaded_file[0])
+        else:
+            df = FileHandler.process_excel_file(uploaded_file[0])
+
+        if df is not None:
+            st.dataframe(df.head())
+
+            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+
+            task_type = st.selectbox("Task Type:", ["Classification", "Regression"])
+
+            if task_type == "Classification" and len(categorical_cols) == 0:
+                st.error("Need categorical columns for classification tasks")
+                return
+            if task_type == "Regression" and len(numeric_cols) < 2:
+                st.error("Need at least 2 numeric columns for regression tasks")
+                return
+
+            col1, col2 = st.columns(2)
+            with col1:
+                feature_cols = st.multiselect("Feature Variables:", numeric_cols,
+                                              default=numeric_cols[:-1] if len(numeric_cols) > 1 else [])
+            with col2:
+                if task_type == "Classification":
+                    target_col = st.selectbox("Target Variable:", categorical_cols)
+                else:
+                    target_col = st.selectbox("Target Variable:", numeric_cols)
+
+            # Search configuration
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                model_name = st.selectbox("Model:", list(SEARCH_SPACES[task_type]))
+                strategy = st.selectbox("Search Strategy:", SEARCH_STRATEGIES)
+            with col2:
+                scoring_label = st.selectbox("Scoring:", list(SCORING_OPTIONS[task_type]))
+                budget_options = ['rows'] if SEARCH_SPACES[task_type][model_name]['iterations'] is None \
+                    else list(BUDGET_TYPES)
+                budget = st.selectbox("Budget:", budget_options, format_func=BUDGET_TYPES.get)
+            with col3:
+                n_candidates = st.slider("Candidates:", 3, 100, 27, disabled=strategy == "Hyperband",
+                                         help="Hyperband sizes its brackets from the budget range")
+                eta = st.slider("Halving Factor (eta):", 2, 4, 3)
+                cv_folds = st.slider("CV Folds:", 2, 10, 3)
+
+            if feature_cols and target_col and target_col not in feature_cols:
+                perform_hyperparameter_search(df, feature_cols, target_col, task_type, model_name, strategy,
+                                              SCORING_OPTIONS[task_type][scoring_label], budget, n_candidates, eta,
+                                              cv_folds)
+
+
+def perform_hyperparameter_search(df, feature_cols, target_col, task_type, model_name, strategy, scoring, budget,
+                                  n_candidates, eta, cv_folds):
+    """Run the search with a live leaderboard, then refit and offer the best pipeline for download"""
+    if st.button("Run Search"):
+        try:
+            import time
+            from sklearn.metrics import get_scorer
+
+            data = prepare_data(df, feature_cols, target_col, task_type)
+            if len(data.y) < 10 * cv_folds:
+                st.error(f"Need at least {10 * cv_folds} complete rows for a {cv_folds}-fold search")
+                return
+
+            train_rows, test_rows = data.split()
+
+            st.markdown("### 🏁 Live Leaderboard")
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            board = st.empty()
+            last_draw = [0.0]
+
+            def on_update(leaderboard, message, fraction):
+                progress_bar.progress(fraction)
+                status_text.text(message)
+                # Redrawing the table on every finished fold would dominate small searches
+                if time.time() - last_draw[0] > 0.5 or fraction >= 1:
+                    board.dataframe(leaderboard.head(20).round(4))
+                    last_draw[0] = time.time()
+
+            search = HyperparameterSearch(data, model_name, scoring, train_rows, cv=cv_folds, budget=budget,
+                                          eta=eta, on_update=on_update)
+            result = search.run(strategy, n_candidates)
+            board.dataframe(result.leaderboard.round(4))
+
+            st.markdown("### 🏆 Best Configuration")
+            st.success(f"Best CV {scoring}: {result.best_score:.4f} ({result.fits} fold fits, "
+                       f"{len(result.leaderboard)} candidates)")
+            st.json(result.best_params)
+
+            # Holdout check on the untouched test rows, then refit on every row for the saved pipeline
+            fits, _ = fit_models(data, {'best': result.best_estimator})
+            holdout_score = get_scorer(scoring)(fits['best'].model, data.X[test_rows], data.y[test_rows])
+            final_model = fit_models(data, {'best': result.best_estimator}, test_size=None)[0]['best'].model
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(f"CV {scoring}", f"{result.best_score:.4f}")
+            with col2:
+                st.metric(f"Holdout {scoring}", f"{holdout_score:.4f}")
+
+            pipeline_bytes = serialize_pipeline(final_model, feature_cols, target_col, task_type, data.classes,
+                                                result.best_params, result.best_score)
+            serve_download(pipeline_bytes, f"best_{model_name.lower().replace(' ', '_')}.joblib",
+                           "application/octet-stream", label="📥 Download Best Pipeline (joblib)")
+            st.caption("Load with joblib.load(path)['pipeline']; the file also lists the feature columns and "
+                       "target classes.")
+
+        except Exception as e:
+            st.error(f"Error in hyperparameter search: {str(e)}")
+
+
 def trend_analysis():
     """Analyze trends in time series data"""
     create_tool_header("Trend Analysis", "Identify and analyze trends in your data", "📈")
@@ -2806,7 +2794,7 @@ def trend_analysis():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -2897,6 +2885,19 @@ def analyze_trend_data(df, date_col, value_col):
         else:
             st.warning("⚠️ The trend is not statistically significant")
 
+        # Cycles left over once the trend line is removed
+        if len(y) >= 8:
+            residual_profile = spectral_profile(y - trend_line)
+            st.markdown("### 🔄 Cyclical Components")
+            st.write(f"**Lag-1 Autocorrelation of Residuals:** {residual_profile.acf[1]:.4f}")
+            if abs(residual_profile.acf[1]) > 0.5:
+                st.warning("⚠️ Residuals are strongly autocorrelated; the p-value above is likely optimistic")
+            cycle_period = residual_profile.best_period()
+            if cycle_period:
+                st.info(f"🔍 Residuals repeat with a period of about {cycle_period} observations; "
+                        f"see Seasonality Analysis for a full decomposition")
+                st.dataframe(residual_profile.candidates, use_container_width=True)
+
     except Exception as e:
         st.error(f"Error in trend analysis: {str(e)}")
 
@@ -2911,7 +2912,7 @@ def forecasting():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -2937,16 +2938,34 @@ def forecasting():
                 with col3:
                     forecast_periods = st.number_input("Forecast Periods:", min_value=1, max_value=50, value=10)
 
-                forecast_method = st.selectbox("Forecasting Method:",
-                                               ["Linear Trend", "Moving Average", "Exponential Smoothing"])
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    forecast_method = st.selectbox("Forecasting Method:", FORECAST_METHODS)
+                with col2:
+                    group_options = ["None"] + [col for col in df.columns if col not in (date_col, value_col)]
+                    group_col = st.selectbox("Series Key (batch mode):", group_options,
+                                             help="Forecast one series per value of this column, e.g. a SKU")
+                with col3:
+                    season_length = None
+                    if forecast_method in SEASONAL_METHODS:
+                        season_length = st.number_input(
+                            "Season Length:", min_value=2, max_value=1000,
+                            value=default_season_length(pd.to_datetime(df[date_col], errors='coerce').dropna()))
+
+                backtest = st.checkbox("Backtest on the last forecast-horizon points", value=True)
 
                 if st.button("Generate Forecast"):
-                    perform_forecasting(df, date_col, value_col, forecast_periods, forecast_method)
+                    if group_col == "None":
+                        perform_forecasting(df, date_col, value_col, forecast_periods, forecast_method,
+                                            season_length, backtest)
+                    else:
+                        perform_batch_forecasting(df, date_col, value_col, group_col, forecast_periods,
+                                                  forecast_method, season_length, backtest)
             else:
                 st.error("Need at least one date column and one numeric column for forecasting")
 
 
-def perform_forecasting(df, date_col, value_col, forecast_periods, method):
+def perform_forecasting(df, date_col, value_col, forecast_periods, method, season_length=None, backtest=True):
     """Perform time series forecasting"""
     try:
         # Prepare data
@@ -2958,57 +2977,38 @@ def perform_forecasting(df, date_col, value_col, forecast_periods, method):
         dates = df_clean[date_col].values
 
         # Generate future dates
-        last_date = pd.to_datetime(dates[-1])
-        date_freq = pd.infer_freq(df_clean[date_col])
-        if date_freq is None:
-            # Estimate frequency from data
-            time_diff = (pd.to_datetime(dates[-1]) - pd.to_datetime(dates[0])) / (len(dates) - 1)
-            future_dates = [last_date + time_diff * i for i in range(1, forecast_periods + 1)]
-        else:
-            future_dates = pd.date_range(start=last_date + pd.Timedelta(days=1),
-                                         periods=forecast_periods, freq=date_freq)
+        last_date = pd.DatetimeIndex([dates[-1]])
+        step = (pd.to_datetime(dates[-1]) - pd.to_datetime(dates[0])) / max(len(dates) - 1, 1)
+        forecast_dates = future_dates(last_date, forecast_periods, infer_frequency(df_clean[date_col]), step)[0]
 
         # Forecasting
-        forecast_values = []
-        if method == "Linear Trend":
-            from scipy import stats
-            x = np.arange(len(values))
-            slope, intercept, _, _, _ = stats.linregress(x, values)
-            forecast_x = np.arange(len(values), len(values) + forecast_periods)
-            forecast_values = intercept + slope * forecast_x
-
-        elif method == "Moving Average":
-            window = min(5, len(values))
-            last_avg = np.mean(values[-window:])
-            forecast_values = [last_avg] * forecast_periods
-
-        elif method == "Exponential Smoothing":
-            alpha = 0.3
-            smoothed = [values[0]]
-            for i in range(1, len(values)):
-                smoothed.append(alpha * values[i] + (1 - alpha) * smoothed[i - 1])
-
-            # Forecast using last smoothed value and trend
-            if len(values) > 1:
-                trend = smoothed[-1] - smoothed[-2]
-                forecast_values = [smoothed[-1] + trend * i for i in range(1, forecast_periods + 1)]
-            else:
-                forecast_values = [smoothed[-1]] * forecast_periods
-        else:
-            # Default fallback
-            forecast_values = [values[-1]] * forecast_periods
+        forecast_values, holdout_forecast, accuracy = forecast_series(values, forecast_periods, method,
+                                                                      season_length, backtest)
 
         # Display results
         st.markdown("### 📊 Forecast Results")
 
         # Create forecast dataframe
         forecast_df = pd.DataFrame({
-            'Date': future_dates,
+            'Date': forecast_dates,
             'Forecast': forecast_values
         })
 
         st.dataframe(forecast_df)
 
+        if accuracy and not np.isnan(accuracy['MAE']):
+            st.markdown("### 🎯 Backtest Accuracy")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("MAE", f"{accuracy['MAE']:.4f}")
+            with col2:
+                st.metric("RMSE", f"{accuracy['RMSE']:.4f}")
+            with col3:
+                st.metric("MAPE", f"{accuracy['MAPE']:.2f}%" if not np.isnan(accuracy['MAPE']) else "N/A")
+            st.caption(f"{method} refitted without the last {forecast_periods} points and scored on them")
+        elif backtest:
+            st.info(f"Not enough history to backtest {forecast_periods} periods ahead")
+
         # Plot
         st.markdown("### 📈 Forecast Visualization")
         plt.figure(figsize=(12, 6))
@@ -3017,7 +3017,9 @@ def perform_forecasting(df, date_col, value_col, forecast_periods, method):
         plt.plot(dates, values, 'o-', label='Historical Data', alpha=0.7)
 
         # Forecast
-        plt.plot(future_dates, forecast_values, 'r--', label=f'{method} Forecast', linewidth=2)
+        plt.plot(forecast_dates, forecast_values, 'r--', label=f'{method} Forecast', linewidth=2)
+        if holdout_forecast is not None and not np.isnan(holdout_forecast).all():
+            plt.plot(dates[-forecast_periods:], holdout_forecast, 'g:', label='Backtest Forecast', linewidth=2)
 
         plt.xlabel(date_col)
         plt.ylabel(value_col)
@@ -3036,6 +3038,59 @@ def perform_forecasting(df, date_col, value_col, forecast_periods, method):
         st.error(f"Error in forecasting: {str(e)}")
 
 
+def perform_batch_forecasting(df, date_col, value_col, group_col, forecast_periods, method, season_length=None,
+                              backtest=True):
+    """Forecast every series in the data, one per value of the series key column"""
+    try:
+        progress_bar = st.progress(0)
+        result, accuracy = batch_forecast(df, date_col, value_col, group_col, forecast_periods, method,
+                                          season_length, backtest, progress_callback=progress_bar.progress)
+        progress_bar.empty()
+        stats = result.stats
+
+        st.markdown("### 📊 Batch Forecast Results")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Series", f"{stats['series']:,}")
+        with col2:
+            st.metric("Output Rows", f"{stats['rows']:,}")
+        with col3:
+            st.metric("Series/s", f"{stats['series_per_second']:,.0f}")
+        with col4:
+            st.metric("Output Size", f"{stats['bytes_out'] / (1024 * 1024):.1f} MB")
+        st.caption(f"{stats['chunks']} chunks on {stats['workers']} worker(s) in {stats['elapsed_seconds']:.2f}s, "
+                   f"date step {stats['frequency']}")
+
+        if not accuracy.empty:
+            scored = accuracy.dropna(subset=['MAE'])
+            st.markdown("### 🎯 Backtest Accuracy")
+            if scored.empty:
+                st.info(f"No series has enough history to backtest {forecast_periods} periods ahead")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Median MAE", f"{scored['MAE'].median():.4f}")
+                with col2:
+                    st.metric("Median RMSE", f"{scored['RMSE'].median():.4f}")
+                with col3:
+                    median_mape = scored['MAPE'].median()
+                    st.metric("Median MAPE", f"{median_mape:.2f}%" if not np.isnan(median_mape) else "N/A")
+                st.caption(f"{len(scored):,} of {len(accuracy):,} series backtested on their last "
+                           f"{forecast_periods} points; least accurate first")
+                st.dataframe(scored.sort_values('MAE', ascending=False).head(100), use_container_width=True)
+
+        st.markdown("### 📋 Forecast Preview")
+        st.dataframe(result.preview)
+
+        with result.output:
+            serve_download(result.output, result.filename, result.mime_type)
+            if not accuracy.empty:
+                serve_download(accuracy.to_csv(index=False).encode(), "forecast_accuracy.csv", "text/csv")
+
+    except Exception as e:
+        st.error(f"Error in batch forecasting: {str(e)}")
+
+
 def clustering_analysis():
     """Perform clustering analysis on data"""
     create_tool_header("Clustering Analysis", "Find patterns and groups in your data", "🎯")
@@ -3046,7 +3101,7 @@ def clustering_analysis():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -3061,29 +3116,24 @@ def clustering_analysis():
                     col1, col2 = st.columns(2)
                     with col1:
                         n_clusters = st.slider("Number of clusters:", 2, 10, 3)
+                        scalable = st.checkbox(
+                            "Scalable mode", value=len(df) > SCALABLE_ROWS,
+                            help="Mini-batch K-Means / BIRCH trained in chunks, with a sampled silhouette score")
                     with col2:
-                        algorithm = st.selectbox("Clustering Algorithm:", ["K-Means", "Hierarchical"])
+                        algorithm = st.selectbox("Clustering Algorithm:", CLUSTERING_ALGORITHMS)
+                        run_sweep = st.checkbox("Elbow analysis (try 2-10 clusters)", value=False)
 
                     if st.button("Perform Clustering"):
-                        perform_clustering(df, selected_cols, n_clusters, algorithm)
+                        perform_clustering(df, selected_cols, n_clusters, algorithm, scalable, run_sweep)
                 else:
                     st.warning("Please select at least 2 columns for clustering")
             else:
                 st.error("Need at least 2 numeric columns for clustering analysis")
 
 
-def perform_clustering(df, selected_cols, n_clusters, algorithm):
+def perform_clustering(df, selected_cols, n_clusters, algorithm, scalable=False, run_sweep=False):
     """Perform clustering analysis"""
     try:
-        # Import with error handling
-        try:
-            from sklearn.cluster import KMeans, AgglomerativeClustering
-            from sklearn.preprocessing import StandardScaler
-            from sklearn.metrics import silhouette_score
-        except ImportError:
-            st.error("scikit-learn is required for clustering analysis. Please install it.")
-            return
-
         # Prepare data
         data = df[selected_cols].dropna()
 
@@ -3092,19 +3142,17 @@ def perform_clustering(df, selected_cols, n_clusters, algorithm):
             return
 
         # Standardize features
-        scaler = StandardScaler()
-        data_scaled = scaler.fit_transform(data)
-
-        # Perform clustering
-        if algorithm == "K-Means":
-            model = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto')
-        else:
-            model = AgglomerativeClustering(n_clusters=n_clusters)
+        data_scaled = standardize(data, scalable)
 
-        clusters = model.fit_predict(data_scaled)
+        # Perform clustering (labels are assigned to every complete row, also in scalable mode)
+        with st.spinner("Clustering..."):
+            clusters, method = cluster_labels(data_scaled, n_clusters, algorithm, scalable)
+        note = describe_method(method, algorithm, len(data))
+        if note:
+            st.info(note)
 
-        # Calculate silhouette score
-        silhouette_avg = silhouette_score(data_scaled, clusters)
+        # Calculate silhouette score (estimated on a sample for large data)
+        silhouette_avg = sampled_silhouette(data_scaled, clusters)
 
         # Add cluster labels to original data
         data_with_clusters = data.copy()
@@ -3120,6 +3168,10 @@ def perform_clustering(df, selected_cols, n_clusters, algorithm):
             st.metric("Silhouette Score", f"{silhouette_avg:.3f}")
         with col3:
             st.metric("Data Points", len(data))
+        if len(data) > SILHOUETTE_SAMPLE:
+            st.caption(f"Method: {method} · silhouette estimated on {SILHOUETTE_SAMPLE:,} sampled rows")
+        else:
+            st.caption(f"Method: {method}")
 
         # Cluster summary
         st.markdown("### 📈 Cluster Summary")
@@ -3130,18 +3182,48 @@ def perform_clustering(df, selected_cols, n_clusters, algorithm):
         st.markdown("### 📊 Cluster Visualization")
 
         if len(selected_cols) >= 2:
-            plt.figure(figsize=(10, 8))
-            scatter = plt.scatter(data[selected_cols[0]], data[selected_cols[1]],
-                                  c=clusters, cmap='viridis', alpha=0.7)
+            # Large results are drawn from a random sample of rows
+            shown = plot_sample(len(data))
+            plot_data = data if shown is None else data.iloc[shown]
+            plot_clusters = clusters if shown is None else clusters[shown]
+            fig = plt.figure(figsize=(10, 8))
+            scatter = plt.scatter(plot_data[selected_cols[0]], plot_data[selected_cols[1]],
+                                  c=plot_clusters, cmap='viridis', alpha=0.7, s=8 if shown is not None else None)
             plt.xlabel(selected_cols[0])
             plt.ylabel(selected_cols[1])
-            plt.title(f"{algorithm} Clustering Results")
+            title = f"{method} Clustering Results"
+            plt.title(title if shown is None else f"{title} ({len(shown):,} of {len(data):,} rows)")
             plt.colorbar(scatter, label='Cluster')
-            st.pyplot()
-            plt.close()
+            st.pyplot(fig)
+            plt.close(fig)
 
-        # Download results
-        csv_data = data_with_clusters.to_csv(index=False)
+        # Elbow analysis
+        if run_sweep:
+            st.markdown("### 📐 Elbow Analysis")
+            k_values = [k for k in range(2, 11) if k <= len(data)]
+            with st.spinner("Trying different numbers of clusters..."):
+                sweep = k_sweep(data_scaled, k_values, algorithm, scalable)
+            st.dataframe(sweep.round(3))
+
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
+            ax1.plot(sweep['Clusters'], sweep['Inertia'], 'o-')
+            ax1.set_xlabel('Number of Clusters')
+            ax1.set_ylabel('Within-Cluster Sum of Squares')
+            ax1.set_title('Elbow Curve')
+            ax2.plot(sweep['Clusters'], sweep['Silhouette'], 'o-', color='green')
+            ax2.set_xlabel('Number of Clusters')
+            ax2.set_ylabel('Silhouette Score')
+            ax2.set_title('Silhouette by Number of Clusters')
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
+
+            if sweep['Silhouette'].notna().any():
+                best_k = int(sweep.loc[sweep['Silhouette'].idxmax(), 'Clusters'])
+                st.info(f"Highest silhouette score at {best_k} clusters")
+
+        # Download results: every row of the dataset with its cluster (empty where values were missing)
+        csv_data = assign_to_rows(df, data.index, clusters).to_csv(index=False)
         FileHandler.create_download_link(csv_data.encode(), "clustering_results.csv", "text/csv")
 
         # Interpretation
@@ -3167,13 +3249,13 @@ def t_test_analysis():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
 
             test_type = st.selectbox("T-Test Type:",
-                                     ["One-Sample T-Test", "Two-Sample T-Test", "Paired T-Test"])
+                                     ["One-Sample T-Test", "Two-Sample T-Test", "Paired T-Test", "Batch T-Tests"])
 
             numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
             categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
@@ -3184,6 +3266,8 @@ def t_test_analysis():
                 perform_two_sample_ttest(df, numeric_cols, categorical_cols)
             elif test_type == "Paired T-Test":
                 perform_paired_ttest(df, numeric_cols)
+            elif test_type == "Batch T-Tests":
+                perform_batch_ttests(df, numeric_cols, categorical_cols)
 
 
 def perform_one_sample_ttest(df, numeric_cols):
@@ -3358,6 +3442,46 @@ def perform_paired_ttest(df, numeric_cols):
         st.error("Need at least 2 numeric columns for paired t-test")
 
 
+def perform_batch_ttests(df, numeric_cols, categorical_cols):
+    """Screen many columns with vectorized t-tests and multiple-comparison correction"""
+    if len(numeric_cols) == 0:
+        st.error("No numeric columns found for t-test")
+        return
+
+    test_cols = st.multiselect("Columns to Test:", numeric_cols, default=numeric_cols)
+    designs = ["One-Sample"] + (["Two-Sample"] if categorical_cols else [])
+    design = st.selectbox("Design:", designs)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if design == "One-Sample":
+            test_value = st.number_input("Test Value (μ₀):", value=0.0)
+        else:
+            group_col = st.selectbox("Group Column:", categorical_cols)
+            groups = list(df[group_col].dropna().unique())
+            if len(groups) < 2:
+                st.error("Group column needs at least 2 groups")
+                return
+            group_a = st.selectbox("Group A:", groups)
+            group_b = st.selectbox("Group B:", [group for group in groups if group != group_a])
+            equal_var = st.checkbox("Assume equal variances", value=True)
+    with col2:
+        alternative = st.selectbox("Alternative Hypothesis:", ALTERNATIVES)
+        correction = st.selectbox("Multiple-Comparison Correction:", CORRECTIONS)
+    with col3:
+        alpha = st.number_input("Significance Level (α):", min_value=0.001, max_value=0.2, value=0.05, step=0.01)
+
+    if test_cols and st.button("Run Batch T-Tests"):
+        try:
+            if design == "One-Sample":
+                results = one_sample_ttests(df, test_cols, test_value, alternative)
+            else:
+                results = two_sample_ttests(df, test_cols, group_col, [group_a, group_b], equal_var, alternative)
+            display_test_results(apply_correction(results, correction, alpha), alpha, "batch_ttests.csv")
+        except Exception as e:
+            st.error(f"Error in batch t-tests: {str(e)}")
+
+
 def anova_analysis():
     """Perform ANOVA analysis"""
     create_tool_header("ANOVA Analysis", "Compare means across multiple groups", "📊")
@@ -3368,7 +3492,7 @@ def anova_analysis():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -3377,18 +3501,40 @@ def anova_analysis():
             categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
 
             if len(numeric_cols) > 0 and len(categorical_cols) > 0:
+                batch_mode = st.checkbox("Test many dependent variables at once (batch)", value=False)
                 col1, col2 = st.columns(2)
                 with col1:
-                    dependent_var = st.selectbox("Dependent Variable:", numeric_cols)
+                    if batch_mode:
+                        dependent_vars = st.multiselect("Dependent Variables:", numeric_cols, default=numeric_cols)
+                    else:
+                        dependent_var = st.selectbox("Dependent Variable:", numeric_cols)
                 with col2:
                     independent_var = st.selectbox("Independent Variable (Groups):", categorical_cols)
+                    if batch_mode:
+                        correction = st.selectbox("Multiple-Comparison Correction:", CORRECTIONS)
 
                 if st.button("Perform ANOVA"):
-                    perform_anova_test(df, dependent_var, independent_var)
+                    if batch_mode:
+                        perform_batch_anova(df, dependent_vars, independent_var, correction)
+                    else:
+                        perform_anova_test(df, dependent_var, independent_var)
             else:
                 st.error("Need at least one numeric column and one categorical column")
 
 
+def perform_batch_anova(df, dependent_vars, independent_var, correction):
+    """One-way ANOVA of every dependent variable in one vectorized pass"""
+    if not dependent_vars:
+        st.error("Select at least one dependent variable")
+        return
+    try:
+        alpha = 0.05
+        results = apply_correction(anova_tests(df, dependent_vars, independent_var), correction, alpha)
+        display_test_results(results, alpha, "batch_anova.csv")
+    except Exception as e:
+        st.error(f"Error in batch ANOVA: {str(e)}")
+
+
 def perform_anova_test(df, dependent_var, independent_var):
     """Perform ANOVA test"""
     try:
@@ -3485,7 +3631,7 @@ def moving_averages():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -3572,7 +3718,7 @@ def trend_decomposition():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -3609,8 +3755,6 @@ def trend_decomposition():
 def perform_decomposition(df, date_col, value_col, period, model):
     """Perform time series decomposition"""
     try:
-        from scipy import signal
-
         # Prepare data
         df_clean = df[[date_col, value_col]].dropna()
         df_clean[date_col] = pd.to_datetime(df_clean[date_col])
@@ -3635,12 +3779,7 @@ def perform_decomposition(df, date_col, value_col, period, model):
             detrended = np.divide(values, trend_safe, out=np.zeros_like(values), where=(trend_safe != 0))
 
         # Simple seasonal component (average by period position)
-        seasonal = np.zeros_like(values)
-        for i in range(period):
-            mask = np.arange(i, len(values), period)
-            if len(mask) > 0:
-                period_avg = np.nanmean(detrended[mask])
-                seasonal[mask] = period_avg
+        seasonal = seasonal_means(detrended, period)[np.arange(len(values)) % period]
 
         # Residual
         if model == "Additive":
@@ -3657,6 +3796,8 @@ def perform_decomposition(df, date_col, value_col, period, model):
             'Residual': residual
         })
 
+        show_candidate_periods(values, period)
+
         st.markdown("### 📊 Decomposition Results")
         st.dataframe(results_df.head(20))
 
@@ -3748,16 +3889,36 @@ def excel_reader():
             with col3:
                 na_values = st.text_input("Additional NA Values (comma-separated):", "")
 
+            with st.expander("⚡ Fast Read Mode"):
+                fast_mode = st.checkbox("Use fast reader", True,
+                                        help=f"Streams rows with {fast_engine_name(uploaded_file[0].name)}, applies "
+                                             "the row limit and column selection while parsing, and keeps a "
+                                             "Parquet shadow copy so re-opening the workbook is instant")
+                columns = st.text_input("Only read columns (comma-separated, optional):", "")
+                all_sheets = len(sheet_names) > 1 and st.checkbox(
+                    "Parse all sheets in parallel", False,
+                    help="Parses every sheet in separate processes and caches them for later reads"
+                )
+
             if st.button("Read Excel File"):
                 read_excel_file(uploaded_file[0], selected_sheet, header_row, skip_rows,
-                                max_rows, index_col, na_values)
+                                max_rows, index_col, na_values, fast_mode=fast_mode,
+                                columns=columns, all_sheets=sheet_names if all_sheets else None)
 
         except Exception as e:
             st.error(f"Error reading Excel file: {str(e)}")
 
 
-def read_excel_file(uploaded_file, sheet_name, header_row, skip_rows, max_rows, index_col, na_values):
+def read_excel_file(uploaded_file, sheet_name, header_row, skip_rows, max_rows, index_col, na_values,
+                    fast_mode=False, columns="", all_sheets=None):
     """Read Excel file with specified parameters"""
+    if fast_mode:
+        df = read_excel_file_fast(uploaded_file, sheet_name, header_row, skip_rows, max_rows, index_col,
+                                  na_values, columns, all_sheets)
+        if df is not None:
+            show_excel_sheet(df, sheet_name)
+        return
+
     try:
         # Prepare parameters
         read_params = {
@@ -3778,6 +3939,54 @@ def read_excel_file(uploaded_file, sheet_name, header_row, skip_rows, max_rows,
         # Read the Excel file
         df = pd.read_excel(uploaded_file, **read_params)
 
+    except Exception as e:
+        st.error(f"Error processing Excel file: {str(e)}")
+        return
+
+    show_excel_sheet(df, sheet_name)
+
+
+def read_excel_file_fast(uploaded_file, sheet_name, header_row, skip_rows, max_rows, index_col, na_values,
+                         columns="", all_sheets=None):
+    """Read Excel sheets with the streaming engine, in parallel and through the Parquet shadow cache"""
+    try:
+        options = {
+            'header': header_row if header_row >= 0 else None,
+            'skiprows': skip_rows,
+            'nrows': max_rows or None,
+            'usecols': [c.strip() for c in columns.split(',') if c.strip()] or None,
+            'na_values': [val.strip() for val in na_values.split(',')] if na_values.strip() else []
+        }
+        sheet_names = list(all_sheets) if all_sheets else [sheet_name]
+
+        with st.spinner(f"Reading {len(sheet_names)} sheet(s)..."):
+            result = read_excel_sheets(bytes(uploaded_file.getbuffer()), uploaded_file.name, sheet_names,
+                                       digest=upload_digest(uploaded_file), options=options)
+
+        stats = result['stats']
+        st.caption(f"Read {len(sheet_names)} sheet(s) in {stats['elapsed_seconds']:.2f}s "
+                   f"({stats['shadow_hits']} from the Parquet shadow cache, {stats['parsed_sheets']} parsed)")
+
+        if len(sheet_names) > 1:
+            st.dataframe(pd.DataFrame([
+                {'Sheet': name, 'Rows': len(sheet_df), 'Columns': len(sheet_df.columns),
+                 'Source': stats['sources'][name]}
+                for name, sheet_df in result['sheets'].items()
+            ]))
+
+        df = result['sheets'][sheet_name]
+        if index_col >= 0 and index_col < len(df.columns):
+            df = df.set_index(df.columns[index_col])
+        return df
+
+    except Exception as e:
+        st.error(f"Error processing Excel file: {str(e)}")
+        return None
+
+
+def show_excel_sheet(df, sheet_name):
+    """Display file information, summary, analysis and export options for a loaded sheet"""
+    try:
         # Display file information
         st.markdown("### 📁 File Information")
         col1, col2, col3, col4 = st.columns(4)
@@ -3910,15 +4119,24 @@ def generate_quick_charts(df):
                 plt.close()
 
             elif chart_type == "Line Chart":
-                st.line_chart(df[viz_cols])
+                if len(df) > LINE_POINTS:
+                    st.caption(f"{len(df):,} rows downsampled to about {LINE_POINTS:,} points per column (LTTB)")
+                st.line_chart(reduce_lines(df[viz_cols].reset_index(drop=True)))
 
             elif chart_type == "Scatter Matrix" and len(viz_cols) > 1:
-                from pandas.plotting import scatter_matrix
-                fig, axes = plt.subplots(figsize=(12, 12))
-                scatter_matrix(df[viz_cols], alpha=0.6, diagonal='hist', ax=axes)
-                plt.tight_layout()
-                st.pyplot()
-                plt.close()
+                if len(df) > DENSITY_THRESHOLD:
+                    st.caption(density_note(len(df), MATRIX_BINS))
+                    fig = scatter_matrix_figure(df, viz_cols)
+                    plt.tight_layout()
+                    st.pyplot(fig)
+                    plt.close()
+                else:
+                    from pandas.plotting import scatter_matrix
+                    fig, axes = plt.subplots(figsize=(12, 12))
+                    scatter_matrix(df[viz_cols], alpha=0.6, diagonal='hist', ax=axes)
+                    plt.tight_layout()
+                    st.pyplot()
+                    plt.close()
 
     # Categorical data visualization
     categorical_cols = df.select_dtypes(include=['object']).columns
@@ -4017,12 +4235,12 @@ def data_format_converter():
 
     with col1:
         input_format = st.selectbox("Input Format:", [
-            "CSV", "Excel", "JSON", "XML", "Parquet", "TSV", "Fixed Width"
+            "CSV", "Excel", "JSON", "JSON Lines", "XML", "Parquet", "TSV", "Fixed Width"
         ])
 
     with col2:
         output_format = st.selectbox("Output Format:", [
-            "CSV", "Excel", "JSON", "XML", "Parquet", "TSV", "HTML", "LaTeX"
+            "CSV", "Excel", "JSON", "JSON Lines", "XML", "Parquet", "TSV", "HTML", "LaTeX"
         ])
 
     if input_format == output_format:
@@ -4031,7 +4249,7 @@ def data_format_converter():
 
     # File upload based on input format
     file_extensions = {
-        "CSV": ['csv'], "Excel": ['xlsx', 'xls'], "JSON": ['json'],
+        "CSV": ['csv'], "Excel": ['xlsx', 'xls'], "JSON": ['json'], "JSON Lines": ['jsonl', 'ndjson', 'json'],
         "XML": ['xml'], "Parquet": ['parquet'], "TSV": ['tsv', 'txt'],
         "Fixed Width": ['txt', 'dat']
     }
@@ -4047,6 +4265,24 @@ def data_format_converter():
         # Output-specific settings
         output_settings = get_output_settings(output_format)
 
+        with st.expander("⚡ Ingestion Options"):
+            col1, col2 = st.columns(2)
+            with col1:
+                input_settings['columns'] = st.text_input("Only read columns (comma-separated, optional):", "")
+                input_settings['max_rows'] = st.number_input("Row limit (0 = all rows):", 0, value=0, step=1000)
+                input_settings['arrow_dtypes'] = st.checkbox("Arrow-backed dtypes", True)
+            with col2:
+                input_settings['memory_budget_mb'] = st.number_input("Memory budget (MB):", 64,
+                                                                     value=DEFAULT_MEMORY_BUDGET_MB, step=64)
+                input_settings['sample_mb'] = st.number_input(
+                    "Sample first N MB to infer compact types (0 = off):", 0, 256, 8,
+                    help="Narrows integers and dictionary-encodes low-cardinality text before the full read"
+                )
+
+        if input_format in STREAMING_FORMATS and output_format in STREAMING_FORMATS:
+            st.caption("⚡ This format pair is converted in streaming mode: record batches are written straight "
+                       "to the output file, so memory use stays flat regardless of file size.")
+
         if st.button("🔄 Convert Data"):
             convert_data_format(uploaded_file[0], input_format, output_format,
                                 input_settings, output_settings)
@@ -4105,11 +4341,24 @@ def get_output_settings(output_format):
         settings['root_name'] = st.text_input("Root Element Name:", "data")
         settings['row_name'] = st.text_input("Row Element Name:", "row")
 
+    elif output_format == "Parquet":
+        col1, col2 = st.columns(2)
+        with col1:
+            settings['compression'] = st.selectbox("Compression:", ["snappy", "zstd", "gzip", "none"])
+        with col2:
+            settings['row_group_size'] = st.number_input("Rows per Row Group:", 1024, value=DEFAULT_ROW_GROUP_SIZE,
+                                                         step=16384)
+
     return settings
 
 
 def convert_data_format(uploaded_file, input_format, output_format, input_settings, output_settings):
     """Convert data between formats"""
+    if (input_format in STREAMING_FORMATS and output_format in STREAMING_FORMATS
+            and not output_settings.get('index', False)):
+        convert_data_format_streaming(uploaded_file, input_format, output_format, input_settings, output_settings)
+        return
+
     try:
         # Read input data
         df = read_input_data(uploaded_file, input_format, input_settings)
@@ -4141,52 +4390,80 @@ def convert_data_format(uploaded_file, input_format, output_format, input_settin
         st.error(f"Conversion error: {str(e)}")
 
 
-def read_input_data(uploaded_file, input_format, settings):
-    """Read data from various input formats"""
+def convert_data_format_streaming(uploaded_file, input_format, output_format, input_settings, output_settings):
+    """Convert between CSV/TSV/JSON Lines/Parquet batch by batch without materializing a DataFrame"""
     try:
-        if input_format == "CSV":
-            sep = settings.get('separator', ',')
-            encoding = settings.get('encoding', 'utf-8')
-            header = settings.get('header', 0)
-            skip_rows = settings.get('skip_rows', 0)
+        columns_str = input_settings.get('columns', '')
+        columns = [c.strip() for c in columns_str.split(',') if c.strip()] if columns_str else None
+
+        status = st.empty()
+        result = convert_stream(
+            uploaded_file, input_format, output_format, input_settings, output_settings,
+            columns=columns,
+            max_rows=input_settings.get('max_rows') or None,
+            progress_callback=lambda rows: status.caption(f"Converted {rows:,} rows...")
+        )
+        status.empty()
 
-            df = pd.read_csv(uploaded_file, sep=sep, encoding=encoding,
-                             header=header if header >= 0 else None,
-                             skiprows=skip_rows if skip_rows > 0 else None)
+        if result.preview is not None:
+            st.markdown("### 📊 Data Preview")
+            st.dataframe(result.preview)
 
-        elif input_format == "Excel":
-            sheet_name = settings.get('sheet_name', 0) or 0
-            header = settings.get('header', 0)
-            df = pd.read_excel(uploaded_file, sheet_name=sheet_name, header=header)
+        stats = result.stats
+        st.success(f"✅ Successfully converted to {output_format}!")
 
-        elif input_format == "JSON":
-            orient = settings.get('orient', 'records')
-            df = pd.read_json(uploaded_file, orient=orient)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Rows", f"{stats['rows']:,}")
+        with col2:
+            st.metric("Rows/s", f"{stats['rows_per_second']:,.0f}")
+        with col3:
+            st.metric("MB/s", f"{stats['mb_per_second']:.1f}")
+        with col4:
+            st.metric("Output Size", f"{stats['bytes_out'] / (1024 * 1024):.1f} MB")
+        st.caption(f"{stats['batches']} record batches in {stats['elapsed_seconds']:.2f}s")
 
-        elif input_format == "Parquet":
-            df = pd.read_parquet(uploaded_file)
+        with result.output:
+            if output_format != "Parquet":
+                st.text_area("Output Preview:", result.output.read(1000).decode('utf-8', errors='replace'),
+                             height=200)
+                result.output.seek(0)
+            serve_download(result.output, result.filename, result.mime_type)
 
-        elif input_format == "TSV":
-            df = pd.read_csv(uploaded_file, sep='\t')
+    except Exception as e:
+        st.error(f"Conversion error: {str(e)}")
 
-        elif input_format == "XML":
-            # Basic XML reading (requires lxml)
-            try:
-                df = pd.read_xml(uploaded_file)
-            except ImportError:
-                st.error("XML support requires lxml package")
-                return None
 
-        elif input_format == "Fixed Width":
-            widths_str = settings.get('widths', '10,15,20')
-            widths = [int(w.strip()) for w in widths_str.split(',')]
-            names_str = settings.get('names', '')
-            names = [n.strip() for n in names_str.split(',')] if names_str else None
+def read_input_data(uploaded_file, input_format, settings):
+    """Read data from various input formats"""
+    try:
+        columns_str = settings.get('columns', '')
+        columns = [c.strip() for c in columns_str.split(',') if c.strip()] if columns_str else None
+
+        result = ingest_dataframe(
+            uploaded_file, "JSON" if input_format == "JSON Lines" else input_format, settings,
+            columns=columns,
+            max_rows=settings.get('max_rows') or None,
+            memory_budget_mb=settings.get('memory_budget_mb', DEFAULT_MEMORY_BUDGET_MB),
+            dtype_backend="pyarrow" if settings.get('arrow_dtypes', True) else "numpy",
+            sample_mb=settings.get('sample_mb') or None
+        )
 
-            df = pd.read_fwf(uploaded_file, widths=widths, names=names)
+        info = result.info
+        st.caption(f"Read {info['rows']:,} rows × {info['columns']} columns with the {info['engine']} engine "
+                   f"in {info['elapsed_seconds']:.2f}s ({info['memory_bytes'] / (1024 * 1024):.1f} MB in memory)")
+        if info['truncated']:
+            st.warning(f"⚠️ Memory budget reached - only the first {info['rows']:,} rows were loaded. "
+                       f"Raise the budget or select fewer columns to read the full file.")
+        if info['compact_types']:
+            st.caption("Compact types from sampling: " +
+                       ", ".join(f"{name} → {dtype}" for name, dtype in info['compact_types'].items()))
 
-        return df
+        return result.df
 
+    except ImportError as e:
+        st.error(f"{input_format} support requires an additional package: {str(e)}")
+        return None
     except Exception as e:
         st.error(f"Error reading {input_format} file: {str(e)}")
         return None
@@ -4207,14 +4484,9 @@ def convert_to_output(df, output_format, settings):
             sheet_name = settings.get('sheet_name', 'Sheet1')
             include_index = settings.get('index', False)
 
-            # Create Excel file in memory
-            import io
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name=sheet_name, index=include_index)
-
-            output_data = output.getvalue()
-            return output_data, "converted_data.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            # Spooled write-only workbook; the download helper accepts the file object directly
+            output_data = write_excel({sheet_name: df}, index=include_index)
+            return output_data, "converted_data.xlsx", EXCEL_MIME
 
         elif output_format == "JSON":
             orient = settings.get('orient', 'records')
@@ -4223,6 +4495,10 @@ def convert_to_output(df, output_format, settings):
             output_data = df.to_json(orient=orient, indent=indent)
             return output_data, "converted_data.json", "application/json"
 
+        elif output_format == "JSON Lines":
+            output_data = df.to_json(orient='records', lines=True, date_format='iso')
+            return output_data, "converted_data.jsonl", "application/x-ndjson"
+
         elif output_format == "Parquet":
             import io
             output = io.BytesIO()
@@ -4650,9 +4926,14 @@ def duplicate_remover():
 
     if uploaded_file:
         if uploaded_file[0].name.endswith('.csv'):
+            large_file = uploaded_file[0].size > DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+            if st.checkbox("Out-of-core mode (stream the file instead of loading it)", value=large_file,
+                           help="Deduplicates files larger than memory in two passes with a disk-backed hash set"):
+                stream_duplicate_removal(uploaded_file[0])
+                return
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -4664,7 +4945,7 @@ def duplicate_remover():
             with col1:
                 st.metric("Total Rows", len(df))
             with col2:
-                duplicates = df.duplicated().sum()
+                duplicates = int(duplicate_mask(row_hashes(df), df=df).sum())
                 st.metric("Duplicate Rows", duplicates)
             with col3:
                 unique_pct = ((len(df) - duplicates) / len(df)) * 100
@@ -4712,67 +4993,98 @@ def duplicate_remover():
                 # Still offer column-specific duplicate analysis
                 st.markdown("### 🔍 Column-Specific Duplicate Analysis")
 
-                col = st.selectbox("Analyze duplicates in specific column:", df.columns.tolist())
+                col = st.selectbox("Analyze duplicates in specific column:", df.columns.tolist())
+
+                if st.button("Analyze Column Duplicates"):
+                    analyze_column_duplicates(df, col)
+
+            show_near_duplicate_detection(df)
+
+
+def stream_duplicate_removal(uploaded_file):
+    """Deduplicate a CSV file without loading it into memory"""
+    st.markdown("### 🌊 Out-of-Core Duplicate Removal")
+
+    try:
+        header = next(iter_record_batches(uploaded_file, "CSV", max_rows=1)).schema.names
+    except Exception as e:
+        st.error(f"Error reading CSV: {str(e)}")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        subset_cols = st.multiselect("Check duplicates based on (empty = all columns):", header)
+        keep_option = st.selectbox("Keep which duplicate:", [
+            "First occurrence", "Last occurrence", "None (remove all)"
+        ])
+    with col2:
+        case_sensitive = st.checkbox("Case sensitive (for text columns)", value=True)
+        memory_budget_mb = st.number_input("Memory Budget (MB):", min_value=16, value=DEFAULT_MEMORY_BUDGET_MB,
+                                           step=64)
+
+    if st.button("🗑️ Remove Duplicates"):
+        keep_map = {
+            "First occurrence": "first",
+            "Last occurrence": "last",
+            "None (remove all)": False
+        }
+        try:
+            progress_bar = st.progress(0)
+            result = dedup_stream(uploaded_file, "CSV", subset=subset_cols or None, keep=keep_map[keep_option],
+                                  normalize=not case_sensitive, memory_budget_mb=memory_budget_mb,
+                                  progress_callback=progress_bar.progress)
+            progress_bar.empty()
+        except Exception as e:
+            st.error(f"Error removing duplicates: {str(e)}")
+            return
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Original Rows", f"{result.stats['rows']:,}")
+        with col2:
+            st.metric("Rows Removed", f"{result.stats['removed_rows']:,}")
+        with col3:
+            st.metric("Final Rows", f"{result.stats['kept_rows']:,}")
 
-                if st.button("Analyze Column Duplicates"):
-                    analyze_column_duplicates(df, col)
+        st.caption(f"{result.stats['partitions']} hash partitions, "
+                   f"{result.stats['rows_per_second']:,.0f} rows/s")
+        st.dataframe(result.preview)
+        serve_download(result.output, "cleaned_data.csv", result.mime_type)
 
 
 def analyze_duplicates(df, subset_cols, case_sensitive):
     """Analyze duplicate rows in detail"""
     try:
-        # Prepare data for duplicate detection
-        if subset_cols:
-            check_df = df[subset_cols].copy()
-        else:
-            check_df = df.copy()
-
-        # Handle case sensitivity for text columns
-        if not case_sensitive:
-            for col in check_df.columns:
-                if check_df[col].dtype == 'object':
-                    check_df[col] = check_df[col].astype(str).str.lower()
-
-        # Find duplicates
-        duplicated_mask = check_df.duplicated(keep=False)
-        duplicate_rows = df[duplicated_mask]
-
-        if len(duplicate_rows) > 0:
+        # One 64-bit hash per row of the checked columns; only rows with matching hashes are compared
+        normalize = not case_sensitive
+        hashes = row_hashes(df, subset_cols, normalize=normalize)
+        duplicated_mask = duplicate_mask(hashes, False, df, subset_cols, normalize)
+        duplicate_count = int(duplicated_mask.sum())
+        all_groups = duplicate_groups(hashes, duplicated_mask, None, df, subset_cols, normalize)
+
+        if duplicate_count > 0:
             st.markdown("### 🔍 Duplicate Analysis Results")
 
             # Summary statistics
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                st.metric("Duplicate Rows", len(duplicate_rows))
+                st.metric("Duplicate Rows", duplicate_count)
             with col2:
-                unique_groups = check_df[duplicated_mask].drop_duplicates().shape[0]
+                unique_groups = len(all_groups)
                 st.metric("Unique Duplicate Groups", unique_groups)
             with col3:
-                avg_duplicates = len(duplicate_rows) / unique_groups if unique_groups > 0 else 0
+                avg_duplicates = duplicate_count / unique_groups if unique_groups > 0 else 0
                 st.metric("Avg Duplicates per Group", f"{avg_duplicates:.1f}")
 
             # Show sample duplicate groups
             st.markdown("#### 📝 Sample Duplicate Groups")
 
-            # Group duplicates and show examples
-            grouped = []
-            seen_groups = set()
-
-            for idx, row in check_df[duplicated_mask].iterrows():
-                row_tuple = tuple(row.values)
-                if row_tuple not in seen_groups:
-                    seen_groups.add(row_tuple)
-                    group_mask = (check_df == row).all(axis=1)
-                    group_df = df[group_mask]
-                    grouped.append(group_df)
-
-                    if len(grouped) >= 5:  # Show max 5 groups
-                        break
+            grouped = all_groups[:5]  # Show max 5 groups
 
             for i, group in enumerate(grouped, 1):
                 st.markdown(f"**Group {i}:**")
-                st.dataframe(group)
+                st.dataframe(df.iloc[group])
 
             if len(grouped) < unique_groups:
                 st.info(f"Showing {len(grouped)} of {unique_groups} duplicate groups")
@@ -4786,14 +5098,8 @@ def analyze_duplicates(df, subset_cols, case_sensitive):
 def remove_duplicates(df, subset_cols, keep_option, case_sensitive):
     """Remove duplicate rows from dataframe"""
     try:
-        # Prepare data for duplicate detection
         original_len = len(df)
 
-        if subset_cols:
-            subset = subset_cols
-        else:
-            subset = None
-
         # Map keep option
         keep_map = {
             "First occurrence": "first",
@@ -4802,20 +5108,10 @@ def remove_duplicates(df, subset_cols, keep_option, case_sensitive):
         }
         keep_value = keep_map[keep_option]
 
-        # Handle case sensitivity
-        work_df = df.copy()
-        if not case_sensitive and subset:
-            for col in subset:
-                if work_df[col].dtype == 'object':
-                    work_df[col] = work_df[col].astype(str).str.lower()
-
-        # Remove duplicates
-        if not case_sensitive and subset:
-            # Need to identify duplicates based on modified data but remove from original
-            duplicated_mask = work_df.duplicated(subset=subset, keep=keep_value)
-            cleaned_df = df[~duplicated_mask].copy()
-        else:
-            cleaned_df = df.drop_duplicates(subset=subset, keep=keep_value)
+        # Identify duplicates from row hashes of the (optionally lower-cased) checked columns
+        normalize = not case_sensitive
+        hashes = row_hashes(df, subset_cols, normalize=normalize)
+        cleaned_df = df[~duplicate_mask(hashes, keep_value, df, subset_cols, normalize)]
 
         removed_count = original_len - len(cleaned_df)
 
@@ -4843,22 +5139,12 @@ def remove_duplicates(df, subset_cols, keep_option, case_sensitive):
             col1, col2 = st.columns(2)
 
             with col1:
-                if st.button("📄 Download as CSV"):
-                    csv_data = cleaned_df.to_csv(index=False)
-                    FileHandler.create_download_link(csv_data.encode(), "cleaned_data.csv", "text/csv")
-                    st.success("CSV download ready!")
+                csv_data = cleaned_df.to_csv(index=False)
+                serve_download(csv_data.encode(), "cleaned_data.csv", "text/csv", label="📄 Download as CSV")
 
             with col2:
-                if st.button("📊 Download as Excel"):
-                    import io
-                    output = io.BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        cleaned_df.to_excel(writer, sheet_name='CleanedData', index=False)
-
-                    excel_data = output.getvalue()
-                    FileHandler.create_download_link(excel_data, "cleaned_data.xlsx",
-                                                     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-                    st.success("Excel download ready!")
+                with write_excel({'CleanedData': cleaned_df}) as excel_data:
+                    serve_download(excel_data, "cleaned_data.xlsx", EXCEL_MIME, label="📊 Download as Excel")
         else:
             st.info("No duplicates were removed.")
 
@@ -4866,6 +5152,58 @@ def remove_duplicates(df, subset_cols, keep_option, case_sensitive):
         st.error(f"Error removing duplicates: {str(e)}")
 
 
+def show_near_duplicate_detection(df):
+    """Find rows whose text is similar but not identical (MinHash + LSH)"""
+    text_cols = [col for col in df.columns if df[col].dtype == 'object']
+    if not text_cols:
+        return
+
+    st.markdown("### 🧬 Near-Duplicate Detection")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_cols = st.multiselect("Text columns to compare:", text_cols, default=text_cols[:1])
+        threshold = st.slider("Jaccard similarity threshold:", 0.5, 0.99, 0.8, 0.01)
+    with col2:
+        shingle_size = st.slider("Shingle size (characters):", 2, 10, 4)
+        num_perm = st.selectbox("MinHash permutations:", [64, 128, 256], index=1,
+                                help="More permutations give more accurate similarity estimates")
+
+    if selected_cols and st.button("🧬 Find Near-Duplicates"):
+        try:
+            texts = df[selected_cols].fillna('').astype(str).agg(' '.join, axis=1)
+            with st.spinner("Computing MinHash signatures..."):
+                groups = near_duplicate_groups(texts, threshold, num_perm, shingle_size)
+
+            if not groups:
+                st.success("✅ No near-duplicate rows found at this threshold!")
+                return
+
+            affected = sum(len(group) for group in groups)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Near-Duplicate Groups", len(groups))
+            with col2:
+                st.metric("Rows in Groups", affected)
+            with col3:
+                st.metric("Removable Rows", affected - len(groups))
+
+            st.markdown("#### 📝 Sample Near-Duplicate Groups")
+            for i, group in enumerate(groups[:5], 1):
+                st.markdown(f"**Group {i}** ({len(group)} rows):")
+                st.dataframe(df.iloc[group])
+
+            # Keep the first row of every group
+            drop_positions = np.concatenate([group[1:] for group in groups])
+            keep_mask = np.ones(len(df), dtype=bool)
+            keep_mask[drop_positions] = False
+            csv_data = df[keep_mask].to_csv(index=False)
+            serve_download(csv_data.encode(), "near_deduplicated_data.csv", "text/csv")
+
+        except Exception as e:
+            st.error(f"Error detecting near-duplicates: {str(e)}")
+
+
 def analyze_column_duplicates(df, column):
     """Analyze duplicates in a specific column"""
     try:
@@ -4917,7 +5255,7 @@ def data_type_converter():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -4951,6 +5289,9 @@ def data_type_converter():
             else:
                 st.success("✅ Data types are already optimized!")
 
+            # One-click memory optimizer
+            show_memory_optimizer(df, uploaded_file[0])
+
             # Manual conversion interface
             st.markdown("### ⚙️ Manual Type Conversion")
 
@@ -5126,6 +5467,78 @@ def generate_type_suggestions(df):
     return suggestions
 
 
+def show_memory_optimizer(df, uploaded_file):
+    """Apply every safe memory optimization at once and report the savings per column"""
+    st.markdown("### 🗜️ Memory Optimizer")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        downcast = st.checkbox("Downcast numbers", value=True,
+                               help="Smallest integer type that fits; float32 when no precision is lost")
+        lossy_floats = st.checkbox("Allow lossy float32", value=False, disabled=not downcast)
+        unsigned_ints = st.checkbox("Allow unsigned integers", value=False, disabled=not downcast,
+                                    help="Smaller for non-negative columns, but subtraction and negation on them "
+                                         "wrap around instead of going negative")
+        parse_numbers = st.checkbox("Numeric text → numbers", value=False,
+                                    help="Only columns that print back unchanged, so IDs and ZIP codes keep "
+                                         "their leading zeros")
+    with col2:
+        categorize = st.checkbox("Low-cardinality text → category", value=True)
+        category_ratio = st.slider("Max unique ratio for category:", 0.01, 0.9, 0.5, 0.01, disabled=not categorize)
+        arrow_strings = st.checkbox("Other text → Arrow strings", value=True)
+    with col3:
+        parse_dates = st.checkbox("Parse date text (one cached format per column)", value=True)
+        sparse = st.checkbox("Sparse storage for mostly-missing columns", value=True)
+        sparse_ratio = st.slider("Min missing ratio for sparse:", 0.5, 0.99, 0.9, 0.01, disabled=not sparse)
+
+    share = st.checkbox("Use the optimized data in other tools for this file", value=False,
+                        help="Other tools loading the same upload in this session receive the compact frame "
+                             "instead of re-parsing it")
+
+    if st.button("🗜️ Optimize Memory"):
+        options = {
+            'downcast': downcast,
+            'lossy_floats': lossy_floats,
+            'unsigned_ints': unsigned_ints,
+            'categorize': categorize,
+            'category_ratio': category_ratio,
+            'arrow_strings': arrow_strings,
+            'parse_dates': parse_dates,
+            'parse_numbers': parse_numbers,
+            'sparse': sparse,
+            'sparse_ratio': sparse_ratio
+        }
+        progress_bar = st.progress(0)
+        optimized_df, report = optimize_dataframe(df, options, progress_callback=progress_bar.progress)
+        progress_bar.empty()
+
+        before = df.memory_usage(deep=True).sum()
+        after = optimized_df.memory_usage(deep=True).sum()
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Memory Before", f"{before / 1024 ** 2:.2f} MB")
+        with col2:
+            st.metric("Memory After", f"{after / 1024 ** 2:.2f} MB", f"-{(1 - after / before) * 100:.1f}%")
+        with col3:
+            st.metric("Reduction", f"{before / after:.1f}×" if after else "N/A")
+
+        st.dataframe(report, use_container_width=True)
+
+        if share:
+            replace_dataframe(uploaded_file, optimized_df)
+            st.success("✅ Other tools in this session will now load the optimized data for this file")
+
+        # Parquet keeps the optimized types for later sessions
+        try:
+            output = io.BytesIO()
+            dense_copy(optimized_df).to_parquet(output, engine='pyarrow', index=False)
+            output.seek(0)
+            serve_download(output, "optimized_data.parquet", "application/octet-stream")
+        except (ValueError, TypeError, NotImplementedError) as e:
+            st.warning(f"Parquet export unavailable for this data: {str(e)}")
+
+
 def outlier_detector():
     """Detect outliers using multiple methods"""
     create_tool_header("Outlier Detector", "Detect and analyze outliers in your data", "🎯")
@@ -5136,7 +5549,7 @@ def outlier_detector():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -5377,18 +5790,28 @@ def data_profiling():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
 
+            mode = st.radio("Profiling mode:", ["Exact", "Approximate (sketches)"], horizontal=True,
+                            index=1 if len(df) > 5_000_000 else 0,
+                            help="Approximate mode uses t-digest quantiles and HyperLogLog distinct counts "
+                                 "with bounded memory per column")
+
             if st.button("🔍 Generate Data Profile"):
-                generate_comprehensive_profile(df)
+                generate_comprehensive_profile(df, mode="approximate" if mode.startswith("Approximate") else "exact")
 
 
-def generate_comprehensive_profile(df):
+def generate_comprehensive_profile(df, mode="exact"):
     """Generate comprehensive data profile"""
     try:
+        # Every column statistic below comes from one chunked pass over the data
+        profile = profile_dataframe(df, mode=mode)
+        approx = "≈" if mode == "approximate" else ""
+        st.caption(f"Profiled {profile.rows:,} rows in {profile.elapsed_seconds:.2f}s ({mode} mode)")
+
         # Dataset Overview
         st.markdown("### 📊 Dataset Overview")
 
@@ -5399,16 +5822,13 @@ def generate_comprehensive_profile(df):
         with col2:
             st.metric("Columns", len(df.columns))
         with col3:
-            memory_usage = df.memory_usage(deep=True).sum() / 1024 ** 2
+            memory_usage = profile.memory_bytes / 1024 ** 2
             st.metric("Memory (MB)", f"{memory_usage:.2f}")
         with col4:
-            missing_cells = df.isnull().sum().sum()
-            total_cells = len(df) * len(df.columns)
-            completeness = ((total_cells - missing_cells) / total_cells) * 100
-            st.metric("Completeness", f"{completeness:.1f}%")
+            st.metric("Completeness", f"{profile.completeness:.1f}%")
 
         # Data Quality Score
-        quality_score = calculate_comprehensive_quality_score(df)
+        quality_score = calculate_comprehensive_quality_score(df, profile=profile)
 
         if quality_score >= 90:
             st.success(f"✅ Excellent Data Quality: {quality_score:.1f}/100")
@@ -5425,73 +5845,76 @@ def generate_comprehensive_profile(df):
         profile_data = []
 
         for col in df.columns:
-            col_data = df[col]
+            col_profile = profile.columns[col]
+            count = col_profile.count
+            unique = col_profile.unique
 
             # Basic stats
-            profile = {
+            col_stats = {
                 'Column': col,
-                'Type': str(col_data.dtype),
-                'Count': col_data.count(),
-                'Missing': col_data.isnull().sum(),
-                'Missing %': (col_data.isnull().sum() / len(df)) * 100,
-                'Unique': col_data.nunique(),
-                'Unique %': (col_data.nunique() / len(df)) * 100
+                'Type': col_profile.dtype,
+                'Count': count,
+                'Missing': col_profile.missing,
+                'Missing %': (col_profile.missing / len(df)) * 100,
+                'Unique': unique,
+                'Unique %': (unique / len(df)) * 100
             }
 
             # Type-specific analysis
-            if pd.api.types.is_numeric_dtype(col_data):
-                profile.update({
-                    'Min': col_data.min(),
-                    'Max': col_data.max(),
-                    'Mean': col_data.mean(),
-                    'Median': col_data.median(),
-                    'Std': col_data.std(),
-                    'Skewness': col_data.skew()
+            if col_profile.kind == 'numeric':
+                moments = col_profile.moments
+                skewness = moments.skew()
+                col_stats.update({
+                    'Min': moments.min if count else np.nan,
+                    'Max': moments.max if count else np.nan,
+                    'Mean': moments.mean if count else np.nan,
+                    'Median': col_profile.quantile(0.5),
+                    'Std': moments.std(),
+                    'Skewness': skewness
                 })
 
                 # Detect potential issues
                 issues = []
-                if col_data.min() == col_data.max():
+                if moments.min == moments.max:
                     issues.append("Constant values")
-                if abs(col_data.skew()) > 2:
+                if abs(skewness) > 2:
                     issues.append("Highly skewed")
-                if (col_data < 0).any() and col.lower() in ['age', 'count', 'quantity', 'amount', 'price']:
+                if moments.min < 0 and col.lower() in ['age', 'count', 'quantity', 'amount', 'price']:
                     issues.append("Negative values in non-negative field")
 
-                profile['Issues'] = ', '.join(issues) if issues else 'None'
+                col_stats['Issues'] = ', '.join(issues) if issues else 'None'
 
-            elif col_data.dtype == 'object':
+            elif df[col].dtype == 'object':
                 # Text analysis
-                non_null = col_data.dropna()
-                if len(non_null) > 0:
-                    avg_length = non_null.astype(str).str.len().mean()
-                    profile['Avg Length'] = f"{avg_length:.1f}"
+                if count > 0:
+                    col_stats['Avg Length'] = f"{col_profile.avg_length:.1f}"
 
                     # Most common value
-                    mode_val = col_data.mode()
-                    if len(mode_val) > 0:
-                        profile['Most Common'] = str(mode_val.iloc[0])[:50]
-                        mode_freq = (col_data == mode_val.iloc[0]).sum()
-                        profile['Mode Frequency'] = f"{mode_freq} ({(mode_freq / len(df) * 100):.1f}%)"
+                    top = col_profile.top_k(1)
+                    if top:
+                        mode_value, mode_freq = top[0]
+                        col_stats['Most Common'] = str(mode_value)[:50]
+                        col_stats['Mode Frequency'] = f"{approx}{mode_freq} ({(mode_freq / len(df) * 100):.1f}%)"
 
                     # Check for potential data type issues
                     issues = []
+                    sample = pd.Series(col_profile.sample, dtype=object)
                     try:
-                        pd.to_numeric(non_null.head(100), errors='raise')
+                        pd.to_numeric(sample, errors='raise')
                         issues.append("Could be numeric")
                     except:
                         try:
-                            pd.to_datetime(non_null.head(100), errors='raise')
+                            pd.to_datetime(sample, errors='raise')
                             issues.append("Could be datetime")
                         except:
                             pass
 
-                    if col_data.nunique() < len(col_data) * 0.1:
+                    if unique < len(df) * 0.1:
                         issues.append("Low cardinality - consider category")
 
-                    profile['Suggestions'] = ', '.join(issues) if issues else 'None'
+                    col_stats['Suggestions'] = ', '.join(issues) if issues else 'None'
 
-            profile_data.append(profile)
+            profile_data.append(col_stats)
 
         # Display profile table
         profile_df = pd.DataFrame(profile_data)
@@ -5500,7 +5923,7 @@ def generate_comprehensive_profile(df):
         # Data Type Distribution
         st.markdown("### 📊 Data Type Distribution")
 
-        type_counts = df.dtypes.value_counts()
+        type_counts = profile.dtype_counts()
         col1, col2 = st.columns(2)
 
         with col1:
@@ -5515,7 +5938,7 @@ def generate_comprehensive_profile(df):
         # Missing Data Pattern Analysis
         st.markdown("### 🕳️ Missing Data Patterns")
 
-        missing_summary = df.isnull().sum()
+        missing_summary = pd.Series({col: profile.columns[col].missing for col in df.columns}, dtype='int64')
         columns_with_missing = missing_summary[missing_summary > 0]
 
         if len(columns_with_missing) > 0:
@@ -5550,7 +5973,7 @@ def generate_comprehensive_profile(df):
         # Duplicate Analysis
         st.markdown("### 🔄 Duplicate Analysis")
 
-        total_duplicates = df.duplicated().sum()
+        total_duplicates = profile.duplicate_rows
 
         col1, col2, col3 = st.columns(3)
 
@@ -5573,9 +5996,8 @@ def generate_comprehensive_profile(df):
 
         col_duplicate_data = []
         for col in df.columns:
-            col_data = df[col]
-            total_vals = len(col_data)
-            unique_vals = col_data.nunique()
+            total_vals = len(df)
+            unique_vals = profile.columns[col].unique
             duplicated_vals = total_vals - unique_vals
 
             col_duplicate_data.append({
@@ -5613,17 +6035,19 @@ def generate_comprehensive_profile(df):
         st.error(f"Error generating data profile: {str(e)}")
 
 
-def calculate_comprehensive_quality_score(df):
+def calculate_comprehensive_quality_score(df, profile=None):
     """Calculate comprehensive data quality score"""
+    if profile is None:
+        profile = profile_dataframe(df)
     score = 100
 
     # Completeness (30%)
-    missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
+    missing_pct = 100 - profile.completeness
     completeness_score = max(0, 100 - missing_pct * 2)
     score = score * 0.7 + completeness_score * 0.3
 
     # Uniqueness (25%) - check for duplicates
-    duplicates_pct = (df.duplicated().sum() / len(df)) * 100
+    duplicates_pct = (profile.duplicate_rows / len(df)) * 100
     uniqueness_score = max(0, 100 - duplicates_pct * 3)
     score = score * 0.75 + uniqueness_score * 0.25
 
@@ -5633,10 +6057,10 @@ def calculate_comprehensive_quality_score(df):
 
     for col in df.columns:
         if df[col].dtype == 'object':
-            non_null_data = df[col].dropna()
-            if len(non_null_data) > 0:
+            sample = profile.columns[col].sample
+            if len(sample) > 0:
                 try:
-                    pd.to_numeric(non_null_data.head(100), errors='raise')
+                    pd.to_numeric(pd.Series(sample, dtype=object), errors='raise')
                     inconsistent_cols += 1  # Could be numeric but stored as text
                 except:
                     pass
@@ -5652,15 +6076,16 @@ def calculate_comprehensive_quality_score(df):
 
     for col in numeric_cols:
         col_name_lower = col.lower()
-        col_data = df[col]
+        col_profile = profile.columns[col]
+        median = col_profile.quantile(0.5)
 
         # Check for negative values in fields that shouldn't have them
         if any(keyword in col_name_lower for keyword in ['age', 'count', 'quantity', 'amount', 'price']) and (
-                col_data < 0).any():
+                col_profile.moments.min < 0):
             validity_score -= 10
 
         # Check for extremely large values that might be errors
-        if col_data.max() > col_data.median() * 1000 and col_data.median() > 0:
+        if col_profile.moments.max > median * 1000 and median > 0:
             validity_score -= 5
 
     score = score * 0.8 + max(0, validity_score) * 0.2
@@ -5752,27 +6177,20 @@ def export_profile_report(df, profile_df, quality_score):
 
         summary_df = pd.DataFrame([summary_data])
 
-        # Export using ExcelWriter for multiple sheets
-        import io
-        output = io.BytesIO()
-
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            profile_df.to_excel(writer, sheet_name='Column_Analysis', index=False)
-
-            # Missing data analysis if any
-            missing_summary = df.isnull().sum()
-            if missing_summary.sum() > 0:
-                missing_df = pd.DataFrame({
-                    'Column': missing_summary.index,
-                    'Missing_Count': missing_summary.values,
-                    'Missing_Percentage': (missing_summary.values / len(df)) * 100
-                })
-                missing_df.to_excel(writer, sheet_name='Missing_Data', index=False)
+        # Export as a multi-sheet write-only workbook
+        sheets = {'Summary': summary_df, 'Column_Analysis': profile_df}
+
+        # Missing data analysis if any
+        missing_summary = df.isnull().sum()
+        if missing_summary.sum() > 0:
+            sheets['Missing_Data'] = pd.DataFrame({
+                'Column': missing_summary.index,
+                'Missing_Count': missing_summary.values,
+                'Missing_Percentage': (missing_summary.values / len(df)) * 100
+            })
 
-        excel_data = output.getvalue()
-        FileHandler.create_download_link(excel_data, "data_profile_report.xlsx",
-                                         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        with write_excel(sheets) as excel_data:
+            FileHandler.create_download_link(excel_data, "data_profile_report.xlsx", EXCEL_MIME)
         st.success("📄 Comprehensive profile report ready for download!")
 
     except Exception as e:
@@ -5789,7 +6207,7 @@ def distribution_analysis():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -6251,49 +6669,25 @@ def normality_testing(df, columns):
 
         st.markdown("### 🔬 Normality Testing")
 
-        test_results = []
-
-        for col in columns:
-            col_data = df[col].dropna()
-
-            if len(col_data) < 8:
-                st.warning(f"Insufficient data for normality testing of column '{col}' (need at least 8 values)")
-                continue
-
-            # Shapiro-Wilk test (best for small samples)
-            if len(col_data) <= 5000:
-                shapiro_stat, shapiro_p = stats.shapiro(col_data)
-            else:
-                shapiro_stat, shapiro_p = None, None
-
-            # D'Agostino's test
-            if len(col_data) >= 20:
-                dagostino_stat, dagostino_p = stats.normaltest(col_data)
-            else:
-                dagostino_stat, dagostino_p = None, None
-
-            # Kolmogorov-Smirnov test
-            ks_stat, ks_p = stats.kstest(col_data, 'norm', args=(col_data.mean(), col_data.std()))
+        # D'Agostino, Kolmogorov-Smirnov and Anderson-Darling for all columns in one vectorized pass
+        results_df = normality_tests(df, columns)
+        for col in results_df.loc[results_df['Sample Size'] < 8, 'Column']:
+            st.warning(f"Insufficient data for normality testing of column '{col}' (need at least 8 values)")
+        results_df = results_df[results_df['Sample Size'] >= 8].reset_index(drop=True)
 
-            # Anderson-Darling test
-            ad_result = stats.anderson(col_data, dist='norm')
+        # Shapiro-Wilk (best for small samples) has no vectorized form; it runs per column up to 5000 values
+        shapiro = [stats.shapiro(df[col].dropna()) if n <= 5000 else (np.nan, np.nan)
+                   for col, n in zip(results_df['Column'], results_df['Sample Size'])]
+        results_df.insert(1, 'Shapiro-Wilk Stat', [float(result[0]) for result in shapiro])
+        results_df.insert(2, 'Shapiro-Wilk p-value', [float(result[1]) for result in shapiro])
 
-            test_results.append({
-                'Column': col,
-                'Shapiro-Wilk Stat': shapiro_stat,
-                'Shapiro-Wilk p-value': shapiro_p,
-                'D\'Agostino Stat': dagostino_stat,
-                'D\'Agostino p-value': dagostino_p,
-                'KS Stat': ks_stat,
-                'KS p-value': ks_p,
-                'Anderson-Darling Stat': ad_result.statistic,
-                'AD Critical Value (5%)': ad_result.critical_values[2],  # 5% significance
-                'Sample Size': len(col_data)
-            })
+        # Several columns are several tests; interpret Benjamini-Hochberg adjusted p-values
+        if len(results_df) > 1:
+            for p_col in ['Shapiro-Wilk p-value', 'D\'Agostino p-value', 'KS p-value']:
+                results_df[p_col] = adjust_pvalues(results_df[p_col], "Benjamini-Hochberg")
+            st.caption(f"p-values adjusted for {len(results_df)} columns (Benjamini-Hochberg)")
 
-        if test_results:
-            # Display results table
-            results_df = pd.DataFrame(test_results)
+        if len(results_df):
 
             # Format for display
             display_df = results_df.round(6)
@@ -6311,14 +6705,14 @@ def normality_testing(df, columns):
                 interpretations = []
 
                 # Shapiro-Wilk
-                if row['Shapiro-Wilk p-value'] is not None:
+                if pd.notna(row['Shapiro-Wilk p-value']):
                     if row['Shapiro-Wilk p-value'] > alpha:
                         interpretations.append("✅ Shapiro-Wilk: Normal (fail to reject H0)")
                     else:
                         interpretations.append("❌ Shapiro-Wilk: Not normal (reject H0)")
 
                 # D'Agostino
-                if row['D\'Agostino p-value'] is not None:
+                if pd.notna(row['D\'Agostino p-value']):
                     if row['D\'Agostino p-value'] > alpha:
                         interpretations.append("✅ D'Agostino: Normal (fail to reject H0)")
                     else:
@@ -6403,7 +6797,7 @@ def heatmap_creator():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -6443,39 +6837,20 @@ def create_correlation_heatmap(df):
     if st.button("Create Heatmap"):
         try:
             # Calculate correlation matrix
-            corr_matrix = df[numeric_cols].corr(method=method)
-
-            # Create heatmap
-            plt.figure(figsize=(figure_size, figure_size))
-            sns.heatmap(corr_matrix,
-                        annot=show_annotations,
-                        cmap=color_scheme,
-                        center=0,
-                        square=True,
-                        linewidths=0.5,
-                        cbar_kws={"shrink": .8})
+            corr_matrix = correlation_matrix(df[numeric_cols], method=method)
 
-            plt.title(f"{method.title()} Correlation Heatmap", fontsize=16, pad=20)
-            plt.tight_layout()
-            st.pyplot(plt.gcf())
-            plt.close()
+            # Create heatmap (wide matrices are clustered and downsampled)
+            fig = correlation_heatmap(corr_matrix, f"{method.title()} Correlation Heatmap", cmap=color_scheme,
+                                      figsize=(figure_size, figure_size), annotate=show_annotations)
+            st.pyplot(fig)
+            plt.close(fig)
 
             # Show strongest correlations
             st.markdown("### 🔍 Strongest Correlations")
-            correlations = []
-            for i in range(len(corr_matrix.columns)):
-                for j in range(i + 1, len(corr_matrix.columns)):
-                    corr_value = corr_matrix.iloc[i, j]
-                    correlations.append({
-                        'Variable 1': corr_matrix.columns[i],
-                        'Variable 2': corr_matrix.columns[j],
-                        'Correlation': corr_value,
-                        'Strength': 'Strong' if abs(corr_value) > 0.7 else 'Moderate' if abs(
-                            corr_value) > 0.3 else 'Weak'
-                    })
-
-            corr_df = pd.DataFrame(correlations).sort_values('Correlation', key=abs, ascending=False)
-            st.dataframe(corr_df.head(10))
+            corr_df = top_pairs(corr_matrix, k=10)
+            strength = corr_df['Correlation'].abs()
+            corr_df['Strength'] = np.select([strength > 0.7, strength > 0.3], ['Strong', 'Moderate'], 'Weak')
+            st.dataframe(corr_df)
 
         except Exception as e:
             st.error(f"Error creating correlation heatmap: {str(e)}")
@@ -6559,15 +6934,10 @@ def create_pivot_heatmap(df):
         try:
             # Create pivot table
             if column_col == 'None':
-                pivot_data = df.groupby(index_col)[value_col].agg(agg_func).reset_index()
-                pivot_data = pivot_data.set_index(index_col).T
+                pivot_data = aggregate(df, [index_col], [value_col], [agg_func])[value_col][agg_func]
+                pivot_data = pivot_data.to_frame(value_col).T
             else:
-                pivot_data = df.pivot_table(
-                    index=index_col,
-                    columns=column_col,
-                    values=value_col,
-                    aggfunc=agg_func
-                )
+                pivot_data = pivot(df, [index_col], value_col, agg_func, [column_col])
 
             plt.figure(figsize=(12, 8))
             sns.heatmap(pivot_data,
@@ -6598,7 +6968,7 @@ def scatter_plot():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -6674,27 +7044,39 @@ def create_advanced_scatter(df):
             else:
                 size_data = point_size
 
-            # Create scatter plot
-            scatter = plt.scatter(
-                plot_data[x_col],
-                plot_data[y_col],
-                c=color_data if color_data is not None else 'blue',
-                s=size_data,
-                alpha=transparency,
-                cmap=color_scheme
-            )
+            if len(plot_data) > DENSITY_THRESHOLD:
+                # Too many markers to draw: bin the points, coloured by count or by the mean numeric colour
+                numeric_color = color_col != 'None' and pd.api.types.is_numeric_dtype(df[color_col])
+                mesh = draw_density(plt.gca(), df.loc[plot_data.index], x_col, y_col,
+                                    color_col if numeric_color else None, cmap=color_scheme)
+                cbar = plt.colorbar(mesh)
+                cbar.set_label(f"Mean {color_col}" if numeric_color else 'Points per cell')
+                note = density_note(len(plot_data))
+                if (color_col != 'None' and not numeric_color) or size_col != 'None':
+                    note += "; categorical colour and point size are not shown"
+                st.caption(note)
+            else:
+                # Create scatter plot
+                scatter = plt.scatter(
+                    plot_data[x_col],
+                    plot_data[y_col],
+                    c=color_data if color_data is not None else 'blue',
+                    s=size_data,
+                    alpha=transparency,
+                    cmap=color_scheme
+                )
 
-            # Add colorbar if color mapping is used
-            if color_col != 'None':
-                cbar = plt.colorbar(scatter)
-                cbar.set_label(color_col)
+                # Add colorbar if color mapping is used
+                if color_col != 'None':
+                    cbar = plt.colorbar(scatter)
+                    cbar.set_label(color_col)
 
             # Add trend line
             if add_trendline:
                 z = np.polyfit(plot_data[x_col], plot_data[y_col], 1)
                 p = np.poly1d(z)
-                plt.plot(plot_data[x_col].sort_values(), p(plot_data[x_col].sort_values()),
-                         "r--", alpha=0.8, linewidth=2, label='Trend Line')
+                x_ends = np.array([plot_data[x_col].min(), plot_data[x_col].max()])
+                plt.plot(x_ends, p(x_ends), "r--", alpha=0.8, linewidth=2, label='Trend Line')
                 plt.legend()
 
             plt.xlabel(x_col, fontsize=12)
@@ -6731,7 +7113,7 @@ def time_series_plot():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -6771,7 +7153,7 @@ def create_time_series_visualization(df):
 
     # Advanced options
     st.markdown("### ⚙️ Advanced Options")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         resample_freq = st.selectbox("Resample Frequency (optional):", [
             "None", "Daily (D)", "Weekly (W)", "Monthly (M)", "Quarterly (Q)", "Yearly (Y)"
@@ -6780,6 +7162,9 @@ def create_time_series_visualization(df):
         moving_avg = st.selectbox("Moving Average (optional):", [
             "None", "7 days", "30 days", "90 days"
         ])
+    with col3:
+        zoom = st.slider("Zoom (% of time range):", 0, 100, (0, 100),
+                         help="Long series are downsampled to the visible window, so zooming in shows more detail")
 
     if value_cols and st.button("Create Time Series Plot"):
         try:
@@ -6797,38 +7182,52 @@ def create_time_series_visualization(df):
                 }
                 ts_data = ts_data.resample(freq_map[resample_freq]).mean()
 
+            # Moving averages and the trend use every row; only the lines that are drawn are downsampled
+            lines = ts_data[value_cols].copy()
+            ma_cols, trend_col = [], None
+            if plot_type == "Line Plot":
+                if moving_avg != "None":
+                    window_map = {"7 days": 7, "30 days": 30, "90 days": 90}
+                    window = window_map[moving_avg]
+                    for col in value_cols:
+                        ma_cols.append(f"{col} ({moving_avg} MA)")
+                        lines[ma_cols[-1]] = ts_data[col].rolling(window=window).mean()
+
+                if show_trend and len(value_cols) == 1:
+                    x_numeric = (ts_data.index - ts_data.index[0]).days
+                    z = np.polyfit(x_numeric, ts_data[value_cols[0]], 1)
+                    trend_col = f"{value_cols[0]} (Trend)"
+                    lines[trend_col] = np.poly1d(z)(x_numeric)
+
+            viewport = tuple(zoom) if tuple(zoom) != (0, 100) else None
+            shown = reduce_lines(lines, viewport=viewport)
+            if len(shown) < len(lines):
+                st.caption(f"Drawing {len(shown):,} of {len(lines):,} points (LTTB downsampling per series)")
+
             # Create plot
             plt.figure(figsize=(14, 8))
 
             if plot_type == "Area Plot":
-                ts_data[value_cols].plot(kind='area', alpha=0.7, stacked=False)
+                shown[value_cols].plot(kind='area', alpha=0.7, stacked=False)
             elif plot_type == "Multiple Series":
                 for i, col in enumerate(value_cols):
                     plt.subplot(len(value_cols), 1, i + 1)
-                    plt.plot(ts_data.index, ts_data[col], linewidth=2)
+                    plt.plot(shown.index, shown[col], linewidth=2)
                     plt.title(f"{col} over Time")
                     plt.ylabel(col)
                     if i == len(value_cols) - 1:
                         plt.xlabel("Date")
             else:  # Line Plot
                 for col in value_cols:
-                    plt.plot(ts_data.index, ts_data[col], linewidth=2, label=col)
+                    plt.plot(shown.index, shown[col], linewidth=2, label=col)
 
                 # Add moving average if requested
-                if moving_avg != "None":
-                    window_map = {"7 days": 7, "30 days": 30, "90 days": 90}
-                    window = window_map[moving_avg]
-                    for col in value_cols:
-                        ma = ts_data[col].rolling(window=window).mean()
-                        plt.plot(ts_data.index, ma, '--', alpha=0.8,
-                                 label=f"{col} ({moving_avg} MA)")
+                for col in ma_cols:
+                    plt.plot(shown.index, shown[col], '--', alpha=0.8, label=col)
 
                 # Add trend line if requested
-                if show_trend and len(value_cols) == 1:
-                    x_numeric = (ts_data.index - ts_data.index[0]).days
-                    z = np.polyfit(x_numeric, ts_data[value_cols[0]], 1)
-                    p = np.poly1d(z)
-                    plt.plot(ts_data.index, p(x_numeric), 'r--', alpha=0.8,
+                if trend_col:
+                    plt.plot(shown.index, shown[trend_col], 'r--', alpha=0.8,
                              linewidth=2, label='Trend')
 
                 plt.legend()
@@ -6864,16 +7263,15 @@ def dashboard_builder():
     uploaded_file = FileHandler.upload_files(['csv', 'xlsx'], accept_multiple=False)
 
     if uploaded_file:
-        if uploaded_file[0].name.endswith('.csv'):
-            df = FileHandler.process_csv_file(uploaded_file[0])
-        else:
-            df = pd.read_excel(uploaded_file[0])
+        # Parsed once per file content; dashboard widgets rerun only the dashboard fragment
+        df = load_dataframe(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
             create_dashboard(df)
 
 
+@fragment
 def create_dashboard(df):
     """Create comprehensive dashboard"""
     numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -6958,9 +7356,9 @@ def create_overview_dashboard(df, numeric_cols, categorical_cols):
             if len(categorical_cols) > 0:
                 st.markdown("### 📝 Categorical Overview")
                 for col in categorical_cols[:3]:  # Show first 3 categorical columns
-                    value_counts = df[col].value_counts().head(10)
+                    top_values = value_counts(df, col, top=10)
                     st.write(f"**{col}** - Top 10 values:")
-                    st.bar_chart(value_counts)
+                    st.bar_chart(top_values)
 
         except Exception as e:
             st.error(f"Error creating overview dashboard: {str(e)}")
@@ -7190,9 +7588,9 @@ def create_custom_dashboard(df, numeric_cols, categorical_cols):
             if "Bar Chart" in chart_types and charts_created < max_charts and len(categorical_cols) > 0:
                 st.markdown("### 📊 Bar Charts")
                 for col in categorical_cols[:2]:
-                    value_counts = df[col].value_counts().head(10)
+                    top_values = value_counts(df, col, top=10)
                     st.write(f"**{col}**")
-                    st.bar_chart(value_counts)
+                    st.bar_chart(top_values)
                 charts_created += 1
 
         except Exception as e:
@@ -7206,10 +7604,8 @@ def data_aggregator():
     uploaded_file = FileHandler.upload_files(['csv', 'xlsx'], accept_multiple=False)
 
     if uploaded_file:
-        if uploaded_file[0].name.endswith('.csv'):
-            df = FileHandler.process_csv_file(uploaded_file[0])
-        else:
-            df = pd.read_excel(uploaded_file[0])
+        # Parsed once per file content; the shared frame keeps its aggregation cache entries across reruns
+        df = load_dataframe(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -7236,15 +7632,15 @@ def perform_data_aggregation(df):
         agg_cols = st.multiselect("Columns to aggregate:", numeric_cols, default=list(numeric_cols[:3]))
 
     with col2:
-        agg_functions = st.multiselect("Aggregation functions:", [
-            "sum", "mean", "count", "median", "min", "max", "std", "var"
-        ], default=["sum", "mean", "count"])
+        agg_functions = st.multiselect("Aggregation functions:", AGGREGATIONS, default=["sum", "mean", "count"])
 
     # Advanced options
     st.markdown("### ⚙️ Advanced Options")
     col1, col2 = st.columns(2)
     with col1:
         include_totals = st.checkbox("Include totals row", value=False)
+        include_subtotals = st.checkbox("Include subtotals", value=False,
+                                        help="One table per leading subset of the group-by columns")
         sort_by = st.selectbox("Sort results by:", ["None"] + agg_cols)
 
     with col2:
@@ -7254,22 +7650,18 @@ def perform_data_aggregation(df):
 
     if group_cols and agg_cols and agg_functions and st.button("Aggregate Data"):
         try:
-            # Perform aggregation
-            agg_dict = {col: agg_functions for col in agg_cols}
-            result = df.groupby(group_cols).agg(agg_dict)
-
-            # Flatten column names
-            result.columns = ['_'.join(col).strip() for col in result.columns.values]
-            result = result.reset_index()
+            # Per-group partials are cached per (dataset, group keys); totals and subtotals are rolled up from them
+            partials = group_partials(df, group_cols, agg_cols)
 
             # Filter small groups if requested
             if filter_groups:
-                group_sizes = df.groupby(group_cols).size()
-                valid_groups = group_sizes[group_sizes >= min_group_size].index
-                if isinstance(valid_groups, pd.MultiIndex):
-                    result = result[result.set_index(group_cols).index.isin(valid_groups)]
-                else:
-                    result = result[result[group_cols[0]].isin(valid_groups)]
+                partials = partials.select(partials.sizes >= min_group_size)
+
+            def flatten(table):
+                table.columns = ['_'.join(col).strip() for col in table.columns.values]
+                return table
+
+            result = flatten(partials.aggregate(agg_cols, agg_functions, df)).reset_index()
 
             # Sort results
             if sort_by != "None":
@@ -7281,11 +7673,17 @@ def perform_data_aggregation(df):
             st.markdown("### 📊 Aggregated Results")
             st.dataframe(result)
 
+            # Subtotals by each leading subset of the group-by columns
+            if include_subtotals and len(group_cols) > 1:
+                for depth in range(len(group_cols) - 1, 0, -1):
+                    subtotals = flatten(partials.rollup(group_cols[:depth]).aggregate(agg_cols, agg_functions, df))
+                    st.markdown(f"### 🧮 Subtotals by {', '.join(group_cols[:depth])}")
+                    st.dataframe(subtotals.reset_index())
+
             # Add totals row if requested
             if include_totals:
-                numeric_result_cols = result.select_dtypes(include=[np.number]).columns
-                totals = result[numeric_result_cols].sum()
-                totals_row = pd.DataFrame([totals], index=['TOTAL'])
+                totals_row = flatten(partials.rollup([]).aggregate(agg_cols, agg_functions, df))
+                totals_row.index = ['TOTAL']
                 st.markdown("### 🔢 Totals")
                 st.dataframe(totals_row)
 
@@ -7317,7 +7715,7 @@ def column_calculator():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -7472,9 +7870,10 @@ def create_custom_formula_column(df):
     with col1:
         new_col_name = st.text_input("New Column Name:", value="custom_column")
         formula = st.text_area(
-            "Python Formula (use column names):",
+            "Formula (use column names):",
             value="df['column_name'] * 2 + 1",
-            help="Example: df['price'] * df['quantity'], np.sqrt(df['value']), df['col1'] + df['col2']"
+            help="Example: df['price'] * df['quantity'], np.sqrt(df['value']), price - df['price'].mean(), "
+                 "where(df['qty'] > 0, df['total'] / df['qty'], 0)"
         )
 
     with col2:
@@ -7483,23 +7882,15 @@ def create_custom_formula_column(df):
             st.write(f"- {col}")
 
         st.markdown("**Available functions:**")
-        st.write("- np.sqrt, np.log, np.exp")
+        st.write("- np.sqrt, np.log, np.exp, log10, log1p")
         st.write("- np.sin, np.cos, np.tan")
-        st.write("- abs, round")
+        st.write("- abs, round, floor, ceil, clip, minimum, maximum, where")
+        st.write("- Column totals: df['col'].mean(), .sum(), .std(), .min(), .max(), .median()")
 
     if st.button("Create Custom Column"):
         try:
-            # Safety check - only allow certain operations
-            import numpy as np
-            allowed_functions = {
-                'np': np, 'sqrt': np.sqrt, 'log': np.log, 'exp': np.exp,
-                'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
-                'abs': abs, 'round': round, 'df': df
-            }
-
-            # Execute the formula
-            result = eval(formula, {"__builtins__": {}}, allowed_functions)
-            df[new_col_name] = result
+            # Parsed into a whitelisted expression tree and evaluated in row chunks; no Python eval
+            df[new_col_name] = evaluate_formula(df, formula)
 
             st.success(f"✅ Created column '{new_col_name}' with custom formula")
             st.dataframe(df[[new_col_name]].head())
@@ -7510,7 +7901,7 @@ def create_custom_formula_column(df):
 
         except Exception as e:
             st.error(f"Error creating custom column: {str(e)}")
-            st.warning("Make sure your formula uses valid Python syntax and references existing columns.")
+            st.warning("Use column references like df['name'] with arithmetic, comparisons and the functions listed.")
 
 
 def create_date_calculation_column(df):
@@ -7620,7 +8011,8 @@ def perform_data_merge(datasets):
         right_dataset = st.selectbox("Right Dataset:", [name for name in dataset_names if name != left_dataset])
 
     with col2:
-        merge_type = st.selectbox("Merge Type:", ["inner", "left", "right", "outer"])
+        merge_type = st.selectbox("Merge Type:", list(JOIN_TYPES),
+                                  help="semi keeps left rows with a matching key, anti keeps left rows without one")
 
     # Column selection for joining
     left_df = datasets[left_dataset]
@@ -7647,36 +8039,61 @@ def perform_data_merge(datasets):
 
     with col2:
         validate_merge = st.selectbox("Validate Merge:", ["one_to_one", "one_to_many", "many_to_one", "many_to_many"])
+        output_format = st.selectbox("Output Format:", list(JOIN_OUTPUT_FORMATS))
+        memory_budget_mb = st.number_input("Memory Budget (MB):", min_value=64, value=DEFAULT_MEMORY_BUDGET_MB,
+                                           step=64, help="Larger joins are partitioned to disk and run in parallel")
+
+    # Estimate the output size from key statistics before running anything
+    try:
+        estimate = estimate_join(left_df, right_df, left_key, right_key, merge_type)
+    except Exception as e:
+        st.error(f"Error analyzing join keys: {str(e)}")
+        return
+
+    st.markdown("### 📐 Join Size Estimate")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Estimated Rows", f"{estimate['rows']:,}")
+    with col2:
+        st.metric("Estimated Size", f"{estimate['bytes'] / 1024 ** 2:,.1f} MB")
+    with col3:
+        st.metric("Key Relationship", estimate['relationship'].replace('_', '-'))
+
+    if estimate['explodes']:
+        st.warning(f"⚠️ This join produces {estimate['expansion']:,.1f}× the rows of the larger input "
+                   f"(up to {estimate['max_left_duplicates']:,} × {estimate['max_right_duplicates']:,} "
+                   f"rows per key). Check that the join keys are correct.")
+    if estimate['bytes'] > memory_budget_mb * 1024 * 1024 and merge_type not in ('semi', 'anti'):
+        st.info("ℹ️ The result exceeds the memory budget: it will be joined partition by partition on disk "
+                "and streamed to the output file (row order will differ from an in-memory merge).")
 
     if st.button("Merge Datasets"):
         try:
-            # Prepare merge parameters
-            merge_params = {
-                'left': left_df,
-                'right': right_df,
-                'left_on': left_key,
-                'right_on': right_key,
-                'how': merge_type
-            }
+            right_input = right_df
+            suffixes = ("_x", "_y")
 
             # Handle duplicate columns
             if handle_duplicates == "suffix":
-                merge_params['suffixes'] = (left_suffix, right_suffix)
+                suffixes = (left_suffix, right_suffix)
             elif handle_duplicates == "drop_right":
                 # Find common columns (except join keys) and drop from right
                 common_cols = set(left_df.columns).intersection(set(right_df.columns))
                 common_cols.discard(left_key)
                 common_cols.discard(right_key)
                 if common_cols:
-                    right_df_filtered = right_df.drop(columns=list(common_cols))
-                    merge_params['right'] = right_df_filtered
+                    right_input = right_df.drop(columns=list(common_cols))
 
             # Perform merge
-            merged_df = pd.merge(**merge_params)
+            progress_bar = st.progress(0)
+            result, merged_df = hash_join(left_df, right_input, left_key, right_key, how=merge_type,
+                                          suffixes=suffixes, output_format=output_format,
+                                          memory_budget_mb=memory_budget_mb, estimate=estimate,
+                                          progress_callback=progress_bar.progress)
+            progress_bar.empty()
 
             # Display results
             st.markdown("### 📊 Merged Dataset")
-            st.dataframe(merged_df.head())
+            st.dataframe(merged_df.head() if merged_df is not None else result.preview)
 
             # Merge statistics
             col1, col2, col3, col4 = st.columns(4)
@@ -7685,26 +8102,29 @@ def perform_data_merge(datasets):
             with col2:
                 st.metric("Right Dataset Rows", len(right_df))
             with col3:
-                st.metric("Merged Rows", len(merged_df))
+                st.metric("Merged Rows", result.stats['rows'])
             with col4:
-                st.metric("Total Columns", len(merged_df.columns))
+                st.metric("Total Columns", len(result.preview.columns))
+
+            if result.stats['mode'] == 'partitioned':
+                st.caption(f"Joined out of core: {result.stats['partitions']} partitions on "
+                           f"{result.stats['workers']} workers in {result.stats['elapsed_seconds']:.1f}s")
 
             # Merge quality assessment
             st.markdown("### 📋 Merge Quality Assessment")
-            left_matches = merged_df[left_key].notna().sum()
+            left_matches = estimate['left_matched']
             total_left = len(left_df)
             match_rate = (left_matches / total_left) * 100 if total_left > 0 else 0
 
             st.info(f"Match Rate: {match_rate:.1f}% ({left_matches:,} out of {total_left:,} records from left dataset)")
 
             if merge_type in ['left', 'outer']:
-                null_right = merged_df[right_df.columns].isnull().all(axis=1).sum()
+                null_right = estimate['left_unmatched']
                 if null_right > 0:
                     st.warning(f"⚠️ {null_right:,} rows from left dataset have no match in right dataset")
 
             # Download option
-            csv_data = merged_df.to_csv(index=False)
-            FileHandler.create_download_link(csv_data.encode(), "merged_dataset.csv", "text/csv")
+            serve_download(result.output, result.filename, result.mime_type)
 
         except Exception as e:
             st.error(f"Error merging datasets: {str(e)}")
@@ -7720,7 +8140,7 @@ def data_splitter():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         else:
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
 
         if df is not None:
             st.dataframe(df.head())
@@ -8033,6 +8453,7 @@ def text_mining():
     ])
 
     text_data = None
+    documents = None
 
     if input_method == "Upload Text File":
         uploaded_file = FileHandler.upload_files(['txt', 'csv'], accept_multiple=False)
@@ -8051,7 +8472,8 @@ def text_mining():
                 text_cols = df.select_dtypes(include=['object']).columns
                 if len(text_cols) > 0:
                     selected_col = st.selectbox("Select text column:", text_cols)
-                    text_data = " ".join(df[selected_col].dropna().astype(str))
+                    documents = df[selected_col].dropna().astype(str).tolist()
+                    text_data = " ".join(documents)
 
     if text_data:
         st.markdown("### 📊 Text Analysis Results")
@@ -8076,8 +8498,6 @@ def text_mining():
             "Remove punctuation", "Convert to lowercase", "Remove extra whitespace", "Remove numbers"
         ], default=["Convert to lowercase", "Remove extra whitespace"])
 
-        processed_text = preprocess_text(text_data, cleaning_options)
-
         # Key phrase extraction
         st.markdown("### 🔍 Key Phrases & Entities")
 
@@ -8085,7 +8505,7 @@ def text_mining():
 
         with col1:
             # Extract key terms using TF-IDF
-            key_terms = extract_key_terms(processed_text)
+            key_terms = extract_key_terms(documents or [text_data], options=cleaning_options)
             st.markdown("**Top Key Terms:**")
             for term, score in key_terms[:10]:
                 st.write(f"• {term}: {score:.3f}")
@@ -8460,36 +8880,12 @@ def topic_modeling():
 
 # Helper functions for text analytics
 
-def preprocess_text(text, options):
-    """Preprocess text based on selected options"""
-    processed = text
-
-    if "Convert to lowercase" in options:
-        processed = processed.lower()
-
-    if "Remove punctuation" in options:
-        processed = processed.translate(str.maketrans('', '', string.punctuation))
-
-    if "Remove numbers" in options:
-        processed = re.sub(r'\d+', '', processed)
-
-    if "Remove extra whitespace" in options:
-        processed = re.sub(r'\s+', ' ', processed).strip()
-
-    return processed
-
-
-def extract_key_terms(text, max_features=20):
-    """Extract key terms using TF-IDF"""
+def extract_key_terms(documents, max_features=20, options=()):
+    """Extract key terms using TF-IDF over the preprocessed documents, tokenized in parallel chunks"""
+    if isinstance(documents, str):
+        documents = [documents]
     try:
-        vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform([text])
-
-        feature_names = vectorizer.get_feature_names_out()
-        scores = tfidf_matrix.toarray()[0]
-
-        terms_scores = list(zip(feature_names, scores))
-        return sorted(terms_scores, key=lambda x: x[1], reverse=True)
+        return corpus_key_terms(documents, options, top=max_features)
     except:
         return []
 
@@ -8767,88 +9163,13 @@ def show_ngram_contexts(text, top_ngrams):
 
 
 def perform_lda_topic_modeling(documents, num_topics, max_features, min_df, remove_stopwords, max_iter):
-    """Perform LDA topic modeling"""
-    # Prepare text data
-    if remove_stopwords:
-        stop_words = 'english'
-    else:
-        stop_words = None
-
-    # Vectorize the documents
-    vectorizer = CountVectorizer(max_features=max_features, min_df=min_df,
-                                 stop_words=stop_words, lowercase=True)
-    doc_term_matrix = vectorizer.fit_transform(documents)
-
-    # Run LDA
-    lda = LatentDirichletAllocation(n_components=num_topics, max_iter=max_iter,
-                                    random_state=42)
-    lda.fit(doc_term_matrix)
-
-    # Extract results
-    feature_names = vectorizer.get_feature_names_out()
-
-    # Get top words for each topic
-    topics = []
-    for topic_idx, topic in enumerate(lda.components_):
-        top_words_idx = topic.argsort()[-10:][::-1]
-        top_words = [feature_names[i] for i in top_words_idx]
-        topics.append({
-            'topic_id': topic_idx,
-            'top_words': top_words,
-            'word_weights': [topic[i] for i in top_words_idx]
-        })
-
-    # Get document-topic assignments
-    doc_topic_probs = lda.transform(doc_term_matrix)
-
-    return {
-        'topics': topics,
-        'doc_topic_probs': doc_topic_probs,
-        'documents': documents,
-        'algorithm': 'LDA'
-    }
+    """Perform LDA topic modeling with online (mini-batch) LDA over a cached hashed document-term matrix"""
+    return lda_topics(documents, num_topics, max_features, min_df, remove_stopwords, max_iter)
 
 
 def perform_kmeans_topic_modeling(documents, num_topics, max_features, min_df, remove_stopwords):
-    """Perform K-means clustering for topic modeling"""
-    # Prepare text data
-    if remove_stopwords:
-        stop_words = 'english'
-    else:
-        stop_words = None
-
-    # Vectorize using TF-IDF
-    vectorizer = TfidfVectorizer(max_features=max_features, min_df=min_df,
-                                 stop_words=stop_words, lowercase=True)
-    tfidf_matrix = vectorizer.fit_transform(documents)
-
-    # Perform K-means clustering
-    kmeans = KMeans(n_clusters=num_topics, random_state=42)
-    clusters = kmeans.fit_predict(tfidf_matrix)
-
-    # Extract top terms for each cluster
-    feature_names = vectorizer.get_feature_names_out()
-
-    topics = []
-    for i in range(num_topics):
-        # Get centroid for this cluster
-        centroid = kmeans.cluster_centers_[i]
-        # Get indices of top terms
-        top_indices = centroid.argsort()[-10:][::-1]
-        top_words = [feature_names[idx] for idx in top_indices]
-
-        topics.append({
-            'topic_id': i,
-            'top_words': top_words,
-            'word_weights': [centroid[idx] for idx in top_indices]
-        })
-
-    return {
-        'topics': topics,
-        'doc_assignments': clusters,
-        'documents': documents,
-        'algorithm': 'K-Means'
-    }
+    """Perform K-means clustering of TF-IDF document vectors for topic modeling"""
+    return kmeans_topics(documents, num_topics, max_features, min_df, remove_stopwords)
 
 
 def display_topic_modeling_results(results, num_topics):
@@ -8882,15 +9203,14 @@ def display_topic_modeling_results(results, num_topics):
         documents = results['documents']
 
         for topic_idx in range(num_topics):
-            topic_docs = []
-            for doc_idx, probs in enumerate(doc_topic_probs):
-                if probs[topic_idx] > 0.3:  # Threshold for topic assignment
-                    topic_docs.append((doc_idx, probs[topic_idx], documents[doc_idx][:200] + "..."))
+            probs = doc_topic_probs[:, topic_idx]
+            topic_docs = np.flatnonzero(probs > 0.3)  # Threshold for topic assignment
 
-            if topic_docs:
+            if len(topic_docs):
                 st.markdown(f"**Topic {topic_idx} Documents:**")
-                for doc_idx, prob, preview in sorted(topic_docs, key=lambda x: x[1], reverse=True)[:3]:
-                    st.write(f"Doc {doc_idx} (prob: {prob:.3f}): {preview}")
+                for doc_idx in topic_docs[np.argsort(-probs[topic_docs], kind='stable')[:3]]:
+                    preview = documents[doc_idx][:200] + "..."
+                    st.write(f"Doc {doc_idx} (prob: {probs[doc_idx]:.3f}): {preview}")
 
     elif 'doc_assignments' in results:
         st.markdown("### 📄 Document Cluster Assignments")
@@ -8899,9 +9219,9 @@ def display_topic_modeling_results(results, num_topics):
         documents = results['documents']
 
         for topic_idx in range(num_topics):
-            topic_docs = [i for i, cluster in enumerate(assignments) if cluster == topic_idx]
+            topic_docs = np.flatnonzero(np.asarray(assignments) == topic_idx)
 
-            if topic_docs:
+            if len(topic_docs):
                 st.markdown(f"**Topic {topic_idx} ({len(topic_docs)} documents):**")
                 for doc_idx in topic_docs[:3]:  # Show first 3 documents
                     preview = documents[doc_idx][:200] + "..."
@@ -8919,7 +9239,7 @@ def seasonality_analysis():
             if uploaded_file[0].name.endswith('.csv'):
                 df = FileHandler.process_csv_file(uploaded_file[0])
             else:
-                df = pd.read_excel(uploaded_file[0])
+                df = FileHandler.process_excel_file(uploaded_file[0])
 
             if df is not None:
                 st.dataframe(df.head())
@@ -9033,6 +9353,7 @@ def perform_seasonality_analysis(df, date_col, value_col, seasonal_period, decom
         if seasonal_period is None:
             seasonal_period = detect_seasonal_period(values, dates)
             st.info(f"🔍 Auto-detected seasonal period: {seasonal_period}")
+            show_candidate_periods(values)
 
         # Original time series plot
         st.markdown("### 📈 Original Time Series")
@@ -9063,7 +9384,7 @@ def perform_seasonality_analysis(df, date_col, value_col, seasonal_period, decom
         # Seasonal strength metrics
         if show_strength:
             st.markdown("### 💪 Seasonal Strength Metrics")
-            calculate_seasonal_strength(values, trend, seasonal, residual, decomp_model)
+            calculate_seasonal_strength(values, trend, seasonal, residual, decomp_model, seasonal_period)
 
         # Generate downloadable results
         st.markdown("### 📥 Download Results")
@@ -9078,45 +9399,26 @@ def perform_seasonality_analysis(df, date_col, value_col, seasonal_period, decom
 
 
 def detect_seasonal_period(values, dates):
-    """Auto-detect seasonal period using autocorrelation"""
+    """Auto-detect seasonal period from the periodogram, confirmed by the autocorrelation"""
     try:
-        from scipy import signal
-        from scipy.stats import pearsonr
-
-        # Calculate autocorrelation for different lags
-        max_lag = min(len(values) // 3, 100)  # Reasonable maximum lag
-        autocorr_values = []
-
-        for lag in range(1, max_lag):
-            if lag < len(values):
-                corr, _ = pearsonr(values[:-lag], values[lag:])
-                autocorr_values.append(abs(corr))
-            else:
-                autocorr_values.append(0)
-
-        if not autocorr_values:
-            return 12  # Default fallback
-
-        # Find peaks in autocorrelation
-        peaks, _ = signal.find_peaks(autocorr_values, height=0.1)
-
-        if len(peaks) > 0:
-            # Return the first significant peak + 1 (accounting for 0-indexing)
-            return int(peaks[0] + 1)
-
-        # Fallback: check common periods based on data frequency
-        time_diff = (dates.max() - dates.min()).days / len(dates)
-        if time_diff <= 1:  # Daily data
-            return 7  # Weekly seasonality
-        elif time_diff <= 7:  # Weekly data
-            return 4  # Monthly seasonality (4 weeks)
-        else:  # Monthly or longer
-            return 12  # Yearly seasonality
-
+        return detect_period(values, dates)
     except Exception:
         return 12  # Safe fallback
 
 
+def show_candidate_periods(values, seasonal_period=None):
+    """Show the strongest periodogram peaks as candidate seasonal periods"""
+    candidates = spectral_profile(values).candidates
+    if candidates.empty:
+        return
+    st.markdown("#### 🎯 Candidate Periods")
+    st.dataframe(candidates.style.format({'Power Share': '{:.1%}', 'Autocorrelation': '{:.3f}'}),
+                 use_container_width=True)
+    if seasonal_period is not None and seasonal_period not in set(candidates['Period']):
+        st.info(f"💡 Period {seasonal_period} is not among the dominant periods in the data; "
+                f"consider {int(candidates['Period'].iloc[0])}.")
+
+
 def plot_original_series(dates, values, value_col):
     """Plot the original time series"""
     fig, ax = plt.subplots(figsize=(12, 6))
@@ -9132,20 +9434,12 @@ def plot_original_series(dates, values, value_col):
 
 
 def plot_autocorrelation(values, seasonal_period):
-    """Plot autocorrelation function"""
+    """Plot autocorrelation function and periodogram"""
     try:
-        from scipy.stats import pearsonr
-
+        profile = spectral_profile(values)
         max_lag = min(len(values) // 2, seasonal_period * 3)
-        lags = list(range(1, max_lag + 1))
-        autocorr_values = []
-
-        for lag in lags:
-            if lag < len(values):
-                corr, _ = pearsonr(values[:-lag], values[lag:])
-                autocorr_values.append(corr)
-            else:
-                autocorr_values.append(0)
+        lags = np.arange(1, max_lag + 1)
+        autocorr_values = profile.acf[1:max_lag + 1]
 
         fig, ax = plt.subplots(figsize=(12, 6))
         ax.plot(lags, autocorr_values, 'b-', linewidth=1.5)
@@ -9167,8 +9461,25 @@ def plot_autocorrelation(values, seasonal_period):
         st.pyplot(fig)
         plt.close()
 
+        # Periodogram against period, so peaks read directly as cycle lengths
+        periods = 1 / profile.frequencies
+        shown = periods <= profile.max_period
+        fig, ax = plt.subplots(figsize=(12, 4))
+        ax.plot(periods[shown], profile.power[shown], color='#2E86AB', linewidth=1)
+        ax.axvline(x=seasonal_period, color='orange', linestyle=':', linewidth=2,
+                   label=f'Seasonal period ({seasonal_period})')
+        ax.set_xscale('log')
+        ax.set_xlabel('Period (observations)')
+        ax.set_ylabel('Power')
+        ax.set_title('Periodogram')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close()
+
         # Show interpretation
-        max_autocorr = max(autocorr_values) if autocorr_values else 0
+        max_autocorr = float(np.max(autocorr_values)) if len(autocorr_values) else 0
         if max_autocorr > 0.3:
             st.success(f"🔍 Strong seasonal pattern detected (max autocorr: {max_autocorr:.3f})")
         elif max_autocorr > 0.15:
@@ -9191,7 +9502,7 @@ def perform_classical_decomposition(values, period, model='additive'):
         else:  # Odd period
             trend = pd.Series(values).rolling(window=period, center=True).mean()
 
-        trend = trend.fillna(method='bfill').fillna(method='ffill')
+        trend = trend.bfill().ffill()
 
         # Calculate seasonal component
         if model == 'additive':
@@ -9201,20 +9512,12 @@ def perform_classical_decomposition(values, period, model='additive'):
             detrended = detrended.fillna(1)  # Handle division by zero
 
         # Extract seasonal pattern
-        seasonal_pattern = []
-        for i in range(period):
-            season_values = [detrended[j] for j in range(i, len(detrended), period)]
-            if model == 'additive':
-                seasonal_pattern.append(np.mean(season_values))
-            else:
-                seasonal_pattern.append(np.mean(season_values))
+        seasonal_pattern = seasonal_means(detrended, period)
 
         # Normalize seasonal pattern
         if model == 'additive':
-            seasonal_pattern = np.array(seasonal_pattern)
             seasonal_pattern = seasonal_pattern - np.mean(seasonal_pattern)
         else:
-            seasonal_pattern = np.array(seasonal_pattern)
             seasonal_pattern = seasonal_pattern / np.mean(seasonal_pattern)
 
         # Create full seasonal series
@@ -9232,8 +9535,7 @@ def perform_classical_decomposition(values, period, model='additive'):
     except Exception as e:
         st.error(f"Error in decomposition: {str(e)}")
         # Return simple fallbacks
-        trend = pd.Series(values).rolling(window=min(period, len(values) // 2), center=True).mean().fillna(
-            method='bfill').fillna(method='ffill')
+        trend = pd.Series(values).rolling(window=min(period, len(values) // 2), center=True).mean().bfill().ffill()
         seasonal = np.zeros_like(values)
         residual = values - trend
         return trend.values, seasonal, residual
@@ -9415,7 +9717,7 @@ def plot_seasonal_subseries(dates, values, period):
         st.error(f"Error in subseries plot: {str(e)}")
 
 
-def calculate_seasonal_strength(values, trend, seasonal, residual, model):
+def calculate_seasonal_strength(values, trend, seasonal, residual, model, period=None):
     """Calculate and display seasonal strength metrics"""
     try:
         # Calculate seasonal strength
@@ -9493,7 +9795,7 @@ def calculate_seasonal_strength(values, trend, seasonal, residual, model):
         noise_var = np.var(residual)
         snr = signal_var / noise_var if noise_var > 0 else float('inf')
 
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             st.metric(
                 "Signal-to-Noise Ratio",
@@ -9511,6 +9813,15 @@ def calculate_seasonal_strength(values, trend, seasonal, residual, model):
                     help="How regular/consistent the seasonal pattern is (0-1)"
                 )
 
+        with col3:
+            profile = spectral_profile(values)
+            if period is not None and period <= profile.max_period:
+                st.metric(
+                    "Seasonal Autocorrelation",
+                    f"{profile.acf[period]:.3f}",
+                    help="Autocorrelation of the series at the seasonal lag"
+                )
+
     except Exception as e:
         st.error(f"Error in seasonal strength calculation: {str(e)}")
 
@@ -9580,7 +9891,7 @@ def quality_assessment():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith('.json'):
             json_data = FileHandler.process_text_file(uploaded_file[0])
             try:
@@ -9608,8 +9919,9 @@ def quality_assessment():
                 memory_usage = df.memory_usage(deep=True).sum() / 1024 ** 2
                 st.metric("Memory Usage", f"{memory_usage:.2f} MB")
 
-            # Calculate comprehensive quality scores
-            quality_scores = calculate_comprehensive_quality_scores(df)
+            # Calculate comprehensive quality scores from one quality report shared by every section below
+            quality = get_quality_report(df)
+            quality_scores = calculate_comprehensive_quality_scores(df, quality)
 
             # Display overall quality score
             st.markdown("### 🎯 Overall Quality Score")
@@ -9665,12 +9977,12 @@ def quality_assessment():
 
             # Column-level quality assessment
             st.markdown("### 🔍 Column-Level Quality Assessment")
-            column_quality = assess_column_quality(df)
+            column_quality = assess_column_quality(df, quality)
             st.dataframe(column_quality, use_container_width=True)
 
             # Quality issues identification
             st.markdown("### ⚠️ Quality Issues Identified")
-            quality_issues = identify_quality_issues(df)
+            quality_issues = identify_quality_issues(df, quality)
 
             if quality_issues:
                 for issue in quality_issues:
@@ -9712,7 +10024,7 @@ def completeness_check():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith('.json'):
             json_data = FileHandler.process_text_file(uploaded_file[0])
             try:
@@ -9727,8 +10039,9 @@ def completeness_check():
             st.markdown("### 📊 Completeness Overview")
 
             # Overall completeness metrics
-            total_cells = df.shape[0] * df.shape[1]
-            missing_cells = df.isnull().sum().sum()
+            quality = get_quality_report(df)
+            total_cells = quality.total_cells
+            missing_cells = quality.missing_cells
             completeness_rate = (total_cells - missing_cells) / total_cells
 
             col1, col2, col3, col4 = st.columns(4)
@@ -9740,13 +10053,13 @@ def completeness_check():
             with col3:
                 st.metric("Completeness Rate", f"{completeness_rate:.1%}")
             with col4:
-                missing_rows = df.isnull().any(axis=1).sum()
+                missing_rows = quality.rows_with_missing
                 st.metric("Rows with Missing Data", f"{missing_rows:,}")
 
             # Completeness visualization
             st.markdown("### 📈 Missing Data Pattern")
 
-            missing_data = df.isnull().sum().sort_values(ascending=False)
+            missing_data = quality.null_counts.sort_values(ascending=False)
             missing_percent = (missing_data / len(df) * 100).round(2)
 
             # Create completeness chart
@@ -9794,7 +10107,7 @@ def completeness_check():
 
             if missing_cells > 0:
                 # Pattern analysis
-                missing_patterns = analyze_missing_patterns(df)
+                missing_patterns = analyze_missing_patterns(df, quality)
 
                 if missing_patterns:
                     st.markdown("**Common Missing Data Patterns:**")
@@ -9831,7 +10144,7 @@ def completeness_check():
 
             # Export completeness report
             if st.button("📄 Generate Completeness Report"):
-                report = create_completeness_report(df, completeness_df, missing_patterns, recommendations)
+                report = create_completeness_report(df, completeness_df, missing_patterns, recommendations, quality)
                 st.download_button(
                     label="Download Completeness Report",
                     data=report,
@@ -9851,7 +10164,7 @@ def consistency_validator():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith('.json'):
             json_data = FileHandler.process_text_file(uploaded_file[0])
             try:
@@ -9865,10 +10178,11 @@ def consistency_validator():
         if df is not None and not df.empty:
             st.markdown("### 📊 Consistency Analysis Overview")
 
-            # Basic consistency metrics
+            # Basic consistency metrics, from one quality report shared by every section below
             col1, col2, col3, col4 = st.columns(4)
 
-            consistency_issues = detect_consistency_issues(df)
+            quality = get_quality_report(df)
+            consistency_issues = detect_consistency_issues(df, quality)
             total_issues = sum(len(issues) for issues in consistency_issues.values())
 
             with col1:
@@ -9886,13 +10200,13 @@ def consistency_validator():
             # Data type consistency
             st.markdown("### 🔍 Data Type Consistency")
 
-            dtype_analysis = analyze_data_type_consistency(df)
+            dtype_analysis = analyze_data_type_consistency(df, quality)
             st.dataframe(dtype_analysis, use_container_width=True)
 
             # Format consistency checks
             st.markdown("### 📝 Format Consistency Analysis")
 
-            format_issues = check_format_consistency(df)
+            format_issues = check_format_consistency(df, quality)
 
             if format_issues:
                 for column, issues in format_issues.items():
@@ -9911,7 +10225,7 @@ def consistency_validator():
             # Value consistency checks
             st.markdown("### 🔢 Value Consistency Analysis")
 
-            value_consistency = check_value_consistency(df)
+            value_consistency = check_value_consistency(df, quality)
 
             for check_type, results in value_consistency.items():
                 if results:
@@ -9922,7 +10236,7 @@ def consistency_validator():
             # Cross-column consistency
             st.markdown("### 🔄 Cross-Column Consistency")
 
-            cross_column_issues = check_cross_column_consistency(df)
+            cross_column_issues = check_cross_column_consistency(df, quality)
 
             if cross_column_issues:
                 for issue in cross_column_issues:
@@ -9967,7 +10281,7 @@ def accuracy_measure():
         if uploaded_file[0].name.endswith('.csv'):
             df = FileHandler.process_csv_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file[0])
+            df = FileHandler.process_excel_file(uploaded_file[0])
         elif uploaded_file[0].name.endswith('.json'):
             json_data = FileHandler.process_text_file(uploaded_file[0])
             try:
@@ -9981,8 +10295,9 @@ def accuracy_measure():
         if df is not None and not df.empty:
             st.markdown("### 📊 Accuracy Assessment Overview")
 
-            # Calculate accuracy metrics
-            accuracy_results = calculate_accuracy_metrics(df)
+            # Calculate accuracy metrics from one quality report shared by every section below
+            quality = get_quality_report(df)
+            accuracy_results = calculate_accuracy_metrics(df, quality)
 
             col1, col2, col3, col4 = st.columns(4)
 
@@ -10021,13 +10336,13 @@ def accuracy_measure():
             # Column-level accuracy analysis
             st.markdown("### 🔍 Column-Level Accuracy Analysis")
 
-            column_accuracy = assess_column_accuracy(df)
+            column_accuracy = assess_column_accuracy(df, quality)
             st.dataframe(column_accuracy, use_container_width=True)
 
             # Data validation rules
             st.markdown("### ✅ Data Validation Rules")
 
-            validation_results = apply_validation_rules(df)
+            validation_results = apply_validation_rules(df, quality)
 
             if validation_results:
                 for rule_type, results in validation_results.items():
@@ -10044,7 +10359,7 @@ def accuracy_measure():
             # Outlier detection for accuracy
             st.markdown("### 🔍 Outlier Detection (Accuracy Impact)")
 
-            outlier_analysis = detect_accuracy_outliers(df)
+            outlier_analysis = detect_accuracy_outliers(df, quality)
 
             if outlier_analysis['outliers_found']:
                 st.warning(f"Found {outlier_analysis['total_outliers']} potential outliers that may affect accuracy")
@@ -10059,7 +10374,7 @@ def accuracy_measure():
             # Pattern accuracy analysis
             st.markdown("### 📊 Pattern Accuracy Analysis")
 
-            pattern_accuracy = analyze_pattern_accuracy(df)
+            pattern_accuracy = analyze_pattern_accuracy(df, quality)
 
             for pattern_type, analysis in pattern_accuracy.items():
                 if analysis['issues']:
@@ -10092,49 +10407,48 @@ def accuracy_measure():
 
 # Helper functions for data quality assessments
 
-def calculate_comprehensive_quality_scores(df):
+def calculate_comprehensive_quality_scores(df, report):
     """Calculate comprehensive quality scores"""
     scores = {}
 
     # Completeness score
-    total_cells = df.shape[0] * df.shape[1]
-    missing_cells = df.isnull().sum().sum()
+    total_cells = report.total_cells
+    missing_cells = report.missing_cells
     scores['completeness'] = (total_cells - missing_cells) / total_cells
 
     # Consistency score (based on data types and format consistency)
     consistency_issues = 0
     for col in df.columns:
-        if df[col].dtype == 'object':
+        column = report.columns[col]
+        if column.is_object and column.count > 0:
             # Check for mixed types in string columns
-            non_null_values = df[col].dropna()
-            if len(non_null_values) > 0:
-                string_count = sum(isinstance(x, str) for x in non_null_values)
-                consistency_issues += abs(string_count - len(non_null_values))
+            consistency_issues += abs(column.string_count - column.count)
 
     scores['consistency'] = max(0, 1 - (consistency_issues / total_cells))
 
     # Validity score (based on data type appropriateness)
     valid_cells = 0
     for col in df.columns:
-        col_data = df[col].dropna()
-        if len(col_data) > 0:
-            if pd.api.types.is_numeric_dtype(col_data):
+        column = report.columns[col]
+        if column.count > 0:
+            if column.is_numeric:
                 # Check for reasonable numeric ranges
-                if col_data.min() >= 0 and col_data.max() < 1e10:
-                    valid_cells += len(col_data)
+                if column.min >= 0 and column.max < 1e10:
+                    valid_cells += column.count
                 else:
-                    valid_cells += len(col_data) * 0.8  # Penalize extreme values
+                    valid_cells += column.count * 0.8  # Penalize extreme values
             else:
                 # For non-numeric, assume valid if not empty
-                valid_cells += len(col_data)
+                valid_cells += column.count
 
     scores['validity'] = valid_cells / (total_cells - missing_cells) if total_cells > missing_cells else 0
 
     # Uniqueness score (penalize excessive duplicates)
     duplicate_penalty = 0
     for col in df.columns:
-        if df[col].dtype in ['object', 'string']:
-            unique_ratio = df[col].nunique() / len(df[col].dropna())
+        column = report.columns[col]
+        if df[col].dtype in ['object', 'string'] and column.count > 0:
+            unique_ratio = column.nunique / column.count
             if unique_ratio < 0.1:  # Very low uniqueness might indicate data quality issues
                 duplicate_penalty += (0.1 - unique_ratio)
 
@@ -10143,38 +10457,34 @@ def calculate_comprehensive_quality_scores(df):
     return scores
 
 
-def assess_column_quality(df):
+def assess_column_quality(df, report):
     """Assess quality metrics for each column"""
     quality_data = []
 
     for col in df.columns:
-        col_data = df[col]
+        column = report.columns[col]
 
         # Basic metrics
-        total_count = len(col_data)
-        null_count = col_data.isnull().sum()
-        completeness = (total_count - null_count) / total_count
+        total_count = column.total
+        completeness = column.count / total_count
 
         # Uniqueness
-        unique_count = col_data.nunique()
-        uniqueness = unique_count / total_count
+        uniqueness = column.nunique / total_count
 
         # Consistency (basic check)
         consistency = 1.0  # Default
-        if col_data.dtype == 'object':
+        if column.is_object and column.count > 0:
             # Check for mixed content types
-            non_null = col_data.dropna()
-            if len(non_null) > 0:
-                numeric_like = sum(str(x).replace('.', '').isdigit() for x in non_null)
-                if 0 < numeric_like < len(non_null):
-                    consistency = 0.7  # Mixed numeric/text content
+            numeric_like = int(column.digit_like.sum())
+            if 0 < numeric_like < column.count:
+                consistency = 0.7  # Mixed numeric/text content
 
         # Overall column quality score
         column_quality = (completeness + consistency + min(uniqueness * 2, 1)) / 3
 
         quality_data.append({
             'Column': col,
-            'Data Type': str(col_data.dtype),
+            'Data Type': str(column.dtype),
             'Completeness': f"{completeness:.1%}",
             'Uniqueness': f"{uniqueness:.1%}",
             'Consistency': f"{consistency:.1%}",
@@ -10185,12 +10495,12 @@ def assess_column_quality(df):
     return pd.DataFrame(quality_data)
 
 
-def identify_quality_issues(df):
+def identify_quality_issues(df, report):
     """Identify specific quality issues in the dataset"""
     issues = []
 
     # Check for excessive missing data
-    missing_pct = (df.isnull().sum() / len(df)) * 100
+    missing_pct = (report.null_counts / len(df)) * 100
     for col in missing_pct.index:
         if missing_pct[col] > 50:
             issues.append({
@@ -10206,7 +10516,7 @@ def identify_quality_issues(df):
             })
 
     # Check for duplicate rows
-    duplicates = df.duplicated().sum()
+    duplicates = report.duplicate_rows
     if duplicates > 0:
         dup_pct = (duplicates / len(df)) * 100
         severity = 'high' if dup_pct > 10 else 'medium' if dup_pct > 5 else 'low'
@@ -10218,10 +10528,10 @@ def identify_quality_issues(df):
 
     # Check for mixed data types in object columns
     for col in df.select_dtypes(include=['object']).columns:
-        non_null = df[col].dropna()
-        if len(non_null) > 0:
-            numeric_like = sum(str(x).replace('.', '').replace('-', '').isdigit() for x in non_null)
-            if 0 < numeric_like < len(non_null):
+        column = report.columns[col]
+        if column.count > 0:
+            numeric_like = int(column.signed_digit_like.sum())
+            if 0 < numeric_like < column.count:
                 issues.append({
                     'type': 'Mixed Data Types',
                     'description': f"Column '{col}' contains mixed numeric and text data",
@@ -10292,29 +10602,29 @@ QUALITY ISSUES IDENTIFIED:
     return report
 
 
-def analyze_missing_patterns(df):
+def analyze_missing_patterns(df, report):
     """Analyze patterns in missing data"""
     patterns = []
 
-    missing_by_row = df.isnull().sum(axis=1)
+    missing_by_row = report.missing_by_row
 
     # Check for rows with all missing data
-    completely_missing = (missing_by_row == len(df.columns)).sum()
+    completely_missing = int((missing_by_row == len(df.columns)).sum())
     if completely_missing > 0:
         patterns.append(f"{completely_missing} rows have all values missing")
 
     # Check for rows with most data missing
-    mostly_missing = (missing_by_row > len(df.columns) * 0.8).sum()
+    mostly_missing = int((missing_by_row > len(df.columns) * 0.8).sum())
     if mostly_missing > 0:
         patterns.append(f"{mostly_missing} rows have >80% of values missing")
 
-    # Check for columns that are always missing together
-    missing_matrix = df.isnull()
+    # Check for columns that are always missing together (one matrix product for all pairs)
+    co_missing = report.co_missing.to_numpy()
     for i, col1 in enumerate(df.columns):
-        for col2 in df.columns[i + 1:]:
-            both_missing = (missing_matrix[col1] & missing_matrix[col2]).sum()
+        for j in range(i + 1, len(df.columns)):
+            both_missing = int(co_missing[i, j])
             if both_missing > len(df) * 0.1:  # More than 10% missing together
-                patterns.append(f"Columns '{col1}' and '{col2}' often missing together ({both_missing} cases)")
+                patterns.append(f"Columns '{col1}' and '{df.columns[j]}' often missing together ({both_missing} cases)")
 
     return patterns
 
@@ -10343,10 +10653,10 @@ def generate_completeness_recommendations(df, missing_data, missing_percent):
     return recommendations
 
 
-def create_completeness_report(df, completeness_df, missing_patterns, recommendations):
+def create_completeness_report(df, completeness_df, missing_patterns, recommendations, quality):
     """Create a completeness assessment report"""
-    total_cells = df.shape[0] * df.shape[1]
-    missing_cells = df.isnull().sum().sum()
+    total_cells = quality.total_cells
+    missing_cells = quality.missing_cells
     completeness_rate = (total_cells - missing_cells) / total_cells
 
     report = f"""COMPLETENESS ASSESSMENT REPORT
@@ -10378,31 +10688,26 @@ MISSING DATA PATTERNS:
     return report
 
 
-def detect_consistency_issues(df):
+def detect_consistency_issues(df, report):
     """Detect various consistency issues in the dataset"""
     issues = {}
 
     for col in df.columns:
         col_issues = []
-        col_data = df[col].dropna()
+        column = report.columns[col]
 
-        if len(col_data) == 0:
+        if column.count == 0:
             continue
 
         # Check for mixed data types in object columns
-        if df[col].dtype == 'object':
-            # Check for numeric values in string columns
-            numeric_values = 0
-            string_values = 0
-
-            for value in col_data:
-                if isinstance(value, (int, float)):
-                    numeric_values += 1
-                elif isinstance(value, str):
-                    if value.replace('.', '').replace('-', '').isdigit():
-                        numeric_values += 1
-                    else:
-                        string_values += 1
+        if column.is_object:
+            # Non-string values count as numeric when they parse; strings when digit-like
+            is_str = column.is_str
+            numeric_values = int((is_str & column.signed_digit_like).sum())
+            string_values = int((is_str & ~column.signed_digit_like).sum())
+            if not is_str.all():
+                non_str = column.non_null[~is_str]
+                numeric_values += int(non_str.map(lambda v: isinstance(v, (int, float))).sum())
 
             if numeric_values > 0 and string_values > 0:
                 col_issues.append(f"Mixed numeric and text data detected")
@@ -10412,27 +10717,26 @@ def detect_consistency_issues(df):
     return issues
 
 
-def analyze_data_type_consistency(df):
+def analyze_data_type_consistency(df, report):
     """Analyze data type consistency across the dataset"""
     dtype_data = []
 
     for col in df.columns:
-        col_data = df[col]
+        column = report.columns[col]
 
         # Basic type info
         dtype_info = {
             'Column': col,
-            'Declared Type': str(col_data.dtype),
-            'Non-Null Count': col_data.count(),
-            'Null Count': col_data.isnull().sum(),
+            'Declared Type': str(column.dtype),
+            'Non-Null Count': column.count,
+            'Null Count': column.null_count,
         }
 
         # Infer actual content type for object columns
-        if col_data.dtype == 'object':
-            non_null = col_data.dropna()
-            if len(non_null) > 0:
-                numeric_like = sum(str(x).replace('.', '').replace('-', '').isdigit() for x in non_null.head(100))
-                if numeric_like > len(non_null) * 0.8:
+        if column.is_object:
+            if column.count > 0:
+                numeric_like = int(column.signed_digit_like[:100].sum())
+                if numeric_like > column.count * 0.8:
                     dtype_info['Inferred Type'] = 'Numeric (stored as text)'
                     dtype_info['Consistency Issue'] = 'Yes'
                 else:
@@ -10442,7 +10746,7 @@ def analyze_data_type_consistency(df):
                 dtype_info['Inferred Type'] = 'Unknown'
                 dtype_info['Consistency Issue'] = 'Unknown'
         else:
-            dtype_info['Inferred Type'] = str(col_data.dtype)
+            dtype_info['Inferred Type'] = str(column.dtype)
             dtype_info['Consistency Issue'] = 'No'
 
         dtype_data.append(dtype_info)
@@ -10450,63 +10754,47 @@ def analyze_data_type_consistency(df):
     return pd.DataFrame(dtype_data)
 
 
-def check_format_consistency(df):
+def check_format_consistency(df, report):
     """Check for format consistency issues within columns"""
     format_issues = {}
 
     for col in df.select_dtypes(include=['object']).columns:
         col_issues = []
-        col_data = df[col].dropna().astype(str)
+        column = report.columns[col]
 
-        if len(col_data) == 0:
+        if column.count == 0:
             continue
 
-        # Check for common format inconsistencies
-
-        # Date-like patterns
-        date_patterns = col_data.str.contains(r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4}', regex=True)
-        if date_patterns.any() and not date_patterns.all():
-            col_issues.append({
-                'description': f"Inconsistent date formats detected",
-                'severity': 'medium'
-            })
-
-        # Email patterns
-        email_patterns = col_data.str.contains(r'[^@]+@[^@]+\.[^@]+', regex=True)
-        if email_patterns.any() and not email_patterns.all():
-            col_issues.append({
-                'description': f"Mixed email and non-email values",
-                'severity': 'medium'
-            })
-
-        # Phone number patterns
-        phone_patterns = col_data.str.contains(r'\(\d{3}\)\s*\d{3}-\d{4}|\d{3}-\d{3}-\d{4}|\d{10}', regex=True)
-        if phone_patterns.any() and not phone_patterns.all():
-            col_issues.append({
-                'description': f"Inconsistent phone number formats",
-                'severity': 'medium'
-            })
+        # Check for common format inconsistencies (a pattern that matches some but not all values)
+        checks = [
+            (DATE_LIKE_PATTERN, "Inconsistent date formats detected"),
+            (EMAIL_PATTERN, "Mixed email and non-email values"),
+            (PHONE_PATTERN, "Inconsistent phone number formats"),
+        ]
+        for pattern, description in checks:
+            matches = column.pattern_count(pattern)
+            if 0 < matches < column.count:
+                col_issues.append({
+                    'description': description,
+                    'severity': 'medium'
+                })
 
         format_issues[col] = col_issues
 
     return format_issues
 
 
-def check_value_consistency(df):
+def check_value_consistency(df, report):
     """Check for value consistency issues"""
     consistency_results = {}
 
     # Check numeric ranges
     numeric_issues = []
     for col in df.select_dtypes(include=[np.number]).columns:
-        col_data = df[col].dropna()
-        if len(col_data) > 0:
+        column = report.columns[col]
+        if column.count > 0:
             # Check for extreme outliers
-            q1 = col_data.quantile(0.25)
-            q3 = col_data.quantile(0.75)
-            iqr = q3 - q1
-
-            extreme_outliers = ((col_data < q1 - 3 * iqr) | (col_data > q3 + 3 * iqr)).sum()
+            extreme_outliers = column.iqr_outliers(3)
             if extreme_outliers > 0:
                 numeric_issues.append(f"Column '{col}' has {extreme_outliers} extreme outliers")
 
@@ -10515,29 +10803,23 @@ def check_value_consistency(df):
     # Check categorical consistency
     categorical_issues = []
     for col in df.select_dtypes(include=['object']).columns:
-        col_data = df[col].dropna()
-        if len(col_data) > 0:
-            # Check for similar values that might be duplicates
-            unique_values = col_data.unique()
-            if len(unique_values) > 1:
-                for i, val1 in enumerate(unique_values):
-                    for val2 in unique_values[i + 1:]:
-                        if isinstance(val1, str) and isinstance(val2, str):
-                            if val1.lower().strip() == val2.lower().strip() and val1 != val2:
-                                categorical_issues.append(f"Column '{col}' has similar values: '{val1}' and '{val2}'")
+        column = report.columns[col]
+        if column.count > 0:
+            # Values that only differ by case or surrounding whitespace
+            for val1, val2 in column.similar_value_pairs:
+                categorical_issues.append(f"Column '{col}' has similar values: '{val1}' and '{val2}'")
 
     consistency_results['Categorical Consistency Issues'] = categorical_issues
 
     return consistency_results
 
 
-def check_cross_column_consistency(df):
+def check_cross_column_consistency(df, report):
     """Check for consistency issues across multiple columns"""
     cross_issues = []
 
     # Look for columns that might be related
     date_columns = []
-    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
 
     for col in df.columns:
         if 'date' in col.lower() or 'time' in col.lower():
@@ -10548,10 +10830,10 @@ def check_cross_column_consistency(df):
         for i, col1 in enumerate(date_columns):
             for col2 in date_columns[i + 1:]:
                 # Simple check - if both contain date-like strings
-                col1_dates = df[col1].dropna().astype(str).str.contains(r'\d{4}|\d{2}', regex=True)
-                col2_dates = df[col2].dropna().astype(str).str.contains(r'\d{4}|\d{2}', regex=True)
+                col1_dates = report.columns[col1].pattern_count(r'\d{4}|\d{2}') > 0
+                col2_dates = report.columns[col2].pattern_count(r'\d{4}|\d{2}') > 0
 
-                if col1_dates.any() and col2_dates.any():
+                if col1_dates and col2_dates:
                     cross_issues.append({
                         'type': 'Date Relationship',
                         'description': f"Check relationship between date columns '{col1}' and '{col2}'",
@@ -10561,7 +10843,7 @@ def check_cross_column_consistency(df):
     # Check for potential ID columns
     id_columns = [col for col in df.columns if 'id' in col.lower()]
     for col in id_columns:
-        if df[col].nunique() != len(df[col].dropna()):
+        if report.columns[col].nunique != report.columns[col].count:
             cross_issues.append({
                 'type': 'ID Uniqueness',
                 'description': f"ID column '{col}' contains duplicate values",
@@ -10641,45 +10923,36 @@ CONSISTENCY ISSUES:
     return report
 
 
-def calculate_accuracy_metrics(df):
+def calculate_accuracy_metrics(df, report):
     """Calculate comprehensive accuracy metrics"""
-    total_values = df.shape[0] * df.shape[1] - df.isnull().sum().sum()
+    total_values = report.total_cells - report.missing_cells
     potential_errors = 0
 
     # Check for obvious errors
     for col in df.columns:
-        col_data = df[col].dropna()
+        column = report.columns[col]
 
-        if len(col_data) == 0:
+        if column.count == 0:
             continue
 
         # For numeric columns, check for impossible values
-        if pd.api.types.is_numeric_dtype(col_data):
+        if column.is_numeric:
             # Check for negative values where they shouldn't be (if column name suggests positive values)
             if any(keyword in col.lower() for keyword in ['age', 'count', 'quantity', 'amount', 'price']):
-                negative_values = (col_data < 0).sum()
-                potential_errors += negative_values
+                potential_errors += column.negative_count
 
             # Check for extreme outliers
-            if len(col_data) > 10:
-                q1 = col_data.quantile(0.25)
-                q3 = col_data.quantile(0.75)
-                iqr = q3 - q1
-                extreme_outliers = ((col_data < q1 - 3 * iqr) | (col_data > q3 + 3 * iqr)).sum()
-                potential_errors += extreme_outliers * 0.5  # Weight as partial errors
+            if column.count > 10:
+                potential_errors += column.iqr_outliers(3) * 0.5  # Weight as partial errors
 
         # For text columns, check for obvious formatting issues
-        elif col_data.dtype == 'object':
-            text_data = col_data.astype(str)
-
+        elif column.is_object:
             # Check for excessive whitespace
-            whitespace_issues = (text_data != text_data.str.strip()).sum()
-            potential_errors += whitespace_issues * 0.3
+            potential_errors += column.whitespace_count * 0.3
 
             # Check for inconsistent capitalization
             if any(keyword in col.lower() for keyword in ['name', 'title', 'category']):
-                mixed_case = text_data.str.contains(r'[a-z][A-Z]|[A-Z][a-z][A-Z]', regex=True).sum()
-                potential_errors += mixed_case * 0.2
+                potential_errors += column.pattern_count(r'[a-z][A-Z]|[A-Z][a-z][A-Z]') * 0.2
 
     accuracy_rate = max(0, (total_values - potential_errors) / total_values) if total_values > 0 else 0
     confidence_level = min(1.0, accuracy_rate + 0.1)  # Add confidence buffer
@@ -10692,17 +10965,17 @@ def calculate_accuracy_metrics(df):
     }
 
 
-def assess_column_accuracy(df):
+def assess_column_accuracy(df, report):
     """Assess accuracy metrics for each column"""
     accuracy_data = []
 
     for col in df.columns:
-        col_data = df[col].dropna()
+        column = report.columns[col]
 
-        if len(col_data) == 0:
+        if column.count == 0:
             accuracy_data.append({
                 'Column': col,
-                'Data Type': str(df[col].dtype),
+                'Data Type': str(column.dtype),
                 'Valid Values': 0,
                 'Questionable Values': 0,
                 'Accuracy Score': 'N/A',
@@ -10710,41 +10983,36 @@ def assess_column_accuracy(df):
             })
             continue
 
-        valid_values = len(col_data)
+        valid_values = column.count
         questionable_values = 0
         issues = []
 
         # Numeric column checks
-        if pd.api.types.is_numeric_dtype(col_data):
+        if column.is_numeric:
             # Check for negative values in positive-expected columns
             if any(keyword in col.lower() for keyword in ['age', 'count', 'quantity', 'price']):
-                negative_count = (col_data < 0).sum()
+                negative_count = column.negative_count
                 if negative_count > 0:
                     questionable_values += negative_count
                     issues.append(f"{negative_count} negative values")
 
             # Check for outliers
-            if len(col_data) > 10:
-                q1 = col_data.quantile(0.25)
-                q3 = col_data.quantile(0.75)
-                iqr = q3 - q1
-                outliers = ((col_data < q1 - 2 * iqr) | (col_data > q3 + 2 * iqr)).sum()
+            if column.count > 10:
+                outliers = column.iqr_outliers(2)
                 if outliers > 0:
                     questionable_values += outliers
                     issues.append(f"{outliers} outliers")
 
         # Text column checks
-        elif col_data.dtype == 'object':
-            text_data = col_data.astype(str)
-
+        elif column.is_object:
             # Whitespace issues
-            whitespace_count = (text_data != text_data.str.strip()).sum()
+            whitespace_count = column.whitespace_count
             if whitespace_count > 0:
                 questionable_values += whitespace_count
                 issues.append(f"{whitespace_count} whitespace issues")
 
             # Empty strings
-            empty_strings = (text_data.str.len() == 0).sum()
+            empty_strings = column.empty_count
             if empty_strings > 0:
                 questionable_values += empty_strings
                 issues.append(f"{empty_strings} empty strings")
@@ -10753,7 +11021,7 @@ def assess_column_accuracy(df):
 
         accuracy_data.append({
             'Column': col,
-            'Data Type': str(df[col].dtype),
+            'Data Type': str(column.dtype),
             'Valid Values': valid_values,
             'Questionable Values': questionable_values,
             'Accuracy Score': f"{accuracy_score:.1%}",
@@ -10763,39 +11031,36 @@ def assess_column_accuracy(df):
     return pd.DataFrame(accuracy_data)
 
 
-def apply_validation_rules(df):
+def apply_validation_rules(df, report):
     """Apply various validation rules to assess accuracy"""
     validation_results = {}
 
     # Numeric validation rules
     numeric_rules = []
     for col in df.select_dtypes(include=[np.number]).columns:
-        col_data = df[col].dropna()
+        column = report.columns[col]
 
-        if len(col_data) == 0:
+        if column.count == 0:
             continue
 
         # Rule: Age should be reasonable (if column name suggests age)
         if 'age' in col.lower():
-            reasonable_ages = ((col_data >= 0) & (col_data <= 120)).all()
             numeric_rules.append({
                 'description': f"Age values in '{col}' are within reasonable range (0-120)",
-                'status': 'passed' if reasonable_ages else 'failed'
+                'status': 'passed' if column.all_between(0, 120) else 'failed'
             })
 
         # Rule: Percentages should be 0-100 or 0-1
         if any(keyword in col.lower() for keyword in ['percent', 'rate', 'ratio']):
-            if col_data.max() <= 1:
-                valid_range = ((col_data >= 0) & (col_data <= 1)).all()
+            if column.max <= 1:
                 numeric_rules.append({
                     'description': f"Percentage values in '{col}' are in valid range (0-1)",
-                    'status': 'passed' if valid_range else 'failed'
+                    'status': 'passed' if column.all_between(0, 1) else 'failed'
                 })
             else:
-                valid_range = ((col_data >= 0) & (col_data <= 100)).all()
                 numeric_rules.append({
                     'description': f"Percentage values in '{col}' are in valid range (0-100)",
-                    'status': 'passed' if valid_range else 'failed'
+                    'status': 'passed' if column.all_between(0, 100) else 'failed'
                 })
 
     validation_results['Numeric Rules'] = numeric_rules
@@ -10803,25 +11068,23 @@ def apply_validation_rules(df):
     # Text validation rules
     text_rules = []
     for col in df.select_dtypes(include=['object']).columns:
-        col_data = df[col].dropna().astype(str)
+        column = report.columns[col]
 
-        if len(col_data) == 0:
+        if column.count == 0:
             continue
 
         # Rule: Email format validation
         if 'email' in col.lower():
-            email_pattern = r'^[^@]+@[^@]+\.[^@]+$'
-            valid_emails = col_data.str.match(email_pattern).all()
+            valid_emails = column.pattern_count(r'^[^@]+@[^@]+\.[^@]+$', full_match=True) == column.count
             text_rules.append({
                 'description': f"Email addresses in '{col}' follow valid format",
                 'status': 'passed' if valid_emails else 'failed'
             })
 
         # Rule: No excessive whitespace
-        clean_strings = (col_data == col_data.str.strip()).all()
         text_rules.append({
             'description': f"Text values in '{col}' have no leading/trailing whitespace",
-            'status': 'passed' if clean_strings else 'warning'
+            'status': 'passed' if column.whitespace_count == 0 else 'warning'
         })
 
     validation_results['Text Rules'] = text_rules
@@ -10829,7 +11092,7 @@ def apply_validation_rules(df):
     return validation_results
 
 
-def detect_accuracy_outliers(df):
+def detect_accuracy_outliers(df, report):
     """Detect outliers that may indicate accuracy issues"""
     outlier_info = {
         'outliers_found': False,
@@ -10838,35 +11101,26 @@ def detect_accuracy_outliers(df):
     }
 
     for col in df.select_dtypes(include=[np.number]).columns:
-        col_data = df[col].dropna()
+        column = report.columns[col]
 
-        if len(col_data) < 10:  # Need sufficient data for outlier detection
+        if column.count < 10:  # Need sufficient data for outlier detection
             continue
 
-        # Use IQR method
-        q1 = col_data.quantile(0.25)
-        q3 = col_data.quantile(0.75)
-        iqr = q3 - q1
-
-        # Define outliers as values beyond 1.5 * IQR
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-
-        outliers = ((col_data < lower_bound) | (col_data > upper_bound))
-        outlier_count = outliers.sum()
+        # IQR method: outliers are values beyond 1.5 * IQR
+        outlier_count = column.iqr_outliers(1.5)
 
         if outlier_count > 0:
             outlier_info['outliers_found'] = True
             outlier_info['total_outliers'] += outlier_count
             outlier_info['column_outliers'][col] = {
                 'count': outlier_count,
-                'percentage': (outlier_count / len(col_data)) * 100
+                'percentage': (outlier_count / column.count) * 100
             }
 
     return outlier_info
 
 
-def analyze_pattern_accuracy(df):
+def analyze_pattern_accuracy(df, report):
     """Analyze accuracy of common data patterns"""
     pattern_analysis = {}
 
@@ -10874,27 +11128,16 @@ def analyze_pattern_accuracy(df):
     date_patterns = {}
     for col in df.columns:
         if 'date' in col.lower() or 'time' in col.lower():
-            col_data = df[col].dropna().astype(str)
+            column = report.columns[col]
 
-            if len(col_data) == 0:
+            if column.count == 0:
                 continue
 
             # Check for consistent date formats
-            common_formats = [
-                r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-                r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-                r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
-            ]
-
-            format_matches = {}
-            for pattern in common_formats:
-                matches = col_data.str.contains(pattern, regex=True).sum()
-                format_matches[pattern] = matches
-
-            total_matches = sum(format_matches.values())
-            if total_matches != len(col_data):
+            total_matches = sum(column.pattern_count(pattern) for pattern in DATE_FORMAT_PATTERNS)
+            if total_matches != column.count:
                 date_patterns[
-                    col] = f"Inconsistent date formats detected ({total_matches}/{len(col_data)} match common patterns)"
+                    col] = f"Inconsistent date formats detected ({total_matches}/{column.count} match common patterns)"
 
     pattern_analysis['Date Patterns'] = {
         'issues': list(date_patterns.values()) if date_patterns else []
@@ -10904,15 +11147,15 @@ def analyze_pattern_accuracy(df):
     id_patterns = {}
     for col in df.columns:
         if 'id' in col.lower() and df[col].dtype == 'object':
-            col_data = df[col].dropna().astype(str)
+            column = report.columns[col]
 
-            if len(col_data) == 0:
+            if column.count == 0:
                 continue
 
             # Check for consistent ID length
-            lengths = col_data.str.len()
-            if lengths.nunique() > 1:
-                id_patterns[col] = f"Inconsistent ID lengths (range: {lengths.min()}-{lengths.max()})"
+            distinct_lengths, min_length, max_length = column.length_stats
+            if distinct_lengths > 1:
+                id_patterns[col] = f"Inconsistent ID lengths (range: {min_length}-{max_length})"
 
     pattern_analysis['ID Patterns'] = {
         'issues': list(id_patterns.values()) if id_patterns else []
@@ -15,6 +15,7 @@ from pathlib import Path
 import pandas as pd
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
 from utils.file_handler import FileHandler
+from utils.artifact_store import INLINE_THRESHOLD_BYTES
 from PIL import Image, ImageOps
 import subprocess
 import tempfile
@@ -1003,6 +1004,9 @@ def generate_duplicate_report(duplicates, method):
     return report
 
 
+ENCRYPTED_CONTAINER_MAGIC = b"INONEBOX-ENC1\n"
+
+
 def encrypt_files(files, password, method, key_derivation):
     """Encrypt files with specified method"""
     encrypted_files = {}
@@ -1010,18 +1014,25 @@ def encrypt_files(files, password, method, key_derivation):
     for file in files:
         try:
             # Simple encryption simulation (use proper crypto library in production)
-            file_data = file.read()
+            file_data = file.getvalue()
 
             # Create encryption metadata
             encryption_info = {
                 "original_name": file.name,
                 "method": method,
                 "key_derivation": key_derivation,
-                "encrypted_at": datetime.now().isoformat(),
-                "encrypted_data": base64.b64encode(file_data).decode('utf-8')  # Simple base64 encoding for demo
+                "encrypted_at": datetime.now().isoformat()
             }
 
-            encrypted_content = json.dumps(encryption_info, indent=2).encode('utf-8')
+            if len(file_data) > INLINE_THRESHOLD_BYTES:
+                # Large payloads go into a binary container (JSON header line + raw bytes)
+                # instead of being inflated by a third with base64
+                header = json.dumps(encryption_info).encode('utf-8')
+                encrypted_content = ENCRYPTED_CONTAINER_MAGIC + header + b"\n" + file_data
+            else:
+                encryption_info["encrypted_data"] = base64.b64encode(file_data).decode('utf-8')  # Simple base64 encoding for demo
+                encrypted_content = json.dumps(encryption_info, indent=2).encode('utf-8')
+
             encrypted_filename = f"{file.name}.encrypted"
             encrypted_files[encrypted_filename] = encrypted_content
 
@@ -1037,11 +1048,17 @@ def decrypt_files(files, password):
 
     for file in files:
         try:
-            content = file.read()
-            encryption_info = json.loads(content.decode('utf-8'))
+            content = file.getvalue()
+
+            if content.startswith(ENCRYPTED_CONTAINER_MAGIC):
+                header_end = content.index(b"\n", len(ENCRYPTED_CONTAINER_MAGIC))
+                encryption_info = json.loads(content[len(ENCRYPTED_CONTAINER_MAGIC):header_end].decode('utf-8'))
+                decrypted_data = content[header_end + 1:]
+            else:
+                encryption_info = json.loads(content.decode('utf-8'))
 
-            # Simple decryption (use proper crypto library in production)
-            decrypted_data = base64.b64decode(encryption_info['encrypted_data'])
+                # Simple decryption (use proper crypto library in production)
+                decrypted_data = base64.b64decode(encryption_info['encrypted_data'])
 
             original_name = encryption_info['original_name']
             decrypted_files[original_name] = decrypted_data
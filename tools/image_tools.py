@@ -9,6 +9,7 @@ from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
 from utils.common import create_tool_header, show_progress_bar, add_to_recent
 from utils.file_handler import FileHandler
+from utils.tool_page import fragment, load_image, upload_digest, cached_artifact
 import time
 import base64
 import colorsys
@@ -2326,9 +2327,10 @@ def metadata_extractor():
                         aspect_ratio = round(image.width / image.height, 2)
                         st.metric("Aspect Ratio", f"{aspect_ratio}:1")
 
-                    # EXIF data (for JPEG images)
-                    if hasattr(image, '_getexif') and image._getexif():
-                        exif = image._getexif()
+                    # EXIF data (for JPEG images): the main IFD plus the Exif sub-IFD (exposure, dates)
+                    exif_ifd = image.getexif()
+                    if exif_ifd:
+                        exif = {**exif_ifd, **exif_ifd.get_ifd(0x8769)}
                         if exif:
                             st.subheader("EXIF Data")
                             exif_data = {}
@@ -4196,164 +4198,193 @@ def batch_compression():
                                               accept_multiple=True)
 
     if uploaded_files:
-        st.subheader("Batch Compression Settings")
+        batch_compression_panel(uploaded_files)
 
-        # Compression profile
-        compression_profile = st.selectbox("Compression Profile",
-                                           ["Web Optimized", "Print Quality", "Archive", "Maximum Compression",
-                                            "Custom"])
 
-        if compression_profile == "Custom":
-            target_format = st.selectbox("Output Format", ["Keep Original", "JPEG", "PNG", "WebP"])
-            quality = st.slider("Quality", 1, 100, 75)
-            resize_option = st.checkbox("Resize Images")
-            if resize_option:
-                max_dimension = st.slider("Maximum Dimension (pixels)", 100, 4000, 1920)
-        else:
-            # Predefined profiles
-            profiles = {
-                "Web Optimized": {"format": "JPEG", "quality": 85, "max_dim": 1920},
-                "Print Quality": {"format": "JPEG", "quality": 95, "max_dim": None},
-                "Archive": {"format": "PNG", "quality": 9, "max_dim": None},
-                "Maximum Compression": {"format": "JPEG", "quality": 60, "max_dim": 1200}
-            }
+@fragment
+def batch_compression_panel(uploaded_files):
+    """Settings and results for batch compression (reruns independently of the page)"""
+    st.subheader("Batch Compression Settings")
 
-            profile = profiles[compression_profile]
-            st.write(f"Profile settings: Format={profile['format']}, Quality={profile['quality']}")
-            if profile['max_dim']:
-                st.write(f"Max dimension: {profile['max_dim']} pixels")
+    # Compression profile
+    compression_profile = st.selectbox("Compression Profile",
+                                       ["Web Optimized", "Print Quality", "Archive", "Maximum Compression",
+                                        "Custom"])
 
-        # Advanced options
-        with st.expander("Advanced Options"):
-            progressive_jpeg = st.checkbox("Progressive JPEG", True)
-            strip_metadata = st.checkbox("Strip Metadata", True)
-            convert_to_srgb = st.checkbox("Convert to sRGB Color Space", False)
-            apply_sharpening = st.checkbox("Apply Light Sharpening", False)
+    if compression_profile == "Custom":
+        target_format = st.selectbox("Output Format", ["Keep Original", "JPEG", "PNG", "WebP"])
+        quality = st.slider("Quality", 1, 100, 75)
+        resize_option = st.checkbox("Resize Images")
+        if resize_option:
+            max_dimension = st.slider("Maximum Dimension (pixels)", 100, 4000, 1920)
+    else:
+        # Predefined profiles
+        profiles = {
+            "Web Optimized": {"format": "JPEG", "quality": 85, "max_dim": 1920},
+            "Print Quality": {"format": "JPEG", "quality": 95, "max_dim": None},
+            "Archive": {"format": "PNG", "quality": 9, "max_dim": None},
+            "Maximum Compression": {"format": "JPEG", "quality": 60, "max_dim": 1200}
+        }
 
-        if st.button("Start Batch Compression"):
-            try:
-                compressed_files = {}
-                progress_bar = st.progress(0)
-                compression_stats = []
+        profile = profiles[compression_profile]
+        st.write(f"Profile settings: Format={profile['format']}, Quality={profile['quality']}")
+        if profile['max_dim']:
+            st.write(f"Max dimension: {profile['max_dim']} pixels")
 
-                for i, uploaded_file in enumerate(uploaded_files):
-                    image = FileHandler.process_image_file(uploaded_file)
-                    if image:
-                        original_size = len(uploaded_file.getvalue())
+    # Advanced options
+    with st.expander("Advanced Options"):
+        progressive_jpeg = st.checkbox("Progressive JPEG", True)
+        strip_metadata = st.checkbox("Strip Metadata", True)
+        convert_to_srgb = st.checkbox("Convert to sRGB Color Space", False)
+        apply_sharpening = st.checkbox("Apply Light Sharpening", False)
 
-                        # Apply profile settings
-                        if compression_profile == "Custom":
-                            output_format = target_format if target_format != "Keep Original" else (
-                                        image.format or "PNG")
-                            output_quality = quality
-                            max_dim = max_dimension if resize_option else None
-                        else:
-                            profile = profiles[compression_profile]
-                            output_format = profile["format"]
-                            output_quality = profile["quality"]
-                            max_dim = profile["max_dim"]
+    if st.button("Start Batch Compression"):
+        try:
+            compressed_files = {}
+            progress_bar = st.progress(0)
+            compression_stats = []
 
-                        processed_image = image.copy()
+            for i, uploaded_file in enumerate(uploaded_files):
+                image = load_image(uploaded_file)
+                if image:
+                    original_size = uploaded_file.size
+
+                    # Apply profile settings
+                    if compression_profile == "Custom":
+                        output_format = target_format if target_format != "Keep Original" else (
+                                    image.format or "PNG")
+                        output_quality = quality
+                        max_dim = max_dimension if resize_option else None
+                    else:
+                        profile = profiles[compression_profile]
+                        output_format = profile["format"]
+                        output_quality = profile["quality"]
+                        max_dim = profile["max_dim"]
+
+                    settings = {
+                        "format": output_format,
+                        "quality": output_quality,
+                        "max_dim": max_dim,
+                        "progressive": progressive_jpeg,
+                        "strip_metadata": strip_metadata,
+                        "convert_to_srgb": convert_to_srgb,
+                        "sharpen": apply_sharpening
+                    }
 
-                        # Resize if needed
-                        if max_dim and max(processed_image.size) > max_dim:
-                            processed_image.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+                    # Re-running with unchanged settings reuses the previous output
+                    compressed_data = cached_artifact(
+                        "compressed_image", upload_digest(uploaded_file), settings,
+                        lambda img, settings=settings: compress_image(img, settings), image
+                    )
+                    compressed_size = len(compressed_data)
+
+                    # Generate filename
+                    base_name = uploaded_file.name.rsplit('.', 1)[0]
+                    new_filename = f"{base_name}_compressed.{output_format.lower()}"
+                    compressed_files[new_filename] = compressed_data
+
+                    # Track statistics
+                    compression_ratio = (original_size - compressed_size) / original_size * 100
+                    compression_stats.append({
+                        "filename": uploaded_file.name,
+                        "original_size": original_size,
+                        "compressed_size": compressed_size,
+                        "compression_ratio": compression_ratio,
+                        "format": output_format
+                    })
 
-                        # Convert color space if requested
-                        if convert_to_srgb and processed_image.mode != "RGB":
-                            processed_image = processed_image.convert("RGB")
+                    progress_bar.progress((i + 1) / len(uploaded_files))
 
-                        # Apply sharpening if requested
-                        if apply_sharpening:
-                            processed_image = processed_image.filter(
-                                ImageFilter.UnsharpMask(radius=1, percent=100, threshold=3))
+            # Display results
+            st.subheader("Compression Results")
 
-                        # Handle format requirements
-                        if output_format == "JPEG" and processed_image.mode in ("RGBA", "P"):
-                            rgb_image = Image.new("RGB", processed_image.size, (255, 255, 255))
-                            rgb_image.paste(processed_image, mask=processed_image.split()[
-                                -1] if processed_image.mode == "RGBA" else None)
-                            processed_image = rgb_image
+            total_original = sum(stat["original_size"] for stat in compression_stats)
+            total_compressed = sum(stat["compressed_size"] for stat in compression_stats)
+            overall_compression = (total_original - total_compressed) / total_original * 100
 
-                        # Save compressed image
-                        output = io.BytesIO()
-                        save_kwargs = {"format": output_format}
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Images Processed", len(compression_stats))
+            with col2:
+                st.metric("Overall Compression", f"{overall_compression:.1f}%")
+            with col3:
+                st.metric("Space Saved", f"{(total_original - total_compressed) / (1024 * 1024):.1f} MB")
 
-                        if output_format == "JPEG":
-                            save_kwargs.update({
-                                "quality": output_quality,
-                                "optimize": True,
-                                "progressive": progressive_jpeg
-                            })
-                        elif output_format == "PNG":
-                            save_kwargs.update({
-                                "compress_level": min(output_quality // 10, 9),
-                                "optimize": True
-                            })
-                        elif output_format == "WebP":
-                            save_kwargs.update({
-                                "quality": output_quality,
-                                "optimize": True
-                            })
+            # Detailed results table
+            for stat in compression_stats:
+                st.write(
+                    f"**{stat['filename']}**: {stat['original_size']:,} → {stat['compressed_size']:,} bytes ({stat['compression_ratio']:.1f}% reduction)")
 
-                        # Handle metadata
-                        if not strip_metadata and hasattr(image, 'info') and 'exif' in image.info:
-                            save_kwargs["exif"] = image.info["exif"]
+            # Create downloads
+            if compressed_files:
+                if len(compressed_files) == 1:
+                    filename, data = next(iter(compressed_files.items()))
+                    FileHandler.create_download_link(data, filename, "image/jpeg")
+                else:
+                    zip_data = FileHandler.create_zip_archive(compressed_files)
+                    FileHandler.create_download_link(zip_data, "batch_compressed_images.zip", "application/zip")
 
-                        processed_image.save(output, **save_kwargs)
-                        compressed_data = output.getvalue()
-                        compressed_size = len(compressed_data)
+            st.success(f"Batch compression complete! Processed {len(compression_stats)} images.")
 
-                        # Generate filename
-                        base_name = uploaded_file.name.rsplit('.', 1)[0]
-                        new_filename = f"{base_name}_compressed.{output_format.lower()}"
-                        compressed_files[new_filename] = compressed_data
+        except Exception as e:
+            st.error(f"Error during batch compression: {str(e)}")
 
-                        # Track statistics
-                        compression_ratio = (original_size - compressed_size) / original_size * 100
-                        compression_stats.append({
-                            "filename": uploaded_file.name,
-                            "original_size": original_size,
-                            "compressed_size": compressed_size,
-                            "compression_ratio": compression_ratio,
-                            "format": output_format
-                        })
 
-                        progress_bar.progress((i + 1) / len(uploaded_files))
+def compress_image(image, settings):
+    """Compress one image with batch compression settings and return the encoded bytes"""
+    output_format = settings["format"]
+    output_quality = settings["quality"]
+    max_dim = settings["max_dim"]
 
-                # Display results
-                st.subheader("Compression Results")
+    processed_image = image.copy()
 
-                total_original = sum(stat["original_size"] for stat in compression_stats)
-                total_compressed = sum(stat["compressed_size"] for stat in compression_stats)
-                overall_compression = (total_original - total_compressed) / total_original * 100
+    # Resize if needed
+    if max_dim and max(processed_image.size) > max_dim:
+        processed_image.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Images Processed", len(compression_stats))
-                with col2:
-                    st.metric("Overall Compression", f"{overall_compression:.1f}%")
-                with col3:
-                    st.metric("Space Saved", f"{(total_original - total_compressed) / (1024 * 1024):.1f} MB")
+    # Convert color space if requested
+    if settings["convert_to_srgb"] and processed_image.mode != "RGB":
+        processed_image = processed_image.convert("RGB")
 
-                # Detailed results table
-                for stat in compression_stats:
-                    st.write(
-                        f"**{stat['filename']}**: {stat['original_size']:,} → {stat['compressed_size']:,} bytes ({stat['compression_ratio']:.1f}% reduction)")
+    # Apply sharpening if requested
+    if settings["sharpen"]:
+        processed_image = processed_image.filter(
+            ImageFilter.UnsharpMask(radius=1, percent=100, threshold=3))
 
-                # Create downloads
-                if compressed_files:
-                    if len(compressed_files) == 1:
-                        filename, data = next(iter(compressed_files.items()))
-                        FileHandler.create_download_link(data, filename, "image/jpeg")
-                    else:
-                        zip_data = FileHandler.create_zip_archive(compressed_files)
-                        FileHandler.create_download_link(zip_data, "batch_compressed_images.zip", "application/zip")
+    # Handle format requirements
+    if output_format == "JPEG" and processed_image.mode in ("RGBA", "P"):
+        rgb_image = Image.new("RGB", processed_image.size, (255, 255, 255))
+        rgb_image.paste(processed_image, mask=processed_image.split()[
+            -1] if processed_image.mode == "RGBA" else None)
+        processed_image = rgb_image
 
-                st.success(f"Batch compression complete! Processed {len(compression_stats)} images.")
+    # Save compressed image
+    output = io.BytesIO()
+    save_kwargs = {"format": output_format}
 
-            except Exception as e:
-                st.error(f"Error during batch compression: {str(e)}")
+    if output_format == "JPEG":
+        save_kwargs.update({
+            "quality": output_quality,
+            "optimize": True,
+            "progressive": settings["progressive"]
+        })
+    elif output_format == "PNG":
+        save_kwargs.update({
+            "compress_level": min(output_quality // 10, 9),
+            "optimize": True
+        })
+    elif output_format == "WebP":
+        save_kwargs.update({
+            "quality": output_quality,
+            "optimize": True
+        })
+
+    # Handle metadata
+    if not settings["strip_metadata"] and hasattr(image, 'info') and 'exif' in image.info:
+        save_kwargs["exif"] = image.info["exif"]
+
+    processed_image.save(output, **save_kwargs)
+    return output.getvalue()
 
 
 def format_specific_compression():
@@ -6056,18 +6087,15 @@ def exif_viewer():
 
                         # GPS information (if available)
                         gps_info = {}
-                        if hasattr(image, '_getexif'):
-                            try:
-                                exif_dict = image._getexif()
-                                if exif_dict and 34853 in exif_dict:  # GPS tag
-                                    gps_data = exif_dict[34853]
-                                    if gps_data:
-                                        st.write("**🌍 GPS Location Data**")
-                                        for gps_tag, gps_value in gps_data.items():
-                                            st.write(f"• **GPS Tag {gps_tag}:** {gps_value}")
-                                        st.write("")
-                            except:
-                                pass
+                        try:
+                            gps_data = exif_data.get_ifd(0x8825)  # GPS IFD
+                            if gps_data:
+                                st.write("**🌍 GPS Location Data**")
+                                for gps_tag, gps_value in gps_data.items():
+                                    st.write(f"• **GPS Tag {gps_tag}:** {gps_value}")
+                                st.write("")
+                        except:
+                            pass
 
                         if other_info:
                             with st.expander("Additional EXIF Data"):
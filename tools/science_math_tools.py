@@ -4,8 +4,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
 import pandas as pd
-from utils.common import create_tool_header, show_progress_bar, add_to_recent
+from utils.common import create_tool_header, show_progress_bar, add_to_recent, display_test_results
 from utils.file_handler import FileHandler
+from utils.hypothesis_engine import (CORRECTIONS, ALTERNATIVES, apply_correction, one_sample_ttests, anova_tests,
+                                     mann_whitney_tests)
 
 
 def display_tools():
@@ -3355,11 +3357,84 @@ def normality_tests():
                 plt.close(fig)
 
 
+def load_batch_data():
+    """Uploaded CSV whose columns are tested in one batch, or None"""
+    uploaded_file = FileHandler.upload_files(['csv'], accept_multiple=False)
+    if not uploaded_file:
+        return None
+    df = FileHandler.process_csv_file(uploaded_file[0])
+    if df is None:
+        st.error("Error reading CSV file")
+    return df
+
+
+def correction_settings(key: str):
+    """Multiple-comparison correction and significance level for a batch of tests"""
+    col1, col2 = st.columns(2)
+    with col1:
+        correction = st.selectbox("Multiple-comparison correction:", CORRECTIONS, key=f"{key}_correction")
+    with col2:
+        alpha = st.slider("Significance Level (α):", 0.01, 0.10, 0.05, 0.01, key=f"{key}_alpha")
+    return correction, alpha
+
+
+def batch_one_sample_ttest():
+    """One-sample t-tests of every selected column of an uploaded file"""
+    df = load_batch_data()
+    if df is None:
+        return
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    if not numeric_cols:
+        st.error("No numeric columns found in CSV file")
+        return
+
+    columns = st.multiselect("Columns to test:", numeric_cols, default=numeric_cols, key="ttest1_batch_cols")
+    hypothesized_mean = st.number_input("Hypothesized population mean (μ₀):", value=0.0, key="ttest1_batch_mu")
+    alternative = st.selectbox("Alternative hypothesis:", ALTERNATIVES, key="ttest1_batch_alt")
+    correction, alpha = correction_settings("ttest1_batch")
+
+    if columns and st.button("Run Batch One-Sample t-tests"):
+        try:
+            results = one_sample_ttests(df, columns, hypothesized_mean, alternative)
+            display_test_results(apply_correction(results, correction, alpha), alpha, "one_sample_ttests.csv")
+        except Exception as e:
+            st.error(f"Error in batch t-tests: {str(e)}")
+
+
+def batch_group_settings(df, key: str, pairwise: bool):
+    """(value columns, group column, groups) for a batch test between groups of an uploaded file, or None"""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    group_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
+    if not numeric_cols or not group_cols:
+        st.error("Need at least one numeric column and one group column")
+        return None
+
+    columns = st.multiselect("Columns to test:", numeric_cols, default=numeric_cols, key=f"{key}_cols")
+    group_col = st.selectbox("Group column:", group_cols, key=f"{key}_group")
+    groups = list(df[group_col].dropna().unique())
+    if len(groups) < 2:
+        st.error("Group column needs at least 2 groups")
+        return None
+    if pairwise:
+        col1, col2 = st.columns(2)
+        with col1:
+            group_a = st.selectbox("Group 1:", groups, key=f"{key}_group_a")
+        with col2:
+            group_b = st.selectbox("Group 2:", [group for group in groups if group != group_a], key=f"{key}_group_b")
+        groups = [group_a, group_b]
+    return columns, group_col, groups
+
+
 def one_sample_ttest():
     """One-sample t-test"""
     st.markdown("#### One-Sample t-test")
     st.write("Test if the mean of a sample differs from a hypothesized population mean")
 
+    input_method = st.selectbox("Data Input Method:", ["Manual Entry", "Upload File (batch)"], key="ttest1_input")
+    if input_method == "Upload File (batch)":
+        batch_one_sample_ttest()
+        return
+
     # Data input
     data_text = st.text_area("Enter sample data (comma or space separated):",
                              placeholder="23.1, 24.5, 22.8, 25.2, 23.9")
@@ -3612,6 +3687,22 @@ def one_way_anova():
     st.markdown("#### One-Way ANOVA")
     st.write("Compare means of three or more independent groups")
 
+    input_method = st.selectbox("Data Input Method:", ["Manual Entry", "Upload File (batch)"], key="anova_input")
+    if input_method == "Upload File (batch)":
+        df = load_batch_data()
+        settings = batch_group_settings(df, "anova_batch", pairwise=False) if df is not None else None
+        if settings is None:
+            return
+        columns, group_col, _ = settings
+        correction, alpha = correction_settings("anova_batch")
+        if columns and st.button("Run Batch One-Way ANOVA"):
+            try:
+                results = apply_correction(anova_tests(df, columns, group_col), correction, alpha)
+                display_test_results(results, alpha, "one_way_anova.csv")
+            except Exception as e:
+                st.error(f"Error in batch ANOVA: {str(e)}")
+        return
+
     # Number of groups
     num_groups = st.number_input("Number of groups:", min_value=3, max_value=10, value=3)
 
@@ -3705,6 +3796,23 @@ def mann_whitney_test():
     st.markdown("#### Mann-Whitney U Test")
     st.write("Non-parametric test to compare two independent groups (alternative to two-sample t-test)")
 
+    input_method = st.selectbox("Data Input Method:", ["Manual Entry", "Upload File (batch)"], key="mw_input")
+    if input_method == "Upload File (batch)":
+        df = load_batch_data()
+        settings = batch_group_settings(df, "mw_batch", pairwise=True) if df is not None else None
+        if settings is None:
+            return
+        columns, group_col, groups = settings
+        alternative = st.selectbox("Alternative hypothesis:", ALTERNATIVES, key="mw_batch_alt")
+        correction, alpha = correction_settings("mw_batch")
+        if columns and st.button("Run Batch Mann-Whitney U Tests"):
+            try:
+                results = mann_whitney_tests(df, columns, group_col, groups, alternative)
+                display_test_results(apply_correction(results, correction, alpha), alpha, "mann_whitney_tests.csv")
+            except Exception as e:
+                st.error(f"Error in batch Mann-Whitney tests: {str(e)}")
+        return
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -0,0 +1,301 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.quality_engine import frame_digest
+
+AGGREGATIONS = ["sum", "mean", "count", "median", "min", "max", "std", "var"]
+# Every aggregation but the median rolls up exactly from per-group partials
+ROLLUP_AGGREGATIONS = ["sum", "mean", "count", "min", "max", "std", "var"]
+CUBE_CACHE_ENTRIES = int(os.environ.get('AGGREGATION_CACHE_ENTRIES', '16'))
+_MAX_RADIX = 2 ** 62
+
+
+def _group_ids(codes: np.ndarray, cardinalities: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Dense group id of each row of per-key codes (-1 where any key is missing) and each group's key codes.
+
+    Keys are combined by mixed radix and hashed, never sorted row-wise; only the distinct combinations are
+    ordered, so group ids follow the lexicographic order of the (sorted) key levels, as in pandas groupby.
+    """
+    valid = (codes >= 0).all(axis=1)
+    flat = np.zeros(len(codes), dtype=np.int64)
+    radix = 1
+    for j, size in enumerate(cardinalities):
+        if radix * max(size, 1) >= _MAX_RADIX:
+            flat[valid] = pd.factorize(flat[valid], sort=True)[0]
+            radix = int(flat.max()) + 1 if len(flat) else 1
+        flat = flat * max(size, 1) + np.where(valid, codes[:, j], 0)
+        radix *= max(size, 1)
+
+    ids = np.full(len(codes), -1, dtype=np.int64)
+    ids[valid], uniques = pd.factorize(flat[valid], sort=True)
+    rows = np.flatnonzero(valid)
+    first = np.empty(len(uniques), dtype=np.int64)
+    # Reversed assignment leaves the first row of every group
+    first[ids[rows[::-1]]] = rows[::-1]
+    return ids, codes[first]
+
+
+def _add_rows(ids: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    out = np.zeros((n_groups,) + values.shape[1:])
+    np.add.at(out, ids, values)
+    return out
+
+
+class GroupPartials:
+    """Per-group count, sum, sum of squared deviations, min and max of value columns for one set of group keys.
+
+    These are the mergeable pieces of every aggregation but the median, so coarser groupings (fewer keys,
+    sub-totals, or none for a grand total) are derived from them without touching the rows again.
+    """
+
+    def __init__(self, keys: List[str], levels: List[pd.Index], group_keys: np.ndarray, row_groups: np.ndarray,
+                 missing: Dict[str, int], columns: List[str], dtypes: Dict[str, np.dtype], count: np.ndarray,
+                 total: np.ndarray, m2: np.ndarray, low: np.ndarray, high: np.ndarray):
+        self.keys = keys
+        self.levels = levels
+        self.group_keys = group_keys
+        self.row_groups = row_groups
+        # Rows dropped per key for a missing key value; a key can only be rolled away if it drops none
+        self.missing = missing
+        self.columns = columns
+        self.dtypes = dtypes
+        self.count = count
+        self.total = total
+        self.m2 = m2
+        self.low = low
+        self.high = high
+        self.sizes = np.bincount(row_groups[row_groups >= 0], minlength=len(group_keys))
+        self._medians: Dict[str, np.ndarray] = {}
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.group_keys)
+
+    @classmethod
+    def scan(cls, df: pd.DataFrame, keys: List[str], columns: List[str]) -> 'GroupPartials':
+        """Factorize the group keys and compute every column's partials in one pass over the rows"""
+        codes, levels, missing = [], [], {}
+        for key in keys:
+            key_codes, uniques = pd.factorize(df[key], sort=True)
+            codes.append(key_codes)
+            levels.append(pd.Index(uniques, name=key))
+            missing[key] = int((key_codes < 0).sum())
+        codes = np.stack(codes, axis=1).astype(np.int64) if keys else np.zeros((len(df), 0), dtype=np.int64)
+        row_groups, group_keys = _group_ids(codes, [len(level) for level in levels])
+        n_groups = len(group_keys)
+
+        shape = (n_groups, len(columns))
+        count, total, m2 = np.zeros(shape, dtype=np.int64), np.zeros(shape), np.zeros(shape)
+        low, high = np.full(shape, np.inf), np.full(shape, -np.inf)
+        dtypes = {}
+        for j, col in enumerate(columns):
+            dtypes[col] = df[col].dtype
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            present = (row_groups >= 0) & ~np.isnan(values)
+            ids, x = row_groups[present], values[present]
+            count[:, j] = np.bincount(ids, minlength=n_groups)
+            total[:, j] = np.bincount(ids, weights=x, minlength=n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = total[:, j] / count[:, j]
+            m2[:, j] = np.bincount(ids, weights=(x - mean[ids]) ** 2, minlength=n_groups)
+            np.minimum.at(low[:, j], ids, x)
+            np.maximum.at(high[:, j], ids, x)
+
+        return cls(list(keys), levels, group_keys, row_groups.astype(np.int32), missing, list(columns), dtypes,
+                   count, total, m2, low, high)
+
+    def can_rollup(self, keys: Sequence[str]) -> bool:
+        """Whether rolling up to keys (a subset of this one's) gives the same groups as grouping the rows by keys"""
+        return set(keys) <= set(self.keys) and all(self.missing[key] == 0 for key in self.keys if key not in keys)
+
+    def rollup(self, keys: Sequence[str]) -> 'GroupPartials':
+        """Partials for a coarser grouping of the rows in these groups, merged without touching the rows.
+
+        Squared deviations are combined with the parallel-variance update of Chan et al.
+        """
+        if not set(keys) <= set(self.keys):
+            raise ValueError(f"Cannot roll up {self.keys} to {list(keys)}")
+        positions = [self.keys.index(key) for key in keys]
+        coarse, group_keys = _group_ids(self.group_keys[:, positions], [len(self.levels[p]) for p in positions])
+        n_groups = len(group_keys)
+
+        count = _add_rows(coarse, self.count, n_groups).astype(np.int64)
+        total = _add_rows(coarse, self.total, n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fine_mean = self.total / self.count
+            coarse_mean = total / count
+            shift = np.where(self.count > 0, self.count * (fine_mean - coarse_mean[coarse]) ** 2, 0.0)
+        m2 = _add_rows(coarse, self.m2 + shift, n_groups)
+        low, high = np.full(count.shape, np.inf), np.full(count.shape, -np.inf)
+        np.minimum.at(low, coarse, self.low)
+        np.maximum.at(high, coarse, self.high)
+
+        row_groups = np.where(self.row_groups >= 0, coarse[self.row_groups], -1).astype(np.int32)
+        return GroupPartials(list(keys), [self.levels[p] for p in positions], group_keys, row_groups,
+                             {key: self.missing[key] for key in keys}, self.columns, self.dtypes,
+                             count, total, m2, low, high)
+
+    def select(self, keep: np.ndarray) -> 'GroupPartials':
+        """Partials of only the groups where keep is True (e.g. groups above a minimum size)"""
+        remap = np.full(self.n_groups, -1, dtype=np.int64)
+        remap[keep] = np.arange(int(keep.sum()))
+        row_groups = np.where(self.row_groups >= 0, remap[self.row_groups], -1).astype(np.int32)
+        # Roll-ups of a selection (e.g. its totals row) cover only the selected groups
+        return GroupPartials(self.keys, self.levels, self.group_keys[keep], row_groups, self.missing, self.columns,
+                             self.dtypes, self.count[keep], self.total[keep], self.m2[keep], self.low[keep],
+                             self.high[keep])
+
+    def index(self) -> pd.Index:
+        """Group labels, as the index of df.groupby(keys)"""
+        if not self.keys:
+            return pd.RangeIndex(self.n_groups)
+        if len(self.keys) == 1:
+            return self.levels[0].take(self.group_keys[:, 0])
+        return pd.MultiIndex(levels=self.levels, codes=self.group_keys.T, names=self.keys)
+
+    def _median(self, df: pd.DataFrame, col: str) -> np.ndarray:
+        # Medians do not merge across groups, so they are computed from the rows (once per column)
+        if col not in self._medians:
+            present = self.row_groups >= 0
+            values = pd.Series(df[col].to_numpy(dtype=np.float64, na_value=np.nan)[present])
+            medians = values.groupby(self.row_groups[present]).median()
+            self._medians[col] = medians.reindex(range(self.n_groups)).to_numpy()
+        return self._medians[col]
+
+    def statistic(self, col: str, func: str, df: Optional[pd.DataFrame] = None) -> np.ndarray:
+        """One aggregation of one column for every group"""
+        j = self.columns.index(col)
+        count = self.count[:, j]
+        integer = pd.api.types.is_integer_dtype(self.dtypes[col]) and (count > 0).all()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if func == 'count':
+                return count
+            if func == 'sum':
+                return np.round(self.total[:, j]).astype(np.int64) if integer else self.total[:, j]
+            if func == 'mean':
+                return self.total[:, j] / count
+            if func in ('min', 'max'):
+                values = self.low[:, j] if func == 'min' else self.high[:, j]
+                return values.astype(np.int64) if integer else np.where(count > 0, values, np.nan)
+            if func in ('var', 'std'):
+                var = np.where(count > 1, self.m2[:, j] / (count - 1), np.nan)
+                return np.sqrt(var) if func == 'std' else var
+        if func == 'median':
+            if df is None:
+                raise ValueError("The median needs the source rows")
+            return self._median(df, col)
+        raise ValueError(f"Unknown aggregation: {func}")
+
+    def aggregate(self, columns: Sequence[str], functions: Sequence[str],
+                  df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Table shaped like df.groupby(keys).agg({col: functions for col in columns})"""
+        pairs = [(col, func) for col in columns for func in functions]
+        data = {pair: self.statistic(pair[0], pair[1], df) for pair in pairs}
+        result = pd.DataFrame(data, index=self.index())
+        result.columns = pd.MultiIndex.from_tuples(pairs)
+        return result
+
+
+class CubeStore:
+    """Process-wide LRU of GroupPartials keyed by dataset digest and group keys.
+
+    A request is served from the exact grouping when cached, else rolled up from the smallest cached finer
+    grouping of the same data, and only scans the rows when neither exists.
+    """
+
+    def __init__(self, max_entries: int = CUBE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Tuple[str, ...]], GroupPartials]" = OrderedDict()
+        self._digests: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'rollups': 0, 'scans': 0}
+
+    def digest(self, df: pd.DataFrame) -> str:
+        """Content digest of df, hashed once per DataFrame object; frames passed here must not be mutated"""
+        key = id(df)
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+        digest = frame_digest(df)
+        with self._lock:
+            self._digests[key] = (weakref.ref(df, lambda _, key=key: self._digests.pop(key, None)), digest)
+        return digest
+
+    def _finest(self, digest: str, keys: Tuple[str, ...], columns: List[str]) -> Optional[GroupPartials]:
+        candidates = [partials for (data, cached_keys), partials in self._entries.items()
+                      if data == digest and cached_keys != keys and set(columns) <= set(partials.columns)
+                      and partials.can_rollup(keys)]
+        return min(candidates, key=lambda partials: partials.n_groups) if candidates else None
+
+    def partials(self, df: pd.DataFrame, keys: Sequence[str], columns: Sequence[str] = ()) -> GroupPartials:
+        keys, columns = tuple(keys), list(dict.fromkeys(columns))
+        digest = self.digest(df)
+        with self._lock:
+            cached = self._entries.get((digest, keys))
+            if cached is not None and set(columns) <= set(cached.columns):
+                self._entries.move_to_end((digest, keys))
+                self.stats['hits'] += 1
+                return cached
+            source = self._finest(digest, keys, columns)
+        if source is not None:
+            result = source.rollup(keys)
+            self.stats['rollups'] += 1
+        else:
+            # Keep the columns already cached for these keys so the entry only grows
+            known = cached.columns if cached is not None else []
+            result = GroupPartials.scan(df, list(keys), list(dict.fromkeys(known + columns)))
+            self.stats['scans'] += 1
+        with self._lock:
+            self._entries[(digest, keys)] = result
+            self._entries.move_to_end((digest, keys))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+
+@st.cache_resource
+def get_cube_store() -> CubeStore:
+    """Process-wide aggregation cache"""
+    return CubeStore()
+
+
+def group_partials(df: pd.DataFrame, keys: Sequence[str], columns: Sequence[str] = ()) -> GroupPartials:
+    """Cached partial aggregates of columns grouped by keys; df must be treated as read-only"""
+    return get_cube_store().partials(df, keys, columns)
+
+
+def aggregate(df: pd.DataFrame, keys: Sequence[str], columns: Sequence[str],
+              functions: Sequence[str]) -> pd.DataFrame:
+    """df.groupby(keys).agg({col: functions for col in columns}) served from the aggregation cache"""
+    return group_partials(df, keys, columns).aggregate(columns, functions, df)
+
+
+def value_counts(df: pd.DataFrame, column: str, top: Optional[int] = None) -> pd.Series:
+    """Row count per distinct value of column, most frequent first, like Series.value_counts"""
+    partials = group_partials(df, [column])
+    counts = pd.Series(partials.sizes, index=partials.index(), name='count')
+    counts = counts.sort_values(ascending=False, kind='stable')
+    return counts.head(top) if top else counts
+
+
+def pivot(df: pd.DataFrame, index: Sequence[str], values: Union[str, Sequence[str]], aggfunc: str = 'mean',
+          columns: Sequence[str] = ()) -> pd.DataFrame:
+    """pd.pivot_table for a single named aggregation, served from the aggregation cache"""
+    value_cols = [values] if isinstance(values, str) else list(values)
+    table = aggregate(df, list(index) + list(columns), value_cols, [aggfunc])
+    table.columns = table.columns.droplevel(1)
+    table = table.dropna(how='all')
+    if columns:
+        table = table.unstack(list(columns))
+    table = table.dropna(axis=1, how='all').sort_index(axis=1)
+    if isinstance(values, str) and columns:
+        table = table[values]
+    return table
@@ -0,0 +1,248 @@
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import BinaryIO, Dict, Optional, Union
+
+import streamlit as st
+
+# Payloads above this size are never inlined into the page; they are served from disk
+INLINE_THRESHOLD_BYTES = int(os.environ.get('DOWNLOAD_INLINE_THRESHOLD', str(2 * 1024 * 1024)))
+# Compressible payloads above this size are offered gzip-compressed
+COMPRESS_THRESHOLD_BYTES = int(os.environ.get('DOWNLOAD_COMPRESS_THRESHOLD', str(25 * 1024 * 1024)))
+ARTIFACT_TTL_SECONDS = int(os.environ.get('DOWNLOAD_ARTIFACT_TTL', '1800'))
+ARTIFACT_DIR = os.environ.get('DOWNLOAD_ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), 'inonebox_artifacts'))
+
+COMPRESSIBLE_MIME_PREFIXES = ('text/', 'application/json', 'application/x-ndjson', 'application/xml',
+                              'application/javascript', 'application/sql', 'image/svg+xml')
+
+
+class Artifact:
+    """A downloadable result stored on disk"""
+
+    def __init__(self, artifact_id: str, path: str, filename: str, mime_type: str, size: int,
+                 original_size: int, expires_at: float):
+        self.id = artifact_id
+        self.path = path
+        self.filename = filename
+        self.mime_type = mime_type
+        self.size = size
+        self.original_size = original_size
+        self.expires_at = expires_at
+
+    @property
+    def compressed(self) -> bool:
+        return self.size != self.original_size
+
+    def open(self):
+        """Open the stored file for reading"""
+        return open(self.path, 'rb')
+
+
+def _stream_digest(stream: BinaryIO):
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+        digest.update(chunk)
+    return digest
+
+
+class ArtifactStore:
+    """Short-lived on-disk store for download results with size-aware compression and expiry"""
+
+    def __init__(self, root: str = ARTIFACT_DIR, ttl_seconds: int = ARTIFACT_TTL_SECONDS,
+                 compress_threshold: int = COMPRESS_THRESHOLD_BYTES):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.compress_threshold = compress_threshold
+        self._artifacts: Dict[str, Artifact] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _should_compress(self, size: int, mime_type: str, filename: str) -> bool:
+        """Only compress large, text-like payloads that are not already compressed"""
+        if size < self.compress_threshold or filename.endswith('.gz'):
+            return False
+        return mime_type.startswith(COMPRESSIBLE_MIME_PREFIXES)
+
+    @staticmethod
+    def _compression_level(size: int) -> int:
+        """Trade ratio for speed as payloads grow"""
+        if size < 64 * 1024 * 1024:
+            return 6
+        if size < 512 * 1024 * 1024:
+            return 3
+        return 1
+
+    @staticmethod
+    def _artifact_id(digest, filename: str, mime_type: str, compress: Optional[bool]) -> str:
+        """Stable id from the content digest and download options, so identical results share one artifact"""
+        digest.update(f"\0{filename}\0{mime_type}\0{compress}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _reuse(self, artifact_id: str) -> Optional[Artifact]:
+        """The live artifact with this id, its expiry pushed back, or None"""
+        artifact = self.get(artifact_id)
+        if artifact is not None:
+            artifact.expires_at = time.time() + self.ttl_seconds
+        return artifact
+
+    def _staging_path(self) -> str:
+        return os.path.join(self.root, f"staging-{uuid.uuid4().hex}")
+
+    def register_bytes(self, data: bytes, filename: str, mime_type: str = "application/octet-stream",
+                       compress: Optional[bool] = None) -> Artifact:
+        """Store result bytes on disk and return the artifact"""
+        artifact_id = self._artifact_id(hashlib.blake2b(data, digest_size=16), filename, mime_type, compress)
+        existing = self._reuse(artifact_id)
+        if existing is not None:
+            return existing
+        staging = self._staging_path()
+        with open(staging, 'wb') as f:
+            f.write(data)
+        return self._finalize(artifact_id, staging, filename, mime_type, len(data), compress)
+
+    def register_file(self, source_path: str, filename: str, mime_type: str = "application/octet-stream",
+                      compress: Optional[bool] = None, move: bool = True) -> Artifact:
+        """Take ownership of (or copy) an existing result file and return the artifact"""
+        with open(source_path, 'rb') as f:
+            artifact_id = self._artifact_id(_stream_digest(f), filename, mime_type, compress)
+        existing = self._reuse(artifact_id)
+        if existing is not None:
+            if move:
+                os.remove(source_path)
+            return existing
+        staging = self._staging_path()
+        if move:
+            shutil.move(source_path, staging)
+        else:
+            shutil.copyfile(source_path, staging)
+        return self._finalize(artifact_id, staging, filename, mime_type, os.path.getsize(staging), compress)
+
+    def register_stream(self, stream: BinaryIO, filename: str, mime_type: str = "application/octet-stream",
+                        compress: Optional[bool] = None) -> Artifact:
+        """Copy a readable, seekable binary stream (e.g. a spooled temp file) into the store in chunks"""
+        start = stream.tell()
+        artifact_id = self._artifact_id(_stream_digest(stream), filename, mime_type, compress)
+        existing = self._reuse(artifact_id)
+        if existing is not None:
+            return existing
+        stream.seek(start)
+        staging = self._staging_path()
+        with open(staging, 'wb') as f:
+            shutil.copyfileobj(stream, f, length=1024 * 1024)
+        return self._finalize(artifact_id, staging, filename, mime_type, os.path.getsize(staging), compress)
+
+    def _finalize(self, artifact_id: str, staging: str, filename: str, mime_type: str, size: int,
+                  compress: Optional[bool]) -> Artifact:
+        """Optionally compress the staged file, move it into place, then record it and sweep expired artifacts.
+
+        Files are only renamed into their final (content-addressed) path once complete, so sessions
+        registering the same result at the same time cannot see a partial file.
+        """
+        stored_size = size
+        path = os.path.join(self.root, artifact_id)
+        if compress is None:
+            compress = self._should_compress(size, mime_type, filename)
+
+        if compress:
+            gz_staging = staging + '.gz'
+            with open(staging, 'rb') as src, \
+                    gzip.open(gz_staging, 'wb', compresslevel=self._compression_level(size)) as dst:
+                shutil.copyfileobj(src, dst, length=1024 * 1024)
+            gz_size = os.path.getsize(gz_staging)
+            # Keep the compressed copy only when it saves at least 10%
+            if gz_size < size * 0.9:
+                os.remove(staging)
+                staging, path, stored_size = gz_staging, path + '.gz', gz_size
+                filename, mime_type = filename + '.gz', 'application/gzip'
+            else:
+                os.remove(gz_staging)
+        os.replace(staging, path)
+
+        artifact = Artifact(artifact_id, path, filename, mime_type, stored_size, size,
+                            time.time() + self.ttl_seconds)
+        with self._lock:
+            self._artifacts[artifact_id] = artifact
+        self.sweep()
+        return artifact
+
+    def get(self, artifact_id: str) -> Optional[Artifact]:
+        """Look up a live artifact by id (ids are derived from content, see _artifact_id)"""
+        with self._lock:
+            artifact = self._artifacts.get(artifact_id)
+        if artifact is None or artifact.expires_at < time.time() or not os.path.exists(artifact.path):
+            return None
+        return artifact
+
+    def sweep(self):
+        """Delete expired artifacts"""
+        now = time.time()
+        with self._lock:
+            expired = [a for a in self._artifacts.values() if a.expires_at < now]
+            for artifact in expired:
+                del self._artifacts[artifact.id]
+        for artifact in expired:
+            try:
+                os.remove(artifact.path)
+            except OSError:
+                pass
+
+
+@st.cache_resource(show_spinner=False)
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide artifact store"""
+    return ArtifactStore()
+
+
+def _format_size(size: int) -> str:
+    value = float(size)
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if value < 1024.0:
+            return f"{value:.1f} {unit}"
+        value /= 1024.0
+    return f"{value:.1f} TB"
+
+
+def serve_download(data: Union[bytes, str, BinaryIO], filename: str, mime_type: str = "application/octet-stream",
+                   label: Optional[str] = None, key: Optional[str] = None, from_path: bool = False,
+                   compress: Optional[bool] = None):
+    """Render a download button, serving large results from the artifact store instead of inline.
+
+    `data` is the result bytes/text, a readable binary stream positioned at its start, or a file
+    path when `from_path` is True. Small payloads are passed to st.download_button directly;
+    anything above INLINE_THRESHOLD_BYTES is written to the artifact store (optionally
+    gzip-compressed) and handed over as a file handle.
+    """
+    label = label or f"📥 Download {filename}"
+
+    if hasattr(data, 'read'):
+        data.seek(0, os.SEEK_END)
+        size = data.tell()
+        data.seek(0)
+        if size <= INLINE_THRESHOLD_BYTES:
+            data = data.read()
+    if not from_path and not hasattr(data, 'read'):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if len(data) <= INLINE_THRESHOLD_BYTES:
+            return st.download_button(label=label, data=data, file_name=filename, mime=mime_type, key=key,
+                                      on_click="ignore")
+
+    store = get_artifact_store()
+    if from_path:
+        artifact = store.register_file(data, filename, mime_type, compress=compress)
+    elif hasattr(data, 'read'):
+        artifact = store.register_stream(data, filename, mime_type, compress=compress)
+    else:
+        artifact = store.register_bytes(data, filename, mime_type, compress=compress)
+
+    if artifact.compressed:
+        label = f"{label} ({_format_size(artifact.size)} gzip, {_format_size(artifact.original_size)} raw)"
+
+    with artifact.open() as handle:
+        return st.download_button(label=label, data=handle, file_name=artifact.filename,
+                                  mime=artifact.mime_type, key=key, on_click="ignore")
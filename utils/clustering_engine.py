@@ -0,0 +1,185 @@
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import AgglomerativeClustering, Birch, KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+CLUSTERING_ALGORITHMS = ["K-Means", "Hierarchical"]
+# Above this many rows the clustering tool defaults to the scalable (chunked) algorithms
+SCALABLE_ROWS = int(os.environ.get('CLUSTERING_SCALABLE_ROWS', '50000'))
+# Exact agglomerative clustering is O(n^2) in memory and time; beyond this it is replaced by BIRCH
+HIERARCHICAL_MAX_ROWS = int(os.environ.get('CLUSTERING_HIERARCHICAL_MAX_ROWS', '20000'))
+SILHOUETTE_SAMPLE = 10000
+CHUNK_ROWS = 10000
+MINIBATCH_PASSES = 3
+
+
+def standardize(data: pd.DataFrame, scalable: bool = False) -> np.ndarray:
+    """Zero-mean, unit-variance features; float32 in scalable mode to halve the working set"""
+    values = data.to_numpy(dtype=np.float32 if scalable else np.float64)
+    return StandardScaler(copy=False).fit_transform(values)
+
+
+def _chunks(n_rows: int, chunk_rows: int) -> List[slice]:
+    """Row slices of chunk_rows each, with a shorter remainder merged into the last full chunk.
+
+    A partial_fit then never sees fewer rows than a full chunk (or than n_clusters).
+    """
+    starts = list(range(0, n_rows, chunk_rows))
+    if len(starts) > 1 and n_rows - starts[-1] < chunk_rows:
+        starts.pop()
+    return [slice(start, end) for start, end in zip(starts, starts[1:] + [n_rows])]
+
+
+def _predict(model, X: np.ndarray, chunk_rows: int) -> np.ndarray:
+    """Assign every row, a chunk at a time so distance matrices stay small"""
+    return np.concatenate([model.predict(X[part]) for part in _chunks(X.shape[0], chunk_rows)]).astype(np.int64)
+
+
+def _birch_threshold(n_features: int) -> float:
+    # Distances between standardized rows grow with sqrt(d); keep the CF-tree from degenerating into one
+    # subcluster per row on wide data
+    return 0.5 * float(np.sqrt(max(n_features, 2) / 2))
+
+
+def fit_minibatch_kmeans(X: np.ndarray, n_clusters: int, chunk_rows: int = CHUNK_ROWS,
+                         passes: int = MINIBATCH_PASSES, random_state: int = 42) -> MiniBatchKMeans:
+    """MiniBatchKMeans trained incrementally with partial_fit over shuffled chunks"""
+    model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+    rng = np.random.RandomState(random_state)
+    chunks = _chunks(X.shape[0], max(chunk_rows, n_clusters * 3))
+    for _ in range(passes):
+        for i in rng.permutation(len(chunks)):
+            model.partial_fit(X[chunks[i]])
+    return model
+
+
+def fit_birch_tree(X: np.ndarray, chunk_rows: int = CHUNK_ROWS) -> Birch:
+    """BIRCH CF-tree built incrementally with partial_fit, without the final global clustering step"""
+    model = Birch(n_clusters=None, threshold=_birch_threshold(X.shape[1]))
+    for part in _chunks(X.shape[0], chunk_rows):
+        model.partial_fit(X[part])
+    return model
+
+
+def _birch_labels(tree: Birch, subclusters: np.ndarray, n_clusters: int, random_state: int = 42) -> np.ndarray:
+    """Global clustering step over the subcluster centroids, mapped back to every row.
+
+    Agglomerative up to HIERARCHICAL_MAX_ROWS subclusters; beyond that (wide data keeps many more) the
+    centroids are clustered by K-Means weighted by the rows assigned to each.
+    """
+    centers = tree.subcluster_centers_
+    if len(centers) <= n_clusters:
+        return subclusters
+    if len(centers) <= HIERARCHICAL_MAX_ROWS:
+        groups = AgglomerativeClustering(n_clusters=n_clusters).fit_predict(centers)
+    else:
+        weights = np.bincount(subclusters, minlength=len(centers))
+        groups = KMeans(n_clusters=n_clusters, random_state=random_state, n_init='auto') \
+            .fit_predict(centers, sample_weight=weights)
+    return groups[subclusters]
+
+
+def cluster_labels(X: np.ndarray, n_clusters: int, algorithm: str, scalable: bool = False,
+                   chunk_rows: int = CHUNK_ROWS, random_state: int = 42) -> Tuple[np.ndarray, str]:
+    """Cluster label for every row of X and the name of the method actually used"""
+    if algorithm not in CLUSTERING_ALGORITHMS:
+        raise ValueError(f"Unknown clustering algorithm: {algorithm}")
+    if algorithm == "K-Means":
+        if scalable:
+            model = fit_minibatch_kmeans(X, n_clusters, chunk_rows, random_state=random_state)
+            return _predict(model, X, chunk_rows), "Mini-Batch K-Means"
+        return KMeans(n_clusters=n_clusters, random_state=random_state, n_init='auto').fit_predict(X), "K-Means"
+
+    if scalable or len(X) > HIERARCHICAL_MAX_ROWS:
+        tree = fit_birch_tree(X, chunk_rows)
+        return _birch_labels(tree, _predict(tree, X, chunk_rows), n_clusters, random_state), "BIRCH"
+    return AgglomerativeClustering(n_clusters=n_clusters).fit_predict(X), "Hierarchical"
+
+
+def sampled_silhouette(X: np.ndarray, labels: np.ndarray, sample_size: int = SILHOUETTE_SAMPLE,
+                       random_state: int = 42) -> float:
+    """Silhouette score, exact up to sample_size rows and estimated on a random sample beyond that"""
+    if len(np.unique(labels)) < 2:
+        return float('nan')
+    if len(X) <= sample_size:
+        return float(silhouette_score(X, labels))
+    sample = np.random.RandomState(random_state).choice(len(X), sample_size, replace=False)
+    if len(np.unique(labels[sample])) < 2:
+        return float('nan')
+    return float(silhouette_score(X[sample], labels[sample]))
+
+
+def within_cluster_ss(X: np.ndarray, labels: np.ndarray) -> float:
+    """Total within-cluster sum of squares (K-Means inertia) for any labelling"""
+    counts = np.bincount(labels)
+    sums = np.stack([np.bincount(labels, weights=X[:, j], minlength=len(counts)) for j in range(X.shape[1])],
+                    axis=1)
+    present = counts > 0
+    total = float(np.einsum('ij,ij->', X, X, dtype=np.float64))
+    return total - float(((sums[present] ** 2).sum(axis=1) / counts[present]).sum())
+
+
+def _sweep_kmeans(X: np.ndarray, k: int, scalable: bool, chunk_rows: int, sample_size: int,
+                  random_state: int) -> Tuple[int, float, float]:
+    labels, _ = cluster_labels(X, k, "K-Means", scalable, chunk_rows, random_state)
+    return k, within_cluster_ss(X, labels), sampled_silhouette(X, labels, sample_size, random_state)
+
+
+def k_sweep(X: np.ndarray, k_values: List[int], algorithm: str, scalable: bool = False,
+            chunk_rows: int = CHUNK_ROWS, sample_size: int = SILHOUETTE_SAMPLE, random_state: int = 42,
+            n_jobs: Optional[int] = None) -> pd.DataFrame:
+    """Inertia and (sampled) silhouette for each k, for an elbow plot.
+
+    K-Means fits run in parallel, one k per process. Hierarchical sweeps build their tree once (a Ward
+    linkage, or the BIRCH CF-tree at scale) and only re-cut it for each k.
+    """
+    rows: List[Tuple[int, float, float]] = []
+    if algorithm == "K-Means":
+        n_jobs = n_jobs or max(1, (os.cpu_count() or 2) - 1)
+        if n_jobs == 1 or len(k_values) == 1:
+            rows = [_sweep_kmeans(X, k, scalable, chunk_rows, sample_size, random_state) for k in k_values]
+        else:
+            rows = Parallel(n_jobs=min(n_jobs, len(k_values)), backend='loky')(
+                delayed(_sweep_kmeans)(X, k, scalable, chunk_rows, sample_size, random_state) for k in k_values)
+    elif scalable or len(X) > HIERARCHICAL_MAX_ROWS:
+        tree = fit_birch_tree(X, chunk_rows)
+        subclusters = _predict(tree, X, chunk_rows)
+        for k in k_values:
+            labels = _birch_labels(tree, subclusters, k, random_state)
+            rows.append((k, within_cluster_ss(X, labels), sampled_silhouette(X, labels, sample_size, random_state)))
+    else:
+        from scipy.cluster.hierarchy import fcluster, linkage
+        tree = linkage(X, method='ward')
+        for k in k_values:
+            labels = fcluster(tree, k, criterion='maxclust') - 1
+            rows.append((k, within_cluster_ss(X, labels), sampled_silhouette(X, labels, sample_size, random_state)))
+
+    return pd.DataFrame(rows, columns=['Clusters', 'Inertia', 'Silhouette']).sort_values('Clusters') \
+        .reset_index(drop=True)
+
+
+def assign_to_rows(df: pd.DataFrame, index: pd.Index, labels: np.ndarray, column: str = 'Cluster') -> pd.DataFrame:
+    """Copy of the full dataset with a cluster column; rows that were not clustered (missing values) get <NA>"""
+    result = df.copy()
+    result[column] = pd.Series(labels, index=index).reindex(df.index).astype('Int64')
+    return result
+
+
+def plot_sample(n_rows: int, max_points: int = 20000, random_state: int = 42) -> Optional[np.ndarray]:
+    """Row positions to draw in a scatter plot, or None to draw every row"""
+    if n_rows <= max_points:
+        return None
+    return np.sort(np.random.RandomState(random_state).choice(n_rows, max_points, replace=False))
+
+
+def describe_method(method: str, algorithm: str, n_rows: int) -> Optional[str]:
+    """Explanation shown when the requested algorithm was replaced by its scalable counterpart"""
+    if method == "BIRCH" and algorithm == "Hierarchical" and n_rows > HIERARCHICAL_MAX_ROWS:
+        return (f"{n_rows:,} rows is beyond exact hierarchical clustering ({HIERARCHICAL_MAX_ROWS:,}); "
+                f"used BIRCH, which clusters a compact CF-tree and assigns every row")
+    return None
@@ -1,4 +1,5 @@
 import streamlit as st
+import hashlib
 import time
 import uuid
 from typing import Dict, List, Any
@@ -6,30 +7,59 @@ import json
 import importlib
 import inspect
 from difflib import SequenceMatcher
+from math import log1p
+from utils.user_store import get_user_store
+from utils.artifact_store import serve_download
+
+
+def get_user_id() -> str:
+    """Return the signed-in account's user id, or a new id for an anonymous session.
+
+    The id is never read from the page URL, where anyone given the link would share the same state.
+    """
+    account = (st.user.get('sub') or st.user.get('email')) if st.user.get('is_logged_in') else None
+    if account:
+        return hashlib.sha256(f"{st.user.get('iss', '')}|{account}".encode()).hexdigest()[:32]
+    return uuid.uuid4().hex
+
+
+def _bind_user_state():
+    """Point the session's recents, favorites, history and settings at the store's current objects"""
+    state = get_user_store().load(st.session_state.user_id)
+    st.session_state.recent_tools = state.recent_tools
+    st.session_state.favorites = state.favorites
+    st.session_state.history = state.history
+    st.session_state.settings = state.settings
 
 
 def init_session_state():
-    """Initialize session state variables"""
-    if 'recent_tools' not in st.session_state:
-        st.session_state.recent_tools = []
-    if 'favorites' not in st.session_state:
-        st.session_state.favorites = []
-    if 'history' not in st.session_state:
-        st.session_state.history = []
-    if 'settings' not in st.session_state:
-        st.session_state.settings = {
-            'theme': 'light',
-            'auto_save': True,
-            'show_tips': True
-        }
+    """Initialize session state variables from the persistent user store"""
+    if 'user_id' not in st.session_state:
+        st.session_state.user_id = get_user_id()
+        # Links shared while ids were kept in the URL
+        if 'uid' in st.query_params:
+            del st.query_params['uid']
+
+    # The store may have evicted and reloaded this user since the last rerun, so bind on every rerun
+    _bind_user_state()
+
+
+def _persist_favorites():
+    """Write the session's favorites through to the user store"""
+    get_user_store().set_favorites(st.session_state.user_id, st.session_state.favorites)
+    _bind_user_state()
 
 
 def add_to_recent(tool_name: str):
-    """Add tool to recent tools list"""
-    if tool_name not in st.session_state.recent_tools:
-        st.session_state.recent_tools.append(tool_name)
-        if len(st.session_state.recent_tools) > 10:
-            st.session_state.recent_tools.pop(0)
+    """Add tool to recent tools list and count it towards tool popularity"""
+    store = get_user_store()
+    store.add_recent(st.session_state.user_id, tool_name)
+    _bind_user_state()
+
+    # Tool pages call this on every rerun; only count switching to a tool as a use
+    if st.session_state.get('last_opened_tool') != tool_name:
+        st.session_state.last_opened_tool = tool_name
+        store.record_tool_use(tool_name.split(' - ', 1)[-1])
 
 
 def add_to_history(operation: str, details: Dict[str, Any]):
@@ -40,9 +70,8 @@ def add_to_history(operation: str, details: Dict[str, Any]):
         'operation': operation,
         'details': details
     }
-    st.session_state.history.append(history_entry)
-    if len(st.session_state.history) > 100:
-        st.session_state.history.pop(0)
+    get_user_store().add_history(st.session_state.user_id, history_entry)
+    _bind_user_state()
 
 
 def display_tool_grid(categories: Dict[str, Any]):
@@ -206,6 +235,8 @@ def search_tools(query: str, categories: Dict[str, Any], filter_category: str =
 
     # Search through all tools
     all_matches = []
+    popularity = get_user_store().popularity()
+    max_uses = max(popularity.values(), default=0)
 
     for category_name, category_info in tool_index.items():
         # Apply category filter
@@ -222,6 +253,10 @@ def search_tools(query: str, categories: Dict[str, Any], filter_category: str =
             total_score = (name_score * 0.6) + (subcategory_score * 0.3) + (category_score * 0.1)
 
             if total_score > 0.3:  # Minimum threshold
+                # Boost frequently used tools among matches, without creating new matches
+                if max_uses:
+                    total_score += 0.1 * log1p(popularity.get(tool['name'], 0)) / log1p(max_uses)
+
                 all_matches.append({
                     'name': tool['name'],
                     'description': f"{tool['subcategory']} tool from {category_name}",
@@ -305,13 +340,22 @@ def show_progress_bar(text: str, duration: int = 3):
 
 
 def create_download_button(data: bytes, filename: str, mime_type: str = "application/octet-stream"):
-    """Create a download button for processed data"""
-    return st.download_button(
-        label=f"📥 Download {filename}",
-        data=data,
-        file_name=filename,
-        mime=mime_type
-    )
+    """Create a download button for processed data (large results are served from disk)"""
+    return serve_download(data, filename, mime_type)
+
+
+def display_test_results(results, alpha: float = 0.05, filename: str = "test_results.csv"):
+    """Display a batch hypothesis-test table (most significant first) with a CSV download"""
+    st.markdown("### 📊 Batch Test Results")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Tests Run", int(results['P-Value'].notna().sum()))
+    with col2:
+        st.metric("Significant", int(results['Significant'].sum()))
+    with col3:
+        st.metric("Significance Level (α)", alpha)
+    st.dataframe(results)
+    create_download_button(results.to_csv(index=False).encode(), filename, "text/csv")
 
 
 def display_comparison(original_data, processed_data, title: str = "Comparison"):
@@ -393,6 +437,7 @@ def add_to_favorites(tool_name: str, category: str, module: str = ""):
         'usage_count': 0
     }
     st.session_state.favorites.append(favorite)
+    _persist_favorites()
     show_success_message(f"Added {tool_name} to favorites!")
     return True
 
@@ -404,6 +449,7 @@ def remove_from_favorites(tool_name: str, category: str):
         if not (fav['name'] == tool_name and fav['category'] == category)
     ]
     if len(st.session_state.favorites) < original_length:
+        _persist_favorites()
         show_success_message(f"Removed {tool_name} from favorites!")
         return True
     return False
@@ -419,6 +465,7 @@ def update_favorite_usage(tool_name: str, category: str):
         if fav['name'] == tool_name and fav['category'] == category:
             fav['usage_count'] = fav.get('usage_count', 0) + 1
             fav['last_used'] = int(time.time())
+            _persist_favorites()
             break
 
 def save_to_favorites(tool_name: str, settings: Dict[str, Any]):
@@ -430,6 +477,7 @@ def save_to_favorites(tool_name: str, settings: Dict[str, Any]):
         'timestamp': int(time.time())
     }
     st.session_state.favorites.append(favorite)
+    _persist_favorites()
     show_success_message(f"Saved {tool_name} to favorites!")
 
 
@@ -493,7 +541,7 @@ def display_recent_tools_section():
     
     # Display recent tools in a horizontal layout
     cols = st.columns(min(5, len(st.session_state.recent_tools)))
-    for i, tool_name in enumerate(st.session_state.recent_tools[-5:]):  # Show last 5 tools
+    for i, tool_name in enumerate(list(st.session_state.recent_tools)[-5:]):  # Show last 5 tools
         with cols[i]:
             st.markdown(f"""
             <div style="
@@ -0,0 +1,210 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+try:
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+CORRELATION_METHODS = ['pearson', 'spearman', 'kendall']
+DEFAULT_BLOCK_SIZE = 256
+# Heatmaps wider than this are clustered and block-averaged down to this many cells per side
+MAX_HEATMAP_CELLS = 60
+MAX_ANNOTATED_CELLS = 25
+# Hierarchical clustering needs the full condensed distance matrix, so very wide matrices keep column order
+MAX_CLUSTER_COLUMNS = 4000
+_PAIR_ROWS_PER_BLOCK = 512
+
+
+def _standardize(df: pd.DataFrame) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+    """Centered, unit-scale float32 columns (missing values as 0), their presence mask, and valid-column flags"""
+    rows, cols = df.shape
+    values = np.zeros((rows, cols), dtype=np.float32)
+    mask = None
+    valid = np.zeros(cols, dtype=bool)
+
+    for i in range(cols):
+        column = df.iloc[:, i].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(column)
+        if not present.all():
+            if mask is None:
+                mask = np.ones((rows, cols), dtype=np.float32)
+            mask[:, i] = present
+        observed = column[present]
+        if len(observed) < 2:
+            continue
+        mean = observed.mean()
+        scale = observed.std()
+        if not scale > 0:
+            continue
+        valid[i] = True
+        values[present, i] = (observed - mean) / scale
+
+    return values, mask, valid
+
+
+def _dense_block(values: np.ndarray, a: slice, b: slice) -> np.ndarray:
+    rows = values.shape[0]
+    return (values[:, a].T @ values[:, b]) / np.float32(rows)
+
+
+def _masked_block(values: np.ndarray, mask: np.ndarray, a: slice, b: slice) -> np.ndarray:
+    """Pearson r over the rows where both columns are present (pandas' pairwise-complete semantics)"""
+    xa, xb, ma, mb = values[:, a], values[:, b], mask[:, a], mask[:, b]
+    n = ma.T @ mb
+    sum_a = xa.T @ mb
+    sum_b = ma.T @ xb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = xa.T @ xb - sum_a * sum_b / n
+        var_a = (xa * xa).T @ mb - sum_a * sum_a / n
+        var_b = ma.T @ (xb * xb) - sum_b * sum_b / n
+        r = cov / np.sqrt(var_a * var_b)
+    r[(n < 2) | ~(var_a > 0) | ~(var_b > 0)] = np.nan
+    return r
+
+
+def correlation_matrix(df: pd.DataFrame, method: str = 'pearson', block_size: int = DEFAULT_BLOCK_SIZE,
+                       max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Correlation matrix of the numeric columns of df, computed as blockwise float32 matrix products.
+
+    Columns are standardized once and every pair of column blocks is multiplied on a thread pool (the
+    BLAS products release the GIL). Missing values are handled pairwise like DataFrame.corr. Spearman
+    is Pearson over average ranks; with missing values the ranks are taken per column rather than per
+    pair. Kendall has no product form and is delegated to pandas.
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    df = df.select_dtypes(include=[np.number, 'bool'])
+    if method == 'kendall':
+        return df.corr(method='kendall')
+    if method == 'spearman':
+        df = df.rank(method='average')
+
+    columns = df.columns
+    values, mask, valid = _standardize(df)
+    size = len(columns)
+    result = np.full((size, size), np.nan, dtype=np.float32)
+
+    blocks = [slice(start, min(start + block_size, size)) for start in range(0, size, block_size)]
+    tasks = [(a, b) for i, a in enumerate(blocks) for b in blocks[i:]]
+
+    def run(task):
+        a, b = task
+        block = _dense_block(values, a, b) if mask is None else _masked_block(values, mask, a, b)
+        return a, b, block
+
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+    if max_workers > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            computed = list(executor.map(run, tasks))
+    else:
+        computed = [run(task) for task in tasks]
+
+    for a, b, block in computed:
+        result[a, b] = block
+        result[b, a] = block.T
+
+    np.clip(result, -1, 1, out=result)
+    result[~valid, :] = np.nan
+    result[:, ~valid] = np.nan
+    np.fill_diagonal(result, np.where(valid, 1.0, np.nan))
+    return pd.DataFrame(result.astype(np.float64), index=columns, columns=columns)
+
+
+def top_pairs(corr: pd.DataFrame, threshold: Optional[float] = None, k: Optional[int] = None) -> pd.DataFrame:
+    """Distinct column pairs with |r| > threshold, strongest first when k is given (then only the top k).
+
+    The upper triangle is scanned in row blocks, so wide matrices never materialize all p*(p-1)/2 pairs.
+    Without k, pairs come back in matrix order.
+    """
+    values = corr.to_numpy(dtype=np.float64)
+    size = len(values)
+    limit = -1.0 if threshold is None else threshold
+    found_rows: List[np.ndarray] = []
+    found_cols: List[np.ndarray] = []
+
+    for start in range(0, size, _PAIR_ROWS_PER_BLOCK):
+        block = np.abs(values[start:start + _PAIR_ROWS_PER_BLOCK])
+        upper = np.triu(np.ones(block.shape, dtype=bool), k=start + 1)
+        scores = np.where(upper & ~np.isnan(block), block, -np.inf)
+        rows, cols = np.nonzero(scores > limit)
+        if k is not None and len(rows) > k:
+            keep = np.argpartition(-scores[rows, cols], k - 1)[:k]
+            keep.sort()
+            rows, cols = rows[keep], cols[keep]
+        found_rows.append(rows + start)
+        found_cols.append(cols)
+
+    rows = np.concatenate(found_rows) if found_rows else np.array([], dtype=np.intp)
+    cols = np.concatenate(found_cols) if found_cols else np.array([], dtype=np.intp)
+    pair_values = values[rows, cols]
+
+    if k is not None:
+        if len(rows) > k:
+            keep = np.argpartition(-np.abs(pair_values), k - 1)[:k]
+            rows, cols, pair_values = rows[keep], cols[keep], pair_values[keep]
+        # Strongest first; ties keep matrix order
+        order = np.lexsort((cols, rows, -np.abs(pair_values)))
+        rows, cols, pair_values = rows[order], cols[order], pair_values[order]
+
+    names = corr.columns
+    return pd.DataFrame({
+        'Variable 1': names[rows],
+        'Variable 2': names[cols],
+        'Correlation': pair_values
+    })
+
+
+def cluster_order(corr: pd.DataFrame) -> np.ndarray:
+    """Column order that places strongly correlated columns next to each other"""
+    size = len(corr)
+    if not HAS_SCIPY or size < 3 or size > MAX_CLUSTER_COLUMNS:
+        return np.arange(size)
+    distance = 1 - np.abs(np.nan_to_num(corr.to_numpy(dtype=np.float64), nan=0.0))
+    np.fill_diagonal(distance, 0)
+    distance = np.clip((distance + distance.T) / 2, 0, None)
+    return leaves_list(linkage(squareform(distance, checks=False), method='average'))
+
+
+def downsample_matrix(corr: pd.DataFrame, max_cells: int = MAX_HEATMAP_CELLS) -> pd.DataFrame:
+    """Block-average a square matrix to at most max_cells per side, labelling each bin by its first column"""
+    size = len(corr)
+    if size <= max_cells:
+        return corr
+    edges = np.unique(np.linspace(0, size, max_cells + 1).astype(int))
+    starts = edges[:-1]
+    values = corr.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    sums = np.add.reduceat(np.add.reduceat(np.where(present, values, 0), starts, axis=0), starts, axis=1)
+    counts = np.add.reduceat(np.add.reduceat(present.astype(np.int64), starts, axis=0), starts, axis=1)
+    with np.errstate(invalid='ignore'):
+        averaged = sums / counts
+    labels = [f"{corr.columns[start]} (+{end - start - 1})" if end - start > 1 else str(corr.columns[start])
+              for start, end in zip(starts, edges[1:])]
+    return pd.DataFrame(averaged, index=labels, columns=labels)
+
+
+def correlation_heatmap(corr: pd.DataFrame, title: str, cmap: str = 'coolwarm', figsize=(10, 8),
+                        annotate: bool = True, max_cells: int = MAX_HEATMAP_CELLS):
+    """Seaborn heatmap figure of a correlation matrix; wide matrices are clustered and downsampled first"""
+    plot_data = corr
+    if len(corr) > max_cells:
+        order = cluster_order(corr)
+        plot_data = downsample_matrix(corr.iloc[order, order], max_cells)
+        title = f"{title} ({len(corr)} columns, clustered and averaged)"
+    small = len(plot_data) <= MAX_ANNOTATED_CELLS
+
+    fig = plt.figure(figsize=figsize)
+    sns.heatmap(plot_data, annot=annotate and small, fmt='.2f', cmap=cmap, center=0, vmin=-1, vmax=1,
+                square=True, linewidths=0.5 if small else 0, cbar_kws={"shrink": .8})
+    plt.title(title)
+    plt.tight_layout()
+    return fig
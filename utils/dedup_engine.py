@@ -0,0 +1,348 @@
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils.artifact_store import ARTIFACT_DIR
+from utils.ingestion import (DEFAULT_MEMORY_BUDGET_MB, DELIMITED_FORMATS, iter_record_batches, source_size,
+                             stable_column_types)
+from utils.stream_convert import ConversionResult, OUTPUT_FILES, make_batch_writer
+
+DEFAULT_SPOOL_MAX_MB = 64
+MAX_PARTITIONS = 1024
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32; with a, x < 2**32, a*x+b stays below 2**64
+# Key of the second, independent row hash that makes out-of-core dedup keys 128 bits wide
+_CHECK_HASH_KEY = 'dedup-check-hash'
+
+# Stable pandas dtypes for Arrow columns, so a key hashes the same whether or not its batch had nulls
+_STABLE_TYPES = {
+    pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(), pa.uint8(): pd.UInt8Dtype(), pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(), pa.uint64(): pd.UInt64Dtype(), pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def _is_text(series: pd.Series) -> bool:
+    if isinstance(series.dtype, pd.ArrowDtype):
+        return pa.types.is_string(series.dtype.pyarrow_dtype) or pa.types.is_large_string(series.dtype.pyarrow_dtype)
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def _compared(series: pd.Series, normalize: bool) -> pd.Series:
+    """The column as duplicates are compared: text lower-cased as str(value).lower() with normalize"""
+    if normalize and _is_text(series):
+        return series.astype(str).str.lower()
+    return series
+
+
+def row_hashes(df: pd.DataFrame, subset: Optional[Sequence[str]] = None, normalize: bool = False,
+               hash_key: Optional[str] = None) -> np.ndarray:
+    """64-bit hash per row of the subset columns, built one column at a time without copying the frame.
+
+    With normalize, text columns are compared case-insensitively (as str(value).lower()). Object columns
+    hash values by their text, so 1 and '1' hash alike: equal hashes only make rows duplicate candidates.
+    """
+    columns = list(subset) if subset else list(df.columns)
+    key = {'hash_key': hash_key} if hash_key else {}
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for position, name in enumerate(columns):
+        column_hash = pd.util.hash_pandas_object(_compared(df[name], normalize), index=False, **key).to_numpy()
+        # Order-dependent mix so (a, b) and (b, a) hash differently
+        hashes = (hashes * _MIX) ^ (column_hash + np.uint64(position))
+    return hashes
+
+
+def _confirmed(df: pd.DataFrame, positions: np.ndarray, subset: Optional[Sequence[str]],
+               normalize: bool) -> pd.DataFrame:
+    """Compared values of the given rows, to check hash matches against"""
+    columns = list(subset) if subset else list(df.columns)
+    rows = df.iloc[positions]
+    return pd.DataFrame({i: _compared(rows[name], normalize) for i, name in enumerate(columns)})
+
+
+def duplicate_mask(hashes: np.ndarray, keep: Any = 'first', df: Optional[pd.DataFrame] = None,
+                   subset: Optional[Sequence[str]] = None, normalize: bool = False) -> np.ndarray:
+    """Rows that are duplicates under pandas' keep semantics ('first', 'last' or False).
+
+    Given the frame the hashes came from, rows with matching hashes are only candidates, confirmed with
+    DataFrame.duplicated on their actual values, so the result is exactly pandas'.
+    """
+    hashes = pd.Series(hashes, copy=False)
+    if df is None:
+        return hashes.duplicated(keep=keep).to_numpy()
+    # Equal rows always hash alike, so every earlier (or later) copy of a duplicate is a candidate too
+    candidates = np.flatnonzero(hashes.duplicated(keep=False).to_numpy())
+    mask = np.zeros(len(hashes), dtype=bool)
+    if len(candidates):
+        mask[candidates] = _confirmed(df, candidates, subset, normalize).duplicated(keep=keep).to_numpy()
+    return mask
+
+
+def duplicate_groups(hashes: np.ndarray, mask: Optional[np.ndarray] = None, limit: Optional[int] = None,
+                     df: Optional[pd.DataFrame] = None, subset: Optional[Sequence[str]] = None,
+                     normalize: bool = False) -> List[np.ndarray]:
+    """Row positions of each duplicate group, in order of first appearance.
+
+    Given the frame, groups are formed by actual values, as in duplicate_mask.
+    """
+    mask = duplicate_mask(hashes, False, df, subset, normalize) if mask is None else mask
+    positions = np.flatnonzero(mask)
+    if not len(positions):
+        return []
+    if df is None:
+        codes, _ = pd.factorize(hashes[positions])
+    else:
+        values = _confirmed(df, positions, subset, normalize)
+        codes = values.groupby(list(values.columns), sort=False, dropna=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    groups = np.split(positions[order], bounds)
+    return groups[:limit] if limit else groups
+
+
+def _batch_frame(batch: pa.RecordBatch, subset: Optional[Sequence[str]]) -> pd.DataFrame:
+    if subset:
+        batch = batch.select(list(subset))
+    return batch.to_pandas(types_mapper=_STABLE_TYPES.get)
+
+
+def dedup_stream(source, input_format: str, settings: Optional[Dict[str, Any]] = None,
+                 subset: Optional[Sequence[str]] = None, keep: Any = 'first', normalize: bool = False,
+                 output_format: str = "CSV", output_settings: Optional[Dict[str, Any]] = None,
+                 memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB, progress_callback=None,
+                 preview_rows: int = 10) -> ConversionResult:
+    """Remove duplicate rows from a file larger than memory in two streaming passes.
+
+    Pass one hashes the subset columns of every batch and spills (hash, row number) pairs to disk,
+    partitioned by hash so each partition's hash set fits in the memory budget. Rows are keyed by two
+    independent 64-bit hashes, so a collision would need both to match. Each partition is then
+    deduplicated on its own into a disk-backed keep-mask, and pass two streams the file again, writing
+    only the kept rows. If a later block of a CSV/TSV contradicts the column types inferred from the
+    first one, the types are widened over the whole file and both passes restart.
+    """
+    reader_format = "JSON" if input_format == "JSON Lines" else input_format
+    args = (source, reader_format, settings, subset, keep, normalize, output_format, output_settings,
+            memory_budget_mb, progress_callback, preview_rows)
+    try:
+        return _dedup_stream(*args, None)
+    except pa.ArrowInvalid:
+        if reader_format not in DELIMITED_FORMATS:
+            raise
+        return _dedup_stream(*args, stable_column_types(source, reader_format, settings))
+
+
+def _dedup_stream(source, reader_format: str, settings, subset, keep, normalize: bool, output_format: str,
+                  output_settings, memory_budget_mb: float, progress_callback, preview_rows: int,
+                  column_types: Optional[Dict[str, pa.DataType]]) -> ConversionResult:
+    start_time = time.perf_counter()
+    budget = memory_budget_mb * 1024 * 1024
+    partitions = int(min(max(math.ceil(source_size(source) * 6 / budget), 1), MAX_PARTITIONS))
+    spill_dir = tempfile.mkdtemp(prefix='dedup_', dir=_ensure_dir(ARTIFACT_DIR))
+
+    try:
+        # Pass 1: hash every row and spill the hashes by partition
+        files = [open(os.path.join(spill_dir, f'part_{p:04d}.bin'), 'wb') for p in range(partitions)]
+        total_rows = 0
+        try:
+            for batch in iter_record_batches(source, reader_format, settings, column_types=column_types):
+                frame = _batch_frame(batch, subset)
+                hashes = row_hashes(frame, normalize=normalize)
+                checks = row_hashes(frame, normalize=normalize, hash_key=_CHECK_HASH_KEY)
+                rows = np.arange(total_rows, total_rows + len(hashes), dtype=np.int64)
+                parts = (hashes >> np.uint64(54)) % np.uint64(partitions)
+                for p in np.unique(parts):
+                    selected = parts == p
+                    entries = np.empty((int(selected.sum()), 3), dtype=np.uint64)
+                    entries[:, 0] = hashes[selected]
+                    entries[:, 1] = checks[selected]
+                    entries[:, 2] = rows[selected]
+                    files[int(p)].write(entries.tobytes())
+                total_rows += len(hashes)
+        finally:
+            for f in files:
+                f.close()
+        if progress_callback:
+            progress_callback(0.4)
+
+        # Per partition: find duplicates and clear them in a memory-mapped keep-mask
+        keep_mask = np.memmap(os.path.join(spill_dir, 'keep.mask'), dtype=bool, mode='w+',
+                              shape=(max(total_rows, 1),))
+        keep_mask[:] = True
+        for p in range(partitions):
+            entries = np.fromfile(os.path.join(spill_dir, f'part_{p:04d}.bin'), dtype=np.uint64).reshape(-1, 3)
+            if len(entries):
+                # Entries were appended in row order, so keep='first'/'last' match a full-frame pass
+                duplicated = pd.DataFrame(entries[:, :2], copy=False).duplicated(keep=keep).to_numpy()
+                dropped = entries[duplicated, 2].astype(np.int64)
+                keep_mask[dropped] = False
+            if progress_callback:
+                progress_callback(0.4 + 0.2 * (p + 1) / partitions)
+
+        # Pass 2: stream the file again and write the kept rows
+        output = tempfile.SpooledTemporaryFile(max_size=DEFAULT_SPOOL_MAX_MB * 1024 * 1024, dir=ARTIFACT_DIR)
+        writer = None
+        preview = None
+        offset = 0
+        kept = 0
+        try:
+            for batch in iter_record_batches(source, reader_format, settings, column_types=column_types):
+                mask = pa.array(np.asarray(keep_mask[offset:offset + batch.num_rows]))
+                offset += batch.num_rows
+                batch = batch.filter(mask)
+                if writer is None:
+                    writer = make_batch_writer(output_format, output, batch.schema, output_settings or {})
+                if preview is None or len(preview) < preview_rows:
+                    head = batch.slice(0, preview_rows).to_pandas()
+                    preview = head if preview is None else pd.concat([preview, head]).head(preview_rows)
+                writer.write(batch)
+                kept += batch.num_rows
+                if progress_callback:
+                    progress_callback(0.6 + 0.4 * offset / max(total_rows, 1))
+        except Exception:
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            output.close()
+            raise
+        if writer is not None:
+            writer.close()
+        del keep_mask
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    bytes_out = output.tell()
+    output.seek(0)
+    filename, mime_type = OUTPUT_FILES[output_format]
+    stats = {
+        'rows': total_rows,
+        'kept_rows': kept,
+        'removed_rows': total_rows - kept,
+        'partitions': partitions,
+        'bytes_out': bytes_out,
+        'elapsed_seconds': elapsed,
+        'rows_per_second': total_rows / elapsed,
+    }
+    return ConversionResult(output, filename.replace('converted', 'deduplicated'), mime_type, stats, preview)
+
+
+def _ensure_dir(path: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# Near-duplicate detection
+
+def _shingle_hashes(text: str, size: int) -> np.ndarray:
+    """32-bit hashes of the character shingles of whitespace-normalized, lower-cased text"""
+    text = re.sub(r'\s+', ' ', text.lower()).strip()
+    if len(text) <= size:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signatures(texts: Iterable[str], num_perm: int = 128, shingle_size: int = 4, seed: int = 1,
+                       chunk_shingles: int = 200_000) -> np.ndarray:
+    """MinHash signature matrix (rows x num_perm) over character shingles"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+
+    shingle_sets = [_shingle_hashes(str(t), shingle_size) for t in texts]
+    signatures = np.full((len(shingle_sets), num_perm), _MAX_HASH, dtype=np.uint64)
+    start = 0
+    # Process rows in blocks so the (shingles x permutations) matrix stays bounded
+    while start < len(shingle_sets):
+        stop, total = start, 0
+        while stop < len(shingle_sets) and (total == 0 or total + len(shingle_sets[stop]) <= chunk_shingles):
+            total += len(shingle_sets[stop])
+            stop += 1
+        block = shingle_sets[start:stop]
+        values = np.concatenate(block)
+        offsets = np.cumsum([0] + [len(s) for s in block[:-1]])
+        permuted = (values[:, None] * a + b) % _PRIME
+        signatures[start:stop] = np.minimum.reduceat(permuted, offsets, axis=0)
+        start = stop
+    return signatures
+
+
+def _lsh_bands(num_perm: int, threshold: float):
+    """Band count and width whose S-curve threshold (1/b)^(1/r) is closest to the target"""
+    best = None
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def _find(parents: np.ndarray, i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def near_duplicate_groups(texts: pd.Series, threshold: float = 0.8, num_perm: int = 128,
+                          shingle_size: int = 4, max_bucket_pairs: int = 50) -> List[np.ndarray]:
+    """Groups of row positions whose text has estimated Jaccard similarity >= threshold (MinHash + LSH).
+
+    Candidate pairs come from LSH band buckets and are confirmed on the full signatures; groups are the
+    connected components of confirmed pairs, each returned in row order.
+    """
+    values = texts.fillna('').astype(str).to_numpy()
+    if len(values) < 2:
+        return []
+    signatures = minhash_signatures(values, num_perm, shingle_size)
+
+    # Rows with identical signatures are grouped directly; LSH only runs on distinct signatures
+    codes, _ = pd.factorize(pd.Series([s.tobytes() for s in signatures]))
+    _, representatives = np.unique(codes, return_index=True)
+    unique_signatures = signatures[representatives]
+
+    parents = np.arange(len(representatives))
+    bands, rows = _lsh_bands(num_perm, threshold)
+    for band in range(bands):
+        keys = pd.Series([s.tobytes() for s in unique_signatures[:, band * rows:(band + 1) * rows]])
+        band_codes, _ = pd.factorize(keys)
+        order = np.argsort(band_codes, kind='stable')
+        bounds = np.flatnonzero(np.diff(band_codes[order])) + 1
+        for bucket in np.split(order, bounds):
+            if len(bucket) < 2:
+                continue
+            # Large buckets are confirmed against neighbours only, to stay near-linear
+            if len(bucket) <= max_bucket_pairs:
+                pairs = [(i, j) for k, i in enumerate(bucket) for j in bucket[k + 1:]]
+            else:
+                pairs = list(zip(bucket[:-1], bucket[1:]))
+            for i, j in pairs:
+                root_i, root_j = _find(parents, i), _find(parents, j)
+                if root_i == root_j:
+                    continue
+                similarity = np.mean(unique_signatures[i] == unique_signatures[j])
+                if similarity >= threshold:
+                    parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    roots = np.array([_find(parents, i) for i in range(len(representatives))])
+    # Map every original row to its signature's component
+    row_roots = roots[codes]
+    groups = duplicate_groups(row_roots.astype(np.uint64))
+    return [g for g in groups if len(g) > 1]
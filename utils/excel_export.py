@@ -0,0 +1,92 @@
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import pandas as pd
+from openpyxl import Workbook
+
+from utils.artifact_store import ARTIFACT_DIR
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Hard row limit of an .xlsx worksheet, header row included
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_SHEET_NAME = 31
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_SPOOL_MAX_MB = 32
+
+Sheets = Union[Dict[str, pd.DataFrame], Iterable[Tuple[str, pd.DataFrame]]]
+
+
+def _sheet_names(base: str, parts: int) -> List[str]:
+    """Name the sheets a frame is split into: Data, Data_2, Data_3, ..."""
+    base = base[:EXCEL_MAX_SHEET_NAME] or "Sheet"
+    names = [base]
+    for part in range(2, parts + 1):
+        suffix = f"_{part}"
+        names.append(base[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix)
+    return names
+
+
+def _is_tz_aware(dtype) -> bool:
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return True
+    return isinstance(dtype, pd.ArrowDtype) and getattr(dtype.pyarrow_dtype, 'tz', None) is not None
+
+
+def _wall_clock(series: pd.Series) -> pd.Series:
+    """Naive local times of a tz-aware column (NumPy- or Arrow-backed)"""
+    if isinstance(series.dtype, pd.ArrowDtype):
+        # tz_localize(None) on Arrow timestamps returns UTC, not wall-clock time
+        arrow_type = series.dtype.pyarrow_dtype
+        series = series.astype(pd.DatetimeTZDtype(arrow_type.unit, arrow_type.tz))
+    return series.dt.tz_localize(None)
+
+
+def _cell_rows(df: pd.DataFrame, chunk_rows: int) -> Iterator[list]:
+    """Yield plain-Python row lists chunk by chunk, with missing values as empty cells"""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        # Excel has no time zones; write wall-clock time
+        for name in chunk.columns[chunk.dtypes.map(_is_tz_aware)]:
+            chunk = chunk.assign(**{name: _wall_clock(chunk[name])})
+        values = chunk.astype(object).where(chunk.notna(), None)
+        yield from values.values.tolist()
+
+
+def _prepare(df: pd.DataFrame, index: bool) -> pd.DataFrame:
+    if index:
+        df = df.reset_index()
+    # Flatten MultiIndex / non-string headers the same way to_excel would display them
+    df = df.copy(deep=False)
+    df.columns = [" ".join(map(str, c)) if isinstance(c, tuple) else str(c) for c in df.columns]
+    return df
+
+
+def write_excel(sheets: Sheets, index: bool = False, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                spool_max_mb: int = DEFAULT_SPOOL_MAX_MB):
+    """Write one or more DataFrames to an .xlsx workbook with openpyxl's write-only mode.
+
+    Rows are streamed into the workbook in chunks instead of building a cell object per value, and the
+    workbook is saved into a spooled temporary file (returned positioned at the start). Frames longer
+    than the worksheet limit are split across numbered sheets.
+    """
+    items = sheets.items() if isinstance(sheets, dict) else sheets
+    workbook = Workbook(write_only=True)
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+
+    for sheet_name, df in items:
+        df = _prepare(df, index)
+        parts = max(1, -(-len(df) // rows_per_sheet))
+        for part, name in enumerate(_sheet_names(str(sheet_name), parts)):
+            worksheet = workbook.create_sheet(title=name)
+            worksheet.append(list(df.columns))
+            part_df = df.iloc[part * rows_per_sheet:(part + 1) * rows_per_sheet]
+            for row in _cell_rows(part_df, chunk_rows):
+                worksheet.append(row)
+
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_mb * 1024 * 1024, dir=ARTIFACT_DIR)
+    workbook.save(output)
+    output.seek(0)
+    return output
+
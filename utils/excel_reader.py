@@ -0,0 +1,249 @@
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.upload_cache import UploadCache
+
+SHADOW_DIR = os.environ.get('EXCEL_SHADOW_DIR', os.path.join(tempfile.gettempdir(), 'inonebox_excel_shadow'))
+# Shadow copies unused for this long are deleted, then the least recently used until the directory fits the budget
+SHADOW_TTL_SECONDS = int(os.environ.get('EXCEL_SHADOW_TTL', str(7 * 24 * 3600)))
+SHADOW_BUDGET_MB = int(os.environ.get('EXCEL_SHADOW_BUDGET_MB', '2048'))
+
+# Strings pandas treats as missing by default when parsing spreadsheets
+DEFAULT_NA_VALUES = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                     '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'}
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+
+def fast_engine_name(filename: str) -> str:
+    """Name of the engine the fast reader will use for this workbook"""
+    if HAS_CALAMINE:
+        return "calamine"
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        return "openpyxl (read-only stream)"
+    return "pandas default"
+
+
+def _column_names(header_values: Sequence[Any]) -> List[str]:
+    """Header cells to column names, mirroring pandas' Unnamed/duplicate handling"""
+    names, seen = [], {}
+    for i, value in enumerate(header_values):
+        name = f"Unnamed: {i}" if value is None or value == '' else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _parse_openpyxl(data: bytes, sheet_name: str, header: Optional[int], skiprows: int, nrows: Optional[int],
+                    usecols: Optional[List[str]], na_values: Sequence[str]) -> pd.DataFrame:
+    """Parse one sheet from openpyxl's read-only row stream, applying row limit and projection as rows arrive"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = islice(workbook[sheet_name].iter_rows(values_only=True), skiprows, None)
+
+        names = None
+        if header is not None:
+            header_row = next(islice(rows, header, None), None)
+            names = _column_names(header_row or ())
+
+        if nrows:
+            rows = islice(rows, nrows)
+
+        indices = None
+        if usecols and names is not None:
+            indices = [names.index(c) for c in usecols if c in names]
+            names = [names[i] for i in indices]
+
+        width = len(names) if names is not None else 0
+        records = []
+        for row in rows:
+            if indices is not None:
+                row = tuple(row[i] if i < len(row) else None for i in indices)
+            elif names is None:
+                width = max(width, len(row))
+            records.append(row)
+    finally:
+        workbook.close()
+
+    # Read-only sheets often report trailing blank rows; pandas drops them
+    while records and all(v is None for v in records[-1]):
+        records.pop()
+
+    if names is None:
+        names = list(range(width))
+    elif indices is None:
+        width = max([len(names)] + [len(r) for r in records])
+        names = names + [f"Unnamed: {i}" for i in range(len(names), width)]
+    records = [r + (None,) * (len(names) - len(r)) if len(r) < len(names) else r[:len(names)] for r in records]
+
+    df = pd.DataFrame.from_records(records, columns=names, coerce_float=True)
+
+    # Missing-value strings only matter in text columns
+    na_set = DEFAULT_NA_VALUES | set(na_values or [])
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        df[column] = values.mask(values.isin(na_set))
+    return df.infer_objects()
+
+
+def parse_sheet(data: bytes, filename: str, sheet_name: str, options: Dict[str, Any]) -> pd.DataFrame:
+    """Parse one sheet with the fastest available engine, pushing row limit and column projection down"""
+    header = options.get('header', 0)
+    skiprows = options.get('skiprows', 0) or 0
+    nrows = options.get('nrows') or None
+    usecols = options.get('usecols') or None
+    na_values = options.get('na_values') or []
+
+    if not HAS_CALAMINE and filename.lower().endswith(('.xlsx', '.xlsm')):
+        return _parse_openpyxl(data, sheet_name, header, skiprows, nrows, usecols, na_values)
+
+    return pd.read_excel(io.BytesIO(data), sheet_name=sheet_name, header=header, skiprows=skiprows or None,
+                         nrows=nrows, usecols=usecols, na_values=na_values or None,
+                         engine='calamine' if HAS_CALAMINE else None)
+
+
+def _shadow_path(digest: str, sheet_name: str, options: Dict[str, Any]) -> str:
+    """Shadow copies are keyed by workbook digest and the options that change how cells are parsed"""
+    parse_options = {k: options.get(k) for k in ('header', 'skiprows', 'na_values')}
+    parse_options['sheet'] = sheet_name
+    return os.path.join(SHADOW_DIR, UploadCache.make_key('xlsx', digest, parse_options) + '.parquet')
+
+
+def _read_shadow(path: str, options: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """Read a projected, row-limited slice of a shadow copy"""
+    if not os.path.exists(path):
+        return None
+    try:
+        # Mark as recently used for sweep_shadows
+        os.utime(path)
+        parquet_file = pq.ParquetFile(path)
+        usecols = options.get('usecols') or None
+        columns = [c for c in usecols if c in parquet_file.schema_arrow.names] if usecols else None
+        nrows = options.get('nrows') or None
+        if nrows:
+            # Stop decoding row groups once enough rows have been read
+            batches, rows = [], 0
+            for batch in parquet_file.iter_batches(batch_size=min(nrows, 65536), columns=columns):
+                batches.append(batch)
+                rows += batch.num_rows
+                if rows >= nrows:
+                    break
+            table = pa.Table.from_batches(batches) if batches else parquet_file.read(columns=columns)
+            table = table.slice(0, nrows)
+        else:
+            table = parquet_file.read(columns=columns, use_pandas_metadata=True)
+        return table.to_pandas()
+    except Exception:
+        return None
+
+
+def _write_shadow(path: str, df: pd.DataFrame):
+    """Persist a full-sheet parse; sheets Arrow cannot represent are simply not shadowed"""
+    try:
+        os.makedirs(SHADOW_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(path + '.tmp'):
+            os.remove(path + '.tmp')
+
+
+def sweep_shadows(shadow_dir: str = SHADOW_DIR, ttl_seconds: int = SHADOW_TTL_SECONDS,
+                   budget_mb: float = SHADOW_BUDGET_MB):
+    """Delete shadow copies (and leftover partial writes) that expired or exceed the disk budget"""
+    try:
+        entries = [entry for entry in os.scandir(shadow_dir) if entry.is_file()]
+    except OSError:
+        return
+    now = time.time()
+    files = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort()
+
+    total = sum(size for _, size, _ in files)
+    budget = budget_mb * 1024 * 1024
+    for mtime, size, path in files:
+        if mtime >= now - ttl_seconds and total <= budget:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _parse_and_shadow(data: bytes, filename: str, sheet_name: str, options: Dict[str, Any],
+                      shadow_path: Optional[str]) -> pd.DataFrame:
+    """Process-pool worker: parse one sheet and, for full reads, write its shadow copy"""
+    df = parse_sheet(data, filename, sheet_name, options)
+    if shadow_path and not options.get('nrows') and not options.get('usecols'):
+        _write_shadow(shadow_path, df)
+    return df
+
+
+def read_excel_sheets(data: bytes, filename: str, sheet_names: List[str], digest: Optional[str] = None,
+                      options: Optional[Dict[str, Any]] = None, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Read several sheets at once: shadow copies first, remaining sheets parsed in parallel processes.
+
+    `options` takes header, skiprows, nrows, usecols (column names) and na_values. Returns
+    {'sheets': {name: DataFrame}, 'stats': {...}} with per-sheet source ('shadow' or engine) and timing.
+    """
+    options = options or {}
+    start_time = time.perf_counter()
+    sheets, sources = {}, {}
+
+    pending = []
+    for name in sheet_names:
+        path = _shadow_path(digest, name, options) if digest else None
+        df = _read_shadow(path, options) if path else None
+        if df is not None:
+            sheets[name], sources[name] = df, 'shadow'
+        else:
+            pending.append((name, path))
+
+    engine = fast_engine_name(filename)
+    max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+    if len(pending) > 1 and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            futures = {name: executor.submit(_parse_and_shadow, data, filename, name, options, path)
+                       for name, path in pending}
+            for name, future in futures.items():
+                sheets[name], sources[name] = future.result(), engine
+    else:
+        for name, path in pending:
+            sheets[name], sources[name] = _parse_and_shadow(data, filename, name, options, path), engine
+    if digest and pending:
+        sweep_shadows()
+
+    stats = {
+        'elapsed_seconds': time.perf_counter() - start_time,
+        'sources': sources,
+        'parsed_sheets': len(pending),
+        'shadow_hits': len(sheet_names) - len(pending)
+    }
+    return {'sheets': {name: sheets[name] for name in sheet_names}, 'stats': stats}
@@ -6,6 +6,8 @@ import json
 import csv
 from PIL import Image
 import pandas as pd
+from utils.tool_page import read_dataframe, read_image
+from utils.artifact_store import serve_download
 
 
 class FileHandler:
@@ -44,13 +46,8 @@ class FileHandler:
 
     @staticmethod
     def create_download_link(data: bytes, filename: str, mime_type: str = "application/octet-stream"):
-        """Create download button for processed files"""
-        return st.download_button(
-            label=f"📥 Download {filename}",
-            data=data,
-            file_name=filename,
-            mime=mime_type
-        )
+        """Create download button for processed files (large results are served from disk)"""
+        return serve_download(data, filename, mime_type)
 
     @staticmethod
     def process_text_file(uploaded_file) -> str:
@@ -66,22 +63,34 @@ class FileHandler:
 
     @staticmethod
     def process_image_file(uploaded_file) -> Optional[Image.Image]:
-        """Process image file upload"""
+        """Process image file upload (decoded once per content digest, returned as a private copy)"""
         try:
-            return Image.open(uploaded_file)
+            cached = read_image(uploaded_file)
+            image = cached.copy()
+            image.format = cached.format
+            return image
         except Exception as e:
             st.error(f"Error opening image: {str(e)}")
             return None
 
     @staticmethod
-    def process_csv_file(uploaded_file) -> Optional[pd.DataFrame]:
-        """Process CSV file upload"""
+    def process_csv_file(uploaded_file, **read_kwargs) -> Optional[pd.DataFrame]:
+        """Process CSV file upload (parsed once per content digest, returned as a private copy)"""
         try:
-            return pd.read_csv(uploaded_file)
+            return read_dataframe(uploaded_file, **read_kwargs).copy()
         except Exception as e:
             st.error(f"Error reading CSV: {str(e)}")
             return None
 
+    @staticmethod
+    def process_excel_file(uploaded_file, **read_kwargs) -> Optional[pd.DataFrame]:
+        """Process Excel file upload (parsed once per content digest, returned as a private copy)"""
+        try:
+            return read_dataframe(uploaded_file, **read_kwargs).copy()
+        except Exception as e:
+            st.error(f"Error reading Excel file: {str(e)}")
+            return None
+
     @staticmethod
     def process_json_file(uploaded_file) -> Optional[Dict[str, Any]]:
         """Process JSON file upload"""
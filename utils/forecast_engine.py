@@ -0,0 +1,306 @@
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.signal import lfilter
+
+from utils.artifact_store import ARTIFACT_DIR
+from utils.stream_convert import ConversionResult
+
+FORECAST_METHODS = ["Linear Trend", "Moving Average", "Exponential Smoothing", "Holt-Winters", "Seasonal Naive"]
+SEASONAL_METHODS = ("Holt-Winters", "Seasonal Naive")
+MOVING_AVERAGE_WINDOW = 5
+SMOOTHING_ALPHA = 0.3
+TREND_BETA = 0.1
+SEASONAL_GAMMA = 0.1
+# Season length suggested for each inferred date frequency (pandas offset prefix)
+SEASON_LENGTHS = {'min': 60, 'T': 60, 'h': 24, 'H': 24, 'D': 7, 'B': 5, 'W': 52, 'M': 12, 'MS': 12, 'ME': 12,
+                  'Q': 4, 'QS': 4, 'QE': 4}
+# Series are forecast in chunks of at most this many padded (series x time) cells
+CHUNK_CELLS = 2_000_000
+DEFAULT_SPOOL_MAX_MB = 64
+
+
+def _padded(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Left-aligned (series x time) matrix of consecutive series, NaN after each series ends"""
+    matrix = np.full((len(lengths), int(lengths.max()) if len(lengths) else 0), np.nan)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    matrix[rows, np.arange(len(values)) - np.repeat(starts, lengths)] = values
+    return matrix
+
+
+def _steps(horizon: int) -> np.ndarray:
+    return np.arange(1, horizon + 1)[None, :]
+
+
+def _linear_trend(Y: np.ndarray, lengths: np.ndarray, horizon: int) -> np.ndarray:
+    """Least-squares line over each series' first `lengths` points, extrapolated"""
+    t = np.arange(Y.shape[1], dtype=np.float64)[None, :]
+    used = t < lengths[:, None]
+    y = np.where(used, Y, 0.0)
+    n = lengths.astype(np.float64)
+    sum_t, sum_y = (used * t).sum(axis=1), y.sum(axis=1)
+    sum_tt, sum_ty = (used * t * t).sum(axis=1), (y * t).sum(axis=1)
+    denominator = n * sum_tt - sum_t ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(denominator > 0, (n * sum_ty - sum_t * sum_y) / denominator, 0.0)
+    intercept = (sum_y - slope * sum_t) / n
+    return intercept[:, None] + slope[:, None] * (lengths[:, None] - 1 + _steps(horizon))
+
+
+def _moving_average(Y: np.ndarray, lengths: np.ndarray, horizon: int) -> np.ndarray:
+    """Mean of the last MOVING_AVERAGE_WINDOW points, held flat"""
+    cumulative = np.concatenate([np.zeros((len(Y), 1)), np.nancumsum(Y, axis=1)], axis=1)
+    window = np.minimum(MOVING_AVERAGE_WINDOW, lengths)
+    rows = np.arange(len(Y))
+    mean = (cumulative[rows, lengths] - cumulative[rows, lengths - window]) / window
+    return np.repeat(mean[:, None], horizon, axis=1)
+
+
+def _exponential_smoothing(Y: np.ndarray, lengths: np.ndarray, horizon: int) -> np.ndarray:
+    """Simple exponential smoothing (as a linear filter over all series at once), extended by its last step"""
+    alpha = SMOOTHING_ALPHA
+    first = Y[:, :1]
+    smoothed = lfilter([alpha], [1, alpha - 1], np.nan_to_num(Y), axis=1, zi=(1 - alpha) * first)[0]
+    rows = np.arange(len(Y))
+    last = smoothed[rows, lengths - 1]
+    trend = np.where(lengths > 1, last - smoothed[rows, np.maximum(lengths - 2, 0)], 0.0)
+    return last[:, None] + trend[:, None] * _steps(horizon)
+
+
+def _holt_winters(Y: np.ndarray, lengths: np.ndarray, horizon: int, season: int) -> np.ndarray:
+    """Additive Holt-Winters with fixed smoothing weights, stepped through time for all series together.
+
+    Series shorter than two seasons get no seasonal component (Holt's linear trend).
+    """
+    count = len(Y)
+    rows = np.arange(count)
+    seasonal = lengths >= 2 * season
+
+    # Initial state: first value and first difference, or the first two seasons where there are two
+    level = Y[:, 0].copy()
+    trend = np.where(lengths > 1, Y[:, min(1, Y.shape[1] - 1)] - Y[:, 0], 0.0)
+    states = np.zeros((count, season))
+    if seasonal.any():
+        first = Y[seasonal, :season]
+        first_mean = first.mean(axis=1)
+        trend[seasonal] = (Y[seasonal, season:2 * season].mean(axis=1) - first_mean) / season
+        # The first season's mean is the level at its midpoint; the loop starts from the state before t=0
+        offsets = np.arange(season) - (season - 1) / 2
+        level[seasonal] = first_mean - trend[seasonal] * (season + 1) / 2
+        states[seasonal] = first - first_mean[:, None] - trend[seasonal, None] * offsets
+    gamma = np.where(seasonal, SEASONAL_GAMMA, 0.0)
+
+    for t in range(int(lengths.max())):
+        active = t < lengths
+        y = Y[:, t]
+        previous = states[:, t % season]
+        new_level = SMOOTHING_ALPHA * (y - previous) + (1 - SMOOTHING_ALPHA) * (level + trend)
+        new_trend = TREND_BETA * (new_level - level) + (1 - TREND_BETA) * trend
+        states[:, t % season] = np.where(active, gamma * (y - new_level) + (1 - gamma) * previous, previous)
+        level = np.where(active, new_level, level)
+        trend = np.where(active, new_trend, trend)
+
+    positions = (lengths[:, None] - 1 + _steps(horizon)) % season
+    return level[:, None] + trend[:, None] * _steps(horizon) + states[rows[:, None], positions]
+
+
+def _seasonal_naive(Y: np.ndarray, lengths: np.ndarray, horizon: int, season: int) -> np.ndarray:
+    """Repeat the last full season (the last value for series shorter than a season)"""
+    offsets = (_steps(horizon) - 1) % season
+    columns = np.where(lengths[:, None] >= season, lengths[:, None] - season + offsets, lengths[:, None] - 1)
+    return Y[np.arange(len(Y))[:, None], columns]
+
+
+def forecast_matrix(Y: np.ndarray, lengths: np.ndarray, horizon: int, method: str,
+                    season: Optional[int] = None) -> np.ndarray:
+    """(series x horizon) forecasts from the first `lengths` points of each row of a left-aligned matrix"""
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unknown forecasting method: {method}")
+    if (method in SEASONAL_METHODS and not season) or (season is not None and season < 1):
+        raise ValueError(f"{method} needs a season length of at least 1")
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if method == "Linear Trend":
+        return _linear_trend(Y, lengths, horizon)
+    if method == "Moving Average":
+        return _moving_average(Y, lengths, horizon)
+    if method == "Exponential Smoothing":
+        return _exponential_smoothing(Y, lengths, horizon)
+    if method == "Holt-Winters":
+        return _holt_winters(Y, lengths, horizon, season)
+    return _seasonal_naive(Y, lengths, horizon, season)
+
+
+def _accuracy(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-series MAE, RMSE and MAPE (%, over non-zero actuals); NaN for series without a holdout"""
+    errors = predicted - actual
+    present = ~np.isnan(errors)
+    nonzero = present & (actual != 0)
+    absolute = np.where(present, np.abs(errors), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {'MAE': absolute.sum(axis=1) / present.sum(axis=1),
+                'RMSE': np.sqrt(np.where(present, errors ** 2, 0.0).sum(axis=1) / present.sum(axis=1)),
+                'MAPE': np.where(nonzero, absolute / np.abs(actual), 0.0).sum(axis=1) / nonzero.sum(axis=1) * 100}
+
+
+def _forecast_chunk(values: np.ndarray, lengths: np.ndarray, horizon: int, method: str, season: Optional[int],
+                    backtest: bool) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, np.ndarray]]:
+    """Forecasts, holdout forecasts and holdout accuracy for a chunk of consecutive series"""
+    Y = _padded(values, lengths)
+    forecasts = forecast_matrix(Y, lengths, horizon, method, season)
+    if not backtest:
+        return forecasts, None, {}
+
+    # Hold out the last `horizon` points; series too short to keep two training points get no backtest
+    testable = lengths >= horizon + 2
+    origins = np.where(testable, lengths - horizon, lengths)
+    predicted = forecast_matrix(Y, origins, horizon, method, season)
+    columns = np.minimum(origins[:, None] + _steps(horizon) - 1, Y.shape[1] - 1)
+    actual = np.where(testable[:, None], Y[np.arange(len(Y))[:, None], columns], np.nan)
+    predicted[~testable] = np.nan
+    return forecasts, predicted, _accuracy(actual, predicted)
+
+
+def forecast_series(values, horizon: int, method: str, season: Optional[int] = None,
+                    backtest: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, float]]:
+    """(forecast, holdout forecast, holdout accuracy) for one series"""
+    values = np.asarray(values, dtype=np.float64)
+    forecasts, predicted, accuracy = _forecast_chunk(values, np.array([len(values)]), horizon, method, season,
+                                                     backtest)
+    return (forecasts[0], None if predicted is None else predicted[0],
+            {metric: float(scores[0]) for metric, scores in accuracy.items()})
+
+
+def infer_frequency(dates: pd.Series) -> Optional[str]:
+    """pandas frequency string of a date sequence, judged on its first 1000 distinct dates"""
+    unique = pd.DatetimeIndex(dates.drop_duplicates().sort_values().iloc[:1000])
+    if len(unique) < 3:
+        return None
+    return pd.infer_freq(unique)
+
+
+def default_season_length(dates: pd.Series) -> int:
+    """Season length suggested by the sampling frequency of the dates, 12 when it cannot be inferred"""
+    frequency = infer_frequency(dates)
+    if frequency is None:
+        return 12
+    prefix = frequency.split('-')[0].lstrip('0123456789')
+    return SEASON_LENGTHS.get(prefix, 12)
+
+
+def future_dates(last_dates: pd.DatetimeIndex, horizon: int, frequency: Optional[str],
+                 step: pd.Timedelta) -> np.ndarray:
+    """(series x horizon) dates following each series' last date"""
+    if frequency is not None:
+        offset = pd.tseries.frequencies.to_offset(frequency)
+        columns = [(last_dates + offset * h).to_numpy() for h in range(1, horizon + 1)]
+    else:
+        columns = [(last_dates + step * h).to_numpy() for h in range(1, horizon + 1)]
+    return np.stack(columns, axis=1) if columns else np.empty((len(last_dates), 0), dtype='datetime64[ns]')
+
+
+def _chunk_bounds(lengths: np.ndarray, max_cells: int) -> List[Tuple[int, int]]:
+    """Consecutive series ranges whose padded matrix stays within max_cells"""
+    bounds, start, longest = [], 0, 0
+    for i, length in enumerate(lengths):
+        longest = max(longest, int(length))
+        if i > start and (i - start + 1) * longest > max_cells:
+            bounds.append((start, i))
+            start, longest = i, int(length)
+    if len(lengths):
+        bounds.append((start, len(lengths)))
+    return bounds
+
+
+def batch_forecast(df: pd.DataFrame, date_col: str, value_col: str, group_col: str, horizon: int, method: str,
+                   season: Optional[int] = None, backtest: bool = True, n_jobs: Optional[int] = None,
+                   max_cells: int = CHUNK_CELLS, progress_callback=None,
+                   preview_rows: int = 20) -> Tuple[ConversionResult, pd.DataFrame]:
+    """Forecast every series of a long-format frame (one series per group_col value) in parallel chunks.
+
+    Each chunk is forecast with vectorized NumPy over all of its series, backtested on the last `horizon`
+    points in the same task, and appended to a spooled long-format CSV as soon as it is done, so only one
+    chunk's rows are held in memory at a time. Returns the output file and a per-series accuracy table.
+    """
+    start_time = time.perf_counter()
+    data = df[[group_col, date_col, value_col]].dropna()
+    data = data.assign(**{date_col: pd.to_datetime(data[date_col])}).sort_values([group_col, date_col],
+                                                                                  kind='stable')
+    codes, keys = pd.factorize(data[group_col], sort=False)
+    lengths = np.bincount(codes, minlength=len(keys)) if len(keys) else np.array([], dtype=np.int64)
+    values = data[value_col].to_numpy(dtype=np.float64)
+    dates = pd.DatetimeIndex(data[date_col])
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    longest = int(np.argmax(lengths)) if len(lengths) else 0
+    frequency = infer_frequency(pd.Series(dates[starts[longest]:ends[longest]])) if len(lengths) else None
+    steps = np.diff(dates.asi8)[np.diff(codes) == 0]
+    step = pd.Timedelta(int(np.median(steps[steps > 0]))) if (steps > 0).any() else pd.Timedelta(days=1)
+
+    n_jobs = n_jobs or max(1, (os.cpu_count() or 2) - 1)
+    bounds = _chunk_bounds(lengths, max_cells)
+    tasks = [(values[starts[a]:ends[b - 1]], lengths[a:b], horizon, method, season, backtest) for a, b in bounds]
+    if n_jobs == 1 or len(tasks) <= 1:
+        outputs = (_forecast_chunk(*task) for task in tasks)
+    else:
+        outputs = Parallel(n_jobs=min(n_jobs, len(tasks)), backend='loky', return_as='generator')(
+            delayed(_forecast_chunk)(*task) for task in tasks)
+
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    output = tempfile.SpooledTemporaryFile(max_size=DEFAULT_SPOOL_MAX_MB * 1024 * 1024, dir=ARTIFACT_DIR)
+    accuracy_parts, preview, rows = [], None, 0
+    try:
+        for done, ((a, b), (forecasts, predicted, accuracy)) in enumerate(zip(bounds, outputs), start=1):
+            chunk_keys = keys[a:b]
+            last_dates = dates[ends[a:b] - 1]
+            parts = [pd.DataFrame({
+                group_col: np.repeat(chunk_keys, horizon),
+                'Date': future_dates(last_dates, horizon, frequency, step).ravel(),
+                'Type': 'forecast',
+                'Forecast': forecasts.ravel(),
+                'Actual': np.nan,
+            })]
+            if predicted is not None:
+                testable = ~np.isnan(predicted).all(axis=1)
+                holdout = (ends[a:b][testable, None] - horizon + np.arange(horizon)[None, :]).ravel()
+                parts.append(pd.DataFrame({
+                    group_col: np.repeat(chunk_keys[testable], horizon),
+                    'Date': dates[holdout],
+                    'Type': 'backtest',
+                    'Forecast': predicted[testable].ravel(),
+                    'Actual': values[holdout],
+                }))
+                accuracy_parts.append(pd.DataFrame({group_col: chunk_keys, 'Observations': lengths[a:b],
+                                                    **accuracy}))
+            chunk = pd.concat(parts, ignore_index=True)
+            output.write(chunk.to_csv(index=False, header=done == 1).encode('utf-8'))
+            rows += len(chunk)
+            if preview is None:
+                preview = chunk.head(preview_rows)
+            if progress_callback:
+                progress_callback(done / len(tasks))
+    except Exception:
+        output.close()
+        raise
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    bytes_out = output.tell()
+    output.seek(0)
+    stats: Dict[str, Any] = {
+        'series': len(keys),
+        'chunks': len(tasks),
+        'workers': min(n_jobs, max(len(tasks), 1)),
+        'rows': rows,
+        'bytes_out': bytes_out,
+        'elapsed_seconds': elapsed,
+        'series_per_second': len(keys) / elapsed,
+        'frequency': frequency or str(step),
+    }
+    accuracy = pd.concat(accuracy_parts, ignore_index=True) if accuracy_parts else pd.DataFrame()
+    return ConversionResult(output, "batch_forecast.csv", "text/csv", stats, preview), accuracy
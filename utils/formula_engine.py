@@ -0,0 +1,338 @@
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
+DEFAULT_CHUNK_ROWS = 256 * 1024
+MAX_FORMULA_LENGTH = 2000
+MAX_NODES = 300
+# Largest integer (in bits) that constant arithmetic may produce; Python integers are otherwise unbounded
+MAX_CONSTANT_BITS = 4096
+
+# Element-wise functions a formula may call, as bare names or through np.
+FUNCTIONS: Dict[str, Callable] = {
+    'sqrt': np.sqrt, 'cbrt': np.cbrt, 'square': np.square,
+    'log': np.log, 'log10': np.log10, 'log2': np.log2, 'log1p': np.log1p,
+    'exp': np.exp, 'expm1': np.expm1, 'power': np.power,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan, 'arctan2': np.arctan2,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'abs': np.abs, 'absolute': np.abs, 'sign': np.sign,
+    'floor': np.floor, 'ceil': np.ceil, 'trunc': np.trunc, 'round': np.round,
+    'minimum': np.minimum, 'maximum': np.maximum, 'clip': np.clip, 'fmod': np.fmod,
+    'where': np.where, 'isnan': np.isnan, 'isfinite': np.isfinite, 'nan_to_num': np.nan_to_num,
+}
+
+# Whole-column reductions, computed once over the full column before chunked evaluation
+REDUCTIONS = ('mean', 'sum', 'std', 'var', 'min', 'max', 'median', 'count')
+
+CONSTANTS = {'pi': math.pi, 'e': math.e, 'nan': float('nan'), 'inf': float('inf')}
+
+_NUMEXPR_FUNCTIONS = {'sqrt', 'log', 'log10', 'log1p', 'exp', 'expm1', 'sin', 'cos', 'tan', 'arcsin', 'arccos',
+                      'arctan', 'arctan2', 'sinh', 'cosh', 'tanh', 'abs', 'absolute', 'where', 'floor', 'ceil'}
+
+
+def _float_if_zero_divisor(a, b):
+    # Integer // and % give 0 for a zero divisor; pandas switches to floats so they give inf and NaN
+    if np.asarray(a).dtype.kind in 'iu' and np.asarray(b).dtype.kind in 'iu' and np.any(np.asarray(b) == 0):
+        return np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    return a, b
+
+
+def _floor_divide(a, b):
+    return np.floor_divide(*_float_if_zero_divisor(a, b))
+
+
+def _mod(a, b):
+    return np.mod(*_float_if_zero_divisor(a, b))
+
+
+def _power(a, b):
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1 and a.bit_length() * b > MAX_CONSTANT_BITS:
+        raise ValueError(f"Constant is too large (more than {MAX_CONSTANT_BITS} bits)")
+    return a ** b
+
+
+def _is_scalar(value) -> bool:
+    # Plain Python numbers, as constants are kept until they meet a column
+    return type(value) in (int, float)
+
+
+def _negative(value):
+    return -value if _is_scalar(value) else np.negative(value)
+
+
+# (NumPy function, Python operator for constant operands, numexpr symbol). Operators without a numexpr symbol
+# (// and %, whose zero-divisor results differ there) always use NumPy
+_BINARY_OPERATORS = {
+    ast.Add: (np.add, operator.add, '+'), ast.Sub: (np.subtract, operator.sub, '-'),
+    ast.Mult: (np.multiply, operator.mul, '*'), ast.Div: (np.true_divide, operator.truediv, '/'),
+    ast.FloorDiv: (_floor_divide, operator.floordiv, None), ast.Mod: (_mod, operator.mod, None),
+    ast.Pow: (np.power, _power, '**'),
+}
+_COMPARISONS = {
+    ast.Lt: (np.less, '<'), ast.LtE: (np.less_equal, '<='), ast.Gt: (np.greater, '>'),
+    ast.GtE: (np.greater_equal, '>='), ast.Eq: (np.equal, '=='), ast.NotEq: (np.not_equal, '!='),
+}
+
+
+class CompiledFormula:
+    """A validated formula: the columns and reductions it needs and an evaluator over array chunks"""
+
+    def __init__(self, source: str, evaluator: Callable, columns: List[str], reductions: List[Tuple[str, str]],
+                 numexpr_source: Optional[str]):
+        self.source = source
+        self.evaluator = evaluator
+        self.columns = columns
+        self.reductions = reductions
+        self.numexpr_source = numexpr_source
+
+
+class _Compiler:
+    """Translate a whitelisted Python expression AST into nested closures over NumPy arrays"""
+
+    def __init__(self, column_names: Sequence[str]):
+        self.column_names = set(column_names)
+        self.columns: List[str] = []
+        self.reductions: List[Tuple[str, str]] = []
+        # numexpr can only take the expression when every node has an equivalent there
+        self.numexpr_ok = True
+
+    def column(self, name: str):
+        if name not in self.column_names:
+            raise ValueError(f"Unknown column: '{name}'")
+        if name not in self.columns:
+            self.columns.append(name)
+        index = self.columns.index(name)
+        return (lambda env: env['columns'][name]), f"c{index}"
+
+    def column_name(self, node: ast.AST) -> Optional[str]:
+        """df['col'], df["col"], df.col or a bare column name"""
+        if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == 'df':
+            key = node.slice
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                return key.value
+            raise ValueError("Columns must be referenced as df['name']")
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'df':
+            return node.attr
+        if isinstance(node, ast.Name) and node.id in self.column_names:
+            return node.id
+        return None
+
+    def compile(self, node: ast.AST):
+        """Return (evaluator, numexpr text) for a node"""
+        name = self.column_name(node)
+        if name is not None:
+            return self.column(name)
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, str):
+                # Text literals, for comparisons and concatenation with text columns
+                value = node.value
+                self.numexpr_ok = False
+                return (lambda env: value), repr(value)
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Unsupported constant: {node.value!r}")
+            # Kept as Python numbers, so constant arithmetic is exact as in Python; NumPy takes over at columns
+            value = node.value
+            return (lambda env: value), repr(node.value)
+
+        if isinstance(node, ast.Name):
+            if node.id in CONSTANTS:
+                value = CONSTANTS[node.id]
+                if node.id in ('nan', 'inf'):
+                    self.numexpr_ok = False
+                return (lambda env: value), repr(CONSTANTS[node.id])
+            raise ValueError(f"Unknown name: '{node.id}'")
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            func, python_operator, symbol = _BINARY_OPERATORS[type(node.op)]
+            left, left_text = self.compile(node.left)
+            right, right_text = self.compile(node.right)
+            if symbol is None:
+                self.numexpr_ok = False
+
+            def binary(env):
+                a, b = left(env), right(env)
+                if _is_scalar(a) and _is_scalar(b):
+                    return python_operator(a, b)
+                return func(a, b)
+            return binary, f"({left_text} {symbol} {right_text})"
+
+        if isinstance(node, ast.UnaryOp):
+            operand, text = self.compile(node.operand)
+            if isinstance(node.op, ast.USub):
+                return (lambda env: _negative(operand(env))), f"(-{text})"
+            if isinstance(node.op, ast.UAdd):
+                return operand, text
+            if isinstance(node.op, (ast.Not, ast.Invert)):
+                return (lambda env: np.logical_not(operand(env))), f"(~{text})"
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self.compile(value) for value in node.values]
+            func, symbol = (np.logical_and, '&') if isinstance(node.op, ast.And) else (np.logical_or, '|')
+            evaluators = [p[0] for p in parts]
+
+            def boolean(env):
+                result = evaluators[0](env)
+                for evaluator in evaluators[1:]:
+                    result = func(result, evaluator(env))
+                return result
+            return boolean, "(" + f" {symbol} ".join(p[1] for p in parts) + ")"
+
+        if isinstance(node, ast.Compare):
+            terms = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+            operators = []
+            for op in node.ops:
+                if type(op) not in _COMPARISONS:
+                    raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+                operators.append(_COMPARISONS[type(op)])
+
+            def compare(env):
+                values = [t[0](env) for t in terms]
+                result = operators[0][0](values[0], values[1])
+                for i in range(1, len(operators)):
+                    result = np.logical_and(result, operators[i][0](values[i], values[i + 1]))
+                return result
+            texts = [f"({terms[i][1]} {operators[i][1]} {terms[i + 1][1]})" for i in range(len(operators))]
+            return compare, "(" + " & ".join(texts) + ")"
+
+        if isinstance(node, ast.IfExp):
+            test, test_text = self.compile(node.test)
+            body, body_text = self.compile(node.body)
+            orelse, orelse_text = self.compile(node.orelse)
+            return (lambda env: np.where(test(env), body(env), orelse(env))), \
+                f"where({test_text}, {body_text}, {orelse_text})"
+
+        if isinstance(node, ast.Call):
+            return self.call(node)
+
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+    def call(self, node: ast.Call):
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported in formulas")
+        target = node.func
+
+        # df['col'].mean() style whole-column reductions
+        if isinstance(target, ast.Attribute) and target.attr in REDUCTIONS and not node.args:
+            name = self.column_name(target.value)
+            if name is None:
+                raise ValueError(f".{target.attr}() can only be applied to a column")
+            if name not in self.column_names:
+                raise ValueError(f"Unknown column: '{name}'")
+            key = (name, target.attr)
+            if key not in self.reductions:
+                self.reductions.append(key)
+            index = self.reductions.index(key)
+            return (lambda env: env['reductions'][key]), f"r{index}"
+
+        if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) \
+                and target.value.id in ('np', 'numpy'):
+            function_name = target.attr
+        elif isinstance(target, ast.Name):
+            function_name = target.id
+        else:
+            raise ValueError("Only column reductions and whitelisted functions can be called")
+
+        if function_name not in FUNCTIONS:
+            raise ValueError(f"Function not allowed: '{function_name}'")
+        func = FUNCTIONS[function_name]
+        arguments = [self.compile(arg) for arg in node.args]
+        evaluators = [a[0] for a in arguments]
+        if function_name not in _NUMEXPR_FUNCTIONS:
+            self.numexpr_ok = False
+        numexpr_name = 'abs' if function_name == 'absolute' else function_name
+        return (lambda env: func(*[e(env) for e in evaluators])), \
+            f"{numexpr_name}(" + ", ".join(a[1] for a in arguments) + ")"
+
+
+@lru_cache(maxsize=128)
+def compile_formula(formula: str, column_names: Tuple[str, ...]) -> CompiledFormula:
+    """Parse and validate a formula once per (formula, columns); raises ValueError for anything not allowed"""
+    formula = formula.strip()
+    if not formula:
+        raise ValueError("Formula is empty")
+    if len(formula) > MAX_FORMULA_LENGTH:
+        raise ValueError(f"Formula is longer than {MAX_FORMULA_LENGTH} characters")
+    try:
+        tree = ast.parse(formula, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid formula syntax: {e.msg}")
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise ValueError(f"Formula is too complex (more than {MAX_NODES} syntax nodes)")
+
+    compiler = _Compiler(column_names)
+    evaluator, numexpr_text = compiler.compile(tree.body)
+    return CompiledFormula(formula, evaluator, compiler.columns, compiler.reductions,
+                           numexpr_text if compiler.numexpr_ok else None)
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    """Column as a NumPy array (a view where possible); nullable numbers use NaN for missing"""
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    return series.to_numpy()
+
+
+def _reduction_value(value):
+    """A reduction result as a NumPy scalar where pandas returns its own (Timestamp, Timedelta, NaT)"""
+    if value is pd.NaT:
+        return np.datetime64('NaT')
+    if isinstance(value, pd.Timestamp) and value.tz is None:
+        return value.to_datetime64()
+    if isinstance(value, pd.Timedelta):
+        return value.to_timedelta64()
+    return value
+
+
+def evaluate_formula(df: pd.DataFrame, formula: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     use_numexpr: bool = True) -> pd.Series:
+    """Evaluate a formula over a DataFrame in row chunks, so temporaries stay bounded by the chunk size.
+
+    Columns are referenced as df['name'], df.name or by bare name; whole-column reductions such as
+    df['x'].mean() are computed once up front. Only whitelisted NumPy functions can be called.
+    """
+    labels = {str(c): c for c in df.columns}
+    compiled = compile_formula(formula, tuple(labels))
+    columns = {name: _column_values(df[labels[name]]) for name in compiled.columns}
+    reductions = {(name, method): _reduction_value(getattr(df[labels[name]], method)())
+                  for name, method in compiled.reductions}
+
+    if HAS_NUMEXPR and use_numexpr and compiled.numexpr_source is not None and columns:
+        # numexpr blocks the evaluation internally and uses all cores
+        local_dict = {f"c{i}": columns[name] for i, name in enumerate(compiled.columns)}
+        local_dict.update({f"r{i}": reductions[key] for i, key in enumerate(compiled.reductions)})
+        try:
+            return pd.Series(numexpr.evaluate(compiled.numexpr_source, local_dict=local_dict), index=df.index)
+        except (TypeError, ValueError, KeyError, NotImplementedError):
+            pass  # e.g. object columns; fall back to NumPy
+
+    rows = len(df)
+    output = None
+    with np.errstate(all='ignore'):
+        for start in range(0, max(rows, 1), chunk_rows):
+            env = {
+                'columns': {name: values[start:start + chunk_rows] for name, values in columns.items()},
+                'reductions': reductions,
+            }
+            chunk = np.asarray(compiled.evaluator(env))
+            if chunk.ndim == 0:
+                # Formula without columns: broadcast the scalar
+                return pd.Series(np.full(rows, chunk.item()), index=df.index)
+            if output is None:
+                output = np.empty(rows, dtype=chunk.dtype)
+            elif not np.can_cast(chunk.dtype, output.dtype, casting='safe'):
+                output = output.astype(np.result_type(output.dtype, chunk.dtype))
+            output[start:start + len(chunk)] = chunk
+    return pd.Series(output if output is not None else np.empty(0), index=df.index)
@@ -0,0 +1,277 @@
+import io
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import loguniform, randint, uniform
+from sklearn.ensemble import (ExtraTreesClassifier, ExtraTreesRegressor, GradientBoostingClassifier,
+                              GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor)
+from sklearn.linear_model import ElasticNet, Lasso, LogisticRegression, Ridge
+from sklearn.model_selection import ParameterSampler
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+from sklearn.svm import SVC, SVR
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+
+from utils.model_executor import PreparedData, cross_validate_models, with_scaling
+
+SEARCH_STRATEGIES = ["Successive Halving", "Hyperband", "Random Search"]
+BUDGET_TYPES = {"rows": "Training rows", "iterations": "Boosting stages / trees"}
+
+SCORING_OPTIONS = {
+    "Classification": {"Accuracy": "accuracy", "Balanced Accuracy": "balanced_accuracy",
+                       "F1 (weighted)": "f1_weighted"},
+    "Regression": {"R²": "r2", "Negative RMSE": "neg_root_mean_squared_error",
+                   "Negative MAE": "neg_mean_absolute_error"},
+}
+
+_TREE_PARAMS = {
+    'max_depth': [None, 3, 5, 8, 12, 20],
+    'min_samples_split': randint(2, 21),
+    'min_samples_leaf': randint(1, 11),
+}
+_FOREST_PARAMS = {**_TREE_PARAMS, 'max_features': ['sqrt', 'log2', None]}
+_BOOSTING_PARAMS = {
+    'learning_rate': loguniform(0.01, 0.3),
+    'max_depth': randint(2, 7),
+    'subsample': uniform(0.5, 0.5),
+    'min_samples_leaf': randint(1, 21),
+}
+
+# Declared search spaces: estimator factory, whether features are standardized inside the pipeline,
+# sklearn-style parameter distributions, and the (parameter, maximum) used as an iteration budget
+SEARCH_SPACES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "Classification": {
+        "Random Forest": {'estimator': lambda: RandomForestClassifier(random_state=42), 'scale': False,
+                          'params': _FOREST_PARAMS, 'iterations': ('n_estimators', 300)},
+        "Extra Trees": {'estimator': lambda: ExtraTreesClassifier(random_state=42), 'scale': False,
+                        'params': _FOREST_PARAMS, 'iterations': ('n_estimators', 300)},
+        "Gradient Boosting": {'estimator': lambda: GradientBoostingClassifier(random_state=42), 'scale': False,
+                              'params': _BOOSTING_PARAMS, 'iterations': ('n_estimators', 300)},
+        "Logistic Regression": {'estimator': lambda: LogisticRegression(random_state=42, max_iter=1000),
+                                'scale': True, 'params': {'C': loguniform(1e-3, 1e2)}, 'iterations': None},
+        "Support Vector Machine": {'estimator': lambda: SVC(random_state=42), 'scale': True,
+                                   'params': {'C': loguniform(1e-2, 1e2), 'gamma': loguniform(1e-4, 1)},
+                                   'iterations': None},
+        "K-Nearest Neighbors": {'estimator': KNeighborsClassifier, 'scale': True,
+                                'params': {'n_neighbors': randint(1, 31), 'weights': ['uniform', 'distance']},
+                                'iterations': None},
+        "Decision Tree": {'estimator': lambda: DecisionTreeClassifier(random_state=42), 'scale': False,
+                          'params': {**_TREE_PARAMS, 'criterion': ['gini', 'entropy']}, 'iterations': None},
+    },
+    "Regression": {
+        "Random Forest": {'estimator': lambda: RandomForestRegressor(random_state=42), 'scale': False,
+                          'params': _FOREST_PARAMS, 'iterations': ('n_estimators', 300)},
+        "Extra Trees": {'estimator': lambda: ExtraTreesRegressor(random_state=42), 'scale': False,
+                        'params': _FOREST_PARAMS, 'iterations': ('n_estimators', 300)},
+        "Gradient Boosting": {'estimator': lambda: GradientBoostingRegressor(random_state=42), 'scale': False,
+                              'params': _BOOSTING_PARAMS, 'iterations': ('n_estimators', 300)},
+        "Ridge Regression": {'estimator': Ridge, 'scale': True,
+                             'params': {'alpha': loguniform(1e-3, 1e2)}, 'iterations': None},
+        "Lasso Regression": {'estimator': lambda: Lasso(max_iter=5000), 'scale': True,
+                             'params': {'alpha': loguniform(1e-4, 1e1)}, 'iterations': None},
+        "ElasticNet Regression": {'estimator': lambda: ElasticNet(max_iter=5000), 'scale': True,
+                                  'params': {'alpha': loguniform(1e-4, 1e1), 'l1_ratio': uniform(0.05, 0.9)},
+                                  'iterations': None},
+        "Support Vector Machine": {'estimator': SVR, 'scale': True,
+                                   'params': {'C': loguniform(1e-2, 1e2), 'gamma': loguniform(1e-4, 1),
+                                              'epsilon': loguniform(1e-3, 1)},
+                                   'iterations': None},
+        "K-Nearest Neighbors": {'estimator': KNeighborsRegressor, 'scale': True,
+                                'params': {'n_neighbors': randint(1, 31), 'weights': ['uniform', 'distance']},
+                                'iterations': None},
+        "Decision Tree": {'estimator': lambda: DecisionTreeRegressor(random_state=42), 'scale': False,
+                          'params': _TREE_PARAMS, 'iterations': None},
+    },
+}
+
+
+def _rank_key(record: Dict[str, Any]) -> float:
+    """Sort key that ranks failed candidates last"""
+    return -np.inf if np.isnan(record['Score']) else record['Score']
+
+
+def _python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SearchResult:
+    """Leaderboard and winning configuration of a hyperparameter search"""
+
+    def __init__(self, leaderboard: pd.DataFrame, best_params: Dict[str, Any], best_score: float,
+                 best_estimator, fits: int):
+        self.leaderboard = leaderboard
+        self.best_params = best_params
+        self.best_score = best_score
+        self.best_estimator = best_estimator
+        self.fits = fits
+
+
+class HyperparameterSearch:
+    """Budgeted search over one model's declared space, evaluating each rung's candidates in parallel.
+
+    Successive halving scores many sampled candidates on a small budget (a row subsample of the
+    training rows, or few trees/boosting stages) and promotes the best 1/eta of them to eta times the
+    budget until the full budget is reached; Hyperband runs several such brackets with different
+    starting budgets; random search scores every candidate on the full budget. Cross-validation goes
+    through the shared model executor, so folds, the process pool and the fit cache are reused.
+    """
+
+    def __init__(self, data: PreparedData, model_name: str, scoring: str, rows: np.ndarray, cv: int = 3,
+                 budget: str = 'rows', eta: int = 3, random_state: int = 42, n_jobs: Optional[int] = None,
+                 on_update: Optional[Callable[[pd.DataFrame, str, float], None]] = None):
+        space = SEARCH_SPACES[data.task_type][model_name]
+        if budget == 'iterations' and space['iterations'] is None:
+            raise ValueError(f"{model_name} has no iteration budget; use the row budget instead")
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+
+        self.data = data
+        self.space = space
+        self.scoring = scoring
+        self.rows = np.asarray(rows)
+        self.cv = cv
+        self.budget = budget
+        self.eta = eta
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.on_update = on_update
+        self._prefix = 'model__' if space['scale'] else ''
+        self._order = np.random.RandomState(random_state).permutation(self.rows)
+        self._records: List[Dict[str, Any]] = []
+        self._stats = {'fits': 0}
+        self._progress = 0.0
+
+        if budget == 'rows':
+            self.max_budget = len(self.rows)
+            n_classes = len(np.unique(data.y[self.rows])) if data.is_classification else 1
+            self.min_budget = min(self.max_budget, max(30, 2 * cv * n_classes))
+        else:
+            self.max_budget = space['iterations'][1]
+            self.min_budget = 10
+
+    def estimator(self, params: Dict[str, Any], budget: Optional[int] = None):
+        """Unfitted estimator (with scaling when declared) for a parameter set at a budget"""
+        model = self.space['estimator']()
+        if self.space['scale']:
+            model = with_scaling(model)
+        settings = {self._prefix + name: value for name, value in params.items()}
+        if self.budget == 'iterations':
+            settings[self._prefix + self.space['iterations'][0]] = budget or self.max_budget
+        return model.set_params(**settings)
+
+    def _sample(self, n: int, seed: int) -> List[Dict[str, Any]]:
+        sampled = ParameterSampler(self.space['params'], n_iter=n, random_state=seed)
+        return [{name: _python_value(value) for name, value in params.items()} for params in sampled]
+
+    def _budgets(self, start: float, rungs: int) -> List[int]:
+        return [max(1, int(round(start * self.eta ** i))) for i in range(rungs)]
+
+    def leaderboard(self) -> pd.DataFrame:
+        """One row per candidate at the highest budget it reached, best first"""
+        if not self._records:
+            return pd.DataFrame(columns=['Candidate', 'Bracket', 'Rung', 'Budget', 'Score', 'Std', 'Status',
+                                         'Parameters'])
+        board = pd.DataFrame([{**record, 'Parameters': ', '.join(f"{k}={v}" for k, v in record['params'].items())}
+                              for record in self._records]).drop(columns='params')
+        return board.sort_values(['Budget', 'Score'], ascending=[False, False], na_position='last') \
+            .reset_index(drop=True)
+
+    def _notify(self, message: str):
+        if self.on_update:
+            self.on_update(self.leaderboard(), message, min(self._progress, 1.0))
+
+    def _evaluate(self, records: List[Dict[str, Any]], budget: int, rung: int, share: float):
+        """Cross-validate every candidate of one rung at the given budget, all folds in one pool"""
+        rows = np.sort(self._order[:budget]) if self.budget == 'rows' else self.rows
+        estimators = {record['Candidate']: self.estimator(record['params'], budget) for record in records}
+        start = self._progress
+
+        def progress(fraction):
+            self._progress = start + share * fraction
+            self._notify(f"Rung {rung + 1}: {len(records)} candidates at budget {budget}")
+
+        results = cross_validate_models(self.data, estimators, cv=self.cv, scoring=[self.scoring], rows=rows,
+                                        error_score=np.nan, n_jobs=self.n_jobs, progress_callback=progress,
+                                        stats=self._stats)
+        self._progress = start + share
+        for record in records:
+            scores = results[record['Candidate']][f'test_{self.scoring}']
+            failed = np.isnan(scores).any()
+            record.update({'Rung': rung + 1, 'Budget': budget, 'Score': np.nan if failed else float(np.mean(scores)),
+                           'Std': np.nan if failed else float(np.std(scores)),
+                           'Status': 'failed' if failed else 'running'})
+
+    def _halving(self, params_list: List[Dict[str, Any]], budgets: List[int], bracket: int, share: float):
+        records = []
+        for params in params_list:
+            record = {'Candidate': f"#{len(self._records) + 1}", 'Bracket': bracket, 'Rung': 0, 'Budget': 0,
+                      'Score': np.nan, 'Std': np.nan, 'Status': 'queued', 'params': params}
+            self._records.append(record)
+            records.append(record)
+        self._notify(f"Bracket {bracket}: {len(records)} candidates")
+
+        # Work per rung is roughly constant under halving, so progress is split evenly between rungs
+        for rung, budget in enumerate(budgets):
+            self._evaluate(records, budget, rung, share / len(budgets))
+            if rung == len(budgets) - 1:
+                break
+            records.sort(key=_rank_key, reverse=True)
+            keep = max(1, len(records) // self.eta)
+            for record in records[keep:]:
+                record['Status'] = 'stopped'
+            records = records[:keep]
+            self._notify(f"Bracket {bracket}: promoted {keep} candidates")
+
+        for record in records:
+            if record['Status'] != 'failed':
+                record['Status'] = 'finished'
+
+    def run(self, strategy: str, n_candidates: int = 27) -> SearchResult:
+        """Run the search and return the leaderboard and the best configuration at the full budget"""
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+        ratio = max(self.max_budget / self.min_budget, 1)
+
+        if strategy == "Random Search":
+            self._halving(self._sample(n_candidates, self.random_state), [self.max_budget], 1, 1.0)
+        elif strategy == "Successive Halving":
+            rungs = 1 + min(int(math.log(ratio, self.eta) + 1e-9),
+                            int(math.log(max(n_candidates, 1), self.eta) + 1e-9))
+            budgets = self._budgets(self.max_budget / self.eta ** (rungs - 1), rungs)
+            budgets[-1] = self.max_budget
+            self._halving(self._sample(n_candidates, self.random_state), budgets, 1, 1.0)
+        else:
+            s_max = int(math.log(ratio, self.eta) + 1e-9)
+            brackets = list(range(s_max, -1, -1))
+            for bracket, s in enumerate(brackets, start=1):
+                n = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+                budgets = self._budgets(self.max_budget / self.eta ** s, s + 1)
+                budgets[-1] = self.max_budget
+                self._halving(self._sample(n, self.random_state + bracket), budgets, bracket, 1.0 / len(brackets))
+
+        finished = [r for r in self._records if r['Status'] == 'finished']
+        if not finished:
+            raise ValueError("Every candidate failed to fit; check the data or try another model")
+        best = max(finished, key=_rank_key)
+        self._progress = 1.0
+        self._notify(f"Done: {len(self._records)} candidates, {self._stats['fits']} fits")
+        return SearchResult(self.leaderboard(), best['params'], best['Score'], self.estimator(best['params']),
+                            self._stats['fits'])
+
+
+def serialize_pipeline(model, feature_cols: List[str], target_col: str, task_type: str,
+                       classes: Optional[np.ndarray], params: Dict[str, Any], score: float) -> bytes:
+    """Fitted pipeline plus the metadata needed to use it, as a joblib file"""
+    buffer = io.BytesIO()
+    joblib.dump({
+        'pipeline': model,
+        'feature_columns': list(feature_cols),
+        'target_column': target_col,
+        'task_type': task_type,
+        'classes': None if classes is None else list(classes),
+        'params': params,
+        'cv_score': score,
+    }, buffer, compress=3)
+    return buffer.getvalue()
@@ -0,0 +1,316 @@
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+from utils.aggregation_engine import group_partials
+
+CORRECTIONS = ["Benjamini-Hochberg", "Bonferroni", "Holm", "None"]
+ALTERNATIVES = ["two-sided", "greater", "less"]
+# Cells of the (rows x columns) working array per block of columns
+CHUNK_CELLS = 2_000_000
+# scipy's kstest switches from the exact to the asymptotic Kolmogorov distribution above this size
+KS_EXACT_MAX = 10000
+# Anderson-Darling 5% critical value for the normal with estimated mean and variance (Stephens, 1974)
+AD_CRITICAL_5 = 0.752
+
+
+def adjust_pvalues(p_values, method: str = "Benjamini-Hochberg") -> np.ndarray:
+    """Multiple-comparison adjusted p-values; missing p-values stay missing and do not count as tests"""
+    p = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p.shape, np.nan)
+    present = np.flatnonzero(~np.isnan(p))
+    m = len(present)
+    if m == 0 or method == "None":
+        return p.copy()
+    if method not in CORRECTIONS:
+        raise ValueError(f"Unknown correction: {method}")
+
+    order = present[np.argsort(p[present], kind='stable')]
+    ranked = p[order]
+    if method == "Bonferroni":
+        values = ranked * m
+    elif method == "Holm":
+        values = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        values = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    adjusted[order] = np.minimum(values, 1.0)
+    return adjusted
+
+
+def apply_correction(results: pd.DataFrame, method: str = "Benjamini-Hochberg", alpha: float = 0.05,
+                     p_column: str = 'P-Value') -> pd.DataFrame:
+    """Results table with adjusted p-values and a significance flag, most significant first"""
+    results = results.copy()
+    results['Adjusted P-Value'] = adjust_pvalues(results[p_column], method)
+    results['Significant'] = results['Adjusted P-Value'] < alpha
+    return results.sort_values(['Adjusted P-Value', p_column], kind='stable', na_position='last') \
+        .reset_index(drop=True)
+
+
+def _blocks(df: pd.DataFrame, columns: Sequence[str],
+            max_cells: int = CHUNK_CELLS) -> Iterator[Tuple[slice, np.ndarray]]:
+    """(column positions, float64 rows x columns array with NaN for missing) in blocks of columns"""
+    width = max(1, max_cells // max(len(df), 1))
+    for start in range(0, len(columns), width):
+        part = list(columns[start:start + width])
+        yield slice(start, start + len(part)), df[part].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def column_moments(X: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """(count, mean, and sums of 2nd, 3rd and 4th powers of deviations) of each column, ignoring NaN"""
+    present = ~np.isnan(X)
+    n = present.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(present, X, 0.0).sum(axis=0) / n
+    deviations = np.where(present, X - mean, 0.0)
+    squares = deviations ** 2
+    return n, mean, squares.sum(axis=0), (squares * deviations).sum(axis=0), (squares ** 2).sum(axis=0)
+
+
+def _t_pvalue(t: np.ndarray, dof: np.ndarray, alternative: str) -> np.ndarray:
+    if alternative == "greater":
+        return stats.t.sf(t, dof)
+    if alternative == "less":
+        return stats.t.cdf(t, dof)
+    if alternative != "two-sided":
+        raise ValueError(f"Unknown alternative: {alternative}")
+    return 2 * stats.t.sf(np.abs(t), dof)
+
+
+def one_sample_ttests(df: pd.DataFrame, columns: Sequence[str], popmean: float = 0.0,
+                      alternative: str = "two-sided") -> pd.DataFrame:
+    """One-sample t-test of every column's mean against popmean, as scipy's ttest_1samp.
+
+    Counts, means and variances come from the cached (ungrouped) partials of the aggregation engine.
+    """
+    partials = group_partials(df, [], columns)
+    j = [partials.columns.index(col) for col in columns]
+    if partials.n_groups:
+        n, total, m2 = partials.count[0, j].astype(np.float64), partials.total[0, j], partials.m2[0, j]
+    else:
+        n, total, m2 = np.zeros(len(columns)), np.zeros(len(columns)), np.zeros(len(columns))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / n
+        std = np.sqrt(np.where(n > 1, m2 / (n - 1), np.nan))
+        t = (mean - popmean) / (std / np.sqrt(n))
+        effect = (mean - popmean) / std
+    return pd.DataFrame({'Column': list(columns), 'N': n.astype(np.int64), 'Mean': mean, 'Std Dev': std,
+                         'T-Statistic': t, 'DF': n - 1, 'P-Value': _t_pvalue(t, n - 1, alternative),
+                         "Cohen's d": effect})
+
+
+def _group_positions(partials, groups: Sequence) -> List[int]:
+    labels = list(partials.index())
+    missing = [group for group in groups if group not in labels]
+    if missing:
+        raise ValueError(f"Groups not found: {missing}")
+    return [labels.index(group) for group in groups]
+
+
+def two_sample_ttests(df: pd.DataFrame, columns: Sequence[str], group_col: str, groups: Sequence,
+                      equal_var: bool = True, alternative: str = "two-sided") -> pd.DataFrame:
+    """Independent two-sample t-test (Student's, or Welch's when equal_var is False) of every column.
+
+    Per-group counts, means and variances come from the cached group partials of the aggregation engine.
+    """
+    partials = group_partials(df, [group_col], columns)
+    first, second = _group_positions(partials, groups)
+    j = [partials.columns.index(col) for col in columns]
+    n1, n2 = partials.count[first, j].astype(np.float64), partials.count[second, j].astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean1, mean2 = partials.total[first, j] / n1, partials.total[second, j] / n2
+        var1, var2 = partials.m2[first, j] / (n1 - 1), partials.m2[second, j] / (n2 - 1)
+        pooled = ((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2)
+        if equal_var:
+            dof = n1 + n2 - 2
+            se = np.sqrt(pooled * (1 / n1 + 1 / n2))
+        else:
+            se1, se2 = var1 / n1, var2 / n2
+            dof = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+            se = np.sqrt(se1 + se2)
+        valid = (n1 > 1) & (n2 > 1)
+        t = np.where(valid, (mean1 - mean2) / se, np.nan)
+        effect = np.where(valid, (mean1 - mean2) / np.sqrt(pooled), np.nan)
+    return pd.DataFrame({'Column': list(columns), f'N {groups[0]}': n1.astype(np.int64),
+                         f'N {groups[1]}': n2.astype(np.int64), f'Mean {groups[0]}': mean1,
+                         f'Mean {groups[1]}': mean2, 'Mean Difference': mean1 - mean2, 'T-Statistic': t, 'DF': dof,
+                         'P-Value': _t_pvalue(t, dof, alternative), "Cohen's d": effect})
+
+
+def anova_tests(df: pd.DataFrame, columns: Sequence[str], group_col: str) -> pd.DataFrame:
+    """One-way ANOVA of every column across the groups of group_col, as scipy's f_oneway.
+
+    Between- and within-group sums of squares are merged from the cached per-group partials.
+    """
+    partials = group_partials(df, [group_col], columns)
+    j = [partials.columns.index(col) for col in columns]
+    count, total, m2 = partials.count[:, j].astype(np.float64), partials.total[:, j], partials.m2[:, j]
+    k = (count > 0).sum(axis=0)
+    n = count.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grand = total.sum(axis=0) / n
+        group_means = total / count
+        between = np.where(count > 0, count * (group_means - grand) ** 2, 0.0).sum(axis=0)
+        within = m2.sum(axis=0)
+        f = (between / (k - 1)) / (within / (n - k))
+        valid = (k > 1) & (n > k)
+        f = np.where(valid, f, np.nan)
+        p = stats.f.sf(f, k - 1, n - k)
+        eta = between / (between + within)
+    return pd.DataFrame({'Column': list(columns), 'Groups': k, 'N': n.astype(np.int64), 'F-Statistic': f,
+                         'DF Between': k - 1, 'DF Within': n - k, 'P-Value': p, 'Eta Squared': eta})
+
+
+def _rank_sums(X: np.ndarray, in_first: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum of the (tie-averaged) ranks of the first group's rows and the tie term sum(t^3 - t) of each column.
+
+    One argsort per column; ties are found as runs of equal values in the sorted columns laid end to end.
+    """
+    rows, cols = X.shape
+    n = (~np.isnan(X)).sum(axis=0)
+    by_column = np.ascontiguousarray(X.T)
+    order = np.argsort(by_column, axis=1)
+    values = np.take_along_axis(by_column, order, axis=1).ravel()
+    first = in_first[order].ravel()
+    column = np.repeat(np.arange(cols), rows)
+    position = np.tile(np.arange(rows), cols)
+    keep = position < np.repeat(n, rows)
+    values, first, column, position = values[keep], first[keep], column[keep], position[keep]
+    if len(values) == 0:
+        return np.zeros(cols), np.zeros(cols)
+
+    starts = np.flatnonzero(np.r_[True, (np.diff(values) != 0) | (np.diff(column) != 0)])
+    lengths = np.diff(np.r_[starts, len(values)]).astype(np.float64)
+    run_rank = position[starts] + (lengths + 1) / 2
+    ranks = np.repeat(run_rank, lengths.astype(np.int64))
+    rank_sums = np.bincount(column, weights=np.where(first, ranks, 0.0), minlength=cols)
+    return rank_sums, np.bincount(column[starts], weights=lengths ** 3 - lengths, minlength=cols)
+
+
+def mann_whitney_tests(df: pd.DataFrame, columns: Sequence[str], group_col: str, groups: Sequence,
+                       alternative: str = "two-sided") -> pd.DataFrame:
+    """Mann-Whitney U test of every column between two groups, as scipy's mannwhitneyu with the
+    asymptotic method (normal approximation with tie and continuity corrections).
+    """
+    labels = df[group_col]
+    first, second = (labels == groups[0]).to_numpy(), (labels == groups[1]).to_numpy()
+    rows = df.loc[first | second, list(columns)]
+    in_first = first[first | second]
+    n_cols = len(columns)
+    u1, n1, n2, ties = np.zeros(n_cols), np.zeros(n_cols), np.zeros(n_cols), np.zeros(n_cols)
+    for part, X in _blocks(rows, columns):
+        present = ~np.isnan(X)
+        n1[part] = (present & in_first[:, None]).sum(axis=0)
+        n2[part] = (present & ~in_first[:, None]).sum(axis=0)
+        r1, ties[part] = _rank_sums(X, in_first)
+        u1[part] = r1 - n1[part] * (n1[part] + 1) / 2
+
+    n = n1 + n2
+    u2 = n1 * n2 - u1
+    if alternative == "greater":
+        u = u1
+    elif alternative == "less":
+        u = u2
+    elif alternative == "two-sided":
+        u = np.maximum(u1, u2)
+    else:
+        raise ValueError(f"Unknown alternative: {alternative}")
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+        z = (u - n1 * n2 / 2 - 0.5) / sigma
+        p = special.ndtr(-z)
+        if alternative == "two-sided":
+            p = 2 * p
+        valid = (n1 > 0) & (n2 > 0)
+        p = np.where(valid, np.clip(p, 0, 1), np.nan)
+        effect = np.where(valid, 1 - 2 * u1 / (n1 * n2), np.nan)
+    return pd.DataFrame({'Column': list(columns), f'N {groups[0]}': n1.astype(np.int64),
+                         f'N {groups[1]}': n2.astype(np.int64), 'U-Statistic': np.where(valid, u1, np.nan),
+                         'Z': z, 'P-Value': p, 'Rank-Biserial r': effect})
+
+
+def _dagostino(n: np.ndarray, skew: np.ndarray, kurt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """D'Agostino-Pearson K^2 statistic and p-value from sample skewness and (Pearson) kurtosis, as scipy's
+    normaltest (skewtest and kurtosistest combined)
+    """
+    y = skew * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3)) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = np.where(y == 0, 1, y)
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+    expected = 3.0 * (n - 1) / (n + 1)
+    variance = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.) * (n + 3) * (n + 5))
+    x = (kurt - expected) / np.sqrt(variance)
+    sqrt_beta1 = 6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) * np.sqrt((6.0 * (n + 3) * (n + 5))
+                                                                          / (n * (n - 2) * (n - 3)))
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / (sqrt_beta1 ** 2)))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    term2 = np.sign(denom) * np.where(denom == 0.0, np.nan, ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+    z_kurt = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+    k2 = z_skew ** 2 + z_kurt ** 2
+    return k2, stats.chi2.sf(k2, 2)
+
+
+def _sorted_tests(X: np.ndarray, n: np.ndarray, mean: np.ndarray, std: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Kolmogorov-Smirnov (against the fitted normal) and Anderson-Darling statistics of each column"""
+    rows = X.shape[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (np.sort(X, axis=0) - mean) / std
+    position = np.arange(1, rows + 1, dtype=np.float64)[:, None]
+    inside = position <= n
+    cdf = special.ndtr(z)
+    d_plus = np.where(inside, position / n - cdf, -np.inf).max(axis=0, initial=-np.inf)
+    d_minus = np.where(inside, cdf - (position - 1) / n, -np.inf).max(axis=0, initial=-np.inf)
+    ks = np.maximum(d_plus, d_minus)
+
+    # Pair the i-th smallest value with the i-th largest within each column's own length
+    mirrored = np.clip(n.astype(np.int64) - position.astype(np.int64), 0, max(rows - 1, 0))
+    log_sf = np.take_along_axis(special.log_ndtr(-z), mirrored, axis=0)
+    terms = np.where(inside, (2 * position - 1) / n * (special.log_ndtr(z) + log_sf), 0.0)
+    ad = -n - terms.sum(axis=0)
+    return ks, ad
+
+
+def normality_tests(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """D'Agostino-Pearson, Kolmogorov-Smirnov (fitted normal) and Anderson-Darling tests of every column.
+
+    Moments and order statistics are computed on blocks of columns at once; D'Agostino needs at least
+    20 values and the other tests at least 8.
+    """
+    n_cols = len(columns)
+    n, mean, std, skew, kurt = (np.zeros(n_cols) for _ in range(5))
+    ks, ad = np.full(n_cols, np.nan), np.full(n_cols, np.nan)
+    for part, X in _blocks(df, columns):
+        count, mu, m2, m3, m4 = column_moments(X)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sd = np.sqrt(m2 / (count - 1))
+            skew[part] = (m3 / count) / (m2 / count) ** 1.5
+            kurt[part] = (m4 / count) / (m2 / count) ** 2
+        n[part], mean[part], std[part] = count, mu, sd
+        ks[part], ad[part] = _sorted_tests(X, count, mu, sd)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k2, k2_p = _dagostino(n, skew, kurt)
+        exact = stats.kstwo.sf(ks, np.maximum(n, 1))
+        asymptotic = stats.kstwobign.sf(ks * np.sqrt(n))
+        ks_p = np.clip(np.where(n <= KS_EXACT_MAX, exact, asymptotic), 0, 1)
+        critical = np.round(AD_CRITICAL_5 / (1.0 + 0.75 / n + 2.25 / n / n), 3)
+
+    enough = n >= 8
+    return pd.DataFrame({
+        'Column': list(columns),
+        'D\'Agostino Stat': np.where(n >= 20, k2, np.nan),
+        'D\'Agostino p-value': np.where(n >= 20, k2_p, np.nan),
+        'KS Stat': np.where(enough, ks, np.nan),
+        'KS p-value': np.where(enough, ks_p, np.nan),
+        'Anderson-Darling Stat': np.where(enough, ad, np.nan),
+        'AD Critical Value (5%)': np.where(enough, critical, np.nan),
+        'Sample Size': n.astype(np.int64),
+    })
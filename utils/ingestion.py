@@ -0,0 +1,406 @@
+import io
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get('INGEST_MEMORY_BUDGET_MB', '1024'))
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
+DEFAULT_BATCH_ROWS = 65536
+
+# Formats read through native Arrow readers; everything else goes through pandas with pushdown
+ARROW_FORMATS = ("CSV", "TSV", "JSON", "Parquet")
+DELIMITED_FORMATS = ("CSV", "TSV")
+
+
+class IngestResult:
+    """A DataFrame plus statistics about how it was read"""
+
+    def __init__(self, df: pd.DataFrame, info: Dict[str, Any]):
+        self.df = df
+        self.info = info
+
+
+def _as_arrow_source(source):
+    """Wrap uploads/bytes in a zero-copy Arrow buffer reader; pass paths through"""
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(source)
+    if hasattr(source, 'getbuffer'):
+        return pa.BufferReader(source.getbuffer())
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+
+def _as_pandas_source(source):
+    """Give pandas readers a fresh file-like object over the source"""
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, 'getbuffer'):
+        return io.BytesIO(source.getbuffer())
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+
+def source_size(source) -> int:
+    """Size of the source in bytes, if known"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    if hasattr(source, 'getbuffer'):
+        return source.getbuffer().nbytes
+    return getattr(source, 'size', 0) or 0
+
+
+def _read_head(source, max_bytes: int) -> bytes:
+    """Read up to max_bytes from the start of the source, cut at the last complete line"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            head = f.read(max_bytes)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        head = bytes(source[:max_bytes])
+    elif hasattr(source, 'getbuffer'):
+        head = bytes(source.getbuffer()[:max_bytes])
+    else:
+        source.seek(0)
+        head = source.read(max_bytes)
+        source.seek(0)
+
+    if len(head) == max_bytes and b'\n' in head:
+        head = head[:head.rindex(b'\n') + 1]
+    return head
+
+
+def _is_json_lines(source) -> bool:
+    """JSON Lines starts with an object per line; a JSON document starts with '[' or wraps records"""
+    head = _read_head(source, 4096).lstrip()
+    if not head.startswith(b'{'):
+        return False
+    first_line = head.split(b'\n', 1)[0].strip()
+    return first_line.endswith(b'}')
+
+
+def _csv_options(settings: Dict[str, Any], input_format: str, columns: Optional[List[str]],
+                 column_types: Optional[Dict[str, pa.DataType]], block_size: int):
+    """Translate converter settings (pandas semantics) into Arrow CSV options"""
+    sep = '\t' if input_format == "TSV" else (settings.get('separator') or ',')
+    header = settings.get('header', 0)
+    skip_rows = settings.get('skip_rows', 0) or 0
+    encoding = settings.get('encoding', 'utf-8') or 'utf-8'
+
+    has_header = header is not None and header >= 0
+    read_options = pa_csv.ReadOptions(
+        skip_rows=skip_rows + (header if has_header else 0),
+        autogenerate_column_names=not has_header,
+        encoding=encoding,
+        block_size=block_size
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=sep)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=list(columns) if columns else None,
+        column_types=column_types or None,
+        strings_can_be_null=True
+    )
+    return read_options, parse_options, convert_options
+
+
+def iter_record_batches(source, input_format: str, settings: Optional[Dict[str, Any]] = None,
+                        columns: Optional[List[str]] = None, max_rows: Optional[int] = None,
+                        column_types: Optional[Dict[str, pa.DataType]] = None,
+                        block_size: Optional[int] = None) -> Iterator[pa.RecordBatch]:
+    """Stream Arrow record batches from CSV/TSV/JSON Lines/Parquet with projection and row-limit pushdown.
+
+    block_size defaults to DEFAULT_BLOCK_SIZE, read at call time.
+    """
+    settings = settings or {}
+    block_size = block_size or DEFAULT_BLOCK_SIZE
+    rows_left = max_rows if max_rows else None
+
+    if input_format in ("CSV", "TSV"):
+        read_options, parse_options, convert_options = _csv_options(settings, input_format, columns,
+                                                                    column_types, block_size)
+        reader = pa_csv.open_csv(_as_arrow_source(source), read_options=read_options,
+                                 parse_options=parse_options, convert_options=convert_options)
+    elif input_format == "JSON":
+        # The JSON reader cannot decode straight to dictionaries; those are encoded per batch below
+        column_types = column_types or {}
+        dictionary_columns = [name for name, dtype in column_types.items() if pa.types.is_dictionary(dtype)]
+        explicit = [(name, dtype) for name, dtype in column_types.items() if name not in dictionary_columns]
+        read_options = pa_json.ReadOptions(block_size=block_size)
+        parse_options = pa_json.ParseOptions(explicit_schema=pa.schema(explicit) if explicit else None)
+        if hasattr(pa_json, 'open_json'):
+            reader = pa_json.open_json(_as_arrow_source(source), read_options=read_options,
+                                       parse_options=parse_options)
+        else:
+            reader = pa_json.read_json(_as_arrow_source(source), read_options=read_options,
+                                       parse_options=parse_options).to_batches()
+    elif input_format == "Parquet":
+        parquet_file = pq.ParquetFile(_as_arrow_source(source))
+        reader = parquet_file.iter_batches(batch_size=DEFAULT_BATCH_ROWS, columns=list(columns) if columns else None)
+    else:
+        raise ValueError(f"Streaming is not supported for {input_format}")
+
+    for batch in reader:
+        if input_format == "JSON":
+            if columns:
+                batch = batch.select([c for c in columns if c in batch.schema.names])
+            if dictionary_columns:
+                batch = _dictionary_encode(batch, dictionary_columns)
+        if rows_left is not None:
+            if batch.num_rows >= rows_left:
+                yield batch.slice(0, rows_left)
+                return
+            rows_left -= batch.num_rows
+        yield batch
+
+
+def _dictionary_encode(batch: pa.RecordBatch, names: List[str]) -> pa.RecordBatch:
+    """Dictionary-encode the named string columns of a batch"""
+    arrays = []
+    for name, array in zip(batch.schema.names, batch.columns):
+        if name in names and (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+            array = pc.dictionary_encode(array).cast(pa.dictionary(pa.int32(), pa.string()))
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def infer_compact_types(source, input_format: str, settings: Optional[Dict[str, Any]] = None,
+                        sample_mb: float = 8, columns: Optional[List[str]] = None) -> Dict[str, pa.DataType]:
+    """Profile the first sample_mb of the source and choose compact Arrow types per column.
+
+    Integers are narrowed to the smallest type that fits the sample, low-cardinality strings become
+    dictionary-encoded (pandas categoricals), and all-null columns are pinned to string so later
+    blocks cannot conflict with a null-typed first block. If a later value does not fit, the caller
+    falls back to a normal read.
+    """
+    if input_format not in ("CSV", "TSV", "JSON"):
+        return {}
+
+    head = _read_head(source, int(sample_mb * 1024 * 1024))
+    table = pa.Table.from_batches(list(iter_record_batches(head, input_format, settings, columns)))
+
+    compact = {}
+    for field, column in zip(table.schema, table.columns):
+        if pa.types.is_integer(field.type) and column.null_count < len(column):
+            min_value = pc.min(column).as_py()
+            max_value = pc.max(column).as_py()
+            for candidate in (pa.int8(), pa.int16(), pa.int32()):
+                bounds = np.iinfo(candidate.to_pandas_dtype())
+                if bounds.min <= min_value and max_value <= bounds.max:
+                    compact[field.name] = candidate
+                    break
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            non_null = len(column) - column.null_count
+            if non_null and pc.count_distinct(column).as_py() <= max(1, non_null // 2):
+                compact[field.name] = pa.dictionary(pa.int32(), pa.string())
+        elif pa.types.is_null(field.type):
+            compact[field.name] = pa.string()
+    return compact
+
+
+def _keep_temporal_as_text(source, input_format: str, settings: Dict[str, Any],
+                           columns: Optional[List[str]], column_types: Dict[str, pa.DataType]):
+    """Pin columns Arrow would parse as dates/timestamps to strings (pandas read_csv semantics)"""
+    if input_format not in ("CSV", "TSV"):
+        return column_types
+    head = _read_head(source, 1024 * 1024)
+    schema = pa.Table.from_batches(list(iter_record_batches(head, input_format, settings, columns))).schema
+    pinned = dict(column_types)
+    for field in schema:
+        if pa.types.is_temporal(field.type) and field.name not in pinned:
+            pinned[field.name] = pa.string()
+    return pinned
+
+
+def _head_schema(source, input_format: str, settings: Optional[Dict[str, Any]],
+                 columns: Optional[List[str]]) -> pa.Schema:
+    # The first batch's schema is what the streaming reader will use
+    head = _read_head(source, 1024 * 1024)
+    first = next(iter_record_batches(head, input_format, settings, columns), None)
+    return first.schema if first is not None else pa.schema([])
+
+
+def text_column_types(source, input_format: str, settings: Optional[Dict[str, Any]] = None,
+                      columns: Optional[List[str]] = None) -> Dict[str, pa.DataType]:
+    """Read every column of a CSV/TSV source as text, so values pass through unchanged"""
+    return {name: pa.string() for name in _head_schema(source, input_format, settings, columns).names}
+
+
+def _widen(dtype: pa.DataType) -> pa.DataType:
+    if pa.types.is_integer(dtype):
+        return pa.float64()
+    return pa.string()
+
+
+def stable_column_types(source, input_format: str, settings: Optional[Dict[str, Any]] = None,
+                        columns: Optional[List[str]] = None,
+                        block_size: Optional[int] = None) -> Dict[str, pa.DataType]:
+    """Column types of a CSV/TSV source that hold for every block, not just the first.
+
+    The streaming reader fixes each column's type from the first block and fails on a later block that
+    contradicts it. This pass reads the file as text and widens each column (integer -> float -> string)
+    until every value converts.
+    """
+    types = {field.name: field.type for field in _head_schema(source, input_format, settings, columns)}
+    text_types = {name: pa.string() for name in types}
+    for batch in iter_record_batches(source, input_format, settings, columns, column_types=text_types,
+                                     block_size=block_size):
+        for name, column in zip(batch.schema.names, batch.columns):
+            dtype = types[name]
+            while not pa.types.is_string(dtype):
+                try:
+                    column.cast(dtype)
+                    break
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    dtype = _widen(dtype)
+            types[name] = dtype
+    return types
+
+
+def ingest_dataframe(source, input_format: str, settings: Optional[Dict[str, Any]] = None,
+                     columns: Optional[List[str]] = None, max_rows: Optional[int] = None,
+                     memory_budget_mb: Optional[float] = None, dtype_backend: str = "pyarrow",
+                     sample_mb: Optional[float] = None) -> IngestResult:
+    """Read a tabular source into a DataFrame in chunks under a memory budget.
+
+    memory_budget_mb defaults to DEFAULT_MEMORY_BUDGET_MB, read at call time. dtype_backend="pyarrow" keeps
+    Arrow-backed dtypes; "numpy" converts to classic NumPy/object dtypes (and keeps date-like text as
+    strings) for tools that inspect dtypes.
+    """
+    settings = settings or {}
+    if memory_budget_mb is None:
+        memory_budget_mb = DEFAULT_MEMORY_BUDGET_MB
+    start_time = time.perf_counter()
+    budget_bytes = memory_budget_mb * 1024 * 1024
+    info = {
+        'engine': 'pyarrow' if input_format in ARROW_FORMATS else 'pandas',
+        'bytes_in': source_size(source),
+        'batches': 0,
+        'truncated': False,
+        'compact_types': {}
+    }
+
+    if input_format == "JSON" and not _is_json_lines(source):
+        # Arrow only reads JSON Lines; whole-document JSON goes through pandas
+        info['engine'] = 'pandas'
+
+    if info['engine'] == 'pandas':
+        df = _read_with_pandas(source, input_format, settings, columns, max_rows, dtype_backend)
+    else:
+        base_types = {}
+        if dtype_backend == "numpy":
+            base_types = _keep_temporal_as_text(source, input_format, settings, columns, {})
+        column_types = dict(base_types)
+        if sample_mb:
+            column_types.update(infer_compact_types(source, input_format, settings, sample_mb, columns))
+
+        # Narrowed integers are the likeliest to be contradicted by later rows, so drop them first,
+        # then fall back to whole-file type inference
+        relaxed_types = {name: dtype for name, dtype in column_types.items() if not pa.types.is_integer(dtype)}
+        attempts = [column_types, relaxed_types, base_types]
+        for attempt, types in enumerate(attempts):
+            info['batches'] = 0
+            info['truncated'] = False
+            try:
+                batches = _collect_batches(source, input_format, settings, columns, max_rows, types,
+                                           budget_bytes, info, unify=attempt == len(attempts) - 1)
+                break
+            except pa.ArrowInvalid:
+                if attempt == len(attempts) - 1:
+                    raise
+        info['compact_types'] = {name: str(dtype) for name, dtype in types.items() if name not in base_types}
+
+        table = pa.Table.from_batches(batches) if batches else pa.table({})
+        if dtype_backend == "pyarrow":
+            df = table.to_pandas(types_mapper=_arrow_types_mapper, self_destruct=True)
+        else:
+            # All-empty columns become float NaN columns, as pandas.read_csv does
+            for index, field in enumerate(table.schema):
+                if pa.types.is_null(field.type):
+                    table = table.set_column(index, field.name, table.column(index).cast(pa.float64()))
+            df = table.to_pandas(self_destruct=True)
+
+    info['rows'] = len(df)
+    info['columns'] = len(df.columns)
+    info['memory_bytes'] = int(df.memory_usage(deep=True).sum())
+    info['elapsed_seconds'] = time.perf_counter() - start_time
+    return IngestResult(df, info)
+
+
+def _arrow_types_mapper(arrow_type: pa.DataType):
+    """Arrow-backed dtypes, except dictionaries which become pandas categoricals"""
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def _collect_batches(source, input_format, settings, columns, max_rows, column_types, budget_bytes, info,
+                     unify: bool = False) -> List[pa.RecordBatch]:
+    """Accumulate record batches until the row limit or memory budget is reached"""
+    if unify and input_format in ("CSV", "TSV"):
+        # Non-streaming read infers types over the whole file, then slices into batches
+        read_options, parse_options, convert_options = _csv_options(settings, input_format, columns,
+                                                                    column_types, DEFAULT_BLOCK_SIZE)
+        table = pa_csv.read_csv(_as_arrow_source(source), read_options=read_options,
+                                parse_options=parse_options, convert_options=convert_options)
+        if max_rows:
+            table = table.slice(0, max_rows)
+        stream = table.to_batches(max_chunksize=DEFAULT_BATCH_ROWS)
+    else:
+        # Smaller blocks under tight budgets so the limit is enforced at a useful granularity
+        block_size = int(min(DEFAULT_BLOCK_SIZE, max(1024 * 1024, budget_bytes // 8)))
+        stream = iter_record_batches(source, input_format, settings, columns, max_rows, column_types,
+                                     block_size)
+
+    batches = []
+    used = 0
+    for batch in stream:
+        if used + batch.nbytes > budget_bytes and batches:
+            info['truncated'] = True
+            break
+        batches.append(batch)
+        used += batch.nbytes
+        info['batches'] += 1
+    return batches
+
+
+def _read_with_pandas(source, input_format: str, settings: Dict[str, Any], columns: Optional[List[str]],
+                      max_rows: Optional[int], dtype_backend: str) -> pd.DataFrame:
+    """Fallback readers for formats without a native Arrow reader, still pushing down rows/columns"""
+    backend_kwargs = {'dtype_backend': 'pyarrow'} if dtype_backend == "pyarrow" else {}
+    handle = _as_pandas_source(source)
+
+    if input_format == "Excel":
+        sheet_name = settings.get('sheet_name', 0) or 0
+        return pd.read_excel(handle, sheet_name=sheet_name, header=settings.get('header', 0),
+                             usecols=columns or None, nrows=max_rows or None, **backend_kwargs)
+    if input_format == "JSON":
+        df = pd.read_json(handle, orient=settings.get('orient', 'records'), **backend_kwargs)
+    elif input_format == "XML":
+        df = pd.read_xml(handle, **backend_kwargs)
+    elif input_format == "Fixed Width":
+        widths = [int(w.strip()) for w in settings.get('widths', '10,15,20').split(',')]
+        names_str = settings.get('names', '')
+        names = [n.strip() for n in names_str.split(',')] if names_str else None
+        df = pd.read_fwf(handle, widths=widths, names=names, nrows=max_rows or None, **backend_kwargs)
+    else:
+        raise ValueError(f"Unsupported input format: {input_format}")
+
+    if columns:
+        df = df[[c for c in columns if c in df.columns]]
+    if max_rows:
+        df = df.head(max_rows)
+    return df
@@ -0,0 +1,290 @@
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.artifact_store import ARTIFACT_DIR
+from utils.ingestion import DEFAULT_MEMORY_BUDGET_MB
+from utils.stream_convert import ConversionResult
+
+JOIN_TYPES = ("inner", "left", "right", "outer", "semi", "anti")
+JOIN_OUTPUT_FORMATS = {
+    "CSV": ("merged_dataset.csv", "text/csv"),
+    "Parquet": ("merged_dataset.parquet", "application/octet-stream"),
+}
+
+# Output this many times larger than the bigger input is flagged as a likely key explosion
+EXPLOSION_FACTOR = 10
+MAX_PARTITIONS = 256
+DEFAULT_SPOOL_MAX_MB = 64
+_WRITE_CHUNK_ROWS = 100_000
+
+
+def _row_bytes(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True, index=False).sum() / len(df) if len(df) else 0.0
+
+
+def estimate_join(left: pd.DataFrame, right: pd.DataFrame, left_on: str, right_on: str,
+                  how: str = "inner") -> Dict[str, Any]:
+    """Exact output row count of a join, derived from per-key counts of both sides.
+
+    Missing keys match each other, as they do in pd.merge.
+    """
+    left_counts = left[left_on].value_counts(dropna=False)
+    right_counts = right[right_on].value_counts(dropna=False)
+    shared = left_counts.to_frame('left').join(right_counts.rename('right'), how='inner')
+
+    pair_rows = int((shared['left'] * shared['right']).sum())
+    left_matched = int(shared['left'].sum())
+    right_matched = int(shared['right'].sum())
+    left_unmatched = len(left) - left_matched
+    right_unmatched = len(right) - right_matched
+
+    rows = {
+        'inner': pair_rows,
+        'left': pair_rows + left_unmatched,
+        'right': pair_rows + right_unmatched,
+        'outer': pair_rows + left_unmatched + right_unmatched,
+        'semi': left_matched,
+        'anti': left_unmatched,
+    }[how]
+
+    left_unique = bool(left_counts.max() <= 1) if len(left_counts) else True
+    right_unique = bool(right_counts.max() <= 1) if len(right_counts) else True
+    relationship = {
+        (True, True): 'one_to_one',
+        (True, False): 'one_to_many',
+        (False, True): 'many_to_one',
+        (False, False): 'many_to_many',
+    }[(left_unique, right_unique)]
+
+    width = _row_bytes(left) if how in ('semi', 'anti') else _row_bytes(left) + _row_bytes(right)
+    biggest = max(len(left), len(right), 1)
+    return {
+        'rows': rows,
+        'bytes': rows * width,
+        'expansion': rows / biggest,
+        'relationship': relationship,
+        'matched_keys': len(shared),
+        'left_matched': left_matched,
+        'left_unmatched': left_unmatched,
+        'right_unmatched': right_unmatched,
+        'max_left_duplicates': int(left_counts.max()) if len(left_counts) else 0,
+        'max_right_duplicates': int(right_counts.max()) if len(right_counts) else 0,
+        'explodes': rows > EXPLOSION_FACTOR * biggest,
+    }
+
+
+def _normalized_keys(left_keys: pd.Series, right_keys: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Key values in a form where keys that pd.merge treats as equal also hash equally"""
+    if pd.api.types.is_numeric_dtype(left_keys) and pd.api.types.is_numeric_dtype(right_keys) \
+            and not pd.api.types.is_bool_dtype(left_keys) and not pd.api.types.is_bool_dtype(right_keys):
+        return left_keys.astype('float64'), right_keys.astype('float64')
+    if left_keys.dtype == right_keys.dtype:
+        return left_keys, right_keys
+    return left_keys.astype(str), right_keys.astype(str)
+
+
+def _partition_ids(keys: pd.Series, partitions: int) -> np.ndarray:
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return (hashes % np.uint64(partitions)).astype(np.int64)
+
+
+def _write_part(df: pd.DataFrame, path: str) -> str:
+    """Spill one partition as Parquet; frames Arrow cannot represent fall back to pickle"""
+    try:
+        df.to_parquet(path + '.parquet', engine='pyarrow', index=False)
+        return path + '.parquet'
+    except (pa.ArrowException, ValueError, TypeError):
+        df.to_pickle(path + '.pkl')
+        return path + '.pkl'
+
+
+def _read_part(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path, engine='pyarrow') if path.endswith('.parquet') else pd.read_pickle(path)
+
+
+def _spill_partitions(df: pd.DataFrame, ids: np.ndarray, partitions: int, prefix: str) -> Dict[int, str]:
+    order = np.argsort(ids, kind='stable')
+    bounds = np.searchsorted(ids[order], np.arange(partitions + 1))
+    paths = {}
+    for part in range(partitions):
+        rows = order[bounds[part]:bounds[part + 1]]
+        paths[part] = _write_part(df.iloc[rows], f"{prefix}_{part:04d}")
+    return paths
+
+
+def _join_partition(left_path: str, right_path: str, params: Dict[str, Any], out_prefix: str) -> Tuple[str, int]:
+    """Process-pool worker: join one pair of partitions and spill the result"""
+    merged = pd.merge(_read_part(left_path), _read_part(right_path), **params)
+    return _write_part(merged, out_prefix), len(merged)
+
+
+class _OutputWriter:
+    """Append DataFrames to a spooled CSV or Parquet file"""
+
+    def __init__(self, output_format: str, sink):
+        self.output_format = output_format
+        self.sink = sink
+        self.header = True
+        self.writer = None
+        self.schema = None
+
+    def write(self, df: pd.DataFrame):
+        for start in range(0, max(len(df), 1), _WRITE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + _WRITE_CHUNK_ROWS]
+            if self.output_format == "CSV":
+                if len(chunk) or self.header:
+                    self.sink.write(chunk.to_csv(index=False, header=self.header).encode('utf-8'))
+                    self.header = False
+            else:
+                table = pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+                if self.writer is None:
+                    self.schema = table.schema
+                    self.writer = pq.ParquetWriter(self.sink, self.schema)
+                self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _unified_schema(paths) -> Optional[pa.Schema]:
+    """Common Arrow schema of the partition results (int partitions widen to float where others have NaN)"""
+    schemas = [pq.read_schema(p) for p in paths if p.endswith('.parquet')]
+    if not schemas:
+        return None
+    schemas = [s.remove_metadata() for s in schemas]
+    return pa.unify_schemas(schemas, promote_options='permissive')
+
+
+def hash_join(left: pd.DataFrame, right: pd.DataFrame, left_on: str, right_on: str, how: str = "inner",
+              suffixes: Tuple[str, str] = ("_x", "_y"), output_format: str = "CSV",
+              memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB, partitions: Optional[int] = None,
+              max_workers: Optional[int] = None, estimate: Optional[Dict[str, Any]] = None,
+              progress_callback=None, preview_rows: int = 5) -> Tuple[ConversionResult, Optional[pd.DataFrame]]:
+    """Join two frames into a spooled output file, going out of core when the join exceeds the memory budget.
+
+    Small joins run as a single pd.merge and also return the merged frame. Larger joins hash-partition both
+    inputs to Parquet on disk, join matching partitions in parallel processes and stream each partition's
+    result to the output, so the full result is never held in memory (the merged frame is then None and row
+    order differs from pd.merge). 'semi' and 'anti' keep the left rows with / without a matching key.
+    """
+    start_time = time.perf_counter()
+    estimate = estimate or estimate_join(left, right, left_on, right_on, how)
+    budget = memory_budget_mb * 1024 * 1024
+    input_bytes = left.memory_usage(deep=True).sum() + right.memory_usage(deep=True).sum()
+
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    output = tempfile.SpooledTemporaryFile(max_size=DEFAULT_SPOOL_MAX_MB * 1024 * 1024, dir=ARTIFACT_DIR)
+    writer = _OutputWriter(output_format, output)
+    merged = None
+    stats = {'mode': 'in-memory', 'partitions': 1, 'workers': 1}
+
+    try:
+        if how in ('semi', 'anti'):
+            # The result is a subset of the left rows, so only the distinct right keys are needed
+            matched = left[left_on].isin(right[right_on].unique())
+            merged = left[matched if how == 'semi' else ~matched]
+            writer.write(merged)
+            rows = len(merged)
+        elif estimate['bytes'] + input_bytes <= budget:
+            merged = pd.merge(left, right, left_on=left_on, right_on=right_on, how=how, suffixes=suffixes)
+            writer.write(merged)
+            rows = len(merged)
+        else:
+            rows, stats = _partitioned_join(left, right, left_on, right_on, how, suffixes, writer, budget,
+                                            input_bytes + estimate['bytes'], partitions, max_workers,
+                                            progress_callback)
+        writer.close()
+    except Exception:
+        output.close()
+        raise
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    bytes_out = output.tell()
+    output.seek(0)
+
+    preview = merged.head(preview_rows) if merged is not None else _preview(output, output_format, preview_rows)
+    filename, mime_type = JOIN_OUTPUT_FORMATS[output_format]
+    stats.update({
+        'rows': rows,
+        'bytes_out': bytes_out,
+        'elapsed_seconds': elapsed,
+        'rows_per_second': rows / elapsed,
+    })
+    return ConversionResult(output, filename, mime_type, stats, preview), merged
+
+
+def _partitioned_join(left, right, left_on, right_on, how, suffixes, writer, budget, total_bytes, partitions,
+                      max_workers, progress_callback) -> Tuple[int, Dict[str, Any]]:
+    # Fail fast on incompatible key types before spilling anything
+    pd.merge(left.head(0), right.head(0), left_on=left_on, right_on=right_on, how=how, suffixes=suffixes)
+
+    max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+    if not partitions:
+        # Each worker should hold one partition pair and its result within its share of the budget
+        partitions = math.ceil(total_bytes / max(budget / max_workers, 1)) * 2
+    partitions = int(min(max(partitions, 2), MAX_PARTITIONS))
+
+    spill_dir = tempfile.mkdtemp(prefix='join_', dir=ARTIFACT_DIR)
+    try:
+        left_keys, right_keys = _normalized_keys(left[left_on], right[right_on])
+        left_paths = _spill_partitions(left, _partition_ids(left_keys, partitions), partitions,
+                                       os.path.join(spill_dir, 'left'))
+        right_paths = _spill_partitions(right, _partition_ids(right_keys, partitions), partitions,
+                                        os.path.join(spill_dir, 'right'))
+
+        params = {'left_on': left_on, 'right_on': right_on, 'how': how, 'suffixes': suffixes}
+        jobs = [(left_paths[p], right_paths[p], params, os.path.join(spill_dir, f'out_{p:04d}'))
+                for p in range(partitions)]
+
+        results = []
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(max_workers, partitions)) as executor:
+                futures = [executor.submit(_join_partition, *job) for job in jobs]
+                for done, future in enumerate(futures, 1):
+                    results.append(future.result())
+                    if progress_callback:
+                        progress_callback(done / partitions)
+        else:
+            for done, job in enumerate(jobs, 1):
+                results.append(_join_partition(*job))
+                if progress_callback:
+                    progress_callback(done / partitions)
+
+        writer.schema = _unified_schema([path for path, _ in results]) if writer.output_format == "Parquet" else None
+        rows = 0
+        for path, count in results:
+            if count or rows == 0:
+                writer.write(_read_part(path))
+            rows += count
+            os.remove(path)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    return rows, {'mode': 'partitioned', 'partitions': partitions, 'workers': max_workers}
+
+
+def _preview(output, output_format: str, rows: int) -> pd.DataFrame:
+    """First rows of a finished output file, read without loading the rest"""
+    position = output.tell()
+    try:
+        if output_format == "CSV":
+            return pd.read_csv(output, nrows=rows)
+        parquet_file = pq.ParquetFile(output)
+        if parquet_file.metadata.num_rows == 0:
+            return parquet_file.schema_arrow.empty_table().to_pandas()
+        return next(parquet_file.iter_batches(batch_size=rows)).to_pandas()
+    except (pd.errors.EmptyDataError, StopIteration):
+        return pd.DataFrame()
+    finally:
+        output.seek(position)
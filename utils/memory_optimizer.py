@@ -0,0 +1,190 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+DEFAULT_OPTIONS = {
+    'downcast': True,
+    'categorize': True,
+    'arrow_strings': True,
+    'parse_dates': True,
+    'parse_numbers': False,
+    'sparse': True,
+    'category_ratio': 0.5,
+    'sparse_ratio': 0.9,
+    'lossy_floats': False,
+    'unsigned_ints': False,
+}
+
+# Cheap pre-check so only text that looks like a date is handed to the datetime parser
+_DATE_LIKE = re.compile(r'^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}|^\s*\d{8}(T|\s|$)')
+_DATE_SAMPLE_SIZE = 20
+
+
+@lru_cache(maxsize=256)
+def _date_format(value: str) -> Optional[str]:
+    """strftime format of a date string, guessed once per distinct sample"""
+    return guess_datetime_format(value)
+
+
+def _downcast_integers(series: pd.Series, unsigned: bool) -> pd.Series:
+    """Smallest integer type that fits; signed unless allowed, since a - b or -a wraps around in unsigned types"""
+    if series.empty:
+        return series
+    kind = 'unsigned' if (unsigned or series.dtype.kind == 'u') and series.min() >= 0 else 'integer'
+    return pd.to_numeric(series, downcast=kind)
+
+
+def _downcast_floats(series: pd.Series, lossy: bool, unsigned: bool) -> pd.Series:
+    values = series.to_numpy()
+    finite = values[~np.isnan(values)]
+    if len(finite) == len(values) and len(values) and np.array_equal(finite, np.round(finite)) \
+            and np.abs(finite).max() < 2 ** 53:
+        # Whole numbers without missing values: store as the smallest integer type
+        return _downcast_integers(series.astype(np.int64), unsigned)
+    if series.dtype == np.float32:
+        return series
+    narrowed = series.astype(np.float32)
+    if lossy or np.array_equal(narrowed.to_numpy().astype(np.float64), values, equal_nan=True):
+        return narrowed
+    return series
+
+
+def _parse_dates(text: pd.Series) -> Optional[pd.Series]:
+    """Parse a text column with one guessed format; None unless every value parses"""
+    sample = text.head(_DATE_SAMPLE_SIZE)
+    if not sample.map(lambda v: isinstance(v, str) and bool(_DATE_LIKE.match(v))).all():
+        return None
+    formats = {_date_format(v.strip()) for v in sample}
+    if len(formats) != 1 or None in formats:
+        return None
+    parsed = pd.to_datetime(text, format=formats.pop(), errors='coerce', cache=True)
+    return parsed if parsed.notna().all() else None
+
+
+def _parse_numbers(text: pd.Series) -> Optional[pd.Series]:
+    """Parse a numeric-looking text column; None unless every value parses and prints back unchanged"""
+    if not text.head(_DATE_SAMPLE_SIZE).map(lambda v: isinstance(v, (str, int, float))).all():
+        return None
+    parsed = pd.to_numeric(text, errors='coerce')
+    if not parsed.notna().all():
+        return None
+    # Leading zeros (ZIP codes, IDs, phone numbers), padding and alternate spellings would be lost
+    if not parsed.astype(str).equals(text.astype(str)):
+        return None
+    return parsed
+
+
+def _optimize_object(series: pd.Series, options: Dict[str, Any]) -> Tuple[pd.Series, str]:
+    non_null = series.dropna()
+    if non_null.empty:
+        return series, 'unchanged'
+
+    numbers = _parse_numbers(non_null) if options['parse_numbers'] else None
+    if numbers is not None:
+        converted = pd.to_numeric(series, errors='coerce')
+        if options['downcast']:
+            converted = _downcast_numeric(converted, options)
+        return converted, 'parsed numbers'
+
+    if options['parse_dates']:
+        dates = _parse_dates(non_null)
+        if dates is not None:
+            return dates.reindex(series.index), 'parsed dates'
+
+    if not non_null.map(type).eq(str).all():
+        # Mixed Python objects have no compact representation
+        return series, 'unchanged'
+
+    if options['categorize'] and non_null.nunique() < len(non_null) * options['category_ratio']:
+        return series.astype('category'), 'category'
+    if options['arrow_strings']:
+        return series.astype(pd.StringDtype('pyarrow')), 'arrow strings'
+    return series, 'unchanged'
+
+
+def _downcast_numeric(series: pd.Series, options: Dict[str, Any]) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series) and series.dtype.kind in 'iu':
+        return _downcast_integers(series, options['unsigned_ints'])
+    if series.dtype.kind == 'f':
+        return _downcast_floats(series, options['lossy_floats'], options['unsigned_ints'])
+    return series
+
+
+def optimize_column(series: pd.Series, options: Optional[Dict[str, Any]] = None) -> Tuple[pd.Series, str]:
+    """Return the most compact representation of one column and a short description of what was done"""
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    dtype = series.dtype
+    action = 'unchanged'
+
+    if dtype == object:
+        series, action = _optimize_object(series, options)
+    elif isinstance(dtype, pd.StringDtype) and options['categorize']:
+        non_null = series.dropna()
+        if len(non_null) and non_null.nunique() < len(non_null) * options['category_ratio']:
+            series, action = series.astype('category'), 'category'
+    elif options['downcast'] and pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.SparseDtype):
+        downcast = _downcast_numeric(series, options)
+        if downcast.dtype != dtype:
+            series, action = downcast, 'downcast'
+
+    # Mostly-missing numeric columns only store their present values
+    if options['sparse'] and isinstance(series.dtype, np.dtype) and series.dtype.kind == 'f' and len(series):
+        if series.isna().mean() >= options['sparse_ratio']:
+            series = series.astype(pd.SparseDtype(series.dtype, np.nan))
+            action = 'sparse' if action == 'unchanged' else f'{action} + sparse'
+
+    return series, action
+
+
+def optimize_dataframe(df: pd.DataFrame, options: Optional[Dict[str, Any]] = None,
+                       progress_callback=None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Shrink a DataFrame column by column and report deep memory usage before and after.
+
+    Returns (optimized frame, per-column report). The input frame is not modified.
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    columns = {}
+    rows = []
+
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        before = int(series.memory_usage(deep=True, index=False))
+        try:
+            optimized, action = optimize_column(series, options)
+        except (ValueError, TypeError, OverflowError):
+            optimized, action = series, 'unchanged'
+        after = int(optimized.memory_usage(deep=True, index=False))
+        columns[i] = optimized
+        rows.append({
+            'Column': name,
+            'Before Type': str(series.dtype),
+            'After Type': str(optimized.dtype),
+            'Action': action,
+            'Memory Before (bytes)': before,
+            'Memory After (bytes)': after,
+            'Saved %': (1 - after / before) * 100 if before else 0.0
+        })
+        if progress_callback:
+            progress_callback((i + 1) / len(df.columns))
+
+    optimized_df = pd.concat(columns, axis=1) if columns else df.copy()
+    optimized_df.columns = df.columns
+    optimized_df.index = df.index
+    return optimized_df, pd.DataFrame(rows)
+
+
+def dense_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """Densify sparse columns, for writers (Parquet, CSV) that do not accept sparse arrays"""
+    sparse_columns = [name for name, dtype in df.dtypes.items() if isinstance(dtype, pd.SparseDtype)]
+    if not sparse_columns:
+        return df
+    df = df.copy(deep=False)
+    for name in sparse_columns:
+        df[name] = df[name].sparse.to_dense()
+    return df
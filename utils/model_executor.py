@@ -0,0 +1,289 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import check_cv, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from utils.quality_engine import frame_digest
+from utils.tool_page import cached_artifact, params_key
+
+FIT_CACHE_ENTRIES = int(os.environ.get('MODEL_FIT_CACHE_ENTRIES', '128'))
+# Splits and fold sets kept per prepared dataset; searches add a fold set per row subset they evaluate
+SPLIT_CACHE_ENTRIES = int(os.environ.get('MODEL_SPLIT_CACHE_ENTRIES', '8'))
+
+
+class PreparedData:
+    """Model-ready features and target for one (dataset, columns, task) selection, with cached splits and folds.
+
+    The object is shared between sessions, so its split and fold caches are bounded LRUs behind a lock.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, index: pd.Index, feature_cols: List[str], task_type: str,
+                 classes: Optional[np.ndarray], key: str):
+        self.X = X
+        self.y = y
+        self.index = index
+        self.feature_cols = feature_cols
+        self.task_type = task_type
+        self.classes = classes
+        self.key = key
+        self._splits: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._folds: "OrderedDict[str, List[Tuple[np.ndarray, np.ndarray]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, entries: OrderedDict, key, build: Callable):
+        with self._lock:
+            if key in entries:
+                entries.move_to_end(key)
+                return entries[key]
+        value = build()
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > max(SPLIT_CACHE_ENTRIES, 1):
+                entries.popitem(last=False)
+        return value
+
+    @property
+    def is_classification(self) -> bool:
+        return self.task_type == "Classification"
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Features as a DataFrame, for tools that report per-column results"""
+        return pd.DataFrame(self.X, columns=self.feature_cols, index=self.index)
+
+    def split(self, test_size: float = 0.2, random_state: int = 42,
+              stratify: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(train, test) row positions; stratified for classification when there is more than one class"""
+        stratify = stratify and self.is_classification and len(np.unique(self.y)) > 1
+        key = (test_size, random_state, stratify)
+        return self._cached(self._splits, key, lambda: tuple(train_test_split(
+            np.arange(len(self.y)), test_size=test_size, random_state=random_state,
+            stratify=self.y if stratify else None)))
+
+    def folds(self, cv, rows: Optional[np.ndarray] = None,
+              groups: Optional[np.ndarray] = None) -> Tuple[str, List[Tuple[np.ndarray, np.ndarray]]]:
+        """(fold-set key, [(train, test) row positions]) for a CV splitter over all rows or a subset of them"""
+        subset = rows if rows is not None else np.arange(len(self.y))
+        digest = hashlib.blake2b(subset.tobytes(), digest_size=8)
+        if groups is not None:
+            digest.update(np.asarray(groups).tobytes())
+        key = f"{cv!r}-{digest.hexdigest()}"
+        return key, self._cached(self._folds, key, lambda: [
+            (subset[train], subset[test]) for train, test in cv.split(self.X[subset], self.y[subset], groups)])
+
+
+def _prepare(df: pd.DataFrame, feature_cols: List[str], target_col: str, task_type: str,
+             key: str) -> PreparedData:
+    complete = df[feature_cols].notna().all(axis=1) & df[target_col].notna()
+    X = df.loc[complete, feature_cols].to_numpy(dtype=np.float64)
+    target = df.loc[complete, target_col]
+    classes = None
+    if task_type == "Classification":
+        encoder = LabelEncoder()
+        y = encoder.fit_transform(target)
+        classes = encoder.classes_
+    else:
+        y = target.to_numpy(dtype=np.float64)
+    return PreparedData(X, y, target.index, list(feature_cols), task_type, classes, key)
+
+
+def prepare_data(df: pd.DataFrame, feature_cols: List[str], target_col: str, task_type: str) -> PreparedData:
+    """Drop incomplete rows and encode the target once per (dataset digest, columns, task).
+
+    The result is shared between reruns and sessions and must be treated as read-only.
+    """
+    columns = list(dict.fromkeys(list(feature_cols) + [target_col]))
+    digest = frame_digest(df[columns])
+    params = {'features': list(feature_cols), 'target': target_col, 'task': task_type}
+    key = f"{digest}-{params_key(params)}"
+    return cached_artifact('model_data', digest, params,
+                           lambda source: _prepare(source, list(feature_cols), target_col, task_type, key), df)
+
+
+def with_scaling(estimator) -> Pipeline:
+    """Standardize features inside the model, so scaling is fitted on training rows only"""
+    return Pipeline([('scaler', StandardScaler()), ('model', estimator)])
+
+
+def estimator_key(estimator) -> str:
+    """Hash of an estimator's class and full parameter set"""
+    params = params_key({'class': f"{type(estimator).__module__}.{type(estimator).__qualname__}",
+                         'params': estimator.get_params(deep=True)})
+    return hashlib.blake2b(params.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class FitResult:
+    """A fitted estimator with its fit time and predictions on the training and test rows"""
+
+    def __init__(self, model, fit_time: float, train_pred: np.ndarray, test_pred: Optional[np.ndarray]):
+        self.model = model
+        self.fit_time = fit_time
+        self.train_pred = train_pred
+        self.test_pred = test_pred
+
+
+class FitCache:
+    """Process-wide LRU of fit and cross-validation results keyed by data, split and estimator parameters"""
+
+    def __init__(self, max_entries: int = FIT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_fit_cache() -> FitCache:
+    """Process-wide fit cache"""
+    return FitCache()
+
+
+def _fit_task(estimator, X: np.ndarray, y: np.ndarray, train: np.ndarray, test: Optional[np.ndarray]) -> FitResult:
+    model = clone(estimator)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_time = time.perf_counter() - start
+    test_pred = model.predict(X[test]) if test is not None else None
+    return FitResult(model, fit_time, model.predict(X[train]), test_pred)
+
+
+def _fold_task(estimator, X: np.ndarray, y: np.ndarray, train: np.ndarray, test: np.ndarray,
+               scoring: Sequence[str], return_train_score: bool, error_score) -> Dict[str, float]:
+    model = clone(estimator)
+    start = time.perf_counter()
+    try:
+        model.fit(X[train], y[train])
+    except Exception:
+        if error_score == 'raise':
+            raise
+        # A configuration that cannot be fitted on this fold scores error_score, like sklearn's cross_validate
+        scores = {'fit_time': time.perf_counter() - start}
+        for metric in scoring:
+            scores[f'test_{metric}'] = error_score
+            if return_train_score:
+                scores[f'train_{metric}'] = error_score
+        return scores
+    scores = {'fit_time': time.perf_counter() - start}
+    for metric in scoring:
+        scorer = get_scorer(metric)
+        scores[f'test_{metric}'] = scorer(model, X[test], y[test])
+        if return_train_score:
+            scores[f'train_{metric}'] = scorer(model, X[train], y[train])
+    return scores
+
+
+def _tagged(tag, func: Callable, *args):
+    return tag, func(*args)
+
+
+def _run(tasks: List[Tuple[Any, Callable, tuple]], n_jobs: Optional[int], progress_callback=None):
+    """Yield (tag, result) for each task, on a loky process pool when there is more than one"""
+    n_jobs = n_jobs or max(1, (os.cpu_count() or 2) - 1)
+    if n_jobs == 1 or len(tasks) <= 1:
+        outputs = ((tag, func(*args)) for tag, func, args in tasks)
+    else:
+        outputs = Parallel(n_jobs=min(n_jobs, len(tasks)), backend='loky', return_as='generator_unordered')(
+            delayed(_tagged)(tag, func, *args) for tag, func, args in tasks)
+    for done, output in enumerate(outputs, start=1):
+        if progress_callback:
+            progress_callback(done / len(tasks))
+        yield output
+
+
+def fit_models(data: PreparedData, estimators: Dict[str, Any], test_size: Optional[float] = 0.2,
+               stratify: bool = True, n_jobs: Optional[int] = None,
+               progress_callback=None) -> Tuple[Dict[str, FitResult], Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Fit independent models on the shared holdout split (or on every row when test_size is None).
+
+    Returns ({name: FitResult}, (train rows, test rows)). Models whose parameters were already fitted
+    on the same data and split come from the fit cache; only the rest are trained, in parallel.
+    """
+    if test_size is None:
+        train, test = np.arange(len(data.y)), None
+        split_key = 'all'
+    else:
+        train, test = data.split(test_size, stratify=stratify)
+        split_key = f"holdout-{test_size}-{stratify}"
+
+    cache = get_fit_cache()
+    results, tasks = {}, []
+    for name, estimator in estimators.items():
+        key = f"fit-{data.key}-{split_key}-{estimator_key(estimator)}"
+        cached = cache.get(key)
+        if cached is not None:
+            results[name] = cached
+        else:
+            tasks.append(((name, key), _fit_task, (estimator, data.X, data.y, train, test)))
+
+    for (name, key), result in _run(tasks, n_jobs, progress_callback):
+        cache.put(key, result)
+        results[name] = result
+    return {name: results[name] for name in estimators}, (train, test)
+
+
+def cross_validate_models(data: PreparedData, estimators: Dict[str, Any], cv, scoring: Sequence[str],
+                          rows: Optional[np.ndarray] = None, groups: Optional[np.ndarray] = None,
+                          return_train_score: bool = False, error_score='raise', n_jobs: Optional[int] = None,
+                          progress_callback=None, stats: Optional[Dict[str, int]] = None
+                          ) -> Dict[str, Dict[str, np.ndarray]]:
+    """Cross-validate several models, spreading every (model, fold) fit across the process pool.
+
+    `cv` is a splitter or a fold count (resolved per estimator like sklearn's cross_validate); folds
+    that fail to fit raise, or score `error_score` when it is a number. Returns
+    {name: {'fit_time', 'test_<metric>', 'train_<metric>': per-fold arrays}}, cached per model. When given,
+    stats['fits'] is increased by the number of fold fits actually run (cached models add none).
+    """
+    scoring = list(scoring)
+    cache = get_fit_cache()
+    results, tasks, pending = {}, [], {}
+    for name, estimator in estimators.items():
+        splitter = check_cv(cv, data.y if rows is None else data.y[rows], classifier=is_classifier(estimator))
+        folds_key, folds = data.folds(splitter, rows, groups)
+        key = f"cv-{data.key}-{folds_key}-{scoring}-{return_train_score}-{error_score}-{estimator_key(estimator)}"
+        cached = cache.get(key)
+        if cached is not None:
+            results[name] = cached
+            continue
+        pending[name] = (key, [None] * len(folds))
+        tasks.extend(((name, i), _fold_task,
+                      (estimator, data.X, data.y, train, test, scoring, return_train_score, error_score))
+                     for i, (train, test) in enumerate(folds))
+
+    if stats is not None:
+        stats['fits'] = stats.get('fits', 0) + len(tasks)
+    for (name, fold), scores in _run(tasks, n_jobs, progress_callback):
+        pending[name][1][fold] = scores
+    for name, (key, fold_scores) in pending.items():
+        result = {metric: np.array([scores[metric] for scores in fold_scores]) for metric in fold_scores[0]}
+        cache.put(key, result)
+        results[name] = result
+    return {name: results[name] for name in estimators}
@@ -0,0 +1,159 @@
+import os
+from typing import List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.colors import LogNorm
+
+from utils.quality_engine import frame_digest
+from utils.tool_page import cached_artifact
+
+# Points kept per line series; a few thousand is beyond what a chart can resolve horizontally
+LINE_POINTS = int(os.environ.get('PLOT_LINE_POINTS', '2000'))
+# Scatter plots with more points than this are drawn as a 2-D binned density
+DENSITY_THRESHOLD = int(os.environ.get('PLOT_DENSITY_THRESHOLD', '50000'))
+DENSITY_BINS = 200
+# Cells per side in each panel of a density scatter matrix
+MATRIX_BINS = 60
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = LINE_POINTS) -> np.ndarray:
+    """Positions of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between contributes the point forming the
+    largest triangle with the previously kept point and the average of the next bucket, which preserves
+    peaks and troughs that uniform sampling would drop.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    x_sums = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    y_sums = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    x_means = np.append(x_sums / sizes, x[-1])
+    y_means = np.append(y_sums / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        cx, cy = x_means[bucket + 1], y_means[bucket + 1]
+        areas = np.abs((ax - cx) * (y[low:high] - ay) - (ax - x[low:high]) * (cy - ay))
+        previous = low + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def _axis_values(index: pd.Index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+
+def _viewport_slice(index: pd.Index, viewport: Optional[Tuple[float, float]]) -> slice:
+    """Rows of a sorted index inside a (start %, end %) window of its range"""
+    if viewport is None or len(index) == 0 or tuple(viewport) == (0, 100):
+        return slice(0, len(index))
+    values = _axis_values(index)
+    span = values[-1] - values[0]
+    start = values[0] + span * viewport[0] / 100
+    end = values[0] + span * viewport[1] / 100
+    return slice(int(np.searchsorted(values, start, side='left')), int(np.searchsorted(values, end, side='right')))
+
+
+def _reduce_lines(df: pd.DataFrame, columns: List[str], n_out: int,
+                  viewport: Optional[Tuple[float, float]]) -> pd.DataFrame:
+    visible = df.iloc[_viewport_slice(df.index, viewport)]
+    if len(visible) <= n_out:
+        return visible[columns]
+    x = _axis_values(visible.index)
+    keep = []
+    for col in columns:
+        present = np.flatnonzero(visible[col].notna().to_numpy())
+        keep.append(present[lttb_indices(x[present], visible[col].to_numpy(dtype=np.float64)[present], n_out)])
+    return visible[columns].iloc[np.unique(np.concatenate(keep))]
+
+
+def reduce_lines(df: pd.DataFrame, columns: Optional[List[str]] = None, n_out: int = LINE_POINTS,
+                 viewport: Optional[Tuple[float, float]] = None) -> pd.DataFrame:
+    """Rows of df (indexed by a sorted x axis) to draw as lines, cached per (data digest, viewport).
+
+    Each column is LTTB-downsampled to n_out points within the viewport, a (start %, end %) window of the
+    x range, and the union of the kept rows is returned. Small inputs come back unchanged.
+    """
+    columns = list(columns if columns is not None else df.columns)
+    if len(df) <= n_out and viewport is None:
+        return df[columns]
+    source = df[columns]
+    params = {'columns': columns, 'n_out': n_out, 'viewport': list(viewport) if viewport else None}
+    return cached_artifact('line_reduction', frame_digest(source.reset_index()), params,
+                           lambda data: _reduce_lines(data, columns, n_out, viewport), source)
+
+
+def _density(x: np.ndarray, y: np.ndarray, c: Optional[np.ndarray], bins: int):
+    finite = np.isfinite(x) & np.isfinite(y)
+    if c is not None:
+        finite &= np.isfinite(c)
+    x, y = x[finite], y[finite]
+    extent = [[x.min(), x.max()], [y.min(), y.max()]] if len(x) else None
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=extent)
+    means = None
+    if c is not None:
+        sums, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=c[finite])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+    return counts, means, x_edges, y_edges
+
+
+def density_grid(df: pd.DataFrame, x_col: str, y_col: str, color_col: Optional[str] = None,
+                 bins: int = DENSITY_BINS):
+    """(counts, mean of color_col or None, x edges, y edges) of a 2-D histogram, cached per data digest"""
+    columns = list(dict.fromkeys([x_col, y_col] + ([color_col] if color_col else [])))
+    source = df[columns]
+
+    def build(data):
+        c = data[color_col].to_numpy(dtype=np.float64) if color_col else None
+        return _density(data[x_col].to_numpy(dtype=np.float64), data[y_col].to_numpy(dtype=np.float64), c, bins)
+
+    return cached_artifact('density_grid', frame_digest(source), {'columns': columns, 'bins': bins}, build, source)
+
+
+def draw_density(ax, df: pd.DataFrame, x_col: str, y_col: str, color_col: Optional[str] = None,
+                 cmap: str = 'viridis', bins: int = DENSITY_BINS):
+    """Draw a binned scatter: point counts per cell on a log scale, or the mean of color_col per cell"""
+    counts, means, x_edges, y_edges = density_grid(df, x_col, y_col, color_col, bins)
+    if means is not None:
+        values = np.ma.masked_invalid(means.T)
+        return ax.pcolormesh(x_edges, y_edges, values, cmap=cmap, shading='flat')
+    values = np.ma.masked_equal(counts.T, 0)
+    return ax.pcolormesh(x_edges, y_edges, values, cmap=cmap, norm=LogNorm(), shading='flat')
+
+
+def density_note(n_points: int, bins: int = DENSITY_BINS) -> str:
+    return (f"{n_points:,} points drawn as a {bins}x{bins} density grid "
+            f"(above {DENSITY_THRESHOLD:,} points)")
+
+
+def scatter_matrix_figure(df: pd.DataFrame, columns: List[str], bins: int = MATRIX_BINS):
+    """Scatter matrix of histograms (diagonal) and binned densities, for data too large for point markers"""
+    size = len(columns)
+    fig, axes = plt.subplots(size, size, figsize=(12, 12), squeeze=False)
+    for i, row_col in enumerate(columns):
+        for j, col in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                ax.hist(df[col].dropna(), bins=bins, alpha=0.7)
+            else:
+                draw_density(ax, df, col, row_col, bins=bins)
+            if i == size - 1:
+                ax.set_xlabel(col)
+            if j == 0:
+                ax.set_ylabel(row_col)
+    return fig
@@ -0,0 +1,502 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.ingestion import iter_record_batches
+
+DEFAULT_CHUNK_ROWS = 100_000
+# Below this many rows the process pool costs more than it saves
+PARALLEL_MIN_ROWS = 500_000
+# Approximate mode keeps exact 64-bit row hashes for duplicate counting up to this many rows, then switches to HLL
+EXACT_ROW_HASH_LIMIT = 20_000_000
+
+PROFILE_MODES = ("exact", "approximate")
+
+
+def _hash_values(values) -> np.ndarray:
+    """64-bit hashes of a 1-D array or Series of values"""
+    return pd.util.hash_array(np.asarray(values))
+
+
+class Moments:
+    """Streaming count/mean/M2/M3/M4/min/max, merged with the pairwise (Chan/Pebay) update"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "Moments":
+        moments = cls()
+        if len(values):
+            moments.n = len(values)
+            moments.mean = float(values.mean())
+            delta = values - moments.mean
+            delta2 = delta * delta
+            moments.m2 = float(delta2.sum())
+            moments.m3 = float((delta2 * delta).sum())
+            moments.m4 = float((delta2 * delta2).sum())
+            moments.min = float(values.min())
+            moments.max = float(values.max())
+        return moments
+
+    def merge(self, other: "Moments") -> "Moments":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (self.m3 + other.m3 + delta * delta_n ** 2 * na * nb * (na - nb)
+              + 3 * delta_n * (na * other.m2 - nb * self.m2))
+        m4 = (self.m4 + other.m4 + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * delta_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4 * delta_n * (na * other.m3 - nb * self.m3))
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, self.mean + delta_n * nb, m2, m3, m4
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 1) -> float:
+        return self.m2 / (self.n - ddof) if self.n > ddof else np.nan
+
+    def std(self, ddof: int = 1) -> float:
+        return float(np.sqrt(self.variance(ddof)))
+
+    def skew(self, bias: bool = False) -> float:
+        """Sample skewness; bias=False matches pandas, bias=True matches scipy.stats.skew"""
+        if self.n < 3 or self.m2 == 0:
+            return 0.0 if self.n >= 3 else np.nan
+        g1 = np.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+        if bias:
+            return float(g1)
+        return float(g1 * np.sqrt(self.n * (self.n - 1)) / (self.n - 2))
+
+    def kurtosis(self, bias: bool = True) -> float:
+        """Excess kurtosis; bias=True matches scipy.stats.kurtosis, bias=False matches pandas"""
+        if self.n < 4 or self.m2 == 0:
+            return 0.0 if self.n >= 4 else np.nan
+        g2 = self.n * self.m4 / self.m2 ** 2 - 3
+        if bias:
+            return float(g2)
+        n = self.n
+        return float(((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)))
+
+
+class TDigest:
+    """Merging t-digest: quantiles from a bounded set of weighted centroids, vectorized with numpy"""
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    def update(self, values: np.ndarray) -> "TDigest":
+        if len(values):
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if len(other.means):
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # k1 scale function: centroids are small near the tails and large in the middle
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        bucket = np.floor(k - k.min()).astype(np.int64)
+        bucket_weights = np.bincount(bucket, weights=weights)
+        bucket_sums = np.bincount(bucket, weights=means * weights)
+        used = bucket_weights > 0
+        self.weights = bucket_weights[used]
+        self.means = bucket_sums[used] / self.weights
+
+    def quantile(self, q: float, minimum: float, maximum: float) -> float:
+        if not len(self.means):
+            return np.nan
+        positions = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        xp = np.concatenate([[0.0], positions, [1.0]])
+        fp = np.concatenate([[minimum], self.means, [maximum]])
+        return float(np.interp(q, xp, fp))
+
+    def cdf(self, x: float, minimum: float, maximum: float) -> float:
+        if not len(self.means):
+            return np.nan
+        positions = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        xp = np.concatenate([[minimum], self.means, [maximum]])
+        fp = np.concatenate([[0.0], positions, [1.0]])
+        return float(np.interp(x, xp, fp))
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit value hashes"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes: np.ndarray) -> "HyperLogLog":
+        if len(hashes):
+            p = self.precision
+            index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+            # Leading zeros of the next 32 bits (exact in float64), capped at 33
+            rest = ((hashes << np.uint64(p)) >> np.uint64(32)).astype(np.float64)
+            rank = np.where(rest > 0, 32 - np.floor(np.log2(np.maximum(rest, 1))), 33).astype(np.uint8)
+            np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return float(m * np.log(m / zeros))
+        return float(raw)
+
+
+class CountMinTopK:
+    """Count-min sketch plus a bounded candidate set for approximate heavy hitters"""
+
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+
+    def __init__(self, width: int = 4096, capacity: int = 64):
+        self.width = width
+        self.capacity = capacity
+        self.table = np.zeros((len(self.SEEDS), width), dtype=np.int64)
+        self.candidates: Dict[Any, int] = {}
+
+    def _columns(self, hashes: np.ndarray) -> List[np.ndarray]:
+        return [((hashes ^ np.uint64(seed)) * np.uint64(0xFF51AFD7ED558CCD) >> np.uint64(40)).astype(np.int64)
+                % self.width for seed in self.SEEDS]
+
+    def _estimate(self, hashes: np.ndarray) -> np.ndarray:
+        return np.min([self.table[row, cols] for row, cols in enumerate(self._columns(hashes))], axis=0)
+
+    def update_counts(self, counts: pd.Series) -> "CountMinTopK":
+        """Add exact per-chunk value counts"""
+        if len(counts):
+            hashes = _hash_values(counts.index.to_numpy())
+            for row, cols in enumerate(self._columns(hashes)):
+                np.add.at(self.table[row], cols, counts.to_numpy(dtype=np.int64))
+            top = counts.nlargest(self.capacity)
+            self._refresh_candidates(list(self.candidates) + list(top.index))
+        return self
+
+    def merge(self, other: "CountMinTopK") -> "CountMinTopK":
+        self.table += other.table
+        self._refresh_candidates(list(self.candidates) + list(other.candidates))
+        return self
+
+    def _refresh_candidates(self, values: List[Any]):
+        values = list(dict.fromkeys(values))
+        estimates = self._estimate(_hash_values(np.array(values, dtype=object)))
+        ranked = sorted(zip(values, estimates.tolist()), key=lambda item: -item[1])[:self.capacity]
+        self.candidates = dict(ranked)
+
+    def top_k(self, k: int) -> List[Tuple[Any, int]]:
+        return sorted(self.candidates.items(), key=lambda item: -item[1])[:k]
+
+
+class ColumnProfile:
+    """Mergeable statistics for one column"""
+
+    def __init__(self, name: str, dtype: str, kind: str, mode: str):
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind  # 'numeric', 'datetime' or 'text'
+        self.mode = mode
+        self.rows = 0
+        self.missing = 0
+        self.moments = Moments() if kind == 'numeric' else None
+        self.digest = TDigest() if kind == 'numeric' and mode == 'approximate' else None
+        self.hll = HyperLogLog() if mode == 'approximate' else None
+        self.top = CountMinTopK() if mode == 'approximate' else None
+        self._count_parts: List[pd.Series] = []  # exact mode: per-chunk value counts, combined lazily
+        self.min = None
+        self.max = None
+        self.text_length_sum = 0
+        self.sample: List[Any] = []
+
+    def update(self, series: pd.Series):
+        self.rows += len(series)
+        non_null = series.dropna()
+        self.missing += len(series) - len(non_null)
+        if not len(non_null):
+            return
+
+        if len(self.sample) < 100:
+            self.sample.extend(non_null.iloc[:100 - len(self.sample)].tolist())
+
+        if self.kind == 'numeric':
+            values = non_null.to_numpy(dtype=np.float64)
+            self.moments.merge(Moments.from_values(values))
+            if self.digest is not None:
+                self.digest.update(values)
+        elif self.kind == 'datetime':
+            low, high = non_null.min(), non_null.max()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        elif series.dtype == object:
+            self.text_length_sum += int(non_null.astype(str).str.len().sum())
+
+        counts = non_null.value_counts(sort=False)
+        if self.mode == 'exact':
+            self._count_parts.append(counts)
+        else:
+            self.hll.update_hashes(_hash_values(counts.index.to_numpy()))
+            self.top.update_counts(counts)
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        self.rows += other.rows
+        self.missing += other.missing
+        self.sample = (self.sample + other.sample)[:100]
+        self.text_length_sum += other.text_length_sum
+        if self.moments is not None:
+            self.moments.merge(other.moments)
+        if self.digest is not None:
+            self.digest.merge(other.digest)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        if self.mode == 'exact':
+            self._count_parts.extend(other._count_parts)
+        else:
+            self.hll.merge(other.hll)
+            self.top.merge(other.top)
+        return self
+
+    @property
+    def counts(self) -> Optional[pd.Series]:
+        """Exact value counts, combining chunk counts on first access"""
+        if not self._count_parts:
+            return None
+        if len(self._count_parts) > 1:
+            self._count_parts = [pd.concat(self._count_parts).groupby(level=0, sort=False).sum()]
+        return self._count_parts[0]
+
+    @property
+    def count(self) -> int:
+        return self.rows - self.missing
+
+    @property
+    def unique(self) -> int:
+        if self.mode == 'exact':
+            counts = self.counts
+            return 0 if counts is None else int(len(counts))
+        # Never report more distinct values than non-null values
+        return int(min(round(self.hll.estimate()), self.count))
+
+    def top_k(self, k: int = 5) -> List[Tuple[Any, int]]:
+        if self.mode == 'exact':
+            counts = self.counts
+            if counts is None:
+                return []
+            top = counts.nlargest(k)
+            return [(value, int(count)) for value, count in top.items()]
+        return [(value, int(count)) for value, count in self.top.top_k(k)]
+
+    @property
+    def avg_length(self) -> float:
+        return self.text_length_sum / self.count if self.count else np.nan
+
+    def quantile(self, q: float) -> float:
+        """Quantile with pandas' linear interpolation (exact mode) or from the t-digest"""
+        if self.kind != 'numeric' or self.count == 0:
+            return np.nan
+        if self.mode == 'approximate':
+            return self.digest.quantile(q, self.moments.min, self.moments.max)
+        counts = self.counts.sort_index()
+        cumulative = np.cumsum(counts.to_numpy())
+        values = counts.index.to_numpy(dtype=np.float64)
+        position = (self.count - 1) * q
+        lower = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+        upper = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+        return float(lower + (upper - lower) * (position - np.floor(position)))
+
+    def count_outside(self, low: float, high: float) -> int:
+        """Number of values below `low` or above `high`"""
+        if self.kind != 'numeric' or self.count == 0:
+            return 0
+        if self.mode == 'approximate':
+            below = self.digest.cdf(low, self.moments.min, self.moments.max) if low > self.moments.min else 0.0
+            above = 1 - self.digest.cdf(high, self.moments.min, self.moments.max) if high < self.moments.max else 0.0
+            return int(round((below + above) * self.count))
+        counts = self.counts
+        values = counts.index.to_numpy(dtype=np.float64)
+        return int(counts.to_numpy()[(values < low) | (values > high)].sum())
+
+
+def _column_kind(series: pd.Series) -> str:
+    if pd.api.types.is_numeric_dtype(series):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'text'
+
+
+class DatasetProfile:
+    """Mergeable whole-table profile: per-column sketches plus row-level totals"""
+
+    def __init__(self, mode: str = "exact"):
+        self.mode = mode
+        self.rows = 0
+        self.memory_bytes = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.row_hashes: List[np.ndarray] = []
+        self.row_hll: Optional[HyperLogLog] = None
+        self.elapsed_seconds = 0.0
+        self.chunks = 0
+
+    def update(self, chunk: pd.DataFrame) -> "DatasetProfile":
+        self.rows += len(chunk)
+        self.chunks += 1
+        self.memory_bytes += int(chunk.memory_usage(deep=True).sum())
+        for name in chunk.columns:
+            series = chunk[name]
+            if name not in self.columns:
+                self.columns[name] = ColumnProfile(name, str(series.dtype), _column_kind(series), self.mode)
+            self.columns[name].update(series)
+
+        row_hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        if self.row_hll is not None:
+            self.row_hll.update_hashes(row_hashes)
+        else:
+            self.row_hashes.append(np.unique(row_hashes))
+            self._check_row_hash_limit()
+        return self
+
+    def _check_row_hash_limit(self):
+        """Fold row hashes into a HyperLogLog once approximate mode exceeds the exact-hash budget"""
+        if self.mode == 'approximate' and self.rows > EXACT_ROW_HASH_LIMIT:
+            self.row_hll = self.row_hll or HyperLogLog()
+            for hashes in self.row_hashes:
+                self.row_hll.update_hashes(hashes)
+            self.row_hashes = []
+
+    def merge(self, other: "DatasetProfile") -> "DatasetProfile":
+        self.rows += other.rows
+        self.chunks += other.chunks
+        self.memory_bytes += other.memory_bytes
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+        self.row_hashes.extend(other.row_hashes)
+        if other.row_hll is not None:
+            self.row_hll = (self.row_hll or HyperLogLog()).merge(other.row_hll)
+        if self.row_hll is not None:
+            self._check_row_hash_limit()
+            for hashes in self.row_hashes:
+                self.row_hll.update_hashes(hashes)
+            self.row_hashes = []
+        else:
+            self._check_row_hash_limit()
+        return self
+
+    @property
+    def missing_cells(self) -> int:
+        return sum(column.missing for column in self.columns.values())
+
+    @property
+    def completeness(self) -> float:
+        total = self.rows * len(self.columns)
+        return (total - self.missing_cells) / total * 100 if total else 100.0
+
+    @property
+    def duplicates_exact(self) -> bool:
+        return self.row_hll is None
+
+    @property
+    def duplicate_rows(self) -> int:
+        """Rows identical to an earlier row (64-bit row hashes; HLL-estimated past EXACT_ROW_HASH_LIMIT)"""
+        if self.row_hll is not None:
+            return max(0, self.rows - int(round(self.row_hll.estimate())))
+        if not self.row_hashes:
+            return 0
+        if len(self.row_hashes) > 1:
+            self.row_hashes = [np.unique(np.concatenate(self.row_hashes))]
+        return self.rows - len(self.row_hashes[0])
+
+    def dtype_counts(self) -> pd.Series:
+        return pd.Series([column.dtype for column in self.columns.values()]).value_counts()
+
+
+def _profile_chunk(chunk: pd.DataFrame, mode: str) -> DatasetProfile:
+    """Process-pool worker: profile one chunk"""
+    return DatasetProfile(mode).update(chunk)
+
+
+def _iter_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def profile_chunks(chunks: Iterable[pd.DataFrame], mode: str = "exact",
+                   max_workers: Optional[int] = None) -> DatasetProfile:
+    """Profile a stream of DataFrame chunks in one pass, optionally across processes"""
+    start_time = time.perf_counter()
+    profile = DatasetProfile(mode)
+    max_workers = max_workers or 1
+
+    if max_workers == 1:
+        for chunk in chunks:
+            profile.update(chunk)
+    else:
+        in_flight = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for chunk in chunks:
+                in_flight.append(executor.submit(_profile_chunk, chunk, mode))
+                # Merge in submission order so column order follows the data
+                if len(in_flight) >= max_workers * 2:
+                    profile.merge(in_flight.pop(0).result())
+            for future in in_flight:
+                profile.merge(future.result())
+
+    profile.elapsed_seconds = time.perf_counter() - start_time
+    return profile
+
+
+def profile_dataframe(df: pd.DataFrame, mode: str = "exact", chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                      max_workers: Optional[int] = None) -> DatasetProfile:
+    """Profile an in-memory DataFrame; large frames are split across worker processes"""
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) - 1) if len(df) >= PARALLEL_MIN_ROWS else 1
+    if max_workers == 1:
+        # In-process the frame is already in memory, so one chunk avoids merging per-chunk partials
+        chunk_rows = max(len(df), 1)
+    profile = profile_chunks(_iter_chunks(df, chunk_rows), mode, max_workers)
+    if not len(df):
+        for name in df.columns:
+            profile.columns[name] = ColumnProfile(name, str(df[name].dtype), _column_kind(df[name]), mode)
+    return profile
+
+
+def profile_source(source, input_format: str, settings: Optional[Dict[str, Any]] = None, mode: str = "approximate",
+                   max_workers: Optional[int] = None) -> DatasetProfile:
+    """Profile a CSV/TSV/JSON Lines/Parquet source out of core, one record batch at a time"""
+    batches = iter_record_batches(source, input_format, settings)
+    return profile_chunks((batch.to_pandas() for batch in batches), mode, max_workers)
@@ -0,0 +1,222 @@
+import hashlib
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DATE_FORMAT_PATTERNS = (
+    r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
+    r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
+    r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
+)
+DATE_LIKE_PATTERN = r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4}'
+EMAIL_PATTERN = r'[^@]+@[^@]+\.[^@]+'
+PHONE_PATTERN = r'\(\d{3}\)\s*\d{3}-\d{4}|\d{3}-\d{3}-\d{4}|\d{10}'
+
+
+class ColumnQuality:
+    """Quality masks and statistics for one column, each computed vectorized on first use and then shared"""
+
+    def __init__(self, series: pd.Series, null_count: int):
+        self.name = series.name
+        self.series = series
+        self.dtype = series.dtype
+        self.total = len(series)
+        self.null_count = int(null_count)
+        self.count = self.total - self.null_count
+        self.is_numeric = pd.api.types.is_numeric_dtype(series)
+        self.is_object = series.dtype == object
+        self._pattern_cache: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._outlier_cache: Dict[float, int] = {}
+
+    @cached_property
+    def non_null(self) -> pd.Series:
+        return self.series.dropna()
+
+    @cached_property
+    def nunique(self) -> int:
+        return int(self.series.nunique())
+
+    # Numeric columns
+
+    @cached_property
+    def values(self) -> np.ndarray:
+        return self.non_null.to_numpy(dtype=np.float64)
+
+    @cached_property
+    def quartiles(self) -> Tuple[float, float]:
+        q1, q3 = np.quantile(self.values, [0.25, 0.75])
+        return float(q1), float(q3)
+
+    @cached_property
+    def min(self) -> float:
+        return float(self.values.min())
+
+    @cached_property
+    def max(self) -> float:
+        return float(self.values.max())
+
+    @cached_property
+    def negative_count(self) -> int:
+        return int(np.count_nonzero(self.values < 0))
+
+    def iqr_outliers(self, k: float) -> int:
+        """Values more than k IQRs outside the quartiles"""
+        if k not in self._outlier_cache:
+            q1, q3 = self.quartiles
+            iqr = q3 - q1
+            values = self.values
+            self._outlier_cache[k] = int(np.count_nonzero((values < q1 - k * iqr) | (values > q3 + k * iqr)))
+        return self._outlier_cache[k]
+
+    def all_between(self, low: float, high: float) -> bool:
+        return bool(self.min >= low and self.max <= high)
+
+    # Text masks (values rendered with astype(str), as the quality reports do)
+
+    @cached_property
+    def text(self) -> pd.Series:
+        return self.non_null.astype(str)
+
+    @cached_property
+    def string_count(self) -> int:
+        """Non-null values that are actual str instances"""
+        return int(np.count_nonzero(self.is_str))
+
+    @cached_property
+    def numeric_parse_count(self) -> int:
+        """Non-null values pd.to_numeric can parse"""
+        return int(pd.to_numeric(self.non_null, errors='coerce').notna().sum())
+
+    @cached_property
+    def parses_as_numeric(self) -> bool:
+        """Equivalent of pd.to_numeric(non_null, errors='raise') succeeding"""
+        if self.numeric_parse_count == self.count:
+            return True
+        try:
+            pd.to_numeric(self.non_null, errors='raise')
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    @cached_property
+    def digit_like(self) -> np.ndarray:
+        """str(value) is all digits once '.' is removed"""
+        return self.text.str.replace('.', '', regex=False).str.isdigit().to_numpy(dtype=bool)
+
+    @cached_property
+    def signed_digit_like(self) -> np.ndarray:
+        """str(value) is all digits once '.' and '-' are removed"""
+        return self.text.str.replace('.', '', regex=False).str.replace('-', '', regex=False) \
+            .str.isdigit().to_numpy(dtype=bool)
+
+    @cached_property
+    def is_str(self) -> np.ndarray:
+        if not self.is_object:
+            return np.zeros(self.count, dtype=bool)
+        return self.non_null.map(type).eq(str).to_numpy()
+
+    @cached_property
+    def whitespace_count(self) -> int:
+        text = self.text
+        return int((text != text.str.strip()).sum())
+
+    @cached_property
+    def empty_count(self) -> int:
+        return int((self.text.str.len() == 0).sum())
+
+    def pattern_mask(self, pattern: str, full_match: bool = False) -> np.ndarray:
+        """Regex search (or anchored match) mask over the text values"""
+        key = (pattern, full_match)
+        if key not in self._pattern_cache:
+            text = self.text
+            mask = text.str.match(pattern) if full_match else text.str.contains(pattern, regex=True)
+            self._pattern_cache[key] = mask.to_numpy(dtype=bool)
+        return self._pattern_cache[key]
+
+    def pattern_count(self, pattern: str, full_match: bool = False) -> int:
+        return int(np.count_nonzero(self.pattern_mask(pattern, full_match)))
+
+    @cached_property
+    def similar_value_pairs(self) -> List[Tuple[str, str]]:
+        """Distinct string values that collide once lower-cased and stripped"""
+        uniques = pd.Series(self.non_null.unique())
+        uniques = uniques[uniques.map(type) == str]
+        normalized = uniques.str.lower().str.strip()
+        collisions = normalized[normalized.duplicated(keep=False)]
+        pairs = []
+        for _, group in uniques[collisions.index].groupby(collisions, sort=False):
+            values = group.tolist()
+            for i, first in enumerate(values):
+                pairs.extend((first, second) for second in values[i + 1:])
+        return pairs
+
+    @cached_property
+    def length_stats(self) -> Tuple[int, int, int]:
+        """(distinct lengths, min length, max length) of the text values"""
+        lengths = self.text.str.len()
+        return int(lengths.nunique()), int(lengths.min()), int(lengths.max())
+
+
+class QualityReport:
+    """Shared masks and counts that every data-quality report reads from"""
+
+    def __init__(self, df: pd.DataFrame, row_hashes: np.ndarray):
+        null_mask = df.isna().to_numpy()
+        null_counts = null_mask.sum(axis=0)
+
+        self.rows = len(df)
+        self.n_columns = len(df.columns)
+        self.total_cells = self.rows * self.n_columns
+        self.column_names = list(df.columns)
+        self.null_mask = null_mask
+        self.null_counts = pd.Series(null_counts, index=df.columns)
+        self.missing_cells = int(null_counts.sum())
+        self.missing_by_row = null_mask.sum(axis=1)
+        self.rows_with_missing = int(np.count_nonzero(self.missing_by_row))
+        self.duplicate_rows = int(pd.Series(row_hashes).duplicated().sum())
+        self.columns: Dict[str, ColumnQuality] = {
+            name: ColumnQuality(df[name], count) for name, count in zip(df.columns, null_counts)
+        }
+
+    @cached_property
+    def co_missing(self) -> pd.DataFrame:
+        """Pairwise counts of rows where both columns are missing"""
+        mask = self.null_mask.astype(np.int32)
+        return pd.DataFrame(mask.T @ mask, index=self.column_names, columns=self.column_names)
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    try:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        # Unhashable cells (lists/dicts from nested JSON) are hashed by their text form
+        return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+def dataset_digest(df: pd.DataFrame, row_hashes: np.ndarray) -> str:
+    """Content digest of a DataFrame from its row hashes, column names and dtypes"""
+    hasher = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    hasher.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Content digest of a DataFrame, for caching results derived from it"""
+    return dataset_digest(df, _row_hashes(df))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_report(digest: str, _df: pd.DataFrame, _row_hashes: np.ndarray) -> QualityReport:
+    return QualityReport(_df, _row_hashes)
+
+
+def get_quality_report(df: pd.DataFrame) -> QualityReport:
+    """Quality report for a DataFrame, shared by every quality tool that sees the same data.
+
+    Looking it up hashes the whole frame, so a page fetches it once per render and hands it to its sections.
+    """
+    row_hashes = _row_hashes(df)
+    return _cached_report(dataset_digest(df, row_hashes), df, row_hashes)
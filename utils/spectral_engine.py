@@ -0,0 +1,165 @@
+import hashlib
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.tool_page import cached_artifact
+
+# A lag (or period) only counts as seasonal when the autocorrelation there reaches this level
+ACF_THRESHOLD = 0.1
+MAX_CANDIDATES = 5
+
+
+def series_digest(values) -> str:
+    """Content digest of a numeric series, for caching spectral results"""
+    data = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+def _fft_size(n: int) -> int:
+    # Zero-pad to at least 2n - 1 so the circular correlation equals the linear one
+    return 1 << int(2 * n - 1).bit_length()
+
+
+def acf(values, nlags: Optional[int] = None) -> np.ndarray:
+    """Sample autocorrelation for lags 0..nlags in O(n log n) via the FFT (Wiener-Khinchin).
+
+    Uses the standard estimator (overall mean, normalized by the lag-0 sum), as statsmodels' acf does.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    nlags = n - 1 if nlags is None else min(nlags, n - 1)
+    x = x - x.mean()
+    spectrum = np.fft.rfft(x, n=_fft_size(n))
+    autocov = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2)[:nlags + 1]
+    if not autocov[0] > 0:
+        return np.zeros(nlags + 1)
+    return autocov / autocov[0]
+
+
+def detrend(values) -> np.ndarray:
+    """Series minus its least-squares line"""
+    x = np.asarray(values, dtype=np.float64)
+    t = np.arange(len(x), dtype=np.float64)
+    slope, intercept = np.polyfit(t, x, 1)
+    return x - (slope * t + intercept)
+
+
+def periodogram(values):
+    """(frequencies in cycles per observation, power) of the series, without frequency 0"""
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    power = np.abs(np.fft.rfft(x - x.mean())) ** 2 / n
+    return np.fft.rfftfreq(n)[1:], power[1:]
+
+
+def _refine_period(autocorr: np.ndarray, n: int, k: int) -> int:
+    """Integer period between the neighbouring frequency bins of harmonic k with the highest ACF comb.
+
+    A long period's ACF peak is too flat to locate by itself, so each lag is scored by the mean
+    (lag-bias corrected) ACF over all its multiples, which sharpens the peak by the number of cycles.
+    """
+    max_lag = len(autocorr) - 1
+    low = max(2, int(np.floor(n / (k + 1))) + 1)
+    high = min(max_lag, int(np.ceil(n / (k - 1))) - 1 if k > 1 else max_lag)
+    if high < low:
+        return int(round(n / k))
+    lags = np.arange(low, high + 1)
+    multiples = np.arange(1, max(1, max_lag // high) + 1)
+    unbiased = autocorr * n / (n - np.arange(max_lag + 1))
+    comb = unbiased[lags[:, None] * multiples[None, :]].mean(axis=1)
+    return int(lags[np.argmax(comb)])
+
+
+class SpectralProfile:
+    """ACF, periodogram and ranked candidate seasonal periods of one series.
+
+    Candidates are found on the linearly detrended series, whose ACF is not swamped by the trend.
+    """
+
+    def __init__(self, values):
+        x = np.asarray(values, dtype=np.float64)
+        self.n = len(x)
+        # Periods need at least two full cycles to be identifiable
+        self.max_period = self.n // 2
+        self.acf = acf(x, self.max_period)
+        residual = detrend(x)
+        self.detrended_acf = acf(residual, self.max_period)
+        self.frequencies, self.power = periodogram(residual)
+        self.candidates = self._candidates()
+
+    def _candidates(self) -> pd.DataFrame:
+        power = self.power
+        total = power.sum()
+        columns = ['Period', 'Power Share', 'Autocorrelation']
+        if len(power) < 3 or not total > 0:
+            return pd.DataFrame(columns=columns)
+
+        # Local maxima of the periodogram, strongest first; bin i is harmonic k = i + 1
+        peaks = np.flatnonzero((power[1:-1] > power[:-2]) & (power[1:-1] >= power[2:])) + 1
+        peaks = peaks[np.argsort(-power[peaks], kind='stable')]
+
+        rows, seen = [], set()
+        for i in peaks:
+            k = i + 1
+            if self.n / k > self.max_period or self.n / k < 2:
+                continue
+            period = _refine_period(self.detrended_acf, self.n, k)
+            if period in seen or not 2 <= period <= self.max_period:
+                continue
+            seen.add(period)
+            rows.append((period, float(power[i] / total), float(self.detrended_acf[period])))
+            if len(rows) == MAX_CANDIDATES:
+                break
+        return pd.DataFrame(rows, columns=columns)
+
+    def best_period(self) -> Optional[int]:
+        """Strongest spectral peak whose period is confirmed by the autocorrelation, or None"""
+        confirmed = self.candidates[self.candidates['Autocorrelation'] >= ACF_THRESHOLD]
+        if len(confirmed):
+            return int(confirmed['Period'].iloc[0])
+        return None
+
+    def first_acf_peak(self, max_lag: Optional[int] = None) -> Optional[int]:
+        """First lag where |ACF| has a local maximum above the threshold"""
+        values = np.abs(self.acf[1:(max_lag or self.max_period) + 1])
+        if len(values) < 3:
+            return None
+        peaks = np.flatnonzero((values[1:-1] > values[:-2]) & (values[1:-1] > values[2:])
+                               & (values[1:-1] >= ACF_THRESHOLD)) + 1
+        return int(peaks[0] + 1) if len(peaks) else None
+
+
+def spectral_profile(values) -> SpectralProfile:
+    """Spectral profile of a series, computed once per series digest and shared between reruns and sessions"""
+    values = np.asarray(values, dtype=np.float64)
+    return cached_artifact('spectral_profile', series_digest(values), None, SpectralProfile, values)
+
+
+def detect_period(values, dates: Optional[pd.Series] = None, default: int = 12) -> int:
+    """Seasonal period from the periodogram (confirmed by the ACF), else the first ACF peak, else the sampling rate"""
+    if len(values) >= 4:
+        profile = spectral_profile(values)
+        period = profile.best_period() or profile.first_acf_peak()
+        if period:
+            return period
+    if dates is None or len(dates) == 0:
+        return default
+    step_days = (dates.max() - dates.min()).days / len(dates)
+    if step_days <= 1:
+        return 7
+    if step_days <= 7:
+        return 4
+    return default
+
+
+def seasonal_means(detrended, period: int) -> np.ndarray:
+    """Mean of the detrended series at each position in the cycle, ignoring missing values"""
+    x = np.asarray(detrended, dtype=np.float64)
+    position = np.arange(len(x)) % period
+    present = ~np.isnan(x)
+    sums = np.bincount(position[present], weights=x[present], minlength=period)
+    counts = np.bincount(position[present], minlength=period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
@@ -0,0 +1,202 @@
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from utils.artifact_store import ARTIFACT_DIR
+from utils.ingestion import (DELIMITED_FORMATS, iter_record_batches, source_size, stable_column_types,
+                             text_column_types)
+
+# Formats the streaming converter can read and write batch by batch
+STREAMING_FORMATS = ("CSV", "TSV", "JSON Lines", "Parquet")
+
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+DEFAULT_SPOOL_MAX_MB = 64
+
+OUTPUT_FILES = {
+    "CSV": ("converted_data.csv", "text/csv"),
+    "TSV": ("converted_data.tsv", "text/tab-separated-values"),
+    "JSON Lines": ("converted_data.jsonl", "application/x-ndjson"),
+    "Parquet": ("converted_data.parquet", "application/octet-stream"),
+}
+
+
+class ConversionResult:
+    """Spooled output file plus throughput statistics"""
+
+    def __init__(self, output, filename: str, mime_type: str, stats: Dict[str, Any], preview):
+        self.output = output
+        self.filename = filename
+        self.mime_type = mime_type
+        self.stats = stats
+        self.preview = preview
+
+
+class _CsvBatchWriter:
+    """Write record batches as delimited text"""
+
+    def __init__(self, sink, schema: pa.Schema, settings: Dict[str, Any], delimiter: str):
+        self.sink = sink
+        self.encoding = settings.get('encoding', 'utf-8') or 'utf-8'
+        self.delimiter = delimiter
+        self.include_header = True
+        self.writer = None
+        if self.encoding.lower().replace('-', '') == 'utf8':
+            self.writer = pa_csv.CSVWriter(sink, schema, write_options=pa_csv.WriteOptions(delimiter=delimiter))
+
+    def write(self, batch: pa.RecordBatch):
+        if self.writer is not None:
+            self.writer.write_batch(batch)
+        else:
+            # Arrow writes UTF-8 only; other encodings go through pandas one batch at a time
+            text = batch.to_pandas().to_csv(index=False, sep=self.delimiter, header=self.include_header)
+            self.sink.write(text.encode(self.encoding, errors='replace'))
+        self.include_header = False
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _JsonLinesBatchWriter:
+    """Write record batches as JSON Lines"""
+
+    def __init__(self, sink, schema: pa.Schema, settings: Dict[str, Any]):
+        self.sink = sink
+
+    def write(self, batch: pa.RecordBatch):
+        if batch.num_rows:
+            text = batch.to_pandas().to_json(orient='records', lines=True, date_format='iso')
+            self.sink.write(text.encode('utf-8'))
+            if not text.endswith('\n'):
+                self.sink.write(b'\n')
+
+    def close(self):
+        pass
+
+
+class _ParquetBatchWriter:
+    """Write record batches to Parquet, buffering them into full-size row groups"""
+
+    def __init__(self, sink, schema: pa.Schema, settings: Dict[str, Any]):
+        self.row_group_size = int(settings.get('row_group_size') or DEFAULT_ROW_GROUP_SIZE)
+        compression = settings.get('compression', 'snappy')
+        self.writer = pq.ParquetWriter(sink, schema, compression=None if compression == 'none' else compression)
+        self.pending = []
+        self.pending_rows = 0
+
+    def write(self, batch: pa.RecordBatch):
+        self.pending.append(batch)
+        self.pending_rows += batch.num_rows
+        if self.pending_rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self.pending:
+            table = pa.Table.from_batches(self.pending)
+            self.writer.write_table(table, row_group_size=self.row_group_size)
+            self.pending = []
+            self.pending_rows = 0
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def make_batch_writer(output_format: str, sink, schema: pa.Schema, settings: Dict[str, Any]):
+    if output_format == "CSV":
+        return _CsvBatchWriter(sink, schema, settings, settings.get('separator') or ',')
+    if output_format == "TSV":
+        return _CsvBatchWriter(sink, schema, settings, '\t')
+    if output_format == "JSON Lines":
+        return _JsonLinesBatchWriter(sink, schema, settings)
+    if output_format == "Parquet":
+        return _ParquetBatchWriter(sink, schema, settings)
+    raise ValueError(f"Streaming output is not supported for {output_format}")
+
+
+def _write_batches(source, reader_format: str, output_format: str, output, input_settings, output_settings,
+                   columns, max_rows, column_types, progress_callback, preview_rows: int):
+    """Stream every batch into a new writer on output; returns (rows, batches, preview)"""
+    writer = None
+    rows = 0
+    batches = 0
+    preview = None
+    try:
+        for batch in iter_record_batches(source, reader_format, input_settings, columns, max_rows, column_types):
+            if writer is None:
+                writer = make_batch_writer(output_format, output, batch.schema, output_settings)
+                preview = batch.slice(0, preview_rows).to_pandas()
+            writer.write(batch)
+            rows += batch.num_rows
+            batches += 1
+            if progress_callback:
+                progress_callback(rows)
+    except Exception:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        raise
+    if writer is not None:
+        writer.close()
+    return rows, batches, preview
+
+
+def convert_stream(source, input_format: str, output_format: str, input_settings: Optional[Dict[str, Any]] = None,
+                   output_settings: Optional[Dict[str, Any]] = None, columns=None, max_rows: Optional[int] = None,
+                   spool_max_mb: int = DEFAULT_SPOOL_MAX_MB, progress_callback=None,
+                   preview_rows: int = 5) -> ConversionResult:
+    """Convert between streaming formats batch by batch into a spooled output file.
+
+    Memory stays bounded by the reader block size and (for Parquet) one row group; output rolls over
+    from memory to a temporary file once it exceeds spool_max_mb. Delimited text converted to delimited
+    text is read as strings; for other targets, column types a later block contradicts are widened over
+    the whole file and the conversion restarts.
+    """
+    output_settings = output_settings or {}
+    reader_format = "JSON" if input_format == "JSON Lines" else input_format
+    column_types = None
+    if input_format in DELIMITED_FORMATS and output_format in DELIMITED_FORMATS:
+        column_types = text_column_types(source, reader_format, input_settings, columns)
+
+    start_time = time.perf_counter()
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_mb * 1024 * 1024, dir=ARTIFACT_DIR)
+    args = (source, reader_format, output_format, output, input_settings, output_settings, columns, max_rows)
+
+    try:
+        try:
+            rows, batches, preview = _write_batches(*args, column_types, progress_callback, preview_rows)
+        except pa.ArrowInvalid:
+            if input_format not in DELIMITED_FORMATS or column_types is not None:
+                raise
+            output.seek(0)
+            output.truncate()
+            column_types = stable_column_types(source, reader_format, input_settings, columns)
+            rows, batches, preview = _write_batches(*args, column_types, progress_callback, preview_rows)
+    except Exception:
+        output.close()
+        raise
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    bytes_in = source_size(source)
+    bytes_out = output.tell()
+    output.seek(0)
+
+    filename, mime_type = OUTPUT_FILES[output_format]
+    stats = {
+        'rows': rows,
+        'batches': batches,
+        'bytes_in': bytes_in,
+        'bytes_out': bytes_out,
+        'elapsed_seconds': elapsed,
+        'rows_per_second': rows / elapsed,
+        'mb_per_second': bytes_in / elapsed / (1024 * 1024)
+    }
+    return ConversionResult(output, filename, mime_type, stats, preview)
@@ -0,0 +1,257 @@
+import hashlib
+import os
+import re
+import string
+from collections import Counter
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfTransformer
+
+from utils.clustering_engine import SCALABLE_ROWS, cluster_labels
+from utils.tool_page import cached_artifact
+
+# scikit-learn's default token pattern: words of two or more alphanumeric characters, matched on lowercase text
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+# Hash buckets per document-term matrix; collisions between frequent terms are rare at 2**20
+N_FEATURES = int(os.environ.get('TEXT_HASH_FEATURES', str(2 ** 20)))
+# Documents tokenized per task; each worker holds one chunk's token lists at a time
+CHUNK_DOCS = int(os.environ.get('TEXT_CHUNK_DOCS', '5000'))
+# Most frequent terms each chunk reports for naming buckets; topic tools keep at most a few thousand buckets
+NAMED_TERMS = int(os.environ.get('TEXT_NAMED_TERMS', '20000'))
+LDA_BATCH_DOCS = 2048
+# Online LDA stops after this many mini-batch updates, so large corpora make fewer passes than small ones
+LDA_MAX_UPDATES = int(os.environ.get('TEXT_LDA_MAX_UPDATES', '500'))
+TOP_WORDS = 10
+
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+DIGITS = re.compile(r'\d+')
+WHITESPACE = re.compile(r'\s+')
+
+
+def clean_text(text: str, options: Iterable[str]) -> str:
+    """Apply the text-mining preprocessing options (lowercase, punctuation, numbers, whitespace)"""
+    if "Convert to lowercase" in options:
+        text = text.lower()
+    if "Remove punctuation" in options:
+        text = text.translate(PUNCTUATION_TABLE)
+    if "Remove numbers" in options:
+        text = DIGITS.sub('', text)
+    if "Remove extra whitespace" in options:
+        text = WHITESPACE.sub(' ', text).strip()
+    return text
+
+
+def tokenize(text: str, stop_words: bool = True) -> List[str]:
+    """Tokens of a document as CountVectorizer produces them (lowercased, English stop words optional)"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if stop_words:
+        return [token for token in tokens if token not in ENGLISH_STOP_WORDS]
+    return tokens
+
+
+def iter_chunks(documents: Iterable[str], chunk_docs: int = CHUNK_DOCS) -> Iterator[List[str]]:
+    """Lists of up to chunk_docs documents from any iterable, without materializing the rest"""
+    documents = iter(documents)
+    while True:
+        chunk = list(islice(documents, chunk_docs))
+        if not chunk:
+            return
+        yield chunk
+
+
+def corpus_digest(documents: Iterable[str], chunk_docs: int = CHUNK_DOCS) -> str:
+    """Content digest of an ordered collection of documents, for caching document-term matrices"""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter_chunks(documents, chunk_docs):
+        # Lengths make the separator unambiguous whatever the documents contain
+        digest.update(np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk)).tobytes())
+        digest.update('\x1e'.join(chunk).encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def _identity(tokens):
+    return tokens
+
+
+def _hasher(n_features: int) -> HashingVectorizer:
+    # Counts (no sign flipping, no normalization) so LDA and TF-IDF can be applied on top
+    return HashingVectorizer(n_features=n_features, analyzer=_identity, alternate_sign=False, norm=None,
+                             dtype=np.float32)
+
+
+def _hash_chunk(chunk: List[str], stop_words: bool, n_features: int,
+                named_terms: int) -> Tuple[sp.csr_matrix, Counter]:
+    """Hashed term counts of a chunk of documents and the frequencies of its named_terms most frequent terms"""
+    tokens = [tokenize(doc, stop_words) for doc in chunk]
+    top = Counter(chain.from_iterable(tokens)).most_common(named_terms)
+    return _hasher(n_features).transform(tokens), Counter(dict(top))
+
+
+def _count_chunk(chunk: List[str], options: Tuple[str, ...], stop_words: bool) -> Counter:
+    # Term counting needs no document boundaries, so the chunk is cleaned and tokenized as one text
+    return Counter(tokenize(clean_text(' '.join(chunk), options), stop_words))
+
+
+def _map_chunks(func: Callable, documents: Iterable[str], args: tuple, n_jobs: Optional[int],
+                chunk_docs: int) -> Iterator:
+    """func(chunk, *args) for every chunk of documents, across a process pool when there is more than one chunk"""
+    chunks = iter_chunks(documents, chunk_docs)
+    head = list(islice(chunks, 2))
+    chunks = chain(head, chunks)
+    n_jobs = n_jobs or max(1, (os.cpu_count() or 2) - 1)
+    if n_jobs == 1 or len(head) <= 1:
+        return (func(chunk, *args) for chunk in chunks)
+    return Parallel(n_jobs=n_jobs, backend='loky', return_as='generator')(
+        delayed(func)(chunk, *args) for chunk in chunks)
+
+
+class DocumentTermMatrix:
+    """Hashed term counts of a corpus (one row per document) with a representative term for every bucket.
+
+    HashingVectorizer keeps no vocabulary, so each bucket is named after the most frequent term that
+    hashed into it. Only the most frequent terms are tracked; buckets of rarer terms stay unnamed ('').
+    """
+
+    def __init__(self, counts: sp.csr_matrix, term_counts: Counter, n_features: int):
+        self.counts = counts
+        self.n_features = n_features
+        self.doc_freq = np.bincount(counts.indices, minlength=n_features)
+        self.term_freq = np.asarray(counts.sum(axis=0), dtype=np.float64).ravel()
+        self.terms = np.full(n_features, '', dtype=object)
+        if term_counts:
+            vocabulary = [term for term, _ in term_counts.most_common()]
+            buckets = _hasher(n_features).transform([[term] for term in vocabulary]).indices
+            # np.unique keeps each bucket's first (most frequent) term
+            named, first = np.unique(buckets, return_index=True)
+            self.terms[named] = np.asarray(vocabulary, dtype=object)[first]
+
+    @property
+    def n_documents(self) -> int:
+        return self.counts.shape[0]
+
+    def select(self, max_features: int, min_df: int = 1) -> Tuple[sp.csr_matrix, np.ndarray]:
+        """Counts restricted to the max_features most frequent terms found in at least min_df documents.
+
+        Selection follows CountVectorizer: min_df first, then the highest corpus-wide term frequencies.
+        """
+        eligible = np.flatnonzero(self.doc_freq >= min_df)
+        if len(eligible) == 0:
+            raise ValueError("After pruning, no terms remain. Try a lower min document frequency.")
+        keep = eligible[np.argsort(-self.term_freq[eligible], kind='stable')[:max_features]]
+        keep.sort()
+        return self.counts[:, keep], self.terms[keep]
+
+
+def hash_documents(documents: Iterable[str], stop_words: bool = True, n_features: int = N_FEATURES,
+                   n_jobs: Optional[int] = None, chunk_docs: int = CHUNK_DOCS,
+                   named_terms: int = NAMED_TERMS) -> DocumentTermMatrix:
+    """Stream documents (any iterable) through tokenization and feature hashing, a chunk per worker task.
+
+    Bucket names come from each chunk's named_terms most frequent terms, so the merged term counts stay
+    bounded however large the corpus vocabulary is.
+    """
+    parts, term_counts = [], Counter()
+    args = (stop_words, n_features, named_terms)
+    for counts, chunk_terms in _map_chunks(_hash_chunk, documents, args, n_jobs, chunk_docs):
+        parts.append(counts)
+        term_counts.update(chunk_terms)
+        if len(term_counts) > 2 * named_terms:
+            term_counts = Counter(dict(term_counts.most_common(named_terms)))
+    counts = sp.vstack(parts, format='csr') if parts else sp.csr_matrix((0, n_features), dtype=np.float32)
+    return DocumentTermMatrix(counts, term_counts, n_features)
+
+
+def document_term_matrix(documents: Sequence[str], stop_words: bool = True,
+                         n_features: int = N_FEATURES) -> DocumentTermMatrix:
+    """Hashed document-term matrix of a corpus, built once per corpus digest and shared between reruns"""
+    params = {'stop_words': stop_words, 'n_features': n_features}
+    return cached_artifact('document_term_matrix', corpus_digest(documents), params,
+                           lambda docs: hash_documents(docs, stop_words, n_features), documents)
+
+
+def _batches(n_rows: int, batch_rows: int) -> List[slice]:
+    return [slice(start, min(start + batch_rows, n_rows)) for start in range(0, n_rows, batch_rows)]
+
+
+def online_lda(X: sp.csr_matrix, n_topics: int, passes: int, batch_docs: int = LDA_BATCH_DOCS,
+               max_updates: int = LDA_MAX_UPDATES, n_jobs: Optional[int] = None,
+               random_state: int = 42) -> LatentDirichletAllocation:
+    """LDA trained by online variational Bayes, one partial_fit per shuffled mini-batch of documents.
+
+    Each mini-batch's E-step is split across n_jobs processes.
+    """
+    n_jobs = n_jobs or max(1, (os.cpu_count() or 2) - 1)
+    lda = LatentDirichletAllocation(n_components=n_topics, learning_method='online', batch_size=batch_docs,
+                                    total_samples=X.shape[0], n_jobs=n_jobs, random_state=random_state)
+    batches = _batches(X.shape[0], batch_docs)
+    passes = max(1, min(passes, -(-max_updates // len(batches))))
+    rng = np.random.RandomState(random_state)
+    for _ in range(passes):
+        for i in rng.permutation(len(batches)):
+            lda.partial_fit(X[batches[i]])
+    return lda
+
+
+def _top_terms(weights: np.ndarray, terms: np.ndarray, top: int = TOP_WORDS) -> List[dict]:
+    topics = []
+    for topic_idx, row in enumerate(weights):
+        order = np.argsort(row)[-top:][::-1]
+        topics.append({'topic_id': topic_idx, 'top_words': list(terms[order]), 'word_weights': list(row[order])})
+    return topics
+
+
+def lda_topics(documents: Sequence[str], n_topics: int, max_features: int, min_df: int, stop_words: bool,
+               passes: int) -> dict:
+    """Topics (top words and weights) and per-document topic probabilities from online LDA"""
+    X, terms = document_term_matrix(documents, stop_words).select(max_features, min_df)
+    lda = online_lda(X, n_topics, passes)
+    return {
+        'topics': _top_terms(lda.components_, terms),
+        'doc_topic_probs': lda.transform(X),
+        'documents': documents,
+        'algorithm': 'Online LDA',
+    }
+
+
+def kmeans_topics(documents: Sequence[str], n_topics: int, max_features: int, min_df: int,
+                  stop_words: bool) -> dict:
+    """Topics from K-Means over TF-IDF rows, mini-batch above SCALABLE_ROWS documents.
+
+    Each topic's words are the heaviest terms of its centroid, the mean TF-IDF row of its documents.
+    """
+    X, terms = document_term_matrix(documents, stop_words).select(max_features, min_df)
+    tfidf = TfidfTransformer().fit_transform(X)
+    labels, method = cluster_labels(tfidf, n_topics, "K-Means", scalable=tfidf.shape[0] > SCALABLE_ROWS)
+    members = sp.csr_matrix((np.ones(len(labels)), (labels, np.arange(len(labels)))),
+                            shape=(n_topics, len(labels)))
+    sizes = np.maximum(np.bincount(labels, minlength=n_topics), 1)
+    centroids = np.asarray((members @ tfidf).todense()) / sizes[:, None]
+    return {
+        'topics': _top_terms(centroids, terms),
+        'doc_assignments': labels,
+        'documents': documents,
+        'algorithm': method,
+    }
+
+
+def key_terms(documents: Iterable[str], options: Iterable[str] = (), top: int = 20, stop_words: bool = True,
+              n_jobs: Optional[int] = None, chunk_docs: int = CHUNK_DOCS) -> List[Tuple[str, float]]:
+    """Top terms of a corpus taken as one document, highest first.
+
+    Scores match TfidfVectorizer(max_features=top) fitted on the joined text: with a single document
+    every IDF is 1, so they are the counts of the top terms, L2-normalized.
+    """
+    options = tuple(options)
+    counts = Counter()
+    for chunk_counts in _map_chunks(_count_chunk, documents, (options, stop_words), n_jobs, chunk_docs):
+        counts.update(chunk_counts)
+    most_common = counts.most_common(top)
+    if not most_common:
+        return []
+    norm = float(np.sqrt(sum(count ** 2 for _, count in most_common)))
+    return [(term, count / norm) for term, count in most_common]
@@ -0,0 +1,121 @@
+import io
+import json
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from PIL import Image
+
+from utils.ingestion import ingest_dataframe
+from utils.upload_cache import get_upload_cache, upload_digest
+
+
+def _fallback_fragment(func=None, **kwargs):
+    """No-op decorator used when this Streamlit version has no fragments"""
+    if func is None:
+        return lambda f: f
+    return func
+
+
+# Widgets inside a fragment only rerun that fragment instead of the whole tool page
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or _fallback_fragment
+
+
+def params_key(params: Optional[Dict[str, Any]]) -> str:
+    """Stable cache key for a parameter dict"""
+    return json.dumps(params or {}, sort_keys=True, default=str)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _cached_artifact(kind: str, digest: str, key: str, _builder: Callable, _source: Any):
+    """Build a derived artifact once per (kind, digest, params)"""
+    return _builder(_source)
+
+
+def cached_artifact(kind: str, digest: str, params: Optional[Dict[str, Any]], builder: Callable, source: Any):
+    """Return a derived artifact cached by (kind, content digest, params).
+
+    The cached object is shared between reruns and sessions, so callers must treat it as read-only
+    (copy before mutating).
+    """
+    return _cached_artifact(kind, digest, params_key(params), builder, source)
+
+
+def _table_reader(uploaded_file):
+    """Upload-cache kind and pandas reader for a tabular upload"""
+    name = uploaded_file.name.lower()
+    if name.endswith(('.xlsx', '.xls')):
+        return 'excel', pd.read_excel
+    if name.endswith('.json'):
+        return 'json', pd.read_json
+    return 'csv', pd.read_csv
+
+
+def _replacement_key(kind: str, uploaded_file, read_kwargs: Dict[str, Any]) -> str:
+    return f"{kind}:{upload_digest(uploaded_file)}:{params_key(read_kwargs)}"
+
+
+def read_dataframe(uploaded_file, **read_kwargs) -> pd.DataFrame:
+    """Parse an uploaded CSV/Excel/JSON file, going through the shared upload cache"""
+    kind, reader = _table_reader(uploaded_file)
+    replaced = st.session_state.get('_replaced_frames', {}).get(_replacement_key(kind, uploaded_file, read_kwargs))
+    if replaced is not None:
+        return replaced
+
+    def parse():
+        if kind == 'csv' and not read_kwargs:
+            # Arrow CSV parsing with classic dtypes, so existing dtype checks keep working. No memory budget:
+            # tools must see every row, and a budgeted read would silently return a truncated frame
+            try:
+                return ingest_dataframe(uploaded_file, "CSV", memory_budget_mb=float('inf'),
+                                        dtype_backend="numpy").df
+            except (pa.ArrowInvalid, UnicodeDecodeError):
+                pass
+        return reader(io.BytesIO(uploaded_file.getbuffer()), **read_kwargs)
+
+    return get_upload_cache().get_or_load(kind, upload_digest(uploaded_file), read_kwargs, parse)
+
+
+def load_dataframe(uploaded_file, **read_kwargs) -> Optional[pd.DataFrame]:
+    """Parse an uploaded CSV/Excel/JSON file once per content digest and read options.
+
+    The DataFrame is shared through the upload cache; treat it as read-only.
+    """
+    try:
+        return read_dataframe(uploaded_file, **read_kwargs)
+    except Exception as e:
+        st.error(f"Error reading {uploaded_file.name}: {str(e)}")
+        return None
+
+
+def replace_dataframe(uploaded_file, df: pd.DataFrame, **read_kwargs):
+    """Serve df to every tool that later loads this upload (with the same read options) in this session.
+
+    The replacement is kept in session state, so other sessions uploading the same bytes still get the
+    original parse from the shared cache.
+    """
+    kind, _ = _table_reader(uploaded_file)
+    st.session_state.setdefault('_replaced_frames', {})[_replacement_key(kind, uploaded_file, read_kwargs)] = df
+
+
+def _decode_image(uploaded_file) -> Image.Image:
+    """Fully decode an uploaded image so it no longer depends on the upload buffer"""
+    image = Image.open(io.BytesIO(uploaded_file.getbuffer()))
+    image.load()
+    return image
+
+
+def read_image(uploaded_file) -> Image.Image:
+    """Decode an uploaded image, going through the shared upload cache"""
+    return get_upload_cache().get_or_load('image', upload_digest(uploaded_file), None,
+                                          lambda: _decode_image(uploaded_file))
+
+
+def load_image(uploaded_file) -> Optional[Image.Image]:
+    """Decode an uploaded image once per content digest (shared; treat as read-only)"""
+    try:
+        return read_image(uploaded_file)
+    except Exception as e:
+        st.error(f"Error opening image: {str(e)}")
+        return None
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+import streamlit as st
+from PIL import Image
+
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get('UPLOAD_CACHE_MB', '512'))
+DEFAULT_SPILL_BUDGET_MB = int(os.environ.get('UPLOAD_CACHE_SPILL_MB', '4096'))
+DEFAULT_SPILL_DIR = os.environ.get(
+    'UPLOAD_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'inonebox_upload_cache')
+)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a cached object in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    return 0
+
+
+class UploadCache:
+    """Process-wide LRU cache of parsed uploads keyed by content digest and parse options.
+
+    Entries are evicted least-recently-used first once the memory budget is exceeded. Evicted
+    DataFrames are spilled to Parquet and read back on the next hit; images are simply dropped
+    since re-decoding them is cheap compared to re-parsing tabular data.
+    """
+
+    def __init__(self, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB, spill_dir: str = DEFAULT_SPILL_DIR,
+                 spill_budget_mb: int = DEFAULT_SPILL_BUDGET_MB):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.spill_budget = spill_budget_mb * 1024 * 1024
+        self.spill_dir = spill_dir
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._spilled: "OrderedDict[str, int]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.RLock()
+        self.stats = {'hits': 0, 'spill_hits': 0, 'misses': 0, 'evictions': 0}
+        os.makedirs(spill_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(kind: str, digest: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from the content digest and parse options"""
+        options_json = json.dumps(options or {}, sort_keys=True, default=str)
+        options_hash = hashlib.blake2b(options_json.encode('utf-8'), digest_size=8).hexdigest()
+        return f"{kind}-{digest}-{options_hash}"
+
+    def get_or_load(self, kind: str, digest: str, options: Optional[Dict[str, Any]], loader: Callable[[], Any]):
+        """Return the cached object, loading (and caching) it on a miss.
+
+        The returned object is shared; callers must copy it before mutating.
+        """
+        key = self.make_key(kind, digest, options)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+
+            spilled = self._load_spilled(key)
+            if spilled is not None:
+                self.stats['spill_hits'] += 1
+                self._store(key, spilled)
+                return spilled
+
+        # Parse outside the lock so other sessions are not blocked by a large upload
+        value = loader()
+        with self._lock:
+            self.stats['misses'] += 1
+            self._store(key, value)
+        return value
+
+    def _store(self, key: str, value: Any):
+        """Insert an entry and evict until within the memory budget"""
+        size = estimate_size(value)
+        if key in self._entries:
+            self._memory_used -= self._sizes[key]
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._memory_used += size
+        self._entries.move_to_end(key)
+
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self._memory_used > self.memory_budget and len(self._entries) > 1:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._memory_used -= self._sizes.pop(old_key)
+            self.stats['evictions'] += 1
+            if isinstance(old_value, pd.DataFrame):
+                self._spill(old_key, old_value)
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.parquet")
+
+    def _spill(self, key: str, df: pd.DataFrame):
+        """Write an evicted DataFrame to the spill directory as Parquet"""
+        path = self._spill_path(key)
+        try:
+            if not os.path.exists(path):
+                df.to_parquet(path, engine='pyarrow', index=True)
+            self._spilled[key] = os.path.getsize(path)
+            self._spilled.move_to_end(key)
+        except Exception:
+            # Columns Arrow cannot represent (mixed objects, non-string names) are simply dropped
+            if os.path.exists(path):
+                os.remove(path)
+            return
+
+        while sum(self._spilled.values()) > self.spill_budget and len(self._spilled) > 1:
+            old_key, _ = self._spilled.popitem(last=False)
+            try:
+                os.remove(self._spill_path(old_key))
+            except OSError:
+                pass
+
+    def _load_spilled(self, key: str) -> Optional[pd.DataFrame]:
+        """Read a previously spilled DataFrame, if present"""
+        path = self._spill_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path, engine='pyarrow')
+        except Exception:
+            return None
+
+    def clear(self):
+        """Drop all in-memory and spilled entries"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._memory_used = 0
+            for key in list(self._spilled):
+                try:
+                    os.remove(self._spill_path(key))
+                except OSError:
+                    pass
+            self._spilled.clear()
+
+    def memory_used(self) -> int:
+        """Bytes currently held in memory"""
+        return self._memory_used
+
+
+def upload_digest(uploaded_file) -> str:
+    """Hash an uploaded file once per upload; later reruns reuse the stored digest"""
+    digests = st.session_state.setdefault('_upload_digests', {})
+    key = getattr(uploaded_file, 'file_id', None) or f"{uploaded_file.name}:{uploaded_file.size}"
+    if key not in digests:
+        digests[key] = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+    return digests[key]
+
+
+@st.cache_resource(show_spinner=False)
+def get_upload_cache() -> UploadCache:
+    """Process-wide parsed-upload cache shared by all tools and sessions"""
+    return UploadCache()
@@ -0,0 +1,218 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque, Counter, OrderedDict
+from typing import Dict, List, Any, Optional
+
+import streamlit as st
+
+DEFAULT_DB_PATH = os.environ.get(
+    'USER_STATE_DB', os.path.join(os.path.expanduser('~'), '.inonebox', 'user_state.db')
+)
+MAX_RECENT_TOOLS = 10
+MAX_HISTORY = 100
+FLUSH_BATCH_SIZE = 25
+FLUSH_INTERVAL_SECONDS = 5.0
+# Users kept in memory; every anonymous session brings a new id, so the cache must not grow with each one
+MAX_CACHED_USERS = int(os.environ.get('USER_STATE_CACHE_USERS', '1000'))
+
+DEFAULT_SETTINGS = {
+    'theme': 'light',
+    'auto_save': True,
+    'show_tips': True
+}
+
+
+class UserState:
+    """In-memory state for one user, bounded with deques"""
+
+    def __init__(self, recent_tools: Optional[List[str]] = None, history: Optional[List[Dict[str, Any]]] = None,
+                 favorites: Optional[List[Dict[str, Any]]] = None, settings: Optional[Dict[str, Any]] = None):
+        self.recent_tools = deque(recent_tools or [], maxlen=MAX_RECENT_TOOLS)
+        self.history = deque(history or [], maxlen=MAX_HISTORY)
+        self.favorites = list(favorites or [])
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+
+
+class UserStateStore:
+    """SQLite-backed user state with a write-through in-memory cache and batched flushes"""
+
+    FIELDS = ('recent_tools', 'history', 'favorites', 'settings')
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, flush_batch_size: int = FLUSH_BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS, max_cached_users: int = MAX_CACHED_USERS):
+        self.db_path = db_path
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self.max_cached_users = max_cached_users
+
+        self._lock = threading.RLock()
+        self._cache: OrderedDict[str, UserState] = OrderedDict()
+        self._dirty = set()
+        self._pending_usage = Counter()
+        self._popularity: Optional[Counter] = None
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._init_db()
+        atexit.register(self.flush)
+
+    def _init_db(self):
+        """Create tables if they do not exist"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_state (
+                    user_id TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (user_id, field)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tool_usage (
+                    tool_name TEXT PRIMARY KEY,
+                    uses INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def load(self, user_id: str) -> UserState:
+        """Return the cached state for a user, loading it from SQLite on first access"""
+        with self._lock:
+            state = self._cache.get(user_id)
+            if state is not None:
+                self._cache.move_to_end(user_id)
+                return state
+
+            rows = self._conn.execute(
+                "SELECT field, value FROM user_state WHERE user_id = ?", (user_id,)
+            ).fetchall()
+            stored = {}
+            for field, value in rows:
+                try:
+                    stored[field] = json.loads(value)
+                except json.JSONDecodeError:
+                    continue
+
+            state = UserState(**{field: stored.get(field) for field in self.FIELDS})
+            self._cache[user_id] = state
+            self._evict()
+            return state
+
+    def _evict(self):
+        """Drop least recently used users beyond the cache limit, flushing their pending changes first"""
+        # The user just loaded always stays, so callers can mark it dirty
+        while len(self._cache) > max(self.max_cached_users, 1):
+            oldest = next(iter(self._cache))
+            if any(user_id == oldest for user_id, _ in self._dirty):
+                self.flush()
+            self._cache.popitem(last=False)
+
+    def add_recent(self, user_id: str, tool_name: str) -> bool:
+        """Append a tool to the user's recents; returns True if it was not already there"""
+        with self._lock:
+            state = self.load(user_id)
+            if tool_name in state.recent_tools:
+                return False
+            state.recent_tools.append(tool_name)
+            self._mark_dirty(user_id, 'recent_tools')
+            return True
+
+    def add_history(self, user_id: str, entry: Dict[str, Any]):
+        """Append an entry to the user's bounded history"""
+        with self._lock:
+            self.load(user_id).history.append(entry)
+            self._mark_dirty(user_id, 'history')
+
+    def set_favorites(self, user_id: str, favorites: List[Dict[str, Any]]):
+        """Replace the user's favorites"""
+        with self._lock:
+            self.load(user_id).favorites = favorites
+            self._mark_dirty(user_id, 'favorites')
+
+    def set_settings(self, user_id: str, settings: Dict[str, Any]):
+        """Replace the user's settings"""
+        with self._lock:
+            self.load(user_id).settings = settings
+            self._mark_dirty(user_id, 'settings')
+
+    def record_tool_use(self, tool_name: str):
+        """Count one use of a tool towards its global popularity"""
+        with self._lock:
+            self._pending_usage[tool_name] += 1
+            if self._popularity is not None:
+                self._popularity[tool_name] += 1
+            self._pending_writes += 1
+            self._maybe_flush()
+
+    def popularity(self) -> Counter:
+        """Return global tool usage counts (cached after the first read)"""
+        with self._lock:
+            if self._popularity is None:
+                rows = self._conn.execute("SELECT tool_name, uses FROM tool_usage").fetchall()
+                self._popularity = Counter(dict(rows))
+                self._popularity.update(self._pending_usage)
+            return self._popularity
+
+    def _mark_dirty(self, user_id: str, field: str):
+        """Queue a field for the next batched flush"""
+        self._dirty.add((user_id, field))
+        self._pending_writes += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        """Flush when enough writes are pending or the flush interval has elapsed"""
+        if (self._pending_writes >= self.flush_batch_size or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write all pending changes to SQLite in one transaction"""
+        with self._lock:
+            if not self._dirty and not self._pending_usage:
+                return
+
+            now = time.time()
+            state_rows = []
+            for user_id, field in self._dirty:
+                value = getattr(self._cache[user_id], field)
+                if isinstance(value, deque):
+                    value = list(value)
+                state_rows.append((user_id, field, json.dumps(value, default=str), now))
+
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO user_state (user_id, field, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(user_id, field) DO UPDATE SET value = excluded.value, "
+                    "updated_at = excluded.updated_at",
+                    state_rows
+                )
+                self._conn.executemany(
+                    "INSERT INTO tool_usage (tool_name, uses) VALUES (?, ?) "
+                    "ON CONFLICT(tool_name) DO UPDATE SET uses = uses + excluded.uses",
+                    list(self._pending_usage.items())
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._dirty.clear()
+            self._pending_usage.clear()
+            self._pending_writes = 0
+            self._last_flush = time.monotonic()
+
+
+@st.cache_resource(show_spinner=False)
+def get_user_store() -> UserStateStore:
+    """Process-wide user state store shared by all sessions"""
+    return UserStateStore()
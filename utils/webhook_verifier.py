@@ -0,0 +1,302 @@
+import hmac
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+# Supported signature schemes: name -> (digest, header, prefix)
+SIGNATURE_SCHEMES = {
+    "HMAC-SHA1": {"digest": "sha1", "header": "X-Hub-Signature", "prefix": "sha1="},
+    "HMAC-SHA256": {"digest": "sha256", "header": "X-Hub-Signature-256", "prefix": "sha256="},
+    "HMAC-SHA512": {"digest": "sha512", "header": "X-Signature-512", "prefix": "sha512="},
+    "Stripe (timestamped)": {"digest": "sha256", "header": "Stripe-Signature", "prefix": ""},
+}
+
+STRIPE_SCHEME = "Stripe (timestamped)"
+DEFAULT_CHUNK_SIZE = 500
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _payload_bytes(payload: Any) -> bytes:
+    """Normalize a payload to bytes; Python objects are serialized compactly (batch records use their raw text)"""
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return payload.encode('utf-8')
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def compute_signature(payload: Any, secret: str, scheme: str = "HMAC-SHA256",
+                      timestamp: Optional[int] = None) -> str:
+    """Compute a webhook signature header value for a payload"""
+    config = SIGNATURE_SCHEMES[scheme]
+    body = _payload_bytes(payload)
+
+    if scheme == STRIPE_SCHEME:
+        timestamp = int(time.time()) if timestamp is None else int(timestamp)
+        signed = f"{timestamp}.".encode('utf-8') + body
+        digest = hmac.new(secret.encode('utf-8'), signed, config["digest"]).hexdigest()
+        return f"t={timestamp},v1={digest}"
+
+    digest = hmac.new(secret.encode('utf-8'), body, config["digest"]).hexdigest()
+    return f"{config['prefix']}{digest}"
+
+
+def _parse_stripe_header(header: str) -> Tuple[Optional[int], List[str]]:
+    """Split a Stripe-style 't=...,v1=...' header into timestamp and signatures"""
+    timestamp = None
+    signatures = []
+    for part in header.split(','):
+        key, _, value = part.strip().partition('=')
+        if key == 't':
+            try:
+                timestamp = int(value)
+            except ValueError:
+                timestamp = None
+        elif key == 'v1':
+            signatures.append(value)
+    return timestamp, signatures
+
+
+def verify_signature(payload: Any, signature: str, secrets: List[str], scheme: str = "HMAC-SHA256",
+                     tolerance: Optional[int] = None, now: Optional[float] = None) -> Dict[str, Any]:
+    """Verify a signature against one or more secrets using constant-time comparison"""
+    config = SIGNATURE_SCHEMES[scheme]
+    body = _payload_bytes(payload)
+    signature = (signature or "").strip()
+
+    if not signature:
+        return {'valid': False, 'reason': 'Missing signature'}
+
+    if scheme == STRIPE_SCHEME:
+        timestamp, candidates = _parse_stripe_header(signature)
+        if timestamp is None or not candidates:
+            return {'valid': False, 'reason': 'Malformed timestamped signature header'}
+        if tolerance is not None:
+            now = time.time() if now is None else now
+            if abs(now - timestamp) > tolerance:
+                return {'valid': False, 'reason': 'Timestamp outside tolerance'}
+        signed = f"{timestamp}.".encode('utf-8') + body
+    else:
+        prefix = config["prefix"]
+        candidates = [signature[len(prefix):] if signature.startswith(prefix) else signature]
+        signed = body
+
+    # Check every secret so timing does not reveal which one matched
+    matched_index = None
+    for index, secret in enumerate(secrets):
+        expected = hmac.new(secret.encode('utf-8'), signed, config["digest"]).hexdigest()
+        for candidate in candidates:
+            if hmac.compare_digest(expected.encode('ascii'), candidate.encode('ascii', 'replace')):
+                if matched_index is None:
+                    matched_index = index
+
+    if matched_index is None:
+        return {'valid': False, 'reason': 'Signature mismatch'}
+    return {'valid': True, 'reason': 'OK', 'secret_index': matched_index}
+
+
+def _extract_signature(record: Dict[str, Any], scheme: str) -> str:
+    """Find the signature in a captured delivery record"""
+    if record.get('signature'):
+        return str(record['signature'])
+
+    header_name = SIGNATURE_SCHEMES[scheme]["header"].lower()
+    headers = record.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == header_name:
+            return str(value)
+    return ""
+
+
+def _raw_member(text: str, key: str) -> Optional[str]:
+    """Exact JSON text of a top-level member of an object, or None when the key is absent"""
+    found = None
+    index = _WHITESPACE.match(text, 0).end()
+    if text[index:index + 1] != '{':
+        return None
+    index = _WHITESPACE.match(text, index + 1).end()
+    while text[index:index + 1] not in ('}', ''):
+        name, index = _DECODER.raw_decode(text, index)
+        start = _WHITESPACE.match(text, _WHITESPACE.match(text, index).end() + 1).end()
+        _, index = _DECODER.raw_decode(text, start)
+        if name == key:
+            found = text[start:index]
+        index = _WHITESPACE.match(text, index).end()
+        if text[index:index + 1] == ',':
+            index = _WHITESPACE.match(text, index + 1).end()
+    return found
+
+
+def _delivery_body(line: str, record: Dict[str, Any]) -> bytes:
+    """Raw body of a captured delivery: a string payload as-is, a JSON payload exactly as written in the line"""
+    key = 'payload' if 'payload' in record else 'body'
+    payload = record.get(key, '')
+    if isinstance(payload, str) or key not in record:
+        return _payload_bytes(payload)
+    return _raw_member(line, key).encode('utf-8')
+
+
+def _verify_chunk(lines: List[Tuple[int, str]], secrets: List[str], scheme: str,
+                  tolerance: Optional[int], now: float) -> List[Dict[str, Any]]:
+    """Verify a chunk of JSONL lines (runs inside a worker process)"""
+    results = []
+    for line_number, line in lines:
+        record = None
+        try:
+            record = json.loads(line)
+            body = _delivery_body(line, record)
+            signature = _extract_signature(record, scheme)
+            outcome = verify_signature(body, signature, secrets, scheme, tolerance, now)
+        except (json.JSONDecodeError, AttributeError) as e:
+            outcome = {'valid': False, 'reason': f'Invalid record: {e}'}
+        except Exception as e:
+            outcome = {'valid': False, 'reason': f'Error: {e}'}
+
+        outcome['line'] = line_number
+        outcome['id'] = record.get('id', '') if isinstance(record, dict) else ''
+        results.append(outcome)
+    return results
+
+
+def _sign_chunk(lines: List[Tuple[int, str]], secret: str, scheme: str,
+                timestamp: Optional[int]) -> List[str]:
+    """Sign a chunk of JSONL lines and return the annotated records (runs inside a worker process).
+
+    Payloads are signed and written back as their raw text, so the output verifies byte for byte.
+    """
+    output = []
+    header = SIGNATURE_SCHEMES[scheme]["header"]
+    for line_number, line in lines:
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict) and 'payload' in record:
+                payload, raw = record.pop('payload'), _raw_member(line, 'payload')
+            else:
+                payload, raw, record = record, line, {}
+            body = payload if isinstance(payload, str) else raw
+            record.setdefault('headers', {})[header] = compute_signature(body, secret, scheme, timestamp)
+            rest = json.dumps(record, ensure_ascii=False)
+            output.append(f'{{"payload": {raw}, {rest[1:]}')
+        except json.JSONDecodeError as e:
+            output.append(json.dumps({'line': line_number, 'error': f'Invalid JSON: {e}'}, ensure_ascii=False))
+    return output
+
+
+def iter_jsonl_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[List[Tuple[int, str]], int]]:
+    """Stream (line_number, line) chunks from a binary or text JSONL source, with the chunk's size in bytes"""
+    if isinstance(source, (str, bytes)):
+        source = io.BytesIO(_payload_bytes(source))
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    text = isinstance(source, io.TextIOBase)
+    chunk = []
+    chunk_bytes = 0
+    for line_number, line in enumerate(source, start=1):
+        chunk_bytes += len(line.encode('utf-8')) if text else len(line)
+        stripped = (line if text else line.decode('utf-8')).strip()
+        if not stripped:
+            continue
+        chunk.append((line_number, stripped))
+        if len(chunk) >= chunk_size:
+            yield chunk, chunk_bytes
+            chunk = []
+            chunk_bytes = 0
+    if chunk:
+        yield chunk, chunk_bytes
+
+
+def _run_chunks(worker, chunks: Iterator, extra_args: Tuple,
+                max_workers: Optional[int]) -> Iterator[Tuple[Any, int]]:
+    """Map a worker over streamed chunks, keeping a bounded number of chunks in flight"""
+    max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+
+    if max_workers == 1:
+        for chunk, chunk_bytes in chunks:
+            yield worker(chunk, *extra_args), chunk_bytes
+        return
+
+    in_flight = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for chunk, chunk_bytes in chunks:
+            in_flight.append((executor.submit(worker, chunk, *extra_args), chunk_bytes))
+            # Preserve input order and cap memory by draining the oldest chunk first
+            if len(in_flight) >= max_workers * 2:
+                future, size = in_flight.pop(0)
+                yield future.result(), size
+        for future, size in in_flight:
+            yield future.result(), size
+
+
+def verify_jsonl_batch(source, secrets: List[str], scheme: str = "HMAC-SHA256",
+                       tolerance: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       max_workers: Optional[int] = None, progress_callback=None) -> Dict[str, Any]:
+    """Verify every delivery in a JSONL file and return results with throughput stats"""
+    secrets = [s for s in secrets if s]
+    if not secrets:
+        raise ValueError("At least one secret is required")
+
+    start_time = time.perf_counter()
+    now = time.time()
+    results = []
+    total_bytes = 0
+
+    chunks = iter_jsonl_chunks(source, chunk_size)
+    for chunk_results, chunk_bytes in _run_chunks(_verify_chunk, chunks, (secrets, scheme, tolerance, now),
+                                                  max_workers):
+        results.extend(chunk_results)
+        total_bytes += chunk_bytes
+        if progress_callback:
+            progress_callback(len(results), total_bytes)
+
+    elapsed = time.perf_counter() - start_time
+    passed = sum(1 for r in results if r['valid'])
+    return {
+        'results': results,
+        'stats': _throughput_stats(len(results), passed, total_bytes, elapsed)
+    }
+
+
+def sign_jsonl_batch(source, secret: str, scheme: str = "HMAC-SHA256", timestamp: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Generate signatures for every payload in a JSONL file"""
+    if not secret:
+        raise ValueError("A secret is required")
+    if scheme == STRIPE_SCHEME and timestamp is None:
+        timestamp = int(time.time())
+
+    start_time = time.perf_counter()
+    lines = []
+    total_bytes = 0
+
+    chunks = iter_jsonl_chunks(source, chunk_size)
+    for chunk_lines, chunk_bytes in _run_chunks(_sign_chunk, chunks, (secret, scheme, timestamp), max_workers):
+        lines.extend(chunk_lines)
+        total_bytes += chunk_bytes
+
+    elapsed = time.perf_counter() - start_time
+    output = ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+    return {
+        'output': output,
+        'stats': _throughput_stats(len(lines), len(lines), total_bytes, elapsed)
+    }
+
+
+def _throughput_stats(total: int, passed: int, total_bytes: int, elapsed: float) -> Dict[str, Any]:
+    """Summarize record counts and throughput"""
+    elapsed = max(elapsed, 1e-9)
+    return {
+        'total': total,
+        'passed': passed,
+        'failed': total - passed,
+        'bytes': total_bytes,
+        'elapsed_seconds': elapsed,
+        'records_per_second': total / elapsed,
+        'mb_per_second': total_bytes / elapsed / (1024 * 1024)
+    }